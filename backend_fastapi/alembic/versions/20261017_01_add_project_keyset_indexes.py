@@ -0,0 +1,45 @@
+"""add project keyset pagination indexes
+
+Revision ID: 20261017_01
+Revises: 20260211_01
+Create Date: 2026-10-17 09:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_01"
+down_revision: Union[str, Sequence[str], None] = "20260211_01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_project_formulation_date_id",
+        "tbl_ProjectInfo",
+        ["FormulationDate", "ProjectID"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "idx_project_name_id",
+        "tbl_ProjectInfo",
+        ["ProjectName", "ProjectID"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "idx_project_name_id", table_name="tbl_ProjectInfo", if_exists=True
+    )
+    op.drop_index(
+        "idx_project_formulation_date_id",
+        table_name="tbl_ProjectInfo",
+        if_exists=True,
+    )
@@ -0,0 +1,46 @@
+"""add pg_trgm keyword search indexes
+
+Revision ID: 20261017_02
+Revises: 20261017_01
+Create Date: 2026-10-17 10:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_02"
+down_revision: Union[str, Sequence[str], None] = "20261017_01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (索引名, 表名, 列名)
+TRGM_INDEXES = [
+    ("idx_project_name_trgm", "tbl_ProjectInfo", "ProjectName"),
+    ("idx_project_formula_code_trgm", "tbl_ProjectInfo", "FormulaCode"),
+    ("idx_material_tradename_trgm", "tbl_RawMaterials", "TradeName"),
+    ("idx_material_cas_trgm", "tbl_RawMaterials", "CAS_Number"),
+    ("idx_filler_tradename_trgm", "tbl_InorganicFillers", "TradeName"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, table_name, column_name in TRGM_INDEXES:
+        op.create_index(
+            index_name,
+            table_name,
+            [column_name],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column_name: "gin_trgm_ops"},
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    for index_name, table_name, _ in reversed(TRGM_INDEXES):
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
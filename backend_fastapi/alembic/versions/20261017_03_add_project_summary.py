@@ -0,0 +1,226 @@
+"""add project summary table maintained by triggers
+
+Revision ID: 20261017_03
+Revises: 20261017_02
+Create Date: 2026-10-17 11:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_03"
+down_revision: Union[str, Sequence[str], None] = "20261017_02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (被监听的表, 触发器名前缀)
+SUMMARY_SOURCES = [
+    ("tbl_FormulaComposition", "trg_composition"),
+    ("tbl_TestResults_Ink", "trg_testresults_ink"),
+    ("tbl_TestResults_Coating", "trg_testresults_coating"),
+    ("tbl_TestResults_3DPrint", "trg_testresults_3dprint"),
+    ("tbl_TestResults_Composite", "trg_testresults_composite"),
+]
+
+# 重新计算指定项目的汇总行。
+# 并发写同一项目的子表时，两个事务的语句级触发器各自按自己的快照重算，
+# 后提交的一方会用看不到对方新行的结果覆盖汇总行。重算前按 ProjectID 顺序锁住父项目行，
+# 后到的事务等前一个提交后再取新快照重算（READ COMMITTED 下每条语句一个快照）。
+# 用 FOR NO KEY UPDATE 而不是 FOR UPDATE：子表外键检查持有父行的 FOR KEY SHARE，
+# FOR UPDATE 与其冲突，两个事务各自插入子行后会互相等待而死锁。
+FN_RECOMPUTE = (
+    'CREATE OR REPLACE FUNCTION "fn_recompute_project_summary"(p_ids INTEGER[]) '
+    "RETURNS VOID AS $$ "
+    "BEGIN "
+    "  IF p_ids IS NULL OR cardinality(p_ids) = 0 THEN RETURN; END IF; "
+    '  PERFORM 1 FROM "tbl_ProjectInfo" WHERE "ProjectID" = ANY(p_ids) '
+    '  ORDER BY "ProjectID" FOR NO KEY UPDATE; '
+    '  INSERT INTO "tbl_ProjectSummary" ('
+    '    "ProjectID_FK", "CompositionCount", "TotalWeightPercentage", "HasCompositions", '
+    '    "TestResultType", "HasTestResults", "LastTestDate", "UpdatedAt") '
+    '  SELECT p."ProjectID", COALESCE(c.cnt, 0), COALESCE(c.total, 0), COALESCE(c.cnt, 0) > 0, '
+    "         t.type_code, t.type_code IS NOT NULL, t.test_date, CURRENT_TIMESTAMP "
+    '  FROM "tbl_ProjectInfo" p '
+    "  LEFT JOIN ("
+    '    SELECT "ProjectID_FK", COUNT(*) AS cnt, SUM("WeightPercentage") AS total '
+    '    FROM "tbl_FormulaComposition" WHERE "ProjectID_FK" = ANY(p_ids) GROUP BY "ProjectID_FK"'
+    '  ) c ON c."ProjectID_FK" = p."ProjectID" '
+    "  LEFT JOIN LATERAL ("
+    "    SELECT r.type_code, r.test_date FROM ("
+    '      SELECT \'INK\' AS type_code, "TestDate" AS test_date FROM "tbl_TestResults_Ink" WHERE "ProjectID_FK" = p."ProjectID" '
+    '      UNION ALL SELECT \'COAT\', "TestDate" FROM "tbl_TestResults_Coating" WHERE "ProjectID_FK" = p."ProjectID" '
+    '      UNION ALL SELECT \'3DP\', "TestDate" FROM "tbl_TestResults_3DPrint" WHERE "ProjectID_FK" = p."ProjectID" '
+    '      UNION ALL SELECT \'COMP\', "TestDate" FROM "tbl_TestResults_Composite" WHERE "ProjectID_FK" = p."ProjectID"'
+    "    ) r ORDER BY r.test_date DESC NULLS LAST LIMIT 1"
+    "  ) t ON TRUE "
+    '  WHERE p."ProjectID" = ANY(p_ids) '
+    '  ON CONFLICT ("ProjectID_FK") DO UPDATE SET '
+    '    "CompositionCount" = EXCLUDED."CompositionCount", '
+    '    "TotalWeightPercentage" = EXCLUDED."TotalWeightPercentage", '
+    '    "HasCompositions" = EXCLUDED."HasCompositions", '
+    '    "TestResultType" = EXCLUDED."TestResultType", '
+    '    "HasTestResults" = EXCLUDED."HasTestResults", '
+    '    "LastTestDate" = EXCLUDED."LastTestDate", '
+    '    "UpdatedAt" = EXCLUDED."UpdatedAt"; '
+    "END; "
+    "$$ LANGUAGE plpgsql; "
+)
+
+FN_REFRESH = (
+    'CREATE OR REPLACE FUNCTION "fn_refresh_project_summary"() '
+    "RETURNS TRIGGER AS $$ "
+    "DECLARE ids INTEGER[]; "
+    "BEGIN "
+    "  IF TG_OP = 'INSERT' THEN "
+    '    SELECT array_agg(DISTINCT "ProjectID_FK") INTO ids FROM new_rows; '
+    "  ELSIF TG_OP = 'DELETE' THEN "
+    '    SELECT array_agg(DISTINCT "ProjectID_FK") INTO ids FROM old_rows; '
+    "  ELSE "
+    "    SELECT array_agg(DISTINCT id) INTO ids FROM ("
+    '      SELECT "ProjectID_FK" AS id FROM new_rows UNION SELECT "ProjectID_FK" FROM old_rows'
+    "    ) changed; "
+    "  END IF; "
+    '  PERFORM "fn_recompute_project_summary"(ids); '
+    "  RETURN NULL; "
+    "END; "
+    "$$ LANGUAGE plpgsql; "
+)
+
+FN_INIT = (
+    'CREATE OR REPLACE FUNCTION "fn_init_project_summary"() '
+    "RETURNS TRIGGER AS $$ "
+    "BEGIN "
+    '  INSERT INTO "tbl_ProjectSummary" ("ProjectID_FK") '
+    '  SELECT "ProjectID" FROM new_rows '
+    '  ON CONFLICT ("ProjectID_FK") DO NOTHING; '
+    "  RETURN NULL; "
+    "END; "
+    "$$ LANGUAGE plpgsql; "
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tbl_ProjectSummary",
+        sa.Column("ProjectID_FK", sa.Integer(), nullable=False, comment="项目ID"),
+        sa.Column(
+            "CompositionCount",
+            sa.Integer(),
+            nullable=False,
+            server_default=sa.text("0"),
+            comment="配方成分数量",
+        ),
+        sa.Column(
+            "TotalWeightPercentage",
+            sa.Numeric(9, 4),
+            nullable=False,
+            server_default=sa.text("0"),
+            comment="配方成分重量百分比合计",
+        ),
+        sa.Column(
+            "HasCompositions",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.text("false"),
+            comment="是否有配方成分",
+        ),
+        sa.Column(
+            "TestResultType",
+            sa.String(length=10),
+            nullable=True,
+            comment="已有测试结果的类型代码（INK/COAT/3DP/COMP）",
+        ),
+        sa.Column(
+            "HasTestResults",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.text("false"),
+            comment="是否有测试结果",
+        ),
+        sa.Column("LastTestDate", sa.Date(), nullable=True, comment="最近测试日期"),
+        sa.Column(
+            "UpdatedAt",
+            sa.DateTime(),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            comment="汇总更新时间",
+        ),
+        sa.ForeignKeyConstraint(
+            ["ProjectID_FK"], ["tbl_ProjectInfo.ProjectID"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("ProjectID_FK"),
+        comment="项目汇总表（触发器维护）",
+    )
+    op.create_index(
+        "idx_project_summary_has_compositions",
+        "tbl_ProjectSummary",
+        ["ProjectID_FK"],
+        unique=False,
+        postgresql_where=sa.text('"HasCompositions"'),
+    )
+    op.create_index(
+        "idx_project_summary_has_test_results",
+        "tbl_ProjectSummary",
+        ["ProjectID_FK"],
+        unique=False,
+        postgresql_where=sa.text('"HasTestResults"'),
+    )
+
+    op.execute(FN_RECOMPUTE)
+    op.execute(FN_REFRESH)
+    op.execute(FN_INIT)
+
+    op.execute(
+        'CREATE TRIGGER "trg_projectinfo_summary_init" AFTER INSERT ON "tbl_ProjectInfo" '
+        "REFERENCING NEW TABLE AS new_rows "
+        'FOR EACH STATEMENT EXECUTE FUNCTION "fn_init_project_summary"()'
+    )
+    for table_name, prefix in SUMMARY_SOURCES:
+        op.execute(
+            f'CREATE TRIGGER "{prefix}_summary_ins" AFTER INSERT ON "{table_name}" '
+            "REFERENCING NEW TABLE AS new_rows "
+            'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"()'
+        )
+        op.execute(
+            f'CREATE TRIGGER "{prefix}_summary_upd" AFTER UPDATE ON "{table_name}" '
+            "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+            'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"()'
+        )
+        op.execute(
+            f'CREATE TRIGGER "{prefix}_summary_del" AFTER DELETE ON "{table_name}" '
+            "REFERENCING OLD TABLE AS old_rows "
+            'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"()'
+        )
+
+    # 回填已有项目
+    op.execute(
+        'SELECT "fn_recompute_project_summary"('
+        'ARRAY(SELECT "ProjectID" FROM "tbl_ProjectInfo"))'
+    )
+
+
+def downgrade() -> None:
+    for table_name, prefix in reversed(SUMMARY_SOURCES):
+        for suffix in ("del", "upd", "ins"):
+            op.execute(
+                f'DROP TRIGGER IF EXISTS "{prefix}_summary_{suffix}" ON "{table_name}"'
+            )
+    op.execute(
+        'DROP TRIGGER IF EXISTS "trg_projectinfo_summary_init" ON "tbl_ProjectInfo"'
+    )
+    op.execute('DROP FUNCTION IF EXISTS "fn_init_project_summary"()')
+    op.execute('DROP FUNCTION IF EXISTS "fn_refresh_project_summary"()')
+    op.execute('DROP FUNCTION IF EXISTS "fn_recompute_project_summary"(INTEGER[])')
+
+    op.drop_index(
+        "idx_project_summary_has_test_results", table_name="tbl_ProjectSummary"
+    )
+    op.drop_index(
+        "idx_project_summary_has_compositions", table_name="tbl_ProjectSummary"
+    )
+    op.drop_table("tbl_ProjectSummary")
@@ -0,0 +1,60 @@
+"""add formula code sequence counter
+
+Revision ID: 20261017_04
+Revises: 20261017_03
+Create Date: 2026-10-17 12:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_04"
+down_revision: Union[str, Sequence[str], None] = "20261017_03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tbl_FormulaCodeSequence",
+        sa.Column("FormulationDate", sa.Date(), nullable=False, comment="配方设计日期"),
+        sa.Column("ProjectType_FK", sa.Integer(), nullable=False, comment="项目类型ID"),
+        sa.Column(
+            "LastValue",
+            sa.Integer(),
+            server_default=sa.text("0"),
+            nullable=False,
+            comment="已分配的最大序号",
+        ),
+        sa.ForeignKeyConstraint(
+            ["ProjectType_FK"],
+            ["tbl_Config_ProjectTypes.TypeID"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("FormulationDate", "ProjectType_FK"),
+        comment="配方编码序号表",
+    )
+
+    # 回填：取已有项目数与编码末尾序号的较大值，保证新分配的序号不与已有编码冲突
+    op.execute(
+        """
+        INSERT INTO "tbl_FormulaCodeSequence" ("FormulationDate", "ProjectType_FK", "LastValue")
+        SELECT "FormulationDate",
+               "ProjectType_FK",
+               GREATEST(
+                   COUNT(*),
+                   COALESCE(MAX(substring("FormulaCode" FROM '-([0-9]+)$')::INTEGER), 0)
+               )
+        FROM "tbl_ProjectInfo"
+        WHERE "FormulationDate" IS NOT NULL AND "ProjectType_FK" IS NOT NULL
+        GROUP BY "FormulationDate", "ProjectType_FK"
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("tbl_FormulaCodeSequence")
@@ -0,0 +1,56 @@
+"""add export jobs table
+
+Revision ID: 20261017_05
+Revises: 20261017_04
+Create Date: 2026-10-17 14:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_05"
+down_revision: Union[str, Sequence[str], None] = "20261017_04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tbl_ExportJobs",
+        sa.Column("JobID", sa.Integer(), autoincrement=True, nullable=False, comment="任务ID"),
+        sa.Column("Resource", sa.String(length=32), nullable=False, comment="导出数据源（projects 等）"),
+        sa.Column("Format", sa.String(length=16), nullable=False, comment="导出格式（csv/txt/xlsx/parquet/arrow）"),
+        sa.Column("Compression", sa.String(length=16), nullable=True, comment="文件压缩方式（gzip），为空表示不压缩"),
+        sa.Column("Filters", postgresql.JSONB(astext_type=sa.Text()), nullable=False, comment="筛选条件"),
+        sa.Column("RequestKey", sa.String(length=64), nullable=False, comment="请求指纹（数据源+格式+压缩+筛选条件的SHA-256）"),
+        sa.Column("Status", sa.String(length=16), nullable=False, comment="任务状态（pending/running/succeeded/failed/expired）"),
+        sa.Column("TotalItems", sa.Integer(), nullable=True, comment="待导出记录数"),
+        sa.Column("ProcessedItems", sa.Integer(), nullable=False, comment="已处理记录数"),
+        sa.Column("RowsWritten", sa.Integer(), nullable=False, comment="已写出行数"),
+        sa.Column("BytesWritten", sa.BigInteger(), nullable=False, comment="已写出字节数（压缩前）"),
+        sa.Column("FileName", sa.String(length=255), nullable=True, comment="下载文件名"),
+        sa.Column("FilePath", sa.String(length=512), nullable=True, comment="文件存储路径"),
+        sa.Column("FileSize", sa.BigInteger(), nullable=True, comment="文件大小（字节）"),
+        sa.Column("ErrorMessage", sa.Text(), nullable=True, comment="错误信息"),
+        sa.Column("CreatedBy", sa.Integer(), nullable=True, comment="创建人用户ID"),
+        sa.Column("CreatedAt", sa.DateTime(), nullable=False, comment="创建时间"),
+        sa.Column("StartedAt", sa.DateTime(), nullable=True, comment="开始时间"),
+        sa.Column("UpdatedAt", sa.DateTime(), nullable=False, comment="最近一次进度更新时间（运行中任务的心跳）"),
+        sa.Column("FinishedAt", sa.DateTime(), nullable=True, comment="完成时间"),
+        sa.Column("ExpiresAt", sa.DateTime(), nullable=True, comment="文件过期时间"),
+        sa.PrimaryKeyConstraint("JobID"),
+        comment="导出任务表",
+    )
+    op.create_index("idx_export_jobs_request_key", "tbl_ExportJobs", ["RequestKey", "CreatedAt"])
+    op.create_index(op.f("ix_tbl_ExportJobs_Status"), "tbl_ExportJobs", ["Status"])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_tbl_ExportJobs_Status"), table_name="tbl_ExportJobs")
+    op.drop_index("idx_export_jobs_request_key", table_name="tbl_ExportJobs")
+    op.drop_table("tbl_ExportJobs")
@@ -0,0 +1,88 @@
+"""add parsed numeric columns for test result measurements
+
+Revision ID: 20261017_06
+Revises: 20261017_05
+Create Date: 2026-10-17 16:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_06"
+down_revision: Union[str, Sequence[str], None] = "20261017_05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 迁移时的测量字段（表 -> (字段, 名称, 标准单位)），冻结在迁移中，不随应用代码变化；
+# 已有数据的解析数值由 scripts/backfill_test_result_values.py 回填
+MEASUREMENT_FIELDS = {
+    "tbl_TestResults_Ink": (
+        ("Ink_Viscosity", "粘度", "cP"),
+        ("Ink_Reactivity", "反应活性/固化时间", "s"),
+        ("Ink_ParticleSize", "粒径", "nm"),
+        ("Ink_SurfaceTension", "表面张力", "mN/m"),
+        ("Ink_ColorValue", "色度(L*)", "Lab*"),
+    ),
+    "tbl_TestResults_Coating": (
+        ("Coating_Adhesion", "附着力", ""),
+        ("Coating_Transparency", "透明度", "%"),
+        ("Coating_SurfaceHardness", "表面硬度", "H"),
+        ("Coating_ChemicalResistance", "耐化学性", ""),
+        ("Coating_CostEstimate", "成本估算", "EUR/kg"),
+    ),
+    "tbl_TestResults_3DPrint": (
+        ("Print3D_Shrinkage", "收缩率", "%"),
+        ("Print3D_YoungsModulus", "杨氏模量", "MPa"),
+        ("Print3D_FlexuralStrength", "弯曲强度", "MPa"),
+        ("Print3D_ShoreHardness", "邵氏硬度", "Shore"),
+        ("Print3D_ImpactResistance", "抗冲击性", "kJ/m^2"),
+    ),
+    "tbl_TestResults_Composite": (
+        ("Composite_FlexuralStrength", "弯曲强度", "MPa"),
+        ("Composite_YoungsModulus", "杨氏模量", "MPa"),
+        ("Composite_ImpactResistance", "抗冲击性", "kJ/m^2"),
+        ("Composite_ConversionRate", "转化率", "%"),
+        ("Composite_WaterAbsorption", "吸水率", "%"),
+    ),
+}
+
+
+def upgrade() -> None:
+    for table_name, fields in MEASUREMENT_FIELDS.items():
+        for name, label, unit in fields:
+            unit_text = f"（{unit}）" if unit else ""
+            op.add_column(
+                table_name,
+                sa.Column(f"{name}_Value", sa.Float(), nullable=True,
+                          comment=f"{label}数值{unit_text}"),
+            )
+            op.add_column(
+                table_name,
+                sa.Column(f"{name}_Unit", sa.String(length=20), nullable=True,
+                          comment=f"{label}单位"),
+            )
+            op.add_column(
+                table_name,
+                sa.Column(f"{name}_ParseStatus", sa.String(length=20), nullable=True,
+                          comment=f"{label}解析状态"),
+            )
+            op.create_index(
+                f"idx_{name.lower()}_value",
+                table_name,
+                [f"{name}_Value", "ProjectID_FK"],
+                unique=False,
+                postgresql_where=sa.text(f'"{name}_Value" IS NOT NULL'),
+            )
+
+
+def downgrade() -> None:
+    for table_name, fields in MEASUREMENT_FIELDS.items():
+        for name, _label, _unit in fields:
+            op.drop_index(f"idx_{name.lower()}_value", table_name=table_name)
+            for suffix in ("_ParseStatus", "_Unit", "_Value"):
+                op.drop_column(table_name, name + suffix)
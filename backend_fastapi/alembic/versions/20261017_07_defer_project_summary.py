@@ -0,0 +1,71 @@
+"""let project summary triggers be deferred within a transaction
+
+Revision ID: 20261017_07
+Revises: 20261017_06
+Create Date: 2026-10-17 18:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_07"
+down_revision: Union[str, Sequence[str], None] = "20261017_06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 事务内 set_config('app.defer_project_summary', 'on', true) 后汇总触发器直接返回，
+# 写入方在提交前对涉及的项目调用一次 fn_recompute_project_summary。
+# 批量导入依次插入项目、成分和四类测试结果，不暂停时同一项目会被初始化一次、重算两次。
+DEFERRED = "  IF current_setting('app.defer_project_summary', true) = 'on' THEN RETURN NULL; END IF; "
+
+
+def _refresh_function(deferrable: bool) -> str:
+    return (
+        'CREATE OR REPLACE FUNCTION "fn_refresh_project_summary"() '
+        "RETURNS TRIGGER AS $$ "
+        "DECLARE ids INTEGER[]; "
+        "BEGIN "
+        + (DEFERRED if deferrable else "")
+        + "  IF TG_OP = 'INSERT' THEN "
+        '    SELECT array_agg(DISTINCT "ProjectID_FK") INTO ids FROM new_rows; '
+        "  ELSIF TG_OP = 'DELETE' THEN "
+        '    SELECT array_agg(DISTINCT "ProjectID_FK") INTO ids FROM old_rows; '
+        "  ELSE "
+        "    SELECT array_agg(DISTINCT id) INTO ids FROM ("
+        '      SELECT "ProjectID_FK" AS id FROM new_rows UNION SELECT "ProjectID_FK" FROM old_rows'
+        "    ) changed; "
+        "  END IF; "
+        '  PERFORM "fn_recompute_project_summary"(ids); '
+        "  RETURN NULL; "
+        "END; "
+        "$$ LANGUAGE plpgsql; "
+    )
+
+
+def _init_function(deferrable: bool) -> str:
+    return (
+        'CREATE OR REPLACE FUNCTION "fn_init_project_summary"() '
+        "RETURNS TRIGGER AS $$ "
+        "BEGIN "
+        + (DEFERRED if deferrable else "")
+        + '  INSERT INTO "tbl_ProjectSummary" ("ProjectID_FK") '
+        '  SELECT "ProjectID" FROM new_rows '
+        '  ON CONFLICT ("ProjectID_FK") DO NOTHING; '
+        "  RETURN NULL; "
+        "END; "
+        "$$ LANGUAGE plpgsql; "
+    )
+
+
+def upgrade() -> None:
+    op.execute(_refresh_function(deferrable=True))
+    op.execute(_init_function(deferrable=True))
+
+
+def downgrade() -> None:
+    op.execute(_init_function(deferrable=False))
+    op.execute(_refresh_function(deferrable=False))
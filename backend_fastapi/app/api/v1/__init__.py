@@ -16,6 +16,7 @@ from app.api.v1.modules.fillers.controller import router as fillers_router
 from app.api.v1.modules.test_results.controller import router as test_results_router
 from app.api.v1.modules.logs.controller import router as logs_router
 from app.api.v1.modules.agent.controller import router as agent_router
+from app.api.v1.modules.exports.controller import router as exports_router
 
 # 注册路由
 api_router.include_router(auth_router, prefix="/auth", tags=["认证管理"])
@@ -27,3 +28,4 @@ api_router.include_router(
 )
 api_router.include_router(logs_router, tags=["系统日志"])
 api_router.include_router(agent_router, prefix="/agent", tags=["Agent"])
+api_router.include_router(exports_router, prefix="/exports", tags=["导出任务"])
@@ -27,6 +27,7 @@ from app.api.v1.modules.agent.schema import (
 from app.api.v1.modules.agent.db_admin import AgentDbAdminService
 from app.api.v1.modules.agent.service import AgentChatService, AgentIngestService
 from app.common.response import ResponseModel, SuccessResponse
+from app.core import json_codec
 from app.core.database import get_db
 from app.core.custom_exceptions import ValidationException
 from app.core.logger import logger
@@ -36,7 +37,7 @@ router = APIRouter()
 
 
 def _encode_ndjson_event(payload: dict[str, Any]) -> bytes:
-    return (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+    return json_codec.dumps_line(payload)
 
 
 def _iter_text_chunks(text: str, *, chunk_size: int = 12) -> list[str]:
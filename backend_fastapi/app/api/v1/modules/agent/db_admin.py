@@ -19,6 +19,10 @@ from app.api.v1.modules.agent.model import AgentTaskModel
 from app.core.custom_exceptions import RecordNotFoundException, ValidationException
 from app.config.settings import settings
 from app.core.logger import logger
+from app.core.query_cache import query_cache
+
+# 变更计划可能写入的业务表对应的列表缓存命名空间
+_DATA_CACHE_NAMESPACES = ("projects", "materials", "fillers")
 
 
 class AgentDbAdminService:
@@ -217,6 +221,7 @@ class AgentDbAdminService:
                 finished_at=datetime.now(),
             )
             await db.commit()
+            query_cache.invalidate(*_DATA_CACHE_NAMESPACES)
             return {
                 "task_id": task_id,
                 "status": "succeeded",
@@ -251,6 +256,7 @@ class AgentDbAdminService:
                     finished_at=datetime.now(),
                 )
                 await db.commit()
+            query_cache.invalidate(*_DATA_CACHE_NAMESPACES)
             raise
 
     @staticmethod
@@ -62,6 +62,7 @@ from app.core.custom_exceptions import (
 )
 from app.core.database import AsyncSessionLocal
 from app.core.logger import logger
+from app.core.query_cache import query_cache
 
 
 class AgentIngestService:
@@ -318,6 +319,8 @@ class AgentIngestService:
         )
 
         await db.commit()
+        if persist_result:
+            query_cache.invalidate("projects", "materials", "fillers")
         await db.refresh(updated_record)
 
         return AgentReviewUpdateResponse(
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+导出任务模块
+"""
+
+from .model import ExportJobModel
+
+__all__ = [
+    "ExportJobModel",
+]
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+导出任务Controller
+"""
+
+from fastapi import APIRouter, Depends, Path
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.security import get_current_user_id
+from app.common.response import SuccessResponse
+from app.api.v1.modules.exports.service import ExportJobService
+from app.api.v1.modules.exports.schema import ExportJobCreateRequest
+
+
+router = APIRouter()
+
+
+@router.post(
+    "",
+    response_model=None,
+    summary="创建导出任务",
+    description="登记异步导出任务并立即返回任务ID；相同请求在复用窗口内返回已有任务",
+)
+async def create_export_job(
+    request: ExportJobCreateRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    创建导出任务
+
+    需要认证: 是
+
+    请求体:
+    - **resource**: 导出数据源 (projects、materials、fillers)
+    - **format**: 导出格式 (csv、txt、xlsx、parquet 或 arrow)
+    - **compression**: 文件压缩方式 (gzip)，默认不压缩
+    - **filters**: 筛选条件，与对应导出接口的查询参数相同
+    """
+    job = await ExportJobService.submit_job(db, request, user_id)
+    return SuccessResponse(
+        data=job.model_dump(mode="json"),
+        msg="复用已有导出任务" if job.reused else "导出任务已提交",
+    )
+
+
+@router.get(
+    "/{job_id}",
+    response_model=None,
+    summary="查询导出任务",
+    description="查询导出任务的状态、进度和下载地址",
+)
+async def get_export_job(
+    job_id: int = Path(..., description="任务ID"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """查询导出任务"""
+    job = await ExportJobService.get_job(db, job_id)
+    return SuccessResponse(data=job.model_dump(mode="json"), msg="查询成功")
+
+
+@router.get(
+    "/{job_id}/download",
+    response_model=None,
+    summary="下载导出文件",
+    description="下载已完成的导出文件，支持 Range 断点续传",
+)
+async def download_export_job(
+    job_id: int = Path(..., description="任务ID"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    下载导出文件（支持 Range / If-Range）
+
+    声明 no-transform，响应压缩中间件不再对文件二次压缩，续传时字节偏移与 ETag 保持一致
+    """
+    path, file_name, media_type = await ExportJobService.get_download(db, job_id)
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=file_name,
+        headers={"Cache-Control": "private, no-transform"},
+    )
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+导出任务CRUD操作
+"""
+
+from datetime import datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.modules.exports.model import ExportJobModel
+from app.api.v1.modules.exports.schema import ExportJobStatus
+
+
+class ExportJobCRUD:
+    """导出任务CRUD操作类"""
+
+    @staticmethod
+    async def create_job(
+        db: AsyncSession,
+        *,
+        resource: str,
+        format: str,
+        compression: Optional[str],
+        filters: dict,
+        request_key: str,
+        created_by: Optional[int] = None,
+    ) -> ExportJobModel:
+        """创建导出任务（pending 状态）"""
+        now = datetime.now()
+        job = ExportJobModel(
+            Resource=resource,
+            Format=format,
+            Compression=compression,
+            Filters=filters,
+            RequestKey=request_key,
+            Status=ExportJobStatus.pending.value,
+            ProcessedItems=0,
+            RowsWritten=0,
+            BytesWritten=0,
+            CreatedBy=created_by,
+            CreatedAt=now,
+            UpdatedAt=now,
+        )
+        db.add(job)
+        await db.flush()
+        return job
+
+    @staticmethod
+    async def get_job_by_id(db: AsyncSession, job_id: int) -> Optional[ExportJobModel]:
+        """根据ID获取导出任务"""
+        result = await db.execute(
+            select(ExportJobModel).where(ExportJobModel.JobID == job_id)
+        )
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def find_reusable_job(
+        db: AsyncSession,
+        request_key: str,
+        created_after: datetime,
+        heartbeat_after: datetime,
+    ) -> Optional[ExportJobModel]:
+        """
+        查找可复用的相同导出任务（最新的一个）
+
+        - 已成功且文件未过期
+        - 或仍在排队/运行中，且运行中的任务心跳未超时
+
+        Args:
+            db: 数据库会话
+            request_key: 请求指纹
+            created_after: 只复用该时间之后创建的任务（新鲜度）
+            heartbeat_after: 运行中任务的最近心跳需晚于该时间
+        """
+        now = datetime.now()
+        stmt = (
+            select(ExportJobModel)
+            .where(
+                ExportJobModel.RequestKey == request_key,
+                ExportJobModel.CreatedAt >= created_after,
+                or_(
+                    and_(
+                        ExportJobModel.Status == ExportJobStatus.succeeded.value,
+                        ExportJobModel.ExpiresAt > now,
+                    ),
+                    ExportJobModel.Status == ExportJobStatus.pending.value,
+                    and_(
+                        ExportJobModel.Status == ExportJobStatus.running.value,
+                        ExportJobModel.UpdatedAt >= heartbeat_after,
+                    ),
+                ),
+            )
+            .order_by(ExportJobModel.CreatedAt.desc())
+            .limit(1)
+        )
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def get_expired_jobs(db: AsyncSession, limit: int = 100) -> List[ExportJobModel]:
+        """获取文件已过保留期、尚未清理的成功任务"""
+        result = await db.execute(
+            select(ExportJobModel)
+            .where(
+                ExportJobModel.Status == ExportJobStatus.succeeded.value,
+                ExportJobModel.ExpiresAt <= datetime.now(),
+            )
+            .order_by(ExportJobModel.ExpiresAt)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def fail_unfinished_jobs(
+        db: AsyncSession, updated_before: datetime, error_message: str
+    ) -> int:
+        """
+        将排队中/运行中、且最近更新早于指定时间的任务标记为失败
+
+        Args:
+            db: 数据库会话
+            updated_before: 只处理该时间之前最后更新的任务
+            error_message: 写入任务的错误信息
+
+        Returns:
+            标记为失败的任务数
+        """
+        now = datetime.now()
+        result = await db.execute(
+            update(ExportJobModel)
+            .where(
+                ExportJobModel.Status.in_(
+                    [ExportJobStatus.pending.value, ExportJobStatus.running.value]
+                ),
+                ExportJobModel.UpdatedAt < updated_before,
+            )
+            .values(
+                Status=ExportJobStatus.failed.value,
+                ErrorMessage=error_message,
+                FinishedAt=now,
+                UpdatedAt=now,
+            )
+        )
+        return result.rowcount
+
+    @staticmethod
+    async def update_job(db: AsyncSession, job: ExportJobModel, **fields: Any) -> ExportJobModel:
+        """
+        更新任务字段（字段名与模型列名一致），同时刷新 UpdatedAt
+
+        Args:
+            db: 数据库会话
+            job: 任务对象
+            **fields: 要更新的列，如 Status="running"
+        """
+        for name, value in fields.items():
+            setattr(job, name, value)
+        job.UpdatedAt = datetime.now()
+        await db.flush()
+        return job
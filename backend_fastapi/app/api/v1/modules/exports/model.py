@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+导出任务模型
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ExportJobModel(Base):
+    """导出任务表"""
+    __tablename__ = "tbl_ExportJobs"
+    __table_args__ = (
+        # 按请求指纹查找可复用的任务
+        Index("idx_export_jobs_request_key", "RequestKey", "CreatedAt"),
+        {'comment': '导出任务表'},
+    )
+
+    JobID: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        comment="任务ID"
+    )
+
+    Resource: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+        comment="导出数据源（projects 等）"
+    )
+
+    Format: Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+        comment="导出格式（csv/txt/xlsx/parquet/arrow）"
+    )
+
+    Compression: Mapped[Optional[str]] = mapped_column(
+        String(16),
+        nullable=True,
+        comment="文件压缩方式（gzip），为空表示不压缩"
+    )
+
+    Filters: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=dict,
+        comment="筛选条件"
+    )
+
+    RequestKey: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="请求指纹（数据源+格式+压缩+筛选条件的SHA-256）"
+    )
+
+    Status: Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+        default="pending",
+        index=True,
+        comment="任务状态（pending/running/succeeded/failed/expired）"
+    )
+
+    TotalItems: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="待导出记录数"
+    )
+
+    ProcessedItems: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="已处理记录数"
+    )
+
+    RowsWritten: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="已写出行数"
+    )
+
+    BytesWritten: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="已写出字节数（压缩前）"
+    )
+
+    FileName: Mapped[Optional[str]] = mapped_column(
+        String(255),
+        nullable=True,
+        comment="下载文件名"
+    )
+
+    FilePath: Mapped[Optional[str]] = mapped_column(
+        String(512),
+        nullable=True,
+        comment="文件存储路径"
+    )
+
+    FileSize: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        nullable=True,
+        comment="文件大小（字节）"
+    )
+
+    ErrorMessage: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+        comment="错误信息"
+    )
+
+    CreatedBy: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="创建人用户ID"
+    )
+
+    CreatedAt: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.now,
+        comment="创建时间"
+    )
+
+    StartedAt: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        nullable=True,
+        comment="开始时间"
+    )
+
+    UpdatedAt: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=datetime.now,
+        comment="最近一次进度更新时间（运行中任务的心跳）"
+    )
+
+    FinishedAt: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        nullable=True,
+        comment="完成时间"
+    )
+
+    ExpiresAt: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        nullable=True,
+        comment="文件过期时间"
+    )
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+导出任务Schema
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+class ExportJobStatus(str, Enum):
+    """导出任务状态"""
+    pending = "pending"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+    expired = "expired"  # 文件已过保留期被清理
+
+
+class ExportJobCreateRequest(BaseModel):
+    """创建导出任务请求"""
+    resource: str = Field("projects", description="导出数据源: projects、materials、fillers 或 project_reports（项目报告图片 ZIP）")
+    format: str = Field("csv", description="导出格式: csv、txt、xlsx、parquet 或 arrow；project_reports 为 zip")
+    compression: Optional[str] = Field(None, description="文件压缩方式: gzip，默认不压缩")
+    filters: Dict[str, Any] = Field(default_factory=dict, description="筛选条件（与对应列表/导出接口的查询参数相同）")
+
+    @field_validator("resource", "format")
+    @classmethod
+    def normalize_name(cls, v: str) -> str:
+        return (v or "").strip().lower()
+
+    @field_validator("compression")
+    @classmethod
+    def normalize_compression(cls, v: Optional[str]) -> Optional[str]:
+        v = (v or "").strip().lower()
+        if v in ("", "none"):
+            return None
+        if v != "gzip":
+            raise ValueError("compression 只支持 gzip")
+        return v
+
+
+class ExportJobResponse(BaseModel):
+    """导出任务响应"""
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+    job_id: int = Field(..., alias="JobID", description="任务ID")
+    resource: str = Field(..., alias="Resource", description="导出数据源")
+    format: str = Field(..., alias="Format", description="导出格式")
+    compression: Optional[str] = Field(None, alias="Compression", description="文件压缩方式")
+    filters: Dict[str, Any] = Field(default_factory=dict, alias="Filters", description="筛选条件")
+    status: ExportJobStatus = Field(..., alias="Status", description="任务状态")
+    total_items: Optional[int] = Field(None, alias="TotalItems", description="待导出记录数")
+    processed_items: int = Field(0, alias="ProcessedItems", description="已处理记录数")
+    rows_written: int = Field(0, alias="RowsWritten", description="已写出行数")
+    bytes_written: int = Field(0, alias="BytesWritten", description="已写出字节数（压缩前）")
+    file_name: Optional[str] = Field(None, alias="FileName", description="下载文件名")
+    file_size: Optional[int] = Field(None, alias="FileSize", description="文件大小（字节）")
+    error_message: Optional[str] = Field(None, alias="ErrorMessage", description="错误信息")
+    created_at: datetime = Field(..., alias="CreatedAt", description="创建时间")
+    started_at: Optional[datetime] = Field(None, alias="StartedAt", description="开始时间")
+    finished_at: Optional[datetime] = Field(None, alias="FinishedAt", description="完成时间")
+    expires_at: Optional[datetime] = Field(None, alias="ExpiresAt", description="文件过期时间")
+
+    # 以下字段由服务层填充
+    progress: Optional[float] = Field(None, description="完成比例（0~1），总数未知时为空")
+    download_url: Optional[str] = Field(None, description="下载地址（任务成功后提供）")
+    reused: bool = Field(False, description="是否复用了已有的相同导出任务")
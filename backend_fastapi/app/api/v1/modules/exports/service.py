@@ -0,0 +1,526 @@
+# -*- coding: utf-8 -*-
+"""
+导出任务服务
+
+大批量导出不再绑定在单个 HTTP 请求上：
+- POST /exports 登记任务后立即返回，导出在进程内后台任务中执行，客户端断开不影响导出
+- 导出内容先写入 .part 临时文件（可选 gzip 压缩），完成后原子重命名为正式文件
+- 执行过程中按间隔把进度（已处理记录数/总数、行数、字节数）写回任务表，同时作为心跳
+- 相同请求（数据源 + 格式 + 压缩 + 筛选条件）在复用窗口内直接返回已有任务或文件
+- 下载接口使用支持 Range 的文件响应，中断的下载可以续传
+"""
+
+import asyncio
+import gzip
+import hashlib
+import os
+import shutil
+import time
+from contextlib import aclosing
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.modules.exports.crud import ExportJobCRUD
+from app.api.v1.modules.exports.model import ExportJobModel
+from app.api.v1.modules.exports.schema import (
+    ExportJobCreateRequest,
+    ExportJobResponse,
+    ExportJobStatus,
+)
+from app.api.v1.modules.fillers.schema import FillerQueryParams
+from app.api.v1.modules.fillers.service import FillerService
+from app.api.v1.modules.materials.schema import MaterialQueryParams
+from app.api.v1.modules.materials.service import MaterialService
+from app.api.v1.modules.projects.export_service import ProjectExportService
+from app.api.v1.modules.projects.report_service import ProjectReportService
+from app.api.v1.modules.projects.schema import ProjectQueryParams, ProjectReportBatchRequest
+from app.config.settings import settings
+from app.core.custom_exceptions import (
+    FileNotFoundError,
+    InvalidOperationException,
+    RecordNotFoundException,
+    ValidationException,
+    get_safe_error_message,
+)
+from app.core.database import AsyncSessionLocal
+from app.core.logger import logger
+from app.core.query_cache import make_cache_key
+from app.utils.export_writers import (
+    ExportProgress,
+    ZipExportArchive,
+    get_export_writer,
+)
+
+
+@dataclass(frozen=True)
+class ExportSource:
+    """
+    可异步导出的数据源
+
+    stream 签名: (查询参数, 写入器类, 进度对象) -> 文件数据块的异步迭代器
+    formats 为该数据源专用的输出格式（格式名 -> 写入器类，如报告 ZIP），
+    为空时支持所有表格导出格式
+    """
+
+    name: str
+    filename_prefix: str
+    params_model: Type[BaseModel]
+    stream: Callable[[Any, Type[Any], ExportProgress], AsyncIterator[bytes]]
+    formats: Optional[Dict[str, Type[Any]]] = None
+
+    def get_writer(self, export_format: str) -> Type[Any]:
+        """
+        按格式获取写入器类
+
+        Raises:
+            ValidationException: 该数据源不支持此格式
+        """
+        if self.formats is None:
+            return get_export_writer(export_format)
+        writer_class = self.formats.get((export_format or "").lower())
+        if writer_class is None:
+            raise ValidationException(
+                f"数据源 {self.name} 不支持导出格式: {export_format}，可选: {', '.join(self.formats)}"
+            )
+        return writer_class
+
+
+def stream_project_reports(
+    params: ProjectReportBatchRequest, writer_class: Type[Any], progress: ExportProgress
+) -> AsyncIterator[bytes]:
+    """批量项目报告（ZIP 格式固定，忽略写入器类）"""
+    return ProjectReportService.stream_report_zip(params, progress=progress)
+
+
+# 数据源名称 -> 数据源
+EXPORT_SOURCES: Dict[str, ExportSource] = {
+    "projects": ExportSource(
+        name="projects",
+        filename_prefix="projects_export",
+        params_model=ProjectQueryParams,
+        stream=ProjectExportService.stream_export,
+    ),
+    "materials": ExportSource(
+        name="materials",
+        filename_prefix="materials_export",
+        params_model=MaterialQueryParams,
+        stream=MaterialService.stream_export,
+    ),
+    "fillers": ExportSource(
+        name="fillers",
+        filename_prefix="fillers_export",
+        params_model=FillerQueryParams,
+        stream=FillerService.stream_export,
+    ),
+    "project_reports": ExportSource(
+        name="project_reports",
+        filename_prefix="project_reports",
+        params_model=ProjectReportBatchRequest,
+        stream=stream_project_reports,
+        formats={ZipExportArchive.format: ZipExportArchive},
+    ),
+}
+
+# 压缩方式 -> (文件扩展名, 下载内容类型)
+COMPRESSIONS: Dict[str, Tuple[str, str]] = {
+    "gzip": ("gz", "application/gzip"),
+}
+
+
+class ExportArtifactFile:
+    """
+    导出文件写入器（同步IO，由 asyncio.to_thread 调用）
+    gzip 压缩在写入时增量完成，不在内存中保留整个文件
+    """
+
+    GZIP_LEVEL = 6
+
+    def __init__(self, path: Path, compression: Optional[str], inner_name: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.bytes_written = 0
+        self._raw = open(path, "wb")
+        self._stream: Any = self._raw
+        if compression == "gzip":
+            self._stream = gzip.GzipFile(
+                filename=inner_name, mode="wb", fileobj=self._raw, compresslevel=self.GZIP_LEVEL
+            )
+
+    def write(self, data: bytes) -> None:
+        self._stream.write(data)
+        self.bytes_written += len(data)
+
+    def close(self) -> None:
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.close()
+
+    def discard(self) -> None:
+        """关闭并删除未完成的文件"""
+        try:
+            self.close()
+        finally:
+            self.path.unlink(missing_ok=True)
+
+
+class ExportJobRunner:
+    """
+    进程内导出任务执行器
+    任务以 asyncio.Task 运行，不依赖发起请求的连接；并发数由信号量限制
+    """
+
+    _tasks: Set[asyncio.Task] = set()
+    _semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def slot(cls) -> asyncio.Semaphore:
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(max(1, settings.EXPORT_JOB_CONCURRENCY))
+        return cls._semaphore
+
+    @classmethod
+    def submit(cls, job_id: int) -> asyncio.Task:
+        """启动任务（保留强引用，避免任务在执行中被回收）"""
+        task = asyncio.create_task(ExportJobService.run_job(job_id))
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+        return task
+
+
+class ExportJobService:
+    """导出任务服务类"""
+
+    @staticmethod
+    def build_request_key(
+        resource: str, export_format: str, compression: Optional[str], filters: Dict[str, Any]
+    ) -> str:
+        """请求指纹：相同数据源、格式、压缩方式和筛选条件得到相同的指纹"""
+        key = make_cache_key(
+            resource=resource,
+            format=export_format,
+            compression=compression,
+            **{f"filter.{name}": value for name, value in filters.items()},
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def build_file_name(job: ExportJobModel) -> str:
+        """下载文件名，如 projects_export_20261017_120000.csv.gz"""
+        source = EXPORT_SOURCES[job.Resource]
+        writer_class = source.get_writer(job.Format)
+        name = (
+            f"{source.filename_prefix}_{job.CreatedAt.strftime('%Y%m%d_%H%M%S')}"
+            f".{writer_class.extension}"
+        )
+        if job.Compression:
+            name += "." + COMPRESSIONS[job.Compression][0]
+        return name
+
+    @staticmethod
+    def to_response(job: ExportJobModel, reused: bool = False) -> ExportJobResponse:
+        """任务对象转响应，补充进度比例和下载地址"""
+        response = ExportJobResponse.model_validate(job)
+        response.reused = reused
+        if job.Status == ExportJobStatus.succeeded.value:
+            response.progress = 1.0
+            response.download_url = f"/api/v1/exports/{job.JobID}/download"
+        else:
+            response.progress = ExportProgress(
+                total_items=job.TotalItems, processed_items=job.ProcessedItems
+            ).fraction
+        return response
+
+    @staticmethod
+    def _validate_request(request: ExportJobCreateRequest) -> Tuple[ExportSource, Dict[str, Any]]:
+        """校验数据源、格式和筛选条件，返回数据源和规范化后的筛选条件"""
+        source = EXPORT_SOURCES.get(request.resource)
+        if source is None:
+            raise ValidationException(
+                f"不支持的导出数据源: {request.resource}，可选: {', '.join(EXPORT_SOURCES)}"
+            )
+        source.get_writer(request.format)
+
+        unknown = set(request.filters) - set(source.params_model.model_fields)
+        if unknown:
+            raise ValidationException(f"未知的筛选条件: {', '.join(sorted(unknown))}")
+        try:
+            params = source.params_model(**request.filters)
+        except ValidationError as e:
+            raise ValidationException(
+                "筛选条件无效", details=e.errors(include_url=False, include_context=False)
+            )
+        return source, params.model_dump(mode="json", exclude_none=True)
+
+    @staticmethod
+    async def _expire_artifact(db: AsyncSession, job: ExportJobModel) -> None:
+        """删除任务的导出文件目录，任务标记为 expired（由调用方提交）"""
+        job_dir = settings.EXPORT_JOB_DIR / str(job.JobID)
+        await asyncio.to_thread(shutil.rmtree, job_dir, True)
+        await ExportJobCRUD.update_job(db, job, Status=ExportJobStatus.expired.value)
+
+    @staticmethod
+    async def purge_expired_jobs(db: AsyncSession, limit: int = 100) -> int:
+        """删除已过保留期的导出文件（最多 limit 个任务），任务标记为 expired"""
+        jobs = await ExportJobCRUD.get_expired_jobs(db, limit)
+        for job in jobs:
+            await ExportJobService._expire_artifact(db, job)
+        if jobs:
+            logger.info(f"Purged {len(jobs)} expired export artifacts")
+        return len(jobs)
+
+    @staticmethod
+    async def purge_loop(interval: Optional[float] = None) -> None:
+        """
+        定期清理过期导出文件（应用启动时立即执行一次）
+
+        提交新任务时也会顺带清理，这里保证没有新提交时文件也会按保留期删除。
+        """
+        interval = interval or settings.EXPORT_JOB_PURGE_INTERVAL
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    limit = 100
+                    while await ExportJobService.purge_expired_jobs(db, limit) == limit:
+                        await db.commit()
+                    await db.commit()
+            except Exception as e:
+                logger.error(f"Failed to purge expired export artifacts: {e}")
+            await asyncio.sleep(interval)
+
+    @staticmethod
+    async def fail_interrupted_jobs() -> int:
+        """
+        启动时将已没有执行者的排队中/运行中任务标记为失败（任务在进程内执行，重启后不会继续）
+
+        单进程部署时，启动前的未完成任务都已中断；多进程部署时其他工作进程可能仍在执行任务，
+        只处理超过 EXPORT_JOB_STALE_SECONDS 未更新的任务（排队中的任务若仍被执行，
+        开始执行时会重新置为运行中）。
+        """
+        updated_before = datetime.now()
+        if settings.WORKERS > 1 and not settings.RELOAD:
+            updated_before -= timedelta(seconds=settings.EXPORT_JOB_STALE_SECONDS)
+        async with AsyncSessionLocal() as db:
+            count = await ExportJobCRUD.fail_unfinished_jobs(
+                db, updated_before, "导出中断：服务已重启，请重新提交"
+            )
+            await db.commit()
+        if count:
+            logger.warning(f"Marked {count} interrupted export jobs as failed")
+        return count
+
+    @staticmethod
+    async def submit_job(
+        db: AsyncSession, request: ExportJobCreateRequest, user_id: Optional[int] = None
+    ) -> ExportJobResponse:
+        """
+        提交导出任务
+
+        复用窗口内已有相同请求的任务（排队中、运行中或文件仍可下载）时直接返回该任务，
+        否则创建新任务并在后台执行。
+
+        Raises:
+            ValidationException: 数据源、格式、压缩方式或筛选条件无效
+        """
+        source, filters = ExportJobService._validate_request(request)
+        request_key = ExportJobService.build_request_key(
+            source.name, request.format, request.compression, filters
+        )
+
+        await ExportJobService.purge_expired_jobs(db)
+
+        # 同一指纹的提交串行化（事务级咨询锁），避免并发的相同请求各自创建任务
+        await db.execute(select(func.pg_advisory_xact_lock(func.hashtext(request_key))))
+        now = datetime.now()
+        job = await ExportJobCRUD.find_reusable_job(
+            db,
+            request_key,
+            created_after=now - timedelta(seconds=settings.EXPORT_JOB_REUSE_SECONDS),
+            heartbeat_after=now - timedelta(seconds=settings.EXPORT_JOB_STALE_SECONDS),
+        )
+        if job is not None and job.Status == ExportJobStatus.succeeded.value:
+            if not job.FilePath or not await asyncio.to_thread(os.path.exists, job.FilePath):
+                await ExportJobCRUD.update_job(db, job, Status=ExportJobStatus.expired.value)
+                job = None
+        if job is not None:
+            await db.commit()
+            logger.info(f"Export job {job.JobID} reused for identical request")
+            return ExportJobService.to_response(job, reused=True)
+
+        job = await ExportJobCRUD.create_job(
+            db,
+            resource=source.name,
+            format=request.format,
+            compression=request.compression,
+            filters=filters,
+            request_key=request_key,
+            created_by=user_id,
+        )
+        await db.commit()
+        await db.refresh(job)
+
+        ExportJobRunner.submit(job.JobID)
+        logger.info(f"Export job {job.JobID} submitted: {source.name}/{request.format}")
+        return ExportJobService.to_response(job)
+
+    @staticmethod
+    async def _get_job(db: AsyncSession, job_id: int) -> ExportJobModel:
+        """获取任务；运行中但心跳超时的任务标记为失败"""
+        job = await ExportJobCRUD.get_job_by_id(db, job_id)
+        if not job:
+            raise RecordNotFoundException("ExportJob", job_id)
+
+        stale_before = datetime.now() - timedelta(seconds=settings.EXPORT_JOB_STALE_SECONDS)
+        if job.Status == ExportJobStatus.running.value and job.UpdatedAt < stale_before:
+            await ExportJobCRUD.update_job(
+                db,
+                job,
+                Status=ExportJobStatus.failed.value,
+                ErrorMessage=f"导出中断：超过 {settings.EXPORT_JOB_STALE_SECONDS} 秒未更新进度",
+                FinishedAt=datetime.now(),
+            )
+            await db.commit()
+        return job
+
+    @staticmethod
+    async def get_job(db: AsyncSession, job_id: int) -> ExportJobResponse:
+        """查询任务状态和进度"""
+        job = await ExportJobService._get_job(db, job_id)
+        return ExportJobService.to_response(job)
+
+    @staticmethod
+    async def get_download(db: AsyncSession, job_id: int) -> Tuple[Path, str, str]:
+        """
+        获取任务文件
+
+        Returns:
+            (文件路径, 下载文件名, 内容类型)
+
+        Raises:
+            InvalidOperationException: 任务尚未成功完成
+            FileNotFoundError: 文件已过期或不存在
+        """
+        job = await ExportJobService._get_job(db, job_id)
+        if job.Status == ExportJobStatus.expired.value:
+            raise FileNotFoundError(job.FileName or str(job_id))
+        if job.Status != ExportJobStatus.succeeded.value:
+            raise InvalidOperationException(
+                f"导出任务尚未完成（当前状态: {job.Status}）", details={"job_id": job_id}
+            )
+
+        path = Path(job.FilePath or "")
+        if job.ExpiresAt is not None and job.ExpiresAt <= datetime.now():
+            # 已过保留期但尚未被定期清理：顺带删除文件
+            await ExportJobService._expire_artifact(db, job)
+            await db.commit()
+            raise FileNotFoundError(job.FileName or str(job_id))
+        if not await asyncio.to_thread(path.is_file):
+            raise FileNotFoundError(job.FileName or str(job_id))
+
+        if job.Compression:
+            media_type = COMPRESSIONS[job.Compression][1]
+        else:
+            media_type = EXPORT_SOURCES[job.Resource].get_writer(job.Format).media_type
+        return path, job.FileName, media_type
+
+    @staticmethod
+    async def _save_progress(
+        db: AsyncSession, job: ExportJobModel, progress: ExportProgress, artifact: ExportArtifactFile
+    ) -> None:
+        await ExportJobCRUD.update_job(
+            db,
+            job,
+            TotalItems=progress.total_items,
+            ProcessedItems=progress.processed_items,
+            RowsWritten=progress.rows_written,
+            BytesWritten=artifact.bytes_written,
+        )
+        await db.commit()
+
+    @staticmethod
+    async def _execute(db: AsyncSession, job: ExportJobModel) -> None:
+        """执行导出：写临时文件 -> 重命名为正式文件 -> 更新任务"""
+        source = EXPORT_SOURCES[job.Resource]
+        writer_class = source.get_writer(job.Format)
+        params = source.params_model(**(job.Filters or {}))
+        file_name = ExportJobService.build_file_name(job)
+        path = settings.EXPORT_JOB_DIR / str(job.JobID) / file_name
+        part_path = path.with_name(path.name + ".part")
+        inner_name = file_name[: -len(".gz")] if job.Compression == "gzip" else file_name
+
+        await ExportJobCRUD.update_job(
+            db,
+            job,
+            Status=ExportJobStatus.running.value,
+            StartedAt=datetime.now(),
+            FileName=file_name,
+            ErrorMessage=None,
+        )
+        await db.commit()
+
+        progress = ExportProgress()
+        artifact = await asyncio.to_thread(
+            ExportArtifactFile, part_path, job.Compression, inner_name
+        )
+        try:
+            last_saved = time.monotonic()
+            async with aclosing(source.stream(params, writer_class, progress)) as chunks:
+                async for chunk in chunks:
+                    await asyncio.to_thread(artifact.write, chunk)
+                    if time.monotonic() - last_saved >= settings.EXPORT_JOB_PROGRESS_INTERVAL:
+                        await ExportJobService._save_progress(db, job, progress, artifact)
+                        last_saved = time.monotonic()
+            await asyncio.to_thread(artifact.close)
+            await asyncio.to_thread(os.replace, part_path, path)
+        except BaseException:
+            await asyncio.to_thread(artifact.discard)
+            raise
+
+        finished_at = datetime.now()
+        file_size = (await asyncio.to_thread(path.stat)).st_size
+        await ExportJobCRUD.update_job(
+            db,
+            job,
+            Status=ExportJobStatus.succeeded.value,
+            TotalItems=progress.total_items,
+            ProcessedItems=progress.processed_items,
+            RowsWritten=progress.rows_written,
+            BytesWritten=artifact.bytes_written,
+            FilePath=str(path),
+            FileSize=file_size,
+            FinishedAt=finished_at,
+            ExpiresAt=finished_at + timedelta(seconds=settings.EXPORT_JOB_RETENTION_SECONDS),
+        )
+        await db.commit()
+        logger.info(
+            f"Export job {job.JobID} finished: {progress.rows_written} rows, {file_size} bytes"
+        )
+
+    @staticmethod
+    async def run_job(job_id: int) -> None:
+        """后台执行导出任务（使用独立的数据库会话）"""
+        async with ExportJobRunner.slot():
+            async with AsyncSessionLocal() as db:
+                job = await ExportJobCRUD.get_job_by_id(db, job_id)
+                if not job:
+                    logger.error(f"Export job not found, job_id={job_id}")
+                    return
+
+                try:
+                    await ExportJobService._execute(db, job)
+                except Exception as e:
+                    logger.exception(f"Export job {job_id} failed: {e}")
+                    await db.rollback()
+                    await ExportJobCRUD.update_job(
+                        db,
+                        job,
+                        Status=ExportJobStatus.failed.value,
+                        ErrorMessage=get_safe_error_message(e, "导出失败"),
+                        FinishedAt=datetime.now(),
+                    )
+                    await db.commit()
@@ -3,18 +3,116 @@
 填料管理CRUD操作
 """
 
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Sequence, Tuple
 from sqlalchemy import select, update, delete, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 from sqlalchemy.orm import selectinload
 
 from app.api.v1.modules.fillers.model import FillerModel, FillerTypeModel
 from app.core.logger import logger
+from app.core.query_cache import make_cache_key
+from app.core.total_count import count_total
+from app.utils.pg_copy import export_columns
+from app.utils.text_search import keyword_condition, similarity_rank
 
 
 class FillerCRUD:
     """填料CRUD操作类"""
+
+    # 列表视图的投影列（填料类型名称在SQL中联表取得，不加载ORM实体）
+    LIST_COLUMNS = (
+        FillerModel.FillerID,
+        FillerModel.TradeName,
+        FillerModel.FillerType_FK,
+        FillerTypeModel.FillerTypeName,
+        FillerModel.Supplier,
+        FillerModel.ParticleSize,
+        FillerModel.IsSilanized,
+        FillerModel.CouplingAgent,
+        FillerModel.SurfaceArea,
+    )
+
+    # 关键词搜索列（均建有 gin_trgm_ops 索引）
+    KEYWORD_COLUMNS = (FillerModel.TradeName,)
     
+    @staticmethod
+    def build_list_conditions(
+        filler_type: Optional[str] = None,
+        supplier: Optional[str] = None,
+        keyword: Optional[str] = None
+    ) -> list:
+        """列表/导出共用的筛选条件（FillerTypeName 条件需要联表 FillerTypeModel）"""
+        conditions = []
+        if filler_type:
+            conditions.append(FillerTypeModel.FillerTypeName == filler_type)
+        if supplier:
+            conditions.append(FillerModel.Supplier == supplier)
+        if keyword:
+            conditions.append(keyword_condition(FillerCRUD.KEYWORD_COLUMNS, keyword))
+        return conditions
+
+    @staticmethod
+    def list_order_by(keyword: Optional[str] = None) -> list:
+        """列表排序：有关键词时先按相似度，再按ID倒序"""
+        order_by = [FillerModel.FillerID.desc()]
+        if keyword:
+            order_by.insert(0, similarity_rank(FillerCRUD.KEYWORD_COLUMNS, keyword).desc())
+        return order_by
+
+    @staticmethod
+    def build_list_query(
+        filler_type: Optional[str] = None,
+        supplier: Optional[str] = None,
+        keyword: Optional[str] = None,
+        columns: Optional[Sequence] = None
+    ) -> Select:
+        """
+        列表/导出共用查询：联表取类型名称，应用筛选条件和列表排序，不分页
+
+        Args:
+            columns: 查询列，默认 LIST_COLUMNS
+        """
+        stmt = (
+            select(*(columns or FillerCRUD.LIST_COLUMNS))
+            .select_from(FillerModel)
+            .join(
+                FillerTypeModel,
+                FillerModel.FillerType_FK == FillerTypeModel.FillerTypeID,
+                isouter=True
+            )
+            .order_by(*FillerCRUD.list_order_by(keyword))
+        )
+        conditions = FillerCRUD.build_list_conditions(filler_type, supplier, keyword)
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        return stmt
+
+    @staticmethod
+    def build_export_query(
+        column_mapping: Dict[str, str],
+        filler_type: Optional[str] = None,
+        supplier: Optional[str] = None,
+        keyword: Optional[str] = None
+    ) -> Select:
+        """
+        导出查询（供 COPY 导出）：与列表相同的筛选和排序，不分页
+
+        Args:
+            column_mapping: {LIST_COLUMNS 中的字段名: 导出列名}，文本列在SQL中去除首尾空白
+                （与列表响应模型一致）并做公式注入防护
+        """
+        columns = {column.key: column for column in FillerCRUD.LIST_COLUMNS}
+        return FillerCRUD.build_list_query(
+            filler_type,
+            supplier,
+            keyword,
+            columns=export_columns(
+                [(columns[field], name) for field, name in column_mapping.items()],
+                strip=True,
+            ),
+        )
+
     @staticmethod
     async def get_by_id(
         db: AsyncSession,
@@ -40,21 +138,13 @@ class FillerCRUD:
         page_size: int,
         filler_type: Optional[str] = None,
         supplier: Optional[str] = None,
-        keyword: Optional[str] = None
-    ) -> Tuple[List[FillerModel], int]:
-        """分页查询填料列表"""
+        keyword: Optional[str] = None,
+        count_mode: Optional[str] = None
+    ) -> Tuple[List[dict], int]:
+        """分页查询填料列表（列投影，返回 LIST_COLUMNS 的字典行而非ORM实体）"""
         try:
             # 构建查询条件
-            conditions = []
-            
-            if filler_type:
-                conditions.append(FillerTypeModel.FillerTypeName == filler_type)
-            
-            if supplier:
-                conditions.append(FillerModel.Supplier == supplier)
-            
-            if keyword:
-                conditions.append(FillerModel.TradeName.like(f"%{keyword}%"))
+            conditions = FillerCRUD.build_list_conditions(filler_type, supplier, keyword)
             
             # 查询总数
             count_stmt = (
@@ -69,31 +159,33 @@ class FillerCRUD:
             if conditions:
                 count_stmt = count_stmt.where(and_(*conditions))
             
-            total_result = await db.execute(count_stmt)
-            total = total_result.scalar() or 0
+            total = await count_total(
+                db,
+                count_stmt,
+                namespace="fillers",
+                cache_key=make_cache_key(
+                    filler_type=filler_type,
+                    supplier=supplier,
+                    keyword=keyword,
+                ),
+                table_name=FillerModel.__tablename__,
+                filtered=bool(conditions),
+                mode=count_mode,
+            )
             
-            # 查询数据
+            # 查询数据（有关键词时按相似度排序）
             offset = (page - 1) * page_size
             stmt = (
-                select(FillerModel)
-                .options(selectinload(FillerModel.filler_type))
-                .join(
-                    FillerTypeModel,
-                    FillerModel.FillerType_FK == FillerTypeModel.FillerTypeID,
-                    isouter=True
-                )
-                .order_by(FillerModel.FillerID.desc())
+                FillerCRUD.build_list_query(filler_type, supplier, keyword)
                 .offset(offset)
                 .limit(page_size)
             )
             
-            if conditions:
-                stmt = stmt.where(and_(*conditions))
-            
             result = await db.execute(stmt)
-            fillers = result.scalars().all()
+            keys = list(result.keys())
+            fillers = [dict(zip(keys, row)) for row in result.all()]
             
-            return list(fillers), total
+            return fillers, total
             
         except Exception as e:
             logger.error(f"分页queryfillerfailed: {e}")
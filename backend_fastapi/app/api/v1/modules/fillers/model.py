@@ -4,7 +4,7 @@
 """
 
 from typing import Optional, List
-from sqlalchemy import String, Integer, Text, ForeignKey, Numeric
+from sqlalchemy import String, Integer, Text, ForeignKey, Numeric, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -39,7 +39,16 @@ class FillerTypeModel(Base):
 class FillerModel(Base):
     """无机填料信息表"""
     __tablename__ = "tbl_InorganicFillers"
-    __table_args__ = {'comment': '无机填料信息主表'}
+    __table_args__ = (
+        # 关键词搜索使用的 pg_trgm 索引
+        Index(
+            "idx_filler_tradename_trgm",
+            "TradeName",
+            postgresql_using="gin",
+            postgresql_ops={"TradeName": "gin_trgm_ops"},
+        ),
+        {'comment': '无机填料信息主表'},
+    )
     
     FillerID: Mapped[int] = mapped_column(
         Integer,
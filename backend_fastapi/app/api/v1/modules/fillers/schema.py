@@ -3,11 +3,12 @@
 填料管理Schema
 """
 
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 from app.core.base_schema import BaseSchema
+from app.utils.export_writers import ExportColumn
 
 
 # ==================== 填料类型Schema ====================
@@ -124,6 +125,34 @@ class FillerResponse(BaseSchema):
         from_attributes = True
 
 
+# 列表批量校验/序列化（一次调用处理整页，而非逐行 model_validate）
+FILLER_LIST_ADAPTER = TypeAdapter(List[FillerResponse])
+
+# 文本导出（csv/txt/xlsx）的列映射 {字段名: 导出列名}
+FILLER_EXPORT_MAPPING = {
+    'FillerID': '填料ID',
+    'TradeName': '商品名称',
+    'FillerTypeName': '填料类型',
+    'Supplier': '供应商',
+    'ParticleSize': '粒径',
+    'IsSilanized': '是否硅烷化',
+    'CouplingAgent': '偶联剂',
+    'SurfaceArea': '比表面积',
+}
+
+# 列式导出（parquet/arrow）的列定义，按 FillerResponse 字段读取
+FILLER_EXPORT_COLUMNS = (
+    ExportColumn("FillerID", "int"),
+    ExportColumn("TradeName", "str"),
+    ExportColumn("FillerTypeName", "str"),
+    ExportColumn("Supplier", "str"),
+    ExportColumn("ParticleSize", "str"),
+    ExportColumn("IsSilanized", "bool"),
+    ExportColumn("CouplingAgent", "str"),
+    ExportColumn("SurfaceArea", "float"),
+)
+
+
 class BatchDeleteRequest(BaseModel):
     """批量删除请求"""
     ids: list[int] = Field(..., min_length=1, description="要删除的ID列表")
@@ -3,7 +3,7 @@
 填料管理Service
 """
 
-from typing import List, Tuple
+from typing import AsyncGenerator, List, Tuple, Optional, Type
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.modules.fillers.crud import FillerCRUD, FillerTypeCRUD
@@ -12,10 +12,19 @@ from app.api.v1.modules.fillers.schema import (
     FillerUpdateRequest,
     FillerQueryParams,
     FillerResponse,
+    FILLER_LIST_ADAPTER,
+    FILLER_EXPORT_MAPPING,
+    FILLER_EXPORT_COLUMNS,
     FillerTypeResponse,
     BatchDeleteRequest
 )
+from app.config.settings import settings
+from app.core.database import AsyncSessionLocal
 from app.core.logger import logger
+from app.core.query_cache import query_cache
+from app.utils.export_helper import ExportHelper
+from app.utils.export_writers import ExportProgress, ExportWriter
+from app.utils.pg_copy import stream_copy_csv
 from app.core.custom_exceptions import (
     RecordNotFoundException,
     DatabaseException,
@@ -25,13 +34,16 @@ from app.core.custom_exceptions import (
 
 class FillerService:
     """填料服务类"""
+
+    EXPORT_BATCH_SIZE = 5000  # 导出时每批读取的行数
     
     @staticmethod
     async def get_filler_list(
         db: AsyncSession,
         page: int,
         page_size: int,
-        query_params: FillerQueryParams
+        query_params: FillerQueryParams,
+        count_mode: Optional[str] = None
     ) -> Tuple[List[FillerResponse], int]:
         """获取填料列表（分页）"""
         fillers, total = await FillerCRUD.get_list_paginated(
@@ -40,20 +52,77 @@ class FillerService:
             page_size=page_size,
             filler_type=query_params.filler_type,
             supplier=query_params.supplier,
-            keyword=query_params.keyword
+            keyword=query_params.keyword,
+            count_mode=count_mode
         )
         
-        # 转换为响应模型
-        filler_list = []
-        for filler in fillers:
-            filler_data = FillerResponse.model_validate(filler)
-            if filler.filler_type:
-                filler_data.FillerTypeName = filler.filler_type.FillerTypeName
-            filler_list.append(filler_data)
+        # 整页批量转换为响应模型（行中已包含联表得到的 FillerTypeName）
+        filler_list = FILLER_LIST_ADAPTER.validate_python(fillers)
         
         logger.info(f"queryfiller列表successful: page{page}, total{total}items")
         return filler_list, total
     
+    @staticmethod
+    def stream_export_csv(
+        query_params: FillerQueryParams,
+        progress: Optional[ExportProgress] = None
+    ) -> AsyncGenerator[bytes, None]:
+        """填料导出 CSV（数据库 COPY 生成，列名和公式注入防护在SQL中完成，不分页）"""
+        stmt = FillerCRUD.build_export_query(
+            FILLER_EXPORT_MAPPING,
+            filler_type=query_params.filler_type,
+            supplier=query_params.supplier,
+            keyword=query_params.keyword
+        )
+        return stream_copy_csv(stmt, progress=progress)
+    
+    @staticmethod
+    async def iter_export_batches(
+        query_params: FillerQueryParams,
+        batch_size: Optional[int] = None,
+        progress: Optional[ExportProgress] = None
+    ) -> AsyncGenerator[List[FillerResponse], None]:
+        """
+        按批读取全部符合条件的填料（与列表相同的筛选和排序，不截断）
+
+        使用独立会话和服务端游标逐批读取：响应开始发送时请求的会话已关闭，
+        且内存中只保留当前一批。
+        """
+        stmt = FillerCRUD.build_list_query(
+            query_params.filler_type,
+            query_params.supplier,
+            query_params.keyword
+        ).execution_options(yield_per=batch_size or FillerService.EXPORT_BATCH_SIZE)
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(stmt)
+            async for rows in result.mappings().partitions():
+                batch = FILLER_LIST_ADAPTER.validate_python([dict(row) for row in rows])
+                if progress is not None:
+                    progress.processed_items += len(batch)
+                    progress.rows_written += len(batch)
+                yield batch
+    
+    @staticmethod
+    def stream_export(
+        query_params: FillerQueryParams,
+        writer_class: Type[ExportWriter],
+        progress: Optional[ExportProgress] = None
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        流式导出填料列表
+
+        - csv: 由数据库 COPY 直接生成（EXPORT_USE_COPY 关闭时走下面的通用路径）
+        - 其他格式: 服务端游标分批读取，逐批编码；parquet/arrow 输出带类型的列
+        """
+        if writer_class.format == "csv" and settings.EXPORT_USE_COPY:
+            return FillerService.stream_export_csv(query_params, progress)
+        return ExportHelper.stream_export(
+            FillerService.iter_export_batches(query_params, progress=progress),
+            writer_class,
+            FILLER_EXPORT_MAPPING,
+            FILLER_EXPORT_COLUMNS,
+        )
+    
     @staticmethod
     async def get_filler_detail(
         db: AsyncSession,
@@ -90,6 +159,7 @@ class FillerService:
             )
             
             await db.commit()
+            query_cache.invalidate("fillers")
             await db.refresh(filler)
             
             logger.info(f"fillercreatesuccessful: {filler.TradeName}")
@@ -138,6 +208,7 @@ class FillerService:
         try:
             await FillerCRUD.update_filler(db, filler_id, **update_data)
             await db.commit()
+            query_cache.invalidate("fillers")
             
             logger.info(f"fillerupdatesuccessful: ID {filler_id}")
             
@@ -166,6 +237,7 @@ class FillerService:
         try:
             await FillerCRUD.delete_filler(db, filler_id)
             await db.commit()
+            query_cache.invalidate("fillers")
             logger.info(f"fillerdeletedsuccessful: ID {filler_id}")
             return True
         except RecordNotFoundException:
@@ -184,6 +256,7 @@ class FillerService:
         try:
             count = await FillerCRUD.batch_delete_fillers(db, delete_data.ids)
             await db.commit()
+            query_cache.invalidate("fillers")
             logger.info(f"batchdeletedfillersuccessful: deleted{count}items")
             return count
         except Exception as e:
@@ -39,6 +39,11 @@ async def get_login_logs(
     username: Optional[str] = Query(None, description="用户名"),
     start_date: Optional[datetime] = Query(None, description="开始日期"),
     end_date: Optional[datetime] = Query(None, description="结束日期"),
+    count_mode: Optional[str] = Query(
+        None,
+        pattern="^(exact|estimated|cached)$",
+        description="总数统计方式: exact / estimated / cached（默认读取配置）",
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_with_role("admin")),
 ):
@@ -53,6 +58,7 @@ async def get_login_logs(
         username=username,
         start_date=start_date,
         end_date=end_date,
+        count_mode=count_mode,
     )
     result = await LogService.get_login_logs(db, query)
     return SuccessResponse(data=result.model_dump())
@@ -65,6 +71,11 @@ async def get_registration_logs(
     username: Optional[str] = Query(None, description="用户名"),
     start_date: Optional[datetime] = Query(None, description="开始日期"),
     end_date: Optional[datetime] = Query(None, description="结束日期"),
+    count_mode: Optional[str] = Query(
+        None,
+        pattern="^(exact|estimated|cached)$",
+        description="总数统计方式: exact / estimated / cached（默认读取配置）",
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user_with_role("admin")),
 ):
@@ -79,6 +90,7 @@ async def get_registration_logs(
         username=username,
         start_date=start_date,
         end_date=end_date,
+        count_mode=count_mode,
     )
     result = await LogService.get_registration_logs(db, query)
     return SuccessResponse(data=result.model_dump())
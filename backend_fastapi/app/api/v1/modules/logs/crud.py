@@ -8,6 +8,8 @@ from typing import List, Optional, Tuple
 from sqlalchemy import func, select, and_, distinct
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.query_cache import make_cache_key, query_cache
+from app.core.total_count import count_total
 from .model import UserLoginLogModel, UserRegistrationLogModel, SystemInfoModel
 from ..projects.model import ProjectModel
 from ..materials.model import MaterialModel
@@ -55,6 +57,7 @@ class LogCRUD:
         )
         db.add(log)
         await db.commit()
+        query_cache.invalidate("login_logs")
         await db.refresh(log)
         return log
 
@@ -133,6 +136,7 @@ class LogCRUD:
         username: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        count_mode: Optional[str] = None,
     ) -> Tuple[List[UserLoginLogModel], int]:
         """分页获取登录日志"""
         # 构建查询条件
@@ -148,8 +152,17 @@ class LogCRUD:
         count_stmt = select(func.count()).select_from(UserLoginLogModel)
         if conditions:
             count_stmt = count_stmt.where(and_(*conditions))
-        count_result = await db.execute(count_stmt)
-        total = count_result.scalar()
+        total = await count_total(
+            db,
+            count_stmt,
+            namespace="login_logs",
+            cache_key=make_cache_key(
+                username=username, start_date=start_date, end_date=end_date
+            ),
+            table_name=UserLoginLogModel.__tablename__,
+            filtered=bool(conditions),
+            mode=count_mode,
+        )
 
         # 查询数据
         stmt = select(UserLoginLogModel)
@@ -187,6 +200,7 @@ class LogCRUD:
         )
         db.add(log)
         await db.commit()
+        query_cache.invalidate("registration_logs")
         await db.refresh(log)
         return log
 
@@ -198,6 +212,7 @@ class LogCRUD:
         username: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        count_mode: Optional[str] = None,
     ) -> Tuple[List[UserRegistrationLogModel], int]:
         """分页获取注册日志"""
         # 构建查询条件
@@ -213,8 +228,17 @@ class LogCRUD:
         count_stmt = select(func.count()).select_from(UserRegistrationLogModel)
         if conditions:
             count_stmt = count_stmt.where(and_(*conditions))
-        count_result = await db.execute(count_stmt)
-        total = count_result.scalar()
+        total = await count_total(
+            db,
+            count_stmt,
+            namespace="registration_logs",
+            cache_key=make_cache_key(
+                username=username, start_date=start_date, end_date=end_date
+            ),
+            table_name=UserRegistrationLogModel.__tablename__,
+            filtered=bool(conditions),
+            mode=count_mode,
+        )
 
         # 查询数据
         stmt = select(UserRegistrationLogModel)
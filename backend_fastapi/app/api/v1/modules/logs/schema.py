@@ -30,6 +30,7 @@ class LoginLogListQuery(BaseModel):
     username: Optional[str] = Field(None, description="用户名")
     start_date: Optional[datetime] = Field(None, description="开始日期")
     end_date: Optional[datetime] = Field(None, description="结束日期")
+    count_mode: Optional[str] = Field(None, description="总数统计方式: exact / estimated / cached")
 
 
 class LoginLogListResponse(BaseModel):
@@ -38,6 +39,7 @@ class LoginLogListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    total_type: str = "exact"
 
 
 # ========== 注册日志相关 ==========
@@ -63,6 +65,7 @@ class RegistrationLogListQuery(BaseModel):
     username: Optional[str] = Field(None, description="用户名")
     start_date: Optional[datetime] = Field(None, description="开始日期")
     end_date: Optional[datetime] = Field(None, description="结束日期")
+    count_mode: Optional[str] = Field(None, description="总数统计方式: exact / estimated / cached")
 
 
 class RegistrationLogListResponse(BaseModel):
@@ -71,6 +74,7 @@ class RegistrationLogListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    total_type: str = "exact"
 
 
 # ========== 系统统计相关 ==========
@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.total_count import total_kind
 from .crud import LogCRUD
 from .schema import (
     LoginLogListQuery,
@@ -37,6 +38,7 @@ class LogService:
             username=query.username,
             start_date=query.start_date,
             end_date=query.end_date,
+            count_mode=query.count_mode,
         )
 
         # 转换 datetime 为字符串
@@ -59,6 +61,7 @@ class LogService:
             total=total,
             page=query.page,
             page_size=query.page_size,
+            total_type=total_kind(total),
         )
 
     @staticmethod
@@ -73,6 +76,7 @@ class LogService:
             username=query.username,
             start_date=query.start_date,
             end_date=query.end_date,
+            count_mode=query.count_mode,
         )
 
         # 转换 datetime 为字符串
@@ -98,6 +102,7 @@ class LogService:
             total=total,
             page=query.page,
             page_size=query.page_size,
+            total_type=total_kind(total),
         )
 
     @staticmethod
@@ -3,14 +3,17 @@
 原料管理Controller
 """
 
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, Query, Path
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.security import get_current_user_id
 from app.common.response import SuccessResponse
-from app.utils.export_helper import ExportHelper
+from app.core.total_count import total_kind
+from app.utils.export_writers import get_export_writer
 from app.api.v1.modules.materials.service import MaterialService
 from app.api.v1.modules.materials.schema import (
     MaterialCreateRequest,
@@ -18,7 +21,8 @@ from app.api.v1.modules.materials.schema import (
     MaterialQueryParams,
     MaterialResponse,
     MaterialCategoryResponse,
-    BatchDeleteRequest
+    BatchDeleteRequest,
+    MATERIAL_LIST_ADAPTER,
 )
 
 
@@ -38,6 +42,11 @@ async def get_material_list(
     category: str = Query(None, description="原料类别"),
     supplier: str = Query(None, description="供应商"),
     keyword: str = Query(None, description="关键词搜索"),
+    count_mode: str = Query(
+        None,
+        pattern="^(exact|estimated|cached)$",
+        description="总数统计方式: exact / estimated / cached（默认读取配置）",
+    ),
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db)
 ):
@@ -56,15 +65,17 @@ async def get_material_list(
         db=db,
         page=page,
         page_size=page_size,
-        query_params=query_params
+        query_params=query_params,
+        count_mode=count_mode
     )
     
     total_pages = (total + page_size - 1) // page_size if total > 0 else 1
     
     return SuccessResponse(
         data={
-            "list": [m.model_dump(mode='json') for m in materials],
-            "total": total,
+            "list": MATERIAL_LIST_ADAPTER.dump_python(materials, mode='json'),
+            "total": int(total),
+            "total_type": total_kind(total),
             "page": page,
             "page_size": page_size,
             "total_pages": total_pages
@@ -77,62 +88,39 @@ async def get_material_list(
     "/export",
     response_model=None,
     summary="导出原料列表",
-    description="导出原料列表数据为CSV或TXT格式"
+    description="导出原料列表数据为CSV、TXT、Excel、Parquet或Arrow格式"
 )
 async def export_materials(
-    format: str = Query('csv', description="导出格式: csv 或 txt"),
+    format: str = Query('csv', description="导出格式: csv、txt、xlsx、parquet 或 arrow"),
     category: str = Query(None, description="类别"),
     supplier: str = Query(None, description="供应商"),
     keyword: str = Query(None, description="关键词"),
-    user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    user_id: int = Depends(get_current_user_id)
 ):
-    """导出原料列表"""
+    """
+    导出原料列表（流式输出）
+
+    导出全部符合条件的原料（不截断），内存占用与数据量无关：
+    - csv: 由数据库 COPY 直接生成（EXPORT_USE_COPY 关闭时与 txt/xlsx 相同）
+    - txt/xlsx/parquet/arrow: 服务端游标分批读取、逐批编码；parquet/arrow 输出带类型的列
+    """
+    # 选择导出格式（不支持的格式返回 422）
+    writer_class = get_export_writer(format)
+
     query_params = MaterialQueryParams(
         category=category,
         supplier=supplier,
         keyword=keyword
     )
-    
-    # 获取所有符合条件的原料
-    materials, _ = await MaterialService.get_material_list(
-        db=db,
-        page=1,
-        page_size=10000,
-        query_params=query_params
-    )
-    
-    # 定义列映射
-    column_mapping = {
-        'MaterialID': '原料ID',
-        'TradeName': '商品名称',
-        'CategoryName': '类别',
-        'Supplier': '供应商',
-        'CAS_Number': 'CAS号',
-        'Density': '密度',
-        'Viscosity': '粘度',
-        'FunctionDescription': '功能说明',
-    }
-    
-    # 准备导出数据
-    export_data = ExportHelper.prepare_export_data(materials, column_mapping)
-    
-    # 导出
-    content, filename = ExportHelper.export(
-        data=export_data,
-        columns=list(column_mapping.values()),
-        format=format,
-        filename=f"materials_{format}"
-    )
-    
-    # 返回文件响应
-    media_type = 'text/csv' if format == 'csv' else 'text/plain'
-    return Response(
-        content=content,
-        media_type=media_type,
-        headers={
-            'Content-Disposition': f'attachment; filename="{filename}"'
-        }
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"materials_{timestamp}.{writer_class.extension}"
+    chunks = MaterialService.stream_export(query_params, writer_class)
+
+    return StreamingResponse(
+        chunks,
+        media_type=writer_class.media_type,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
     )
 
 
@@ -3,18 +3,116 @@
 原料管理CRUD操作
 """
 
-from typing import Optional, List, Tuple
-from sqlalchemy import select, update, delete, func, and_, or_
+from typing import Dict, Optional, List, Sequence, Tuple
+from sqlalchemy import select, update, delete, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 from sqlalchemy.orm import selectinload
 
 from app.api.v1.modules.materials.model import MaterialModel, MaterialCategoryModel
 from app.core.logger import logger
+from app.core.query_cache import make_cache_key
+from app.core.total_count import count_total
+from app.utils.pg_copy import export_columns
+from app.utils.text_search import keyword_condition, similarity_rank
 
 
 class MaterialCRUD:
     """原料CRUD操作类"""
+
+    # 列表视图的投影列（类别名称在SQL中联表取得，不加载ORM实体）
+    LIST_COLUMNS = (
+        MaterialModel.MaterialID,
+        MaterialModel.TradeName,
+        MaterialModel.Category_FK,
+        MaterialCategoryModel.CategoryName,
+        MaterialModel.Supplier,
+        MaterialModel.CAS_Number,
+        MaterialModel.Density,
+        MaterialModel.Viscosity,
+        MaterialModel.FunctionDescription,
+    )
+
+    # 关键词搜索列（均建有 gin_trgm_ops 索引）
+    KEYWORD_COLUMNS = (MaterialModel.TradeName, MaterialModel.CAS_Number)
     
+    @staticmethod
+    def build_list_conditions(
+        category: Optional[str] = None,
+        supplier: Optional[str] = None,
+        keyword: Optional[str] = None
+    ) -> list:
+        """列表/导出共用的筛选条件（CategoryName 条件需要联表 MaterialCategoryModel）"""
+        conditions = []
+        if category:
+            conditions.append(MaterialCategoryModel.CategoryName == category)
+        if supplier:
+            conditions.append(MaterialModel.Supplier == supplier)
+        if keyword:
+            conditions.append(keyword_condition(MaterialCRUD.KEYWORD_COLUMNS, keyword))
+        return conditions
+
+    @staticmethod
+    def list_order_by(keyword: Optional[str] = None) -> list:
+        """列表排序：有关键词时先按相似度，再按ID倒序"""
+        order_by = [MaterialModel.MaterialID.desc()]
+        if keyword:
+            order_by.insert(0, similarity_rank(MaterialCRUD.KEYWORD_COLUMNS, keyword).desc())
+        return order_by
+
+    @staticmethod
+    def build_list_query(
+        category: Optional[str] = None,
+        supplier: Optional[str] = None,
+        keyword: Optional[str] = None,
+        columns: Optional[Sequence] = None
+    ) -> Select:
+        """
+        列表/导出共用查询：联表取类型名称，应用筛选条件和列表排序，不分页
+
+        Args:
+            columns: 查询列，默认 LIST_COLUMNS
+        """
+        stmt = (
+            select(*(columns or MaterialCRUD.LIST_COLUMNS))
+            .select_from(MaterialModel)
+            .join(
+                MaterialCategoryModel,
+                MaterialModel.Category_FK == MaterialCategoryModel.CategoryID,
+                isouter=True
+            )
+            .order_by(*MaterialCRUD.list_order_by(keyword))
+        )
+        conditions = MaterialCRUD.build_list_conditions(category, supplier, keyword)
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        return stmt
+
+    @staticmethod
+    def build_export_query(
+        column_mapping: Dict[str, str],
+        category: Optional[str] = None,
+        supplier: Optional[str] = None,
+        keyword: Optional[str] = None
+    ) -> Select:
+        """
+        导出查询（供 COPY 导出）：与列表相同的筛选和排序，不分页
+
+        Args:
+            column_mapping: {LIST_COLUMNS 中的字段名: 导出列名}，文本列在SQL中去除首尾空白
+                （与列表响应模型一致）并做公式注入防护
+        """
+        columns = {column.key: column for column in MaterialCRUD.LIST_COLUMNS}
+        return MaterialCRUD.build_list_query(
+            category,
+            supplier,
+            keyword,
+            columns=export_columns(
+                [(columns[field], name) for field, name in column_mapping.items()],
+                strip=True,
+            ),
+        )
+
     @staticmethod
     async def get_by_id(
         db: AsyncSession,
@@ -40,26 +138,13 @@ class MaterialCRUD:
         page_size: int,
         category: Optional[str] = None,
         supplier: Optional[str] = None,
-        keyword: Optional[str] = None
-    ) -> Tuple[List[MaterialModel], int]:
-        """分页查询原料列表"""
+        keyword: Optional[str] = None,
+        count_mode: Optional[str] = None
+    ) -> Tuple[List[dict], int]:
+        """分页查询原料列表（列投影，返回 LIST_COLUMNS 的字典行而非ORM实体）"""
         try:
             # 构建查询条件
-            conditions = []
-            
-            if category:
-                conditions.append(MaterialCategoryModel.CategoryName == category)
-            
-            if supplier:
-                conditions.append(MaterialModel.Supplier == supplier)
-            
-            if keyword:
-                conditions.append(
-                    or_(
-                        MaterialModel.TradeName.like(f"%{keyword}%"),
-                        MaterialModel.CAS_Number.like(f"%{keyword}%")
-                    )
-                )
+            conditions = MaterialCRUD.build_list_conditions(category, supplier, keyword)
             
             # 查询总数
             count_stmt = (
@@ -74,31 +159,33 @@ class MaterialCRUD:
             if conditions:
                 count_stmt = count_stmt.where(and_(*conditions))
             
-            total_result = await db.execute(count_stmt)
-            total = total_result.scalar() or 0
+            total = await count_total(
+                db,
+                count_stmt,
+                namespace="materials",
+                cache_key=make_cache_key(
+                    category=category,
+                    supplier=supplier,
+                    keyword=keyword,
+                ),
+                table_name=MaterialModel.__tablename__,
+                filtered=bool(conditions),
+                mode=count_mode,
+            )
             
-            # 查询数据
+            # 查询数据（有关键词时按相似度排序）
             offset = (page - 1) * page_size
             stmt = (
-                select(MaterialModel)
-                .options(selectinload(MaterialModel.category))
-                .join(
-                    MaterialCategoryModel,
-                    MaterialModel.Category_FK == MaterialCategoryModel.CategoryID,
-                    isouter=True
-                )
-                .order_by(MaterialModel.MaterialID.desc())
+                MaterialCRUD.build_list_query(category, supplier, keyword)
                 .offset(offset)
                 .limit(page_size)
             )
             
-            if conditions:
-                stmt = stmt.where(and_(*conditions))
-            
             result = await db.execute(stmt)
-            materials = result.scalars().all()
+            keys = list(result.keys())
+            materials = [dict(zip(keys, row)) for row in result.all()]
             
-            return list(materials), total
+            return materials, total
             
         except Exception as e:
             logger.error(f"分页querymaterialfailed: {e}")
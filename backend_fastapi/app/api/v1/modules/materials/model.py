@@ -4,7 +4,7 @@
 """
 
 from typing import Optional
-from sqlalchemy import String, Integer, Text, ForeignKey, Numeric
+from sqlalchemy import String, Integer, Text, ForeignKey, Numeric, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -39,7 +39,22 @@ class MaterialCategoryModel(Base):
 class MaterialModel(Base):
     """原料信息主表"""
     __tablename__ = "tbl_RawMaterials"
-    __table_args__ = {'comment': '原料信息主表'}
+    __table_args__ = (
+        # 关键词搜索使用的 pg_trgm 索引
+        Index(
+            "idx_material_tradename_trgm",
+            "TradeName",
+            postgresql_using="gin",
+            postgresql_ops={"TradeName": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_material_cas_trgm",
+            "CAS_Number",
+            postgresql_using="gin",
+            postgresql_ops={"CAS_Number": "gin_trgm_ops"},
+        ),
+        {'comment': '原料信息主表'},
+    )
     
     MaterialID: Mapped[int] = mapped_column(
         Integer,
@@ -3,11 +3,12 @@
 原料管理Schema
 """
 
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 from app.core.base_schema import BaseSchema
+from app.utils.export_writers import ExportColumn
 
 
 # ==================== 原料类别Schema ====================
@@ -131,6 +132,34 @@ class MaterialResponse(BaseSchema):
         from_attributes = True
 
 
+# 列表批量校验/序列化（一次调用处理整页，而非逐行 model_validate）
+MATERIAL_LIST_ADAPTER = TypeAdapter(List[MaterialResponse])
+
+# 文本导出（csv/txt/xlsx）的列映射 {字段名: 导出列名}
+MATERIAL_EXPORT_MAPPING = {
+    'MaterialID': '原料ID',
+    'TradeName': '商品名称',
+    'CategoryName': '类别',
+    'Supplier': '供应商',
+    'CAS_Number': 'CAS号',
+    'Density': '密度',
+    'Viscosity': '粘度',
+    'FunctionDescription': '功能说明',
+}
+
+# 列式导出（parquet/arrow）的列定义，按 MaterialResponse 字段读取
+MATERIAL_EXPORT_COLUMNS = (
+    ExportColumn("MaterialID", "int"),
+    ExportColumn("TradeName", "str"),
+    ExportColumn("CategoryName", "str"),
+    ExportColumn("Supplier", "str"),
+    ExportColumn("CAS_Number", "str"),
+    ExportColumn("Density", "float"),
+    ExportColumn("Viscosity", "float"),
+    ExportColumn("FunctionDescription", "str"),
+)
+
+
 class BatchDeleteRequest(BaseModel):
     """批量删除请求"""
     ids: list[int] = Field(..., min_length=1, description="要删除的ID列表")
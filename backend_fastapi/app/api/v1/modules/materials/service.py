@@ -3,7 +3,7 @@
 原料管理Service
 """
 
-from typing import List, Tuple
+from typing import AsyncGenerator, List, Tuple, Optional, Type
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.modules.materials.crud import MaterialCRUD, MaterialCategoryCRUD
@@ -12,10 +12,19 @@ from app.api.v1.modules.materials.schema import (
     MaterialUpdateRequest,
     MaterialQueryParams,
     MaterialResponse,
+    MATERIAL_LIST_ADAPTER,
+    MATERIAL_EXPORT_MAPPING,
+    MATERIAL_EXPORT_COLUMNS,
     MaterialCategoryResponse,
     BatchDeleteRequest
 )
+from app.config.settings import settings
+from app.core.database import AsyncSessionLocal
 from app.core.logger import logger
+from app.core.query_cache import query_cache
+from app.utils.export_helper import ExportHelper
+from app.utils.export_writers import ExportProgress, ExportWriter
+from app.utils.pg_copy import stream_copy_csv
 from app.core.custom_exceptions import (
     RecordNotFoundException,
     DatabaseException,
@@ -25,13 +34,16 @@ from app.core.custom_exceptions import (
 
 class MaterialService:
     """原料服务类"""
+
+    EXPORT_BATCH_SIZE = 5000  # 导出时每批读取的行数
     
     @staticmethod
     async def get_material_list(
         db: AsyncSession,
         page: int,
         page_size: int,
-        query_params: MaterialQueryParams
+        query_params: MaterialQueryParams,
+        count_mode: Optional[str] = None
     ) -> Tuple[List[MaterialResponse], int]:
         """获取原料列表（分页）"""
         materials, total = await MaterialCRUD.get_list_paginated(
@@ -40,20 +52,77 @@ class MaterialService:
             page_size=page_size,
             category=query_params.category,
             supplier=query_params.supplier,
-            keyword=query_params.keyword
+            keyword=query_params.keyword,
+            count_mode=count_mode
         )
         
-        # 转换为响应模型
-        material_list = []
-        for material in materials:
-            material_data = MaterialResponse.model_validate(material)
-            if material.category:
-                material_data.CategoryName = material.category.CategoryName
-            material_list.append(material_data)
+        # 整页批量转换为响应模型（行中已包含联表得到的 CategoryName）
+        material_list = MATERIAL_LIST_ADAPTER.validate_python(materials)
         
         logger.info(f"querymaterial列表successful: page{page}, total{total}items")
         return material_list, total
     
+    @staticmethod
+    def stream_export_csv(
+        query_params: MaterialQueryParams,
+        progress: Optional[ExportProgress] = None
+    ) -> AsyncGenerator[bytes, None]:
+        """原料导出 CSV（数据库 COPY 生成，列名和公式注入防护在SQL中完成，不分页）"""
+        stmt = MaterialCRUD.build_export_query(
+            MATERIAL_EXPORT_MAPPING,
+            category=query_params.category,
+            supplier=query_params.supplier,
+            keyword=query_params.keyword
+        )
+        return stream_copy_csv(stmt, progress=progress)
+    
+    @staticmethod
+    async def iter_export_batches(
+        query_params: MaterialQueryParams,
+        batch_size: Optional[int] = None,
+        progress: Optional[ExportProgress] = None
+    ) -> AsyncGenerator[List[MaterialResponse], None]:
+        """
+        按批读取全部符合条件的原料（与列表相同的筛选和排序，不截断）
+
+        使用独立会话和服务端游标逐批读取：响应开始发送时请求的会话已关闭，
+        且内存中只保留当前一批。
+        """
+        stmt = MaterialCRUD.build_list_query(
+            query_params.category,
+            query_params.supplier,
+            query_params.keyword
+        ).execution_options(yield_per=batch_size or MaterialService.EXPORT_BATCH_SIZE)
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(stmt)
+            async for rows in result.mappings().partitions():
+                batch = MATERIAL_LIST_ADAPTER.validate_python([dict(row) for row in rows])
+                if progress is not None:
+                    progress.processed_items += len(batch)
+                    progress.rows_written += len(batch)
+                yield batch
+    
+    @staticmethod
+    def stream_export(
+        query_params: MaterialQueryParams,
+        writer_class: Type[ExportWriter],
+        progress: Optional[ExportProgress] = None
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        流式导出原料列表
+
+        - csv: 由数据库 COPY 直接生成（EXPORT_USE_COPY 关闭时走下面的通用路径）
+        - 其他格式: 服务端游标分批读取，逐批编码；parquet/arrow 输出带类型的列
+        """
+        if writer_class.format == "csv" and settings.EXPORT_USE_COPY:
+            return MaterialService.stream_export_csv(query_params, progress)
+        return ExportHelper.stream_export(
+            MaterialService.iter_export_batches(query_params, progress=progress),
+            writer_class,
+            MATERIAL_EXPORT_MAPPING,
+            MATERIAL_EXPORT_COLUMNS,
+        )
+    
     @staticmethod
     async def get_material_detail(
         db: AsyncSession,
@@ -90,6 +159,7 @@ class MaterialService:
             )
             
             await db.commit()
+            query_cache.invalidate("materials")
             await db.refresh(material)
             
             logger.info(f"materialcreatesuccessful: {material.TradeName}")
@@ -138,6 +208,7 @@ class MaterialService:
         try:
             await MaterialCRUD.update_material(db, material_id, **update_data)
             await db.commit()
+            query_cache.invalidate("materials")
             
             logger.info(f"materialupdatesuccessful: ID {material_id}")
             
@@ -166,6 +237,7 @@ class MaterialService:
         try:
             await MaterialCRUD.delete_material(db, material_id)
             await db.commit()
+            query_cache.invalidate("materials")
             logger.info(f"materialdeletedsuccessful: ID {material_id}")
             return True
         except RecordNotFoundException:
@@ -184,6 +256,7 @@ class MaterialService:
         try:
             count = await MaterialCRUD.batch_delete_materials(db, delete_data.ids)
             await db.commit()
+            query_cache.invalidate("materials")
             logger.info(f"batchdeletedmaterialsuccessful: deleted{count}items")
             return count
         except Exception as e:
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+项目测试指标统计分析
+
+回答"2025 年所有 3D 打印配方的弯曲强度分布"这类跨项目问题：按项目列表的筛选条件，
+对测试结果的解析数值列（<字段>_Value）按指标、按项目类型统计数量、均值、标准差、
+最值、分位数和直方图。
+
+- 每张测试结果表加载为一份列式快照（项目ID、项目类型、配方日期和各指标数值的 NumPy 数组），
+  一次查询用 array_agg 取回后缓存在进程内；项目或测试结果写操作后与分面统计一同失效
+- 项目类型、配方日期筛选直接在快照上做布尔掩码；其余筛选条件（设计师、关键词、
+  成分/测试结果标记、测试指标范围）由数据库返回匹配的项目ID，再与快照求交
+- 统计在 NumPy 中向量化完成，直方图的区间取全部匹配数据的最值，各项目类型共用同一组区间
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Date, Integer, func, literal, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.modules.projects.crud import ProjectCRUD, TEST_RESULT_MODELS_BY_TABLE
+from app.api.v1.modules.projects.model import ProjectModel, ProjectTypeModel
+from app.api.v1.modules.projects.schema import (
+    ProjectAnalyticsResponse,
+    ProjectQueryParams,
+    PropertyAnalytics,
+    PropertyStats,
+    ProjectTypePropertyStats,
+)
+from app.api.v1.modules.test_results.crud import TestResultCRUD
+from app.config.settings import settings
+from app.core.custom_exceptions import ValidationException
+from app.core.logger import logger
+from app.core.query_cache import query_cache
+from app.utils.measurements import FIELDS_BY_NAME, MEASUREMENT_FIELDS, TABLE_BY_FIELD, VALUE_SUFFIX
+
+# 统计的分位点（百分数），响应中的键为 p5 / p25 / ...
+ANALYTICS_PERCENTILES = (5, 25, 50, 75, 95)
+
+# 快照中配方日期存为距该日期的天数（float，NULL 为 NaN）
+_EPOCH = date(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class PropertySnapshot:
+    """一张测试结果表的列式快照（各数组按行对齐）"""
+
+    table_name: str
+    fields: Tuple[str, ...]
+    project_ids: np.ndarray  # int64
+    type_ids: np.ndarray  # int64，未设置项目类型为 0
+    dates: np.ndarray  # float64，配方日期距 1970-01-01 的天数
+    values: np.ndarray  # float64 (行数, 指标数)，无法解析为 NaN
+    type_names: Dict[int, str]
+
+    @property
+    def size(self) -> int:
+        return len(self.project_ids)
+
+
+def _days(value: date) -> float:
+    return float((value - _EPOCH).days)
+
+
+def summarize(values: np.ndarray, edges: np.ndarray) -> PropertyStats:
+    """
+    一个指标的统计值
+
+    Args:
+        values: 指标数值（已去除 NaN）
+        edges: 直方图区间边界
+    """
+    if values.size == 0:
+        return PropertyStats(count=0, histogram=[0] * (len(edges) - 1))
+    percentiles = np.percentile(values, ANALYTICS_PERCENTILES)
+    return PropertyStats(
+        count=int(values.size),
+        mean=float(values.mean()),
+        std=float(values.std(ddof=1)) if values.size > 1 else None,
+        min=float(values.min()),
+        max=float(values.max()),
+        percentiles={f"p{q}": float(v) for q, v in zip(ANALYTICS_PERCENTILES, percentiles)},
+        histogram=np.histogram(values, edges)[0].tolist(),
+    )
+
+
+def analyze_snapshot(
+    snapshot: PropertySnapshot,
+    mask: np.ndarray,
+    fields: Sequence[str],
+    bins: int,
+) -> List[PropertyAnalytics]:
+    """
+    按掩码选出的行统计各指标（合计 + 按项目类型）
+
+    Args:
+        snapshot: 测试结果表快照
+        mask: 行掩码（筛选条件）
+        fields: 要统计的指标（须属于该表）
+        bins: 直方图区间数
+    """
+    type_ids = snapshot.type_ids[mask]
+    groups = np.unique(type_ids)
+    results = []
+    for field in fields:
+        column = snapshot.values[mask, snapshot.fields.index(field)]
+        present = ~np.isnan(column)
+        values = column[present]
+        edges = np.histogram_bin_edges(values, bins) if values.size else np.zeros(bins + 1)
+        by_type = []
+        for type_id in groups:
+            type_values = values[type_ids[present] == type_id]
+            if type_values.size == 0:
+                continue
+            stats = summarize(type_values, edges)
+            by_type.append(ProjectTypePropertyStats(
+                project_type=snapshot.type_names.get(int(type_id)),
+                **stats.model_dump(),
+            ))
+        measurement = FIELDS_BY_NAME[field]
+        results.append(PropertyAnalytics(
+            field=field,
+            label=measurement.label,
+            unit=measurement.unit,
+            bin_edges=edges.tolist(),
+            overall=summarize(values, edges),
+            by_type=by_type,
+        ))
+    return results
+
+
+class ProjectAnalyticsService:
+    """项目测试指标统计服务类"""
+
+    # 每张表一把锁：快照失效后的并发请求只加载一次
+    _snapshot_locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def resolve_fields(fields: Optional[str], project_type: Optional[str]) -> Dict[str, List[str]]:
+        """
+        要统计的指标，按测试结果表分组
+
+        Args:
+            fields: 逗号分隔的指标字段名；不传时取项目类型对应表的全部指标，
+                未指定（或无法识别）项目类型时为全部表的全部指标
+            project_type: 项目类型筛选
+
+        Raises:
+            ValidationException: 指标字段不存在
+        """
+        if fields:
+            names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+            unknown = [name for name in names if name not in FIELDS_BY_NAME]
+            if unknown:
+                raise ValidationException(f"不支持统计的测试字段: {', '.join(unknown)}", field="fields")
+        else:
+            model = TestResultCRUD.get_model_by_type_name(project_type) if project_type else None
+            tables = [model.__tablename__] if model is not None else list(MEASUREMENT_FIELDS)
+            names = [field.name for table in tables for field in MEASUREMENT_FIELDS[table]]
+
+        grouped: Dict[str, List[str]] = {}
+        for name in names:
+            grouped.setdefault(TABLE_BY_FIELD[name], []).append(name)
+        return grouped
+
+    @staticmethod
+    async def load_snapshot(db: AsyncSession, table_name: str) -> PropertySnapshot:
+        """
+        加载测试结果表快照：每列一个 array_agg，整张表一行返回，
+        避免逐行构造 Python 对象
+        """
+        model = TEST_RESULT_MODELS_BY_TABLE[table_name]
+        fields = tuple(field.name for field in MEASUREMENT_FIELDS[table_name])
+        stmt = (
+            select(
+                func.array_agg(model.ProjectID_FK),
+                func.array_agg(func.coalesce(ProjectModel.ProjectType_FK, 0)),
+                func.array_agg(
+                    type_coerce(ProjectModel.FormulationDate - literal(_EPOCH, Date), Integer)
+                ),
+                *[func.array_agg(getattr(model, field + VALUE_SUFFIX)) for field in fields],
+            )
+            .select_from(model)
+            .join(ProjectModel, ProjectModel.ProjectID == model.ProjectID_FK)
+        )
+        row = (await db.execute(stmt)).one()
+        type_rows = await db.execute(select(ProjectTypeModel.TypeID, ProjectTypeModel.TypeName))
+
+        size = len(row[0] or [])
+        values = np.array(row[3:], dtype=np.float64).T if size else np.empty((0, len(fields)))
+        return PropertySnapshot(
+            table_name=table_name,
+            fields=fields,
+            project_ids=np.array(row[0] or [], dtype=np.int64),
+            type_ids=np.array(row[1] or [], dtype=np.int64),
+            dates=np.array(row[2] or [], dtype=np.float64),
+            values=values.reshape(size, len(fields)),
+            type_names={type_id: name for type_id, name in type_rows.all()},
+        )
+
+    @staticmethod
+    async def get_snapshot(db: AsyncSession, table_name: str) -> PropertySnapshot:
+        """读取快照（缓存失效或过期时重新加载）"""
+        cache_key = ("analytics_snapshot", table_name)
+        snapshot = query_cache.get("projects", cache_key)
+        if snapshot is not None:
+            return snapshot
+
+        lock = ProjectAnalyticsService._snapshot_locks.setdefault(table_name, asyncio.Lock())
+        async with lock:
+            snapshot = query_cache.get("projects", cache_key)
+            if snapshot is not None:
+                return snapshot
+            generation = query_cache.generation("projects")
+            snapshot = await ProjectAnalyticsService.load_snapshot(db, table_name)
+            query_cache.set_if_current(
+                "projects", cache_key, snapshot, settings.PROJECT_ANALYTICS_SNAPSHOT_TTL, generation
+            )
+            logger.info(f"测试指标快照已加载: {table_name}, {snapshot.size} 行")
+            return snapshot
+
+    @staticmethod
+    async def matching_project_ids(
+        db: AsyncSession,
+        table_name: str,
+        query_params: ProjectQueryParams
+    ) -> Optional[np.ndarray]:
+        """
+        快照无法直接判断的筛选条件由数据库求出匹配的项目ID（只取有该表测试结果的项目）
+
+        Returns:
+            项目ID数组；没有此类筛选条件时为 None
+        """
+        conditions = ProjectCRUD._build_list_conditions(
+            formulator=query_params.formulator,
+            keyword=query_params.keyword,
+            has_compositions=query_params.has_compositions,
+            has_test_results=query_params.has_test_results,
+            test_field=query_params.test_field,
+            test_min=query_params.test_min,
+            test_max=query_params.test_max,
+            test_unit=query_params.test_unit,
+        )
+        if not conditions:
+            return None
+        model = TEST_RESULT_MODELS_BY_TABLE[table_name]
+        stmt = select(func.array_agg(ProjectModel.ProjectID)).where(
+            ProjectModel.ProjectID.in_(select(model.ProjectID_FK)), *conditions
+        )
+        ids = (await db.execute(stmt)).scalar_one()
+        return np.array(ids or [], dtype=np.int64)
+
+    @staticmethod
+    def snapshot_mask(snapshot: PropertySnapshot, query_params: ProjectQueryParams) -> np.ndarray:
+        """项目类型、配方日期筛选（与列表的 TypeName 等值、日期闭区间语义一致）"""
+        mask = np.ones(snapshot.size, dtype=bool)
+        if query_params.project_type:
+            type_ids = [
+                type_id for type_id, name in snapshot.type_names.items()
+                if name == query_params.project_type
+            ]
+            mask &= np.isin(snapshot.type_ids, type_ids)
+        # NaN（未填写日期）与任何日期比较都为假，和 SQL 的 NULL 一样被排除
+        if query_params.date_start:
+            mask &= snapshot.dates >= _days(query_params.date_start)
+        if query_params.date_end:
+            mask &= snapshot.dates <= _days(query_params.date_end)
+        return mask
+
+    @staticmethod
+    async def get_analytics(
+        db: AsyncSession,
+        query_params: ProjectQueryParams,
+        fields: Optional[str] = None,
+        bins: int = 20
+    ) -> ProjectAnalyticsResponse:
+        """
+        跨项目测试指标统计
+
+        Args:
+            db: 数据库会话
+            query_params: 项目列表筛选条件
+            fields: 逗号分隔的指标字段名（不传按项目类型取全部指标）
+            bins: 直方图区间数
+
+        Returns:
+            各指标的合计与按项目类型统计
+        """
+        properties: List[PropertyAnalytics] = []
+        total = 0
+        for table_name, table_fields in ProjectAnalyticsService.resolve_fields(
+            fields, query_params.project_type
+        ).items():
+            snapshot = await ProjectAnalyticsService.get_snapshot(db, table_name)
+            mask = ProjectAnalyticsService.snapshot_mask(snapshot, query_params)
+            project_ids = await ProjectAnalyticsService.matching_project_ids(
+                db, table_name, query_params
+            )
+            if project_ids is not None:
+                mask &= np.isin(snapshot.project_ids, project_ids)
+            total += int(mask.sum())
+            properties.extend(analyze_snapshot(snapshot, mask, table_fields, bins))
+
+        return ProjectAnalyticsResponse(
+            total=total,
+            bins=bins,
+            percentiles=list(ANALYTICS_PERCENTILES),
+            properties=properties,
+        )
@@ -4,29 +4,45 @@
 API路由层 - 处理HTTP请求
 """
 
-from fastapi import APIRouter, Depends, Query, Path
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Path
 from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.settings import settings
 from app.core.database import get_db
 from app.core.security import get_current_user_id
 from app.common.response import SuccessResponse, PaginatedResponse
 from app.utils.export_helper import ExportHelper
-from app.utils.chart_generator import ChartGenerator
+from app.utils.report_cache import report_image_cache
+from app.utils.report_renderer import report_render_pool
 from app.core.base_schema import PaginationParams
 from app.core.logger import logger
+from app.core.custom_exceptions import (
+    RecordNotFoundException,
+    ServiceUnavailableException,
+    ValidationException,
+)
+from app.core.total_count import total_kind
 from app.api.v1.modules.projects.service import ProjectService, CompositionService
+from app.api.v1.modules.projects.report_service import ProjectReportService
+from app.api.v1.modules.projects.analytics_service import ProjectAnalyticsService
 from app.api.v1.modules.projects.schema import (
     ProjectCreateRequest,
     ProjectUpdateRequest,
     ProjectQueryParams,
+    ProjectReportBatchRequest,
     ProjectBasicResponse,
+    PROJECT_LIST_ADAPTER,
     ProjectDetailResponse,
     ProjectTypeResponse,
     CompositionCreateRequest,
     CompositionUpdateRequest,
     CompositionResponse,
+    CompositionReplaceRequest,
     BatchDeleteRequest,
+    BulkProjectCreateRequest,
 )
 
 
@@ -51,6 +67,22 @@ async def get_project_list(
     keyword: str = Query(None, description="关键词搜索"),
     has_compositions: bool = Query(None, description="是否有配方成分"),
     has_test_results: bool = Query(None, description="是否有测试结果"),
+    test_field: str = Query(None, description="测试指标范围筛选字段（如 Ink_Viscosity）"),
+    test_min: float = Query(None, description="测试指标下限（含）"),
+    test_max: float = Query(None, description="测试指标上限（含）"),
+    test_unit: str = Query(None, description="上下限单位，不传为该字段的标准单位"),
+    sort_by: str = Query(
+        None,
+        pattern="^(ProjectID|FormulationDate|ProjectName|relevance)$",
+        description="排序字段: ProjectID / FormulationDate / ProjectName / relevance",
+    ),
+    sort_order: str = Query("desc", pattern="^(asc|desc)$", description="排序方向: asc 或 desc"),
+    after: str = Query(None, description="游标（上一页返回的next_cursor），传入后忽略page"),
+    count_mode: str = Query(
+        None,
+        pattern="^(exact|estimated|cached)$",
+        description="总数统计方式: exact / estimated / cached（默认读取配置）",
+    ),
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
@@ -69,6 +101,12 @@ async def get_project_list(
     - **keyword**: 关键词（搜索项目名称或配方编码）
     - **has_compositions**: 是否有配方成分
     - **has_test_results**: 是否有测试结果
+    - **test_field / test_min / test_max / test_unit**: 测试指标范围筛选（如粘度 10~20 cP），
+      按解析后的数值比较，单位不同时自动换算
+    - **sort_by**: 排序字段（有关键词时默认按相关度，否则默认ProjectID）
+    - **sort_order**: 排序方向（默认desc）
+    - **after**: 游标分页令牌，深翻页时使用，耗时与页深无关
+    - **count_mode**: 总数统计方式，响应中的 total_type 标明实际使用的方式
     """
     # 构建查询参数
     query_params = ProjectQueryParams(
@@ -79,11 +117,25 @@ async def get_project_list(
         keyword=keyword,
         has_compositions=has_compositions,
         has_test_results=has_test_results,
+        test_field=test_field,
+        test_min=test_min,
+        test_max=test_max,
+        test_unit=test_unit,
     )
 
+    if sort_by is None:
+        sort_by = "relevance" if keyword else "ProjectID"
+
     # 查询数据
-    projects, total = await ProjectService.get_project_list(
-        db=db, page=page, page_size=page_size, query_params=query_params
+    projects, total, next_cursor = await ProjectService.get_project_list(
+        db=db,
+        page=page,
+        page_size=page_size,
+        query_params=query_params,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        after=after,
+        count_mode=count_mode,
     )
 
     # 构建分页响应
@@ -91,72 +143,235 @@ async def get_project_list(
 
     return SuccessResponse(
         data={
-            "list": [p.model_dump(mode="json") for p in projects],
-            "total": total,
+            "list": PROJECT_LIST_ADAPTER.dump_python(projects, mode="json"),
+            "total": int(total),
+            "total_type": total_kind(total),
             "page": page,
             "page_size": page_size,
             "total_pages": total_pages,
+            "next_cursor": next_cursor,
         },
         msg="查询成功",
     )
 
 
+@router.get(
+    "/facets",
+    response_model=None,
+    summary="获取项目分面统计",
+    description="在当前筛选条件下按项目类型、配方设计师、月份统计项目数量",
+)
+async def get_project_facets(
+    project_type: str = Query(None, description="项目类型"),
+    formulator: str = Query(None, description="配方设计师"),
+    date_start: str = Query(None, description="开始日期(YYYY-MM-DD)"),
+    date_end: str = Query(None, description="结束日期(YYYY-MM-DD)"),
+    keyword: str = Query(None, description="关键词搜索"),
+    has_compositions: bool = Query(None, description="是否有配方成分"),
+    has_test_results: bool = Query(None, description="是否有测试结果"),
+    test_field: str = Query(None, description="测试指标范围筛选字段（如 Ink_Viscosity）"),
+    test_min: float = Query(None, description="测试指标下限（含）"),
+    test_max: float = Query(None, description="测试指标上限（含）"),
+    test_unit: str = Query(None, description="上下限单位，不传为该字段的标准单位"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    获取项目分面统计
+
+    需要认证: 是
+
+    查询参数与 /list 的筛选参数一致，返回:
+    - **types**: 各项目类型的数量
+    - **formulators**: 各配方设计师的数量
+    - **months**: 各月份（YYYY-MM）的数量
+    - **total**: 符合条件的项目总数
+    """
+    query_params = ProjectQueryParams(
+        project_type=project_type,
+        formulator=formulator,
+        date_start=date_start,
+        date_end=date_end,
+        keyword=keyword,
+        has_compositions=has_compositions,
+        has_test_results=has_test_results,
+        test_field=test_field,
+        test_min=test_min,
+        test_max=test_max,
+        test_unit=test_unit,
+    )
+
+    facets = await ProjectService.get_project_facets(db=db, query_params=query_params)
+
+    return SuccessResponse(data=facets.model_dump(mode="json"), msg="查询成功")
+
+
+@router.get(
+    "/analytics",
+    response_model=None,
+    summary="跨项目测试指标统计",
+    description="在项目列表筛选条件下，按测试指标和项目类型统计数量、均值、标准差、分位数和直方图",
+)
+async def get_project_analytics(
+    fields: str = Query(None, description="统计的测试字段，逗号分隔（如 Print3D_FlexuralStrength），默认按项目类型取全部指标"),
+    bins: int = Query(20, ge=1, le=100, description="直方图区间数"),
+    project_type: str = Query(None, description="项目类型"),
+    formulator: str = Query(None, description="配方设计师"),
+    date_start: str = Query(None, description="开始日期(YYYY-MM-DD)"),
+    date_end: str = Query(None, description="结束日期(YYYY-MM-DD)"),
+    keyword: str = Query(None, description="关键词搜索"),
+    has_compositions: bool = Query(None, description="是否有配方成分"),
+    has_test_results: bool = Query(None, description="是否有测试结果"),
+    test_field: str = Query(None, description="测试指标范围筛选字段（如 Ink_Viscosity）"),
+    test_min: float = Query(None, description="测试指标下限（含）"),
+    test_max: float = Query(None, description="测试指标上限（含）"),
+    test_unit: str = Query(None, description="上下限单位，不传为该字段的标准单位"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    跨项目测试指标统计
+
+    需要认证: 是
+
+    筛选参数与 /list 一致，例如 2025 年 3D 打印配方的弯曲强度分布:
+    `?project_type=3D Printing&date_start=2025-01-01&date_end=2025-12-31&fields=Print3D_FlexuralStrength`
+
+    返回每个指标:
+    - **overall / by_type**: 合计及按项目类型的 count、mean、std、min、max、percentiles、histogram
+    - **bin_edges**: 直方图区间边界（各项目类型共用），数值均为标准单位（unit）
+    """
+    query_params = ProjectQueryParams(
+        project_type=project_type,
+        formulator=formulator,
+        date_start=date_start,
+        date_end=date_end,
+        keyword=keyword,
+        has_compositions=has_compositions,
+        has_test_results=has_test_results,
+        test_field=test_field,
+        test_min=test_min,
+        test_max=test_max,
+        test_unit=test_unit,
+    )
+
+    analytics = await ProjectAnalyticsService.get_analytics(
+        db=db, query_params=query_params, fields=fields, bins=bins
+    )
+
+    return SuccessResponse(data=analytics.model_dump(mode="json"), msg="查询成功")
+
+
 # ==================== 数据导出接口 ====================
 @router.get(
     "/export",
     response_model=None,
     summary="导出项目完整信息（性能优化版）",
-    description="流式导出项目列表数据为CSV或TXT格式，包含项目基本信息、配方成分和测试结果。使用批量查询和流式响应，支持大数据集导出",
+    description="流式导出项目列表数据为CSV、TXT、Excel、Parquet或Arrow格式，包含项目基本信息、配方成分和测试结果。使用批量查询和流式响应，支持大数据集导出",
 )
 async def export_projects(
-    format: str = Query("csv", description="导出格式: csv 或 txt"),
+    format: str = Query("csv", description="导出格式: csv、txt、xlsx、parquet 或 arrow"),
     project_type: str = Query(None, description="项目类型"),
     formulator: str = Query(None, description="配方设计师"),
     keyword: str = Query(None, description="关键词搜索"),
+    test_field: str = Query(None, description="测试指标范围筛选字段（如 Ink_Viscosity）"),
+    test_min: float = Query(None, description="测试指标下限（含）"),
+    test_max: float = Query(None, description="测试指标上限（含）"),
+    test_unit: str = Query(None, description="上下限单位，不传为该字段的标准单位"),
+    layout: str = Query(
+        "full",
+        pattern="^(full|headers)$",
+        description="导出内容: full 完整信息（成分和测试结果）/ headers 仅项目基本信息（仅 csv）",
+    ),
+    parallel: int = Query(
+        None,
+        ge=1,
+        le=settings.EXPORT_PARALLEL_MAX_SHARDS,
+        description="并行分片数（按项目ID区间切分，每个分片一个分片进程和数据库连接），不传为单连接导出",
+    ),
+    split: bool = Query(False, description="每个分片输出为一个文件，打包为 ZIP（不按全局顺序拼接）"),
     user_id: int = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
 ):
     """
     导出项目完整信息（性能优化版）
 
     **性能优化**:
-    - ✅ 使用 selectinload 解决 N+1 查询问题
-    - ✅ 批量处理（每批100条），避免内存溢出
-    - ✅ 流式响应，边生成边输出
-    - ✅ 最大导出限制：50000条记录
+    - ✅ 按主键键集分页批量查询（每批1000个项目），每批耗时不随导出进度增长
+    - ✅ 整个导出在同一个 REPEATABLE READ 只读快照内完成，结果一致
+    - ✅ 流式响应，边生成边输出，内存占用恒定
+    - ✅ 不限制导出数量
+    - ✅ xlsx 流式写出工作簿（超过单表行数上限时自动分表）
+    - ✅ parquet/arrow 输出带类型的列（数值、日期、每个测试属性一列），按记录批次写出
+    - ✅ layout=headers 时每个项目一行，由数据库 COPY 直接生成 CSV
+    - ✅ parallel=N 时按项目ID区间分 N 片，各分片在分片进程中共享同一快照并发查询和编码，
+      按顺序拼接输出（仅 csv/txt）；split=true 时每片一个文件打包为 ZIP（所有格式）
 
     需要认证: 是
 
     查询参数:
-    - **format**: 导出格式 (csv 或 txt)
+    - **format**: 导出格式 (csv、txt、xlsx、parquet 或 arrow)
     - **project_type**: 项目类型筛选
     - **formulator**: 配方设计师筛选
     - **keyword**: 关键词搜索
+    - **test_field / test_min / test_max / test_unit**: 测试指标范围筛选（与列表接口相同）
+    - **layout**: 导出内容 (full 或 headers)
+    - **parallel**: 并行分片数（1~EXPORT_PARALLEL_MAX_SHARDS，连接额度不足时自动减少）
+    - **split**: 是否按分片输出多文件 ZIP（未指定 parallel 时使用默认分片数）
     """
     from app.api.v1.modules.projects.export_service import ProjectExportService
+    from app.utils.export_writers import ZipExportArchive, get_export_writer
     from fastapi.responses import StreamingResponse
     from datetime import datetime
 
+    # 选择导出格式（不支持的格式返回 422）
+    writer_class = get_export_writer(format)
+
     # 构建查询参数
     query_params = ProjectQueryParams(
-        project_type=project_type, formulator=formulator, keyword=keyword
+        project_type=project_type,
+        formulator=formulator,
+        keyword=keyword,
+        test_field=test_field,
+        test_min=test_min,
+        test_max=test_max,
+        test_unit=test_unit,
     )
+    # 导出在流式响应中才构建查询，筛选条件先校验一次，无效时直接返回 422
+    ProjectExportService.build_conditions(query_params)
 
     # 生成文件名
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"projects_export_{timestamp}.{format}"
-
-    # 选择导出格式
-    if format == "txt":
-        stream_generator = ProjectExportService.stream_export_txt(db, query_params)
-        media_type = "text/plain; charset=utf-8"
+    media_type = writer_class.media_type
+    if layout == "headers":
+        if writer_class.format != "csv":
+            raise ValidationException("layout=headers 仅支持 csv 格式", field="format")
+        if parallel or split:
+            raise ValidationException("layout=headers 由单条 COPY 生成，不支持并行导出", field="parallel")
+        filename = f"projects_headers_{timestamp}.csv"
+        chunks = ProjectExportService.stream_header_csv(query_params)
+    elif split:
+        filename = f"projects_export_{timestamp}.zip"
+        media_type = ZipExportArchive.media_type
+        chunks = ProjectExportService.stream_export_parallel(
+            query_params, writer_class, shards=parallel, split=True
+        )
+    elif parallel and parallel > 1:
+        if not writer_class.concatenable:
+            raise ValidationException(
+                f"{writer_class.format} 格式的并行导出不能拼接为一个文件，请同时指定 split=true",
+                field="parallel",
+            )
+        filename = f"projects_export_{timestamp}.{writer_class.extension}"
+        chunks = ProjectExportService.stream_export_parallel(
+            query_params, writer_class, shards=parallel
+        )
     else:
-        stream_generator = ProjectExportService.stream_export_csv(db, query_params)
-        media_type = "text/csv; charset=utf-8"
+        filename = f"projects_export_{timestamp}.{writer_class.extension}"
+        chunks = ProjectExportService.stream_export(query_params, writer_class)
 
     # 返回流式响应
     return StreamingResponse(
-        stream_generator,
+        chunks,
         media_type=media_type,
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"',
@@ -165,14 +380,78 @@ async def export_projects(
     )
 
 
+@router.get(
+    "/export-image/metrics",
+    summary="报告渲染进程池状态",
+    description="项目报告图片渲染的排队深度、完成/失败/拒绝次数、最近的渲染耗时和报告缓存命中情况",
+)
+async def get_report_render_metrics(user_id: int = Depends(get_current_user_id)):
+    """报告渲染进程池与报告缓存指标"""
+    data = report_render_pool.metrics()
+    data["cache"] = report_image_cache.metrics()
+    return SuccessResponse(data=data, msg="查询成功")
+
+
+@router.post(
+    "/export-image/batch",
+    response_model=None,
+    summary="批量导出项目图片报告",
+    description="按项目ID列表或项目列表筛选条件批量生成报告图片，以 ZIP 流式返回（每个项目一张图片）",
+)
+async def export_project_images_batch(
+    request: ProjectReportBatchRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    批量导出项目报告图片
+
+    需要认证: 是
+
+    请求体:
+    - **project_ids**: 项目ID列表（指定时忽略筛选条件）
+    - **profile**: 渲染档位（thumbnail / screen / print）
+    - 其余字段与项目列表筛选条件相同
+
+    返回:
+    - ZIP 文件，报告按完成顺序写入（project_<ID>.<扩展名>），不存在或渲染失败的项目记录在 report_errors.txt
+    - 项目数超过上限时返回 422
+    - 需要进度时通过导出任务提交（POST /api/v1/exports，resource=project_reports，format=zip）
+    """
+    from app.utils.export_writers import ZipExportArchive
+    from fastapi.responses import StreamingResponse
+    from datetime import datetime
+
+    # 先解析项目ID，数量超限在开始传输前返回 422
+    project_ids = await ProjectReportService.resolve_batch_project_ids(db, request)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"project_reports_{timestamp}.zip"
+    return StreamingResponse(
+        ProjectReportService.stream_report_zip(request, project_ids=project_ids),
+        media_type=ZipExportArchive.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-cache",
+            "X-Total-Count": str(len(project_ids)),
+        },
+    )
+
+
 @router.get(
     "/export-image/{project_id}",
     response_model=None,
     summary="导出项目图片报告",
-    description="导出包含项目信息表、配方成分柱状图、测试结果雷达图的PNG图片",
+    description="导出包含项目信息表、配方成分柱状图、测试结果雷达图的报告图片，档位决定分辨率和格式（PNG / WebP / JPEG）",
 )
 async def export_project_image(
     project_id: int = Path(..., gt=0, description="项目ID"),
+    profile: str = Query(
+        None,
+        pattern="^(thumbnail|screen|print)$",
+        description="渲染档位: thumbnail 缩略图 / screen 屏幕（默认）/ print 打印（300 DPI PNG）",
+    ),
+    if_none_match: Optional[str] = Header(None, description="上次响应的 ETag"),
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
@@ -184,121 +463,27 @@ async def export_project_image(
     路径参数:
     - **project_id**: 项目ID
 
+    查询参数:
+    - **profile**: 渲染档位（thumbnail / screen / print）
+
     返回:
-    - PNG图片文件（包含项目信息表、配方成分柱状图、测试结果雷达图）
+    - 报告图片（包含项目信息表、配方成分柱状图、测试结果雷达图），格式由档位决定
+    - ETag 为报告输入和渲染设置的内容哈希；If-None-Match 匹配时返回 304，不读取也不渲染图片
+    - 相同输入的报告从磁盘缓存返回，不重新渲染
+    - 渲染进程池排队已满时返回 503，Retry-After 头给出建议的重试间隔
     """
-    from app.api.v1.modules.test_results.service import TestResultService
-    from app.api.v1.modules.projects.crud import ProjectCRUD
     from datetime import datetime
 
-    # 获取项目详情
-    project = await ProjectCRUD.get_by_id(db, project_id)
-    if not project:
-        return Response(
-            content=b"Project not found", status_code=404, media_type="text/plain"
-        )
-
-    # 准备项目数据
-    project_data = {
-        "ProjectID": project.ProjectID,
-        "ProjectName": project.ProjectName,
-        "TypeName": project.project_type.TypeName if project.project_type else "N/A",
-        "FormulaCode": project.FormulaCode,
-        "FormulatorName": project.FormulatorName,
-        "FormulationDate": project.FormulationDate,
-        "SubstrateApplication": project.SubstrateApplication,
-    }
-
-    # 获取配方成分
-    compositions = []
-    if project.compositions:
-        for comp in project.compositions:
-            comp_data = {
-                "WeightPercentage": float(comp.WeightPercentage),
-                "MaterialName": comp.material.TradeName if comp.material else None,
-                "FillerName": comp.filler.TradeName if comp.filler else None,
-                "Remarks": comp.Remarks if comp.Remarks else "",
-            }
-            compositions.append(comp_data)
-
-    # 获取测试结果
-    test_results = {}
-    project_type_name = project_data["TypeName"]
-    if project_type_name and project_type_name != "N/A":
-        try:
-            test_result = await TestResultService.get_test_result(db, project_id)
-            if test_result:
-                # 将测试结果转换为字典，并清理特殊字符
-                char_replacements = {
-                    "²": "^2",
-                    "³": "^3",
-                    "°": "deg",
-                    "℃": "C",
-                    "μ": "u",
-                    "·": ".",
-                    "～": "~",
-                    "—": "-",
-                }
-                test_results = {}
-                for k, v in test_result.__dict__.items():
-                    if not k.startswith("_") and k not in [
-                        "ResultID",
-                        "ProjectID_FK",
-                        "TestDate",
-                        "Notes",
-                    ]:
-                        # 如果值是字符串，替换特殊字符
-                        if isinstance(v, str):
-                            clean_v = v
-                            for old_char, new_char in char_replacements.items():
-                                clean_v = clean_v.replace(old_char, new_char)
-                            test_results[k] = clean_v
-                        else:
-                            test_results[k] = v
-        except Exception as e:
-            # 如果获取测试结果失败，继续生成图片，只是不包含测试结果
-            pass
-
-    # 生成图片
     try:
-        # 1. 创建项目信息表
-        info_img = ChartGenerator.create_project_info_table(project_data)
-
-        # 2. 创建配料信息表
-        composition_table_img = ChartGenerator.create_composition_table(compositions)
-
-        # 3. 创建配方成分柱状图
-        bar_chart_bytes = ChartGenerator.create_composition_bar_chart(compositions)
-
-        # 4. 创建测试结果表
-        test_result_table_img = ChartGenerator.create_test_result_table(
-            test_results, project_type_name
-        )
-
-        # 5. 创建测试结果雷达图
-        radar_chart_bytes = ChartGenerator.create_test_result_radar_chart(
-            test_results, project_type_name
-        )
-
-        # 6. 组合图片
-        combined_image_bytes = ChartGenerator.combine_images_vertical(
-            info_img,
-            composition_table_img,
-            bar_chart_bytes,
-            test_result_table_img,
-            radar_chart_bytes,
+        image = await ProjectReportService.get_report_image(
+            db, project_id, if_none_match, profile=profile
         )
-
-        # 生成文件名
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"project_{project_id}_{timestamp}.png"
-
-        # 返回图片
+    except RecordNotFoundException:
         return Response(
-            content=combined_image_bytes,
-            media_type="image/png",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            content=b"Project not found", status_code=404, media_type="text/plain"
         )
+    except ServiceUnavailableException:
+        raise
     except Exception as e:
         logger.error("Failed to generate project image report: %s", e, exc_info=True)
         return Response(
@@ -307,6 +492,48 @@ async def export_project_image(
             media_type="text/plain; charset=utf-8",
         )
 
+    # 浏览器每次使用前都带 ETag 重新验证，项目数据变化后立即拿到新图片
+    headers = {"ETag": image.etag, "Cache-Control": "private, no-cache"}
+    if image.content is None:
+        return Response(status_code=304, headers=headers)
+
+    # 生成文件名
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"project_{project_id}_{timestamp}.{image.profile.extension}"
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    headers["X-Report-Cache"] = "hit" if image.cached else "miss"
+
+    # 返回图片
+    return Response(content=image.content, media_type=image.profile.media_type, headers=headers)
+
+
+@router.get(
+    "/{project_id}/chart-data",
+    response_model=None,
+    summary="获取项目报告图表数据",
+    description="返回配方成分柱状图和测试结果雷达图的数据，由前端绘图；图片报告仅用于下载",
+)
+async def get_project_chart_data(
+    project_id: int = Path(..., gt=0, description="项目ID"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    获取项目报告图表数据
+
+    需要认证: 是
+
+    路径参数:
+    - **project_id**: 项目ID
+
+    返回:
+    - **radar**: 雷达图指标（fields / names / units / min / max / measured / values 等长列表），
+      values 为按行业标准范围标准化后的 0-100 值，与图片报告的雷达图一致；reference 为参考线
+    - **compositions**: 成分柱状图（names / kinds / percentages 等长列表）和 total 总重量百分比
+    """
+    chart_data = await ProjectReportService.get_chart_data(db, project_id)
+    return SuccessResponse(data=chart_data.model_dump(mode="json"), msg="查询成功")
+
 
 @router.get(
     "/{project_id}",
@@ -439,6 +666,37 @@ async def batch_delete_projects(
     )
 
 
+@router.post(
+    "/bulk",
+    response_model=None,
+    summary="批量导入项目",
+    description="批量导入项目（可包含配方成分与测试结果），集合式插入并返回逐项结果",
+)
+async def bulk_create_projects(
+    bulk_data: BulkProjectCreateRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    批量导入项目
+
+    需要认证: 是
+
+    请求体:
+    - **items**: 项目列表（最多10000项），每项包含:
+        - 创建项目的全部字段（project_name、project_type_fk、formulator_name、formulation_date、substrate_application）
+        - **compositions**: 配方成分列表（material_id / filler_id / weight_percentage / addition_method / remarks）
+        - **test_result**: 测试结果（字段名与测试结果接口一致，按项目类型写入对应表）
+
+    逐项校验，无效项返回错误原因且不影响其他项；有效项在同一事务中写入
+    """
+    result = await ProjectService.bulk_create_projects(db, bulk_data)
+    return SuccessResponse(
+        data=result.model_dump(mode="json"),
+        msg=f"批量导入完成: 成功 {result.created} 个，失败 {result.failed} 个",
+    )
+
+
 # ==================== 辅助接口 ====================
 @router.get(
     "/config/types",
@@ -508,6 +766,47 @@ async def get_project_compositions(
     )
 
 
+@router.put(
+    "/{project_id}/compositions",
+    response_model=None,
+    summary="整体替换项目配方成分",
+    description="提交完整的目标成分列表，服务端计算差异并在一个事务中批量新增/修改/删除",
+)
+async def replace_project_compositions(
+    project_id: int = Path(..., gt=0, description="项目ID"),
+    replace_data: CompositionReplaceRequest = ...,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    整体替换项目配方成分
+
+    需要认证: 是
+
+    路径参数:
+    - **project_id**: 项目ID
+
+    请求体:
+    - **compositions**: 目标成分列表，每项包含:
+        - **composition_id**: 已有成分ID（可选；为空时按原料/填料匹配已有成分，未匹配则新增）
+        - **material_id** / **filler_id**: 原料ID / 填料ID（至少填一个）
+        - **weight_percentage**: 重量百分比
+        - **addition_method** / **remarks**: 掺入方法 / 备注（可选）
+
+    未出现在列表中的已有成分会被删除；返回替换后的完整成分列表
+    """
+    compositions, stats = await CompositionService.replace_compositions(
+        db, project_id, replace_data
+    )
+    return SuccessResponse(
+        data=[c.model_dump(mode="json") for c in compositions],
+        msg=(
+            f"配方成分已更新: 新增 {stats['created']}，修改 {stats['updated']}，"
+            f"删除 {stats['deleted']}"
+        ),
+    )
+
+
 @router.post(
     "/compositions/create",
     response_model=None,
@@ -4,9 +4,14 @@
 数据访问层 - 负责数据库操作
 """
 
-from typing import Optional, List, Tuple
+from collections import Counter
+from typing import Dict, Optional, List, Tuple
 from datetime import date
-from sqlalchemy import select, update, delete, func, and_, or_
+from sqlalchemy import (
+    select, insert, update, delete, func, and_, literal, literal_column, tuple_,
+    any_, bindparam, cast, ARRAY, Integer, String, Date, Text
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -14,16 +19,86 @@ from app.api.v1.modules.projects.model import (
     ProjectModel,
     ProjectTypeModel,
     FormulaCompositionModel,
+    ProjectSummaryModel,
+    FormulaCodeSequenceModel,
     TestResultInkModel,
     TestResultCoatingModel,
     TestResult3DPrintModel,
-    TestResultCompositeModel
+    TestResultCompositeModel,
 )
+from app.api.v1.modules.materials.model import MaterialModel
+from app.api.v1.modules.fillers.model import FillerModel
+from app.core.custom_exceptions import ValidationException
 from app.core.logger import logger
+from app.core.query_cache import make_cache_key
+from app.core.total_count import count_total
+from app.utils.keyset import (
+    build_keyset_condition,
+    decode_cursor,
+    encode_cursor,
+    parse_optional_value,
+)
+from app.utils.text_search import keyword_condition, similarity_rank
+from app.utils.bulk_insert import unnest_select
+from app.utils.measurements import FIELDS_BY_NAME, TABLE_BY_FIELD, VALUE_SUFFIX, convert_to_unit
+
+# 批量插入的列
+PROJECT_BULK_COLUMNS = [
+    "ProjectName",
+    "ProjectType_FK",
+    "SubstrateApplication",
+    "FormulatorName",
+    "FormulationDate",
+    "FormulaCode",
+]
+COMPOSITION_BULK_COLUMNS = [
+    "ProjectID_FK",
+    "MaterialID_FK",
+    "FillerID_FK",
+    "WeightPercentage",
+    "AdditionMethod",
+    "Remarks",
+]
+
+# 测试结果表名 -> 模型（测试指标范围筛选）
+TEST_RESULT_MODELS_BY_TABLE = {
+    model.__tablename__: model
+    for model in (
+        TestResultInkModel,
+        TestResultCoatingModel,
+        TestResult3DPrintModel,
+        TestResultCompositeModel,
+    )
+}
+
+# 事务级设置：为 on 时项目汇总触发器不重算（见 alembic 20261017_07）
+SUMMARY_DEFER_SETTING = "app.defer_project_summary"
 
 
 class ProjectCRUD:
     """项目CRUD操作类"""
+
+    # 列表支持的排序字段: 字段名 -> (列, 游标值解析函数, 是否可为NULL)
+    SORT_COLUMNS = {
+        "ProjectID": (ProjectModel.ProjectID, int, False),
+        "FormulationDate": (ProjectModel.FormulationDate, date.fromisoformat, True),
+        "ProjectName": (ProjectModel.ProjectName, str, False),
+    }
+
+    # 列表视图的投影列（类型名称在SQL中联表取得，不加载ORM实体）
+    LIST_COLUMNS = (
+        ProjectModel.ProjectID,
+        ProjectModel.ProjectName,
+        ProjectModel.ProjectType_FK,
+        ProjectTypeModel.TypeName,
+        ProjectModel.SubstrateApplication,
+        ProjectModel.FormulatorName,
+        ProjectModel.FormulationDate,
+        ProjectModel.FormulaCode,
+    )
+
+    # 关键词搜索列（均建有 gin_trgm_ops 索引）
+    KEYWORD_COLUMNS = (ProjectModel.ProjectName, ProjectModel.FormulaCode)
     
     @staticmethod
     async def get_by_id(
@@ -57,6 +132,42 @@ class ProjectCRUD:
         except Exception as e:
             logger.error(f"queryprojectfailed: {e}")
             raise
+
+    @staticmethod
+    async def get_by_ids(
+        db: AsyncSession,
+        project_ids: List[int]
+    ) -> List[ProjectModel]:
+        """
+        批量查询项目（与 get_by_id 相同的预加载：项目类型、配方成分及其原料/填料）
+        
+        Args:
+            db: 数据库会话
+            project_ids: 项目ID列表
+        
+        Returns:
+            项目对象列表（按 ProjectID 升序，不存在的ID被忽略）
+        """
+        if not project_ids:
+            return []
+        try:
+            stmt = (
+                select(ProjectModel)
+                .options(selectinload(ProjectModel.project_type))
+                .options(
+                    selectinload(ProjectModel.compositions).selectinload(FormulaCompositionModel.material)
+                )
+                .options(
+                    selectinload(ProjectModel.compositions).selectinload(FormulaCompositionModel.filler)
+                )
+                .where(ProjectModel.ProjectID.in_(project_ids))
+                .order_by(ProjectModel.ProjectID)
+            )
+            result = await db.execute(stmt)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f"批量queryprojectfailed: {e}")
+            raise
     
     @staticmethod
     async def get_list_paginated(
@@ -69,10 +180,23 @@ class ProjectCRUD:
         date_end: Optional[date] = None,
         keyword: Optional[str] = None,
         has_compositions: Optional[bool] = None,
-        has_test_results: Optional[bool] = None
-    ) -> Tuple[List[ProjectModel], int]:
+        has_test_results: Optional[bool] = None,
+        test_field: Optional[str] = None,
+        test_min: Optional[float] = None,
+        test_max: Optional[float] = None,
+        test_unit: Optional[str] = None,
+        sort_by: str = "ProjectID",
+        sort_order: str = "desc",
+        after: Optional[str] = None,
+        count_mode: Optional[str] = None
+    ) -> Tuple[List[dict], int, Optional[str]]:
         """
-        分页查询项目列表
+        分页查询项目列表（列投影，返回 LIST_COLUMNS 的字典行而非ORM实体）
+        
+        支持两种分页方式：
+        - 传入 after 游标时使用键集分页，忽略 page，深翻页耗时不随页数增长
+        - 否则使用 OFFSET 分页（兼容旧的页码跳转）
+        两种方式都会返回下一页游标，便于前端从任意一页切换到游标模式
         
         Args:
             db: 数据库会话
@@ -85,110 +209,34 @@ class ProjectCRUD:
             keyword: 关键词搜索
             has_compositions: 是否有配方成分
             has_test_results: 是否有测试结果
+            test_field / test_min / test_max / test_unit: 测试指标范围筛选
+            sort_by: 排序字段（ProjectID / FormulationDate / ProjectName / relevance）
+                relevance 按关键词相似度排序，未传关键词时退化为 ProjectID
+            sort_order: 排序方向（asc / desc）
+            after: 上一页返回的游标
+            count_mode: 总数统计方式（exact / estimated / cached），None 使用配置
         
         Returns:
-            (项目列表, 总数)
+            (项目行列表, 总数(TotalCount), 下一页游标)
         """
         try:
             # 记录查询参数
             logger.info(f"projectquery参数: keyword={keyword}, has_compositions={has_compositions}, has_test_results={has_test_results}")
             
             # 构建查询条件
-            conditions = []
-            
-            if project_type:
-                # 关联项目类型表
-                conditions.append(ProjectTypeModel.TypeName == project_type)
-            
-            if formulator:
-                conditions.append(ProjectModel.FormulatorName == formulator)
-            
-            if date_start:
-                conditions.append(ProjectModel.FormulationDate >= date_start)
-            
-            if date_end:
-                conditions.append(ProjectModel.FormulationDate <= date_end)
-            
-            if keyword:
-                conditions.append(
-                    or_(
-                        ProjectModel.ProjectName.like(f"%{keyword}%"),
-                        ProjectModel.FormulaCode.like(f"%{keyword}%")
-                    )
-                )
-            
-            # 筛选有配方成分的项目
-            if has_compositions is not None:
-                if has_compositions:
-                    # 只显示有配方成分的项目
-                    # 先查询有配方成分的项目ID列表用于调试
-                    comp_ids_result = await db.execute(select(FormulaCompositionModel.ProjectID_FK).distinct())
-                    comp_ids = [row[0] for row in comp_ids_result.all()]
-                    logger.info(f"有formula成分的projectID列表: {comp_ids}")
-                    
-                    conditions.append(
-                        ProjectModel.ProjectID.in_(
-                            select(FormulaCompositionModel.ProjectID_FK).distinct()
-                        )
-                    )
-                else:
-                    # 只显示没有配方成分的项目
-                    conditions.append(
-                        ProjectModel.ProjectID.notin_(
-                            select(FormulaCompositionModel.ProjectID_FK).distinct()
-                        )
-                    )
-            
-            # 筛选有测试结果的项目
-            if has_test_results is not None:
-                if has_test_results:
-                    # 只显示有测试结果的项目（任一类型）
-                    # 先查询有测试结果的项目ID列表用于调试
-                    ink_ids_result = await db.execute(select(TestResultInkModel.ProjectID_FK).distinct())
-                    ink_ids = [row[0] for row in ink_ids_result.all()]
-                    coating_ids_result = await db.execute(select(TestResultCoatingModel.ProjectID_FK).distinct())
-                    coating_ids = [row[0] for row in coating_ids_result.all()]
-                    print3d_ids_result = await db.execute(select(TestResult3DPrintModel.ProjectID_FK).distinct())
-                    print3d_ids = [row[0] for row in print3d_ids_result.all()]
-                    composite_ids_result = await db.execute(select(TestResultCompositeModel.ProjectID_FK).distinct())
-                    composite_ids = [row[0] for row in composite_ids_result.all()]
-                    all_test_ids = set(ink_ids + coating_ids + print3d_ids + composite_ids)
-                    logger.info(f"有testresult的projectID列表: {all_test_ids}")
-                    
-                    conditions.append(
-                        or_(
-                            ProjectModel.ProjectID.in_(
-                                select(TestResultInkModel.ProjectID_FK).distinct()
-                            ),
-                            ProjectModel.ProjectID.in_(
-                                select(TestResultCoatingModel.ProjectID_FK).distinct()
-                            ),
-                            ProjectModel.ProjectID.in_(
-                                select(TestResult3DPrintModel.ProjectID_FK).distinct()
-                            ),
-                            ProjectModel.ProjectID.in_(
-                                select(TestResultCompositeModel.ProjectID_FK).distinct()
-                            )
-                        )
-                    )
-                else:
-                    # 只显示没有测试结果的项目
-                    conditions.append(
-                        and_(
-                            ProjectModel.ProjectID.notin_(
-                                select(TestResultInkModel.ProjectID_FK).distinct()
-                            ),
-                            ProjectModel.ProjectID.notin_(
-                                select(TestResultCoatingModel.ProjectID_FK).distinct()
-                            ),
-                            ProjectModel.ProjectID.notin_(
-                                select(TestResult3DPrintModel.ProjectID_FK).distinct()
-                            ),
-                            ProjectModel.ProjectID.notin_(
-                                select(TestResultCompositeModel.ProjectID_FK).distinct()
-                            )
-                        )
-                    )
+            conditions = ProjectCRUD._build_list_conditions(
+                project_type=project_type,
+                formulator=formulator,
+                date_start=date_start,
+                date_end=date_end,
+                keyword=keyword,
+                has_compositions=has_compositions,
+                has_test_results=has_test_results,
+                test_field=test_field,
+                test_min=test_min,
+                test_max=test_max,
+                test_unit=test_unit,
+            )
             
             # 查询总数
             count_stmt = (
@@ -203,38 +251,313 @@ class ProjectCRUD:
             if conditions:
                 count_stmt = count_stmt.where(and_(*conditions))
             
-            total_result = await db.execute(count_stmt)
-            total = total_result.scalar() or 0
+            total = await count_total(
+                db,
+                count_stmt,
+                namespace="projects",
+                cache_key=make_cache_key(
+                    project_type=project_type,
+                    formulator=formulator,
+                    date_start=date_start,
+                    date_end=date_end,
+                    keyword=keyword,
+                    has_compositions=has_compositions,
+                    has_test_results=has_test_results,
+                    test_field=test_field,
+                    test_min=test_min,
+                    test_max=test_max,
+                    test_unit=test_unit,
+                ),
+                table_name=ProjectModel.__tablename__,
+                filtered=bool(conditions),
+                mode=count_mode,
+            )
             
-            # 查询数据
-            offset = (page - 1) * page_size
+            # 排序：排序字段 + 主键，保证顺序稳定且与复合索引一致
+            if sort_by == "relevance" and not keyword:
+                sort_by = "ProjectID"
+            # 相关度排序值依赖关键词，游标记录关键词，换关键词后不能沿用
+            cursor_keyword = None
+            if sort_by == "relevance":
+                sort_column = similarity_rank(ProjectCRUD.KEYWORD_COLUMNS, keyword)
+                value_parser, nullable = float, False
+                cursor_keyword = keyword
+            else:
+                sort_column, value_parser, nullable = ProjectCRUD.SORT_COLUMNS[sort_by]
+            descending = sort_order == "desc"
+            if sort_column is ProjectModel.ProjectID:
+                order_by = [sort_column.desc() if descending else sort_column.asc()]
+            elif descending:
+                order_by = [sort_column.desc(), ProjectModel.ProjectID.desc()]
+            else:
+                order_by = [sort_column.asc(), ProjectModel.ProjectID.asc()]
+            
+            # 查询数据（多取一行用于判断是否还有下一页，同时带出排序值用于生成游标）
             stmt = (
-                select(ProjectModel)
-                .options(selectinload(ProjectModel.project_type))
+                select(*ProjectCRUD.LIST_COLUMNS, sort_column.label("sort_value"))
+                .select_from(ProjectModel)
                 .join(
                     ProjectTypeModel,
                     ProjectModel.ProjectType_FK == ProjectTypeModel.TypeID,
                     isouter=True
                 )
-                .order_by(ProjectModel.ProjectID.desc())
-                .offset(offset)
-                .limit(page_size)
+                .order_by(*order_by)
+                .limit(page_size + 1)
             )
             
+            if after:
+                cursor = decode_cursor(after, sort_by, sort_order, cursor_keyword)
+                stmt = stmt.where(
+                    build_keyset_condition(
+                        sort_column,
+                        ProjectModel.ProjectID,
+                        parse_optional_value(cursor["value"], value_parser),
+                        cursor["id"],
+                        descending=descending,
+                        nullable=nullable,
+                    )
+                )
+            else:
+                stmt = stmt.offset((page - 1) * page_size)
+            
             if conditions:
                 stmt = stmt.where(and_(*conditions))
             
             result = await db.execute(stmt)
-            projects = result.scalars().all()
+            keys = list(result.keys())
+            rows = [dict(zip(keys, row)) for row in result.all()]
+            projects = rows[:page_size]
+            
+            next_cursor = None
+            if len(rows) > page_size:
+                last = rows[page_size - 1]
+                next_cursor = encode_cursor(
+                    sort_by, sort_order, last["sort_value"], last["ProjectID"], cursor_keyword
+                )
             
-            logger.info(f"queryresult: total={total}, returned={len(projects)}, projectIDs={[p.ProjectID for p in projects]}")
+            logger.info(f"queryresult: total={total}, returned={len(projects)}")
             
-            return list(projects), total
+            return projects, total, next_cursor
             
         except Exception as e:
             logger.error(f"分页queryprojectfailed: {e}")
             raise
     
+    @staticmethod
+    async def get_facet_counts(
+        db: AsyncSession,
+        project_type: Optional[str] = None,
+        formulator: Optional[str] = None,
+        date_start: Optional[date] = None,
+        date_end: Optional[date] = None,
+        keyword: Optional[str] = None,
+        has_compositions: Optional[bool] = None,
+        has_test_results: Optional[bool] = None,
+        test_field: Optional[str] = None,
+        test_min: Optional[float] = None,
+        test_max: Optional[float] = None,
+        test_unit: Optional[str] = None
+    ) -> dict:
+        """
+        分面统计：在当前筛选条件下按项目类型、配方设计师、月份分组计数
+        使用 GROUPING SETS 一次查询得到全部分面及总数
+        
+        Returns:
+            {"types": [(类型名, 数量)], "formulators": [...], "months": [...], "total": 总数}
+        """
+        try:
+            conditions = ProjectCRUD._build_list_conditions(
+                project_type=project_type,
+                formulator=formulator,
+                date_start=date_start,
+                date_end=date_end,
+                keyword=keyword,
+                has_compositions=has_compositions,
+                has_test_results=has_test_results,
+                test_field=test_field,
+                test_min=test_min,
+                test_max=test_max,
+                test_unit=test_unit,
+            )
+            
+            type_col = ProjectTypeModel.TypeName
+            formulator_col = ProjectModel.FormulatorName
+            # 格式串用字面量，保证 SELECT 与 GROUP BY 中的表达式完全一致
+            month_col = func.to_char(
+                ProjectModel.FormulationDate, literal_column("'YYYY-MM'")
+            )
+            
+            stmt = (
+                select(
+                    type_col,
+                    formulator_col,
+                    month_col.label("month"),
+                    func.grouping(type_col).label("g_type"),
+                    func.grouping(formulator_col).label("g_formulator"),
+                    func.grouping(month_col).label("g_month"),
+                    func.count().label("cnt"),
+                )
+                .select_from(ProjectModel)
+                .join(
+                    ProjectTypeModel,
+                    ProjectModel.ProjectType_FK == ProjectTypeModel.TypeID,
+                    isouter=True
+                )
+                .group_by(
+                    func.grouping_sets(
+                        tuple_(type_col),
+                        tuple_(formulator_col),
+                        tuple_(month_col),
+                        tuple_(),
+                    )
+                )
+            )
+            if conditions:
+                stmt = stmt.where(and_(*conditions))
+            
+            result = await db.execute(stmt)
+            
+            facets = {"types": [], "formulators": [], "months": [], "total": 0}
+            for row in result.all():
+                if not row.g_type:
+                    facets["types"].append((row.TypeName, row.cnt))
+                elif not row.g_formulator:
+                    facets["formulators"].append((row.FormulatorName, row.cnt))
+                elif not row.g_month:
+                    facets["months"].append((row.month, row.cnt))
+                else:
+                    facets["total"] = row.cnt
+            
+            # 类型、设计师按数量降序；月份按时间倒序
+            facets["types"].sort(key=lambda item: (-item[1], item[0] or ""))
+            facets["formulators"].sort(key=lambda item: (-item[1], item[0] or ""))
+            facets["months"].sort(key=lambda item: item[0] or "", reverse=True)
+            return facets
+            
+        except Exception as e:
+            logger.error(f"project分面统计failed: {e}")
+            raise
+    
+    @staticmethod
+    def _build_list_conditions(
+        project_type: Optional[str] = None,
+        formulator: Optional[str] = None,
+        date_start: Optional[date] = None,
+        date_end: Optional[date] = None,
+        keyword: Optional[str] = None,
+        has_compositions: Optional[bool] = None,
+        has_test_results: Optional[bool] = None,
+        test_field: Optional[str] = None,
+        test_min: Optional[float] = None,
+        test_max: Optional[float] = None,
+        test_unit: Optional[str] = None
+    ) -> list:
+        """
+        构建项目列表筛选条件（列表、分面统计共用）
+        
+        注意: project_type 条件引用项目类型表，查询需外连接 ProjectTypeModel
+        
+        Raises:
+            ValidationException: 测试指标范围筛选的字段或单位无法识别，或未给出上下限
+        """
+        conditions = []
+        
+        if project_type:
+            # 关联项目类型表
+            conditions.append(ProjectTypeModel.TypeName == project_type)
+        
+        if formulator:
+            conditions.append(ProjectModel.FormulatorName == formulator)
+        
+        if date_start:
+            conditions.append(ProjectModel.FormulationDate >= date_start)
+        
+        if date_end:
+            conditions.append(ProjectModel.FormulationDate <= date_end)
+        
+        if keyword:
+            conditions.append(
+                keyword_condition(ProjectCRUD.KEYWORD_COLUMNS, keyword)
+            )
+        
+        # 筛选有配方成分 / 测试结果的项目（读取触发器维护的项目汇总表）
+        if has_compositions is not None:
+            conditions.append(
+                ProjectCRUD._summary_flag_condition(
+                    ProjectSummaryModel.HasCompositions, has_compositions
+                )
+            )
+        
+        if has_test_results is not None:
+            conditions.append(
+                ProjectCRUD._summary_flag_condition(
+                    ProjectSummaryModel.HasTestResults, has_test_results
+                )
+            )
+        
+        if test_field:
+            if test_min is None and test_max is None:
+                raise ValidationException(
+                    f"测试指标范围筛选需要 test_min 或 test_max: {test_field}", field="test_field"
+                )
+            conditions.append(
+                ProjectCRUD._test_value_condition(test_field, test_min, test_max, test_unit)
+            )
+        
+        return conditions
+    
+    @staticmethod
+    def _test_value_condition(
+        test_field: str,
+        test_min: Optional[float],
+        test_max: Optional[float],
+        test_unit: Optional[str]
+    ):
+        """
+        测试指标范围筛选条件
+        上下限先换算为该字段的标准单位，再比较解析数值列（"数值列, ProjectID_FK" 部分索引，
+        范围扫描只读索引即可得到项目ID）
+        """
+        table_name = TABLE_BY_FIELD.get(test_field)
+        if table_name is None:
+            raise ValidationException(f"不支持范围筛选的测试字段: {test_field}", field="test_field")
+        try:
+            bounds = [
+                None if bound is None else convert_to_unit(test_field, bound, test_unit)
+                for bound in (test_min, test_max)
+            ]
+        except ValueError:
+            raise ValidationException(
+                f"无法识别的单位: {test_unit}（{test_field} 的标准单位为 "
+                f"{FIELDS_BY_NAME[test_field].unit or '无'}）",
+                field="test_unit",
+            )
+        
+        model = TEST_RESULT_MODELS_BY_TABLE[table_name]
+        value_column = getattr(model, test_field + VALUE_SUFFIX)
+        value_conditions = [value_column.isnot(None)]
+        if bounds[0] is not None:
+            value_conditions.append(value_column >= bounds[0])
+        if bounds[1] is not None:
+            value_conditions.append(value_column <= bounds[1])
+        return ProjectModel.ProjectID.in_(
+            select(model.ProjectID_FK).where(*value_conditions)
+        )
+    
+    @staticmethod
+    def _summary_flag_condition(flag_column, expected: bool):
+        """
+        项目汇总标记筛选条件
+        EXISTS 按主键探测汇总行；缺少汇总行的项目视为标记为否
+        """
+        flagged = (
+            select(ProjectSummaryModel.ProjectID_FK)
+            .where(ProjectSummaryModel.ProjectID_FK == ProjectModel.ProjectID)
+            .where(flag_column.is_(True))
+            .exists()
+        )
+        return flagged if expected else ~flagged
+    
     @staticmethod
     async def create_project(
         db: AsyncSession,
@@ -259,29 +582,163 @@ class ProjectCRUD:
             创建的项目对象
         """
         try:
-            # 生成配方编码
-            formula_code = await ProjectCRUD._generate_formula_code(
-                db, project_type_fk, formulator_name, formulation_date
+            stmt = ProjectCRUD._build_create_statement(
+                project_name=project_name,
+                project_type_fk=project_type_fk,
+                formulator_name=formulator_name,
+                formulation_date=formulation_date,
+                substrate_application=substrate_application
+            )
+            # 序号分配与项目插入在同一条语句中完成（一次往返）
+            result = await db.execute(select(ProjectModel).from_statement(stmt))
+            return result.scalar_one()
+            
+        except Exception as e:
+            logger.error(f"createprojectfailed: {e}")
+            raise
+    
+    @staticmethod
+    async def bulk_create(
+        db: AsyncSession,
+        projects: List[dict]
+    ) -> List[Tuple[int, str]]:
+        """
+        批量创建项目（集合式插入）
+        先按 (配方日期, 项目类型) 一次性预留整段序号，再用一条 INSERT ... SELECT FROM unnest(...) 插入全部项目
+        
+        Args:
+            db: 数据库会话
+            projects: 项目行数据，键为 ProjectName/ProjectType_FK/FormulatorName/
+                FormulationDate/SubstrateApplication
+        
+        Returns:
+            与输入顺序一致的 (ProjectID, FormulaCode) 列表
+        """
+        if not projects:
+            return []
+        try:
+            type_result = await db.execute(
+                select(ProjectTypeModel.TypeID, ProjectTypeModel.TypeCode)
             )
+            type_codes = dict(type_result.all())
             
-            project = ProjectModel(
-                ProjectName=project_name,
-                ProjectType_FK=project_type_fk,
-                SubstrateApplication=substrate_application,
-                FormulatorName=formulator_name,
-                FormulationDate=formulation_date,
-                FormulaCode=formula_code
+            counts = Counter(
+                (p["FormulationDate"], p["ProjectType_FK"]) for p in projects
             )
+            last_values = await ProjectCRUD._reserve_formula_sequences(db, counts)
+            next_values = {key: last_values[key] - n + 1 for key, n in counts.items()}
             
-            db.add(project)
-            await db.flush()
-            await db.refresh(project)
+            rows = []
+            for p in projects:
+                key = (p["FormulationDate"], p["ProjectType_FK"])
+                sequence_num = next_values[key]
+                next_values[key] += 1
+                prefix = ProjectCRUD._formula_code_prefix(p["FormulatorName"], p["FormulationDate"])
+                type_code = type_codes.get(p["ProjectType_FK"]) or "XXX"
+                rows.append({**p, "FormulaCode": f"{prefix}{type_code}-{sequence_num:02d}"})
             
-            return project
+            result = await db.execute(
+                insert(ProjectModel)
+                .from_select(
+                    PROJECT_BULK_COLUMNS,
+                    unnest_select(ProjectModel.__table__, PROJECT_BULK_COLUMNS, rows)
+                )
+                .returning(ProjectModel.FormulaCode, ProjectModel.ProjectID)
+            )
+            # FormulaCode 唯一，按编码对应回输入顺序（INSERT ... RETURNING 不保证顺序）
+            ids_by_code = dict(result.all())
+            return [(ids_by_code[row["FormulaCode"]], row["FormulaCode"]) for row in rows]
             
         except Exception as e:
-            logger.error(f"createprojectfailed: {e}")
+            logger.error(f"批量createprojectfailed: {e}")
             raise
+
+    @staticmethod
+    async def defer_summary_refresh(db: AsyncSession) -> None:
+        """
+        本事务内暂停项目汇总触发器
+
+        批量写入时成分与各类测试结果分别插入，每条语句的触发器都会重算一遍涉及的项目；
+        暂停后由调用方在提交前对写入的项目调用一次 refresh_summaries
+        """
+        await db.execute(select(func.set_config(SUMMARY_DEFER_SETTING, "on", True)))
+
+    @staticmethod
+    async def refresh_summaries(db: AsyncSession, project_ids: List[int]) -> None:
+        """
+        重算项目汇总行（一条语句处理全部项目）并恢复汇总触发器
+
+        Args:
+            db: 数据库会话
+            project_ids: 项目ID列表
+        """
+        await db.execute(
+            select(
+                func.fn_recompute_project_summary(
+                    bindparam("project_ids", project_ids, type_=ARRAY(Integer))
+                ),
+                func.set_config(SUMMARY_DEFER_SETTING, "off", True),
+            )
+        )
+
+    @staticmethod
+    async def _reserve_formula_sequences(
+        db: AsyncSession,
+        counts: Dict[Tuple[date, int], int]
+    ) -> Dict[Tuple[date, int], int]:
+        """
+        为每个 (配方日期, 项目类型) 预留 n 个连续序号
+        
+        Args:
+            db: 数据库会话
+            counts: {(配方日期, 项目类型ID): 需要的序号数量}
+        
+        Returns:
+            {(配方日期, 项目类型ID): 预留后的最大序号}，本次可用区间为 [最大序号-n+1, 最大序号]
+        """
+        # 固定加锁顺序，避免并发批量导入之间互相死锁
+        rows = [
+            {"FormulationDate": d, "ProjectType_FK": t, "LastValue": counts[(d, t)]}
+            for d, t in sorted(counts)
+        ]
+        columns = ["FormulationDate", "ProjectType_FK", "LastValue"]
+        stmt = pg_insert(FormulaCodeSequenceModel).from_select(
+            columns,
+            unnest_select(FormulaCodeSequenceModel.__table__, columns, rows)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                FormulaCodeSequenceModel.FormulationDate,
+                FormulaCodeSequenceModel.ProjectType_FK,
+            ],
+            set_={"LastValue": FormulaCodeSequenceModel.LastValue + stmt.excluded.LastValue}
+        ).returning(
+            FormulaCodeSequenceModel.FormulationDate,
+            FormulaCodeSequenceModel.ProjectType_FK,
+            FormulaCodeSequenceModel.LastValue,
+        )
+        result = await db.execute(stmt)
+        return {(d, t): last_value for d, t, last_value in result.all()}
+    
+    @staticmethod
+    async def lock_for_update(
+        db: AsyncSession,
+        project_id: int
+    ) -> bool:
+        """
+        锁定项目行（FOR NO KEY UPDATE，不阻塞引用该项目的外键插入），
+        用于串行化同一项目的整体修改
+        
+        Returns:
+            项目是否存在
+        """
+        stmt = (
+            select(ProjectModel.ProjectID)
+            .where(ProjectModel.ProjectID == project_id)
+            .with_for_update(key_share=True)
+        )
+        result = await db.execute(stmt)
+        return result.scalar() is not None
     
     @staticmethod
     async def update_project(
@@ -367,59 +824,106 @@ class ProjectCRUD:
             raise
     
     @staticmethod
-    async def _generate_formula_code(
-        db: AsyncSession,
+    def _formula_code_prefix(formulator_name: str, formulation_date: date) -> str:
+        """
+        生成配方编码前缀: 设计师缩写-日期-
+        
+        Args:
+            formulator_name: 配方设计师
+            formulation_date: 配方设计日期
+        
+        Returns:
+            编码前缀，例如 "ZS-01012024-"
+        """
+        initials = "".join(c for c in formulator_name if c.isupper()) or formulator_name[:2].upper()
+        date_str = formulation_date.strftime('%d%m%Y')
+        return f"{initials}-{date_str}-"
+    
+    @staticmethod
+    def _build_create_statement(
+        project_name: str,
         project_type_fk: int,
         formulator_name: str,
-        formulation_date: date
-    ) -> str:
+        formulation_date: date,
+        substrate_application: Optional[str] = None
+    ):
         """
-        生成配方编码
-        格式: 设计师缩写-日期-类型代码-序号
-        例如: ZS-01012024-INK-01
+        构造创建项目的单条语句
+        格式: 设计师缩写-日期-类型代码-序号，例如: ZS-01012024-INK-01
+        
+        WITH formula_seq AS (
+            INSERT INTO "tbl_FormulaCodeSequence" ... VALUES (日期, 类型, 1)
+            ON CONFLICT (日期, 类型) DO UPDATE SET "LastValue" = "LastValue" + 1
+            RETURNING "LastValue"
+        )
+        INSERT INTO "tbl_ProjectInfo" (...) SELECT ..., 前缀 || 类型代码 || '-' || 序号
+        FROM formula_seq RETURNING *
+        
+        序号行在事务提交前保持行锁：同一 (日期, 类型) 的并发创建依次取号，
+        不同 (日期, 类型) 之间互不阻塞；事务回滚时序号一并回滚。
         
         Args:
-            db: 数据库会话
+            project_name: 项目名称
             project_type_fk: 项目类型ID
             formulator_name: 配方设计师
             formulation_date: 配方设计日期
+            substrate_application: 目标基材
         
         Returns:
-            配方编码
+            INSERT ... RETURNING 语句
         """
-        try:
-            # 获取类型代码
-            type_stmt = select(ProjectTypeModel.TypeCode).where(
-                ProjectTypeModel.TypeID == project_type_fk
-            )
-            type_result = await db.execute(type_stmt)
-            type_code = type_result.scalar() or "XXX"
-            
-            # 计算当天相同类型的序号
-            count_stmt = select(func.count(ProjectModel.ProjectID)).where(
-                and_(
-                    ProjectModel.FormulationDate == formulation_date,
-                    ProjectModel.ProjectType_FK == project_type_fk
-                )
+        prefix = ProjectCRUD._formula_code_prefix(formulator_name, formulation_date)
+        
+        seq_insert = pg_insert(FormulaCodeSequenceModel).values(
+            FormulationDate=formulation_date,
+            ProjectType_FK=project_type_fk,
+            LastValue=1
+        )
+        seq = seq_insert.on_conflict_do_update(
+            index_elements=[
+                FormulaCodeSequenceModel.FormulationDate,
+                FormulaCodeSequenceModel.ProjectType_FK,
+            ],
+            set_={"LastValue": FormulaCodeSequenceModel.LastValue + 1}
+        ).returning(FormulaCodeSequenceModel.LastValue).cte("formula_seq")
+        
+        type_code = (
+            select(ProjectTypeModel.TypeCode)
+            .where(ProjectTypeModel.TypeID == project_type_fk)
+            .scalar_subquery()
+        )
+        # 序号至少两位（01、02 ...），超过99时按实际位数输出
+        seq_text = cast(seq.c.LastValue, Text)
+        seq_str = func.lpad(seq_text, func.greatest(2, func.length(seq_text)), "0")
+        formula_code = (
+            literal(prefix, String)
+            + func.coalesce(type_code, "XXX")
+            + "-"
+            + seq_str
+        )
+        
+        return (
+            pg_insert(ProjectModel)
+            .from_select(
+                [
+                    "ProjectName",
+                    "ProjectType_FK",
+                    "SubstrateApplication",
+                    "FormulatorName",
+                    "FormulationDate",
+                    "FormulaCode",
+                ],
+                select(
+                    literal(project_name, String),
+                    literal(project_type_fk, Integer),
+                    literal(substrate_application, String),
+                    literal(formulator_name, String),
+                    literal(formulation_date, Date),
+                    formula_code,
+                ).select_from(seq)
             )
-            count_result = await db.execute(count_stmt)
-            sequence_num = (count_result.scalar() or 0) + 1
-            sequence_str = f"{sequence_num:02d}"
-            
-            # 生成设计师缩写
-            initials = "".join(c for c in formulator_name if c.isupper()) or formulator_name[:2].upper()
-            
-            # 生成日期字符串
-            date_str = formulation_date.strftime('%d%m%Y')
-            
-            # 组合配方编码
-            formula_code = f"{initials}-{date_str}-{type_code}-{sequence_str}"
-            
-            return formula_code
-            
-        except Exception as e:
-            logger.error(f"生成formula编码failed: {e}")
-            raise
+            .returning(ProjectModel)
+        )
 
 
 class ProjectTypeCRUD:
@@ -472,6 +976,7 @@ class CompositionCRUD:
                     joinedload(FormulaCompositionModel.filler)
                 )
                 .where(FormulaCompositionModel.ProjectID_FK == project_id)
+                .order_by(FormulaCompositionModel.CompositionID)
             )
             result = await db.execute(stmt)
             return list(result.scalars().all())
@@ -507,6 +1012,158 @@ class CompositionCRUD:
             logger.error(f"createformula成分failed: {e}")
             raise
     
+    @staticmethod
+    async def get_existing_reference_ids(
+        db: AsyncSession,
+        material_ids: List[int],
+        filler_ids: List[int]
+    ) -> Tuple[set, set]:
+        """
+        批量检查原料/填料ID是否存在（每类一次查询）
+        
+        Returns:
+            (存在的原料ID集合, 存在的填料ID集合)
+        """
+        existing_materials: set = set()
+        existing_fillers: set = set()
+        if material_ids:
+            result = await db.execute(
+                select(MaterialModel.MaterialID).where(
+                    MaterialModel.MaterialID.in_(set(material_ids))
+                )
+            )
+            existing_materials = set(result.scalars().all())
+        if filler_ids:
+            result = await db.execute(
+                select(FillerModel.FillerID).where(
+                    FillerModel.FillerID.in_(set(filler_ids))
+                )
+            )
+            existing_fillers = set(result.scalars().all())
+        return existing_materials, existing_fillers
+    
+    @staticmethod
+    async def bulk_create(
+        db: AsyncSession,
+        rows: List[dict]
+    ) -> int:
+        """
+        批量创建配方成分（unnest 数组展开为单条 INSERT，不逐行 flush/refresh）
+        
+        Args:
+            db: 数据库会话
+            rows: 行数据，键为 ProjectID_FK/MaterialID_FK/FillerID_FK/WeightPercentage/
+                AdditionMethod/Remarks
+        
+        Returns:
+            插入行数
+        """
+        if not rows:
+            return 0
+        try:
+            await db.execute(
+                insert(FormulaCompositionModel).from_select(
+                    COMPOSITION_BULK_COLUMNS,
+                    unnest_select(FormulaCompositionModel.__table__, COMPOSITION_BULK_COLUMNS, rows)
+                )
+            )
+            return len(rows)
+        except Exception as e:
+            logger.error(f"批量createformula成分failed: {e}")
+            raise
+    
+    @staticmethod
+    async def get_rows_by_project_id(
+        db: AsyncSession,
+        project_id: int
+    ) -> List[dict]:
+        """获取项目的配方成分列数据（不加载关联对象，用于差异计算）"""
+        try:
+            stmt = select(
+                *[FormulaCompositionModel.__table__.c[name] for name in ["CompositionID", *COMPOSITION_BULK_COLUMNS]]
+            ).where(
+                FormulaCompositionModel.ProjectID_FK == project_id
+            ).order_by(FormulaCompositionModel.CompositionID)
+            result = await db.execute(stmt)
+            return [dict(row) for row in result.mappings().all()]
+        except Exception as e:
+            logger.error(f"queryformula成分failed: {e}")
+            raise
+    
+    @staticmethod
+    async def bulk_update(
+        db: AsyncSession,
+        project_id: int,
+        rows: List[dict]
+    ) -> int:
+        """
+        批量更新配方成分
+        UPDATE ... SET ... FROM unnest(...) AS v WHERE CompositionID = v.CompositionID
+        
+        Args:
+            db: 数据库会话
+            project_id: 项目ID（只更新属于该项目的成分）
+            rows: 行数据，需包含 CompositionID 及全部 COMPOSITION_BULK_COLUMNS
+        
+        Returns:
+            更新行数
+        """
+        if not rows:
+            return 0
+        try:
+            table = FormulaCompositionModel.__table__
+            columns = ["CompositionID", *COMPOSITION_BULK_COLUMNS]
+            source = unnest_select(table, columns, rows).subquery("v")
+            stmt = (
+                update(table)
+                .where(table.c.CompositionID == source.c.CompositionID)
+                .where(table.c.ProjectID_FK == project_id)
+                .values({
+                    name: source.c[name]
+                    for name in COMPOSITION_BULK_COLUMNS
+                    if name != "ProjectID_FK"
+                })
+            )
+            result = await db.execute(stmt)
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"批量updateformula成分failed: {e}")
+            raise
+    
+    @staticmethod
+    async def bulk_delete(
+        db: AsyncSession,
+        project_id: int,
+        composition_ids: List[int]
+    ) -> int:
+        """
+        批量删除配方成分
+        DELETE ... WHERE CompositionID = ANY(:ids)
+        
+        Args:
+            db: 数据库会话
+            project_id: 项目ID（只删除属于该项目的成分）
+            composition_ids: 成分ID列表
+        
+        Returns:
+            删除行数
+        """
+        if not composition_ids:
+            return 0
+        try:
+            table = FormulaCompositionModel.__table__
+            stmt = delete(table).where(
+                table.c.ProjectID_FK == project_id,
+                table.c.CompositionID == any_(
+                    cast(bindparam("composition_ids", value=list(composition_ids)), ARRAY(Integer))
+                )
+            )
+            result = await db.execute(stmt)
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"批量deletedformula成分failed: {e}")
+            raise
+    
     @staticmethod
     async def update_composition(
         db: AsyncSession,
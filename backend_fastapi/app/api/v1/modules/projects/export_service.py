@@ -1,456 +1,949 @@
 # -*- coding: utf-8 -*-
 """
-项目导出服务（性能优化版本）
-解决 N+1 查询问题，使用流式导出
+项目导出服务（流式导出）
+
+- 在同一个 REPEATABLE READ 只读事务中完成整个导出，所有批次读取同一快照
+- 按主键 ProjectID 做键集分页（WHERE ProjectID > 上一批最大ID），每批耗时与导出进度无关
+- 每批只查询投影列：项目 + 类型名、配方成分 + 原料/填料名称、测试结果各一次
+- 测试结果按预先构建的列计划（TestResultPlan）格式化，行数据按位置读取
+- 文件编码由可插拔的写入器完成（见 app.utils.export_writers），内存占用只与批大小相关
+- 列式格式（parquet/arrow）输出带类型的宽表：重量百分比为数值、日期为日期类型，
+  每个测试属性单独一列，不做表格公式转义
+- 只导出项目基本信息（每个项目一行）时由数据库 COPY 直接生成 CSV，见 stream_header_csv
+- 并行导出按 ProjectID 区间分片，各分片在分片进程中用独立连接查询、生成行并编码，
+  所有连接导入同一个事务快照（pg_export_snapshot），见 stream_export_parallel
 """
 
-import csv
-import io
-from typing import AsyncGenerator, List, Dict, Any, Optional
-from datetime import datetime
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-
-from app.api.v1.modules.projects.model import ProjectModel, FormulaCompositionModel
-from app.api.v1.modules.projects.schema import ProjectQueryParams
-from app.api.v1.modules.test_results.model import (
+import asyncio
+import multiprocessing
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import aclosing, asynccontextmanager, suppress
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import ARRAY, Float, Integer, and_, any_, bindparam, cast, func, literal, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql import Select
+
+from app.api.v1.modules.projects.crud import ProjectCRUD
+from app.api.v1.modules.projects.model import (
+    ProjectModel,
+    ProjectTypeModel,
+    FormulaCompositionModel,
     TestResultInkModel,
     TestResultCoatingModel,
     TestResult3DPrintModel,
     TestResultCompositeModel,
 )
+from app.api.v1.modules.projects.schema import ProjectQueryParams
+from app.api.v1.modules.materials.model import MaterialModel
+from app.api.v1.modules.fillers.model import FillerModel
+from app.config.settings import settings
+from app.core.database import async_engine
 from app.utils.export_helper import ExportHelper
+from app.utils.connection_budget import ConnectionBudget
+from app.utils.export_spool import (
+    STATUS_FAILED,
+    ExportCancelledError,
+    ExportSpool,
+    SpoolWriter,
+    create_spool_file,
+)
+from app.utils.export_writers import (
+    ExportColumn,
+    ExportProgress,
+    ExportWriter,
+    ZipExportArchive,
+    get_export_writer,
+)
+from app.utils.measurements import DETAIL_COLUMNS, VALUE_COLUMNS
+from app.utils.pg_copy import export_columns, stream_copy_csv
 from app.core.logger import logger
 
 
-class ProjectExportService:
-    """项目导出服务（性能优化版）"""
+def _project_ids_param():
+    return cast(bindparam("project_ids"), ARRAY(Integer))
+
+
+# pg_export_snapshot() 返回的快照标识，如 00000003-0000001B-1
+_SNAPSHOT_ID_PATTERN = re.compile(r"^[0-9A-F]+-[0-9A-F]+(-[0-9]+)?$")
+
+
+# 项目批次查询列（build_project_rows 按位置读取，顺序需保持一致）
+PROJECT_EXPORT_COLUMNS = (
+    ProjectModel.ProjectID,
+    ProjectModel.ProjectName,
+    ProjectTypeModel.TypeName,
+    ProjectModel.FormulaCode,
+    ProjectModel.FormulatorName,
+    ProjectModel.FormulationDate,
+    ProjectModel.SubstrateApplication,
+)
+
+# 配方成分查询（同上，按位置读取）
+COMPOSITION_EXPORT_STATEMENT = (
+    select(
+        FormulaCompositionModel.ProjectID_FK,
+        FormulaCompositionModel.MaterialID_FK,
+        FormulaCompositionModel.WeightPercentage,
+        FormulaCompositionModel.AdditionMethod,
+        FormulaCompositionModel.Remarks,
+        MaterialModel.TradeName,
+        FillerModel.TradeName,
+    )
+    .select_from(FormulaCompositionModel)
+    .join(
+        MaterialModel,
+        FormulaCompositionModel.MaterialID_FK == MaterialModel.MaterialID,
+        isouter=True,
+    )
+    .join(
+        FillerModel,
+        FormulaCompositionModel.FillerID_FK == FillerModel.FillerID,
+        isouter=True,
+    )
+    .where(FormulaCompositionModel.ProjectID_FK == any_(_project_ids_param()))
+    .order_by(FormulaCompositionModel.ProjectID_FK, FormulaCompositionModel.CompositionID)
+)
+
+
+@dataclass(frozen=True)
+class TestResultPlan:
+    """
+    测试结果表的导出列计划
+    由模型的 mapper 列构建一次：确定输出字段（按名称排序）和对应的查询语句，
+    之后每行只需按位置与字段名配对
+    """
+
+    model: type
+    keys: Tuple[str, ...]
+    statement: Select
+    columns: Tuple[ExportColumn, ...] = ()  # 列式导出时每个字段的列定义
+
+    # 不导出的字段：主外键、解析单位/解析状态影子列
+    EXCLUDED_FIELDS = frozenset({"ResultID", "ProjectID_FK", *DETAIL_COLUMNS})
+
+    @classmethod
+    def from_model(cls, model: type) -> "TestResultPlan":
+        columns = sorted(
+            (
+                (key, column)
+                for key, column in model.__mapper__.columns.items()
+                if key not in cls.EXCLUDED_FIELDS
+            ),
+            key=lambda item: item[0],
+        )
+        table = model.__table__
+        statement = select(
+            table.c.ProjectID_FK, *[column for _, column in columns]
+        ).where(table.c.ProjectID_FK == any_(_project_ids_param()))
+        return cls(
+            model,
+            tuple(key for key, _ in columns),
+            statement,
+            tuple(ExportColumn.from_sql_column(key, column) for key, column in columns),
+        )
+
+    def format(self, values: Sequence[Any]) -> str:
+        """把一行测试结果格式化为 "字段=值; ..."（忽略空值，解析数值列只在列式导出中输出）"""
+        return "; ".join([
+            f"{key}={value}"
+            for key, value in zip(self.keys, values)
+            if value and key not in VALUE_COLUMNS
+        ])
+
+
+def merge_test_result_columns(
+    plans: Sequence[TestResultPlan],
+) -> Tuple[Tuple[ExportColumn, ...], Dict[type, Tuple[int, ...]]]:
+    """
+    合并各测试结果表的字段为列式导出的测试属性列
+
+    同名字段（TestDate、Notes 等）共用一列，类型取第一次出现时的定义。
+
+    Returns:
+        (测试属性列, {模型: 每个字段在测试属性列中的位置})
+    """
+    columns: List[ExportColumn] = []
+    positions: Dict[str, int] = {}
+    slots: Dict[type, Tuple[int, ...]] = {}
+    for plan in plans:
+        for column in plan.columns:
+            if column.name not in positions:
+                positions[column.name] = len(columns)
+                columns.append(column)
+        slots[plan.model] = tuple(positions[key] for key in plan.keys)
+    return tuple(columns), slots
 
-    # 导出限制常量
-    MAX_EXPORT_COUNT = 50000  # 最大导出数量
-    BATCH_SIZE = 100  # 每批处理的项目数
+
+class ProjectExportService:
+    """项目导出服务"""
+
+    BATCH_SIZE = 1000  # 每批处理的项目数
+    MIN_SHARD_PROJECTS = 5000  # 并行导出时每个分片至少包含的项目数，项目少时减少分片
+    PROGRESS_LOG_INTERVAL = 50  # 每隔多少批记录一次进度
+
+    HEADER_COLUMNS = [
+        "项目ID",
+        "项目名称",
+        "项目类型",
+        "配方编号",
+        "配方设计师",
+        "配方日期",
+        "目标基材",
+        "成分序号",
+        "成分类型",
+        "成分名称",
+        "重量百分比(%)",
+        "掺入方法",
+        "成分备注",
+        "总重量百分比(%)",
+        "测试数据",
+    ]
+
+    # 测试结果列计划（按顺序查找，取第一个命中的结果）
+    TEST_RESULT_PLANS = tuple(
+        TestResultPlan.from_model(model)
+        for model in (
+            TestResultInkModel,
+            TestResultCoatingModel,
+            TestResult3DPrintModel,
+            TestResultCompositeModel,
+        )
+    )
+
+    # 列式导出（parquet/arrow）的列：项目与成分字段 + 每个测试属性一列
+    TEST_RESULT_COLUMNS, TEST_RESULT_SLOTS = merge_test_result_columns(TEST_RESULT_PLANS)
+    TYPED_COLUMNS = (
+        ExportColumn("ProjectID", "int"),
+        ExportColumn("ProjectName", "str"),
+        ExportColumn("ProjectType", "str"),
+        ExportColumn("FormulaCode", "str"),
+        ExportColumn("FormulatorName", "str"),
+        ExportColumn("FormulationDate", "date"),
+        ExportColumn("SubstrateApplication", "str"),
+        ExportColumn("CompositionSeq", "int"),
+        ExportColumn("ComponentType", "str"),
+        ExportColumn("ComponentName", "str"),
+        ExportColumn("WeightPercentage", "float"),
+        ExportColumn("AdditionMethod", "str"),
+        ExportColumn("CompositionRemarks", "str"),
+        ExportColumn("TotalWeightPercentage", "float"),
+    ) + TEST_RESULT_COLUMNS
 
     @staticmethod
-    async def get_projects_with_relations_batch(
-        db: AsyncSession, query_params: ProjectQueryParams, offset: int, limit: int
-    ) -> List[ProjectModel]:
+    @asynccontextmanager
+    async def snapshot_connection(
+        snapshot_id: Optional[str] = None,
+    ) -> AsyncIterator[AsyncConnection]:
         """
-        批量获取项目及其关联数据（使用 selectinload 避免 N+1 问题）
+        打开一个 REPEATABLE READ 只读事务连接
+        事务内所有查询看到同一快照，导出期间的写入不会造成重复或遗漏
 
         Args:
-            db: 数据库会话
-            query_params: 查询参数
-            offset: 偏移量
-            limit: 限制数量
-
-        Returns:
-            项目列表（包含关联的配方成分数据）
+            snapshot_id: 其他连接 pg_export_snapshot() 导出的快照，传入时本事务使用同一快照
+                （导出该快照的事务在导入前需保持打开）
         """
-        # 构建基础查询
-        stmt = select(ProjectModel).options(
-            # 使用 selectinload 一次性加载所有关联数据
-            selectinload(ProjectModel.compositions).selectinload(
-                FormulaCompositionModel.material
-            ),
-            selectinload(ProjectModel.compositions).selectinload(
-                FormulaCompositionModel.filler
-            ),
-            selectinload(ProjectModel.project_type),
+        async with async_engine.connect() as conn:
+            conn = await conn.execution_options(
+                isolation_level="REPEATABLE READ", postgresql_readonly=True
+            )
+            async with conn.begin():
+                if snapshot_id is not None:
+                    if not _SNAPSHOT_ID_PATTERN.match(snapshot_id):
+                        raise ValueError(f"Invalid snapshot id: {snapshot_id!r}")
+                    # 必须是事务中的第一条语句，且不支持参数绑定
+                    await conn.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'"))
+                yield conn
+
+    @staticmethod
+    async def export_snapshot(conn: AsyncConnection) -> str:
+        """导出当前事务的快照标识，供并行导出的分片连接导入"""
+        return (await conn.execute(select(func.pg_export_snapshot()))).scalar_one()
+
+    @staticmethod
+    def build_conditions(query_params: ProjectQueryParams) -> list:
+        """导出筛选条件（与项目列表使用相同的筛选语义）"""
+        return ProjectCRUD._build_list_conditions(
+            project_type=query_params.project_type,
+            formulator=query_params.formulator,
+            date_start=query_params.date_start,
+            date_end=query_params.date_end,
+            keyword=query_params.keyword,
+            has_compositions=query_params.has_compositions,
+            has_test_results=query_params.has_test_results,
+            test_field=query_params.test_field,
+            test_min=query_params.test_min,
+            test_max=query_params.test_max,
+            test_unit=query_params.test_unit,
         )
 
-        # 应用筛选条件
-        if query_params.project_type:
-            stmt = stmt.join(ProjectModel.project_type).where(
-                ProjectModel.project_type.has(TypeName=query_params.project_type)
-            )
+    @staticmethod
+    def _project_query(stmt: Select, conditions: list) -> Select:
+        """项目查询的公共部分：外连接项目类型（筛选条件可能引用类型名）并应用筛选"""
+        stmt = stmt.select_from(ProjectModel).join(
+            ProjectTypeModel,
+            ProjectModel.ProjectType_FK == ProjectTypeModel.TypeID,
+            isouter=True,
+        )
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        return stmt
 
-        if query_params.formulator:
-            stmt = stmt.where(ProjectModel.FormulatorName == query_params.formulator)
+    @staticmethod
+    def build_header_query(query_params: ProjectQueryParams) -> Select:
+        """
+        项目基本信息导出查询（每个项目一行，列名与完整导出的前7列相同，按 ProjectID 升序）
+        """
+        columns = list(PROJECT_EXPORT_COLUMNS)
+        # 日期格式与完整导出一致（str(date)）
+        columns[5] = func.to_char(ProjectModel.FormulationDate, "YYYY-MM-DD")
+        stmt = select(*export_columns(
+            list(zip(columns, ProjectExportService.HEADER_COLUMNS))
+        )).order_by(ProjectModel.ProjectID)
+        return ProjectExportService._project_query(
+            stmt, ProjectExportService.build_conditions(query_params)
+        )
 
-        if query_params.keyword:
-            from sqlalchemy import or_
+    @staticmethod
+    def stream_header_csv(query_params: ProjectQueryParams) -> AsyncGenerator[bytes, None]:
+        """项目基本信息 CSV（数据库 COPY 生成，列名和公式注入防护在SQL中完成）"""
+        return stream_copy_csv(ProjectExportService.build_header_query(query_params))
 
-            keyword_filter = f"%{query_params.keyword}%"
-            stmt = stmt.where(
-                or_(
-                    ProjectModel.ProjectName.ilike(keyword_filter),
-                    ProjectModel.FormulaCode.ilike(keyword_filter),
-                    ProjectModel.SubstrateApplication.ilike(keyword_filter),
-                )
-            )
+    @staticmethod
+    async def count_projects(conn: AsyncConnection, conditions: list) -> int:
+        """统计符合筛选条件的项目数（在快照内执行，与导出结果一致）"""
+        stmt = ProjectExportService._project_query(
+            select(func.count(ProjectModel.ProjectID)), conditions
+        )
+        return (await conn.execute(stmt)).scalar_one()
 
-        # 排序并分页
-        stmt = stmt.order_by(ProjectModel.CreatedAt.desc())
-        stmt = stmt.offset(offset).limit(limit)
+    @staticmethod
+    async def get_shard_bounds(
+        conn: AsyncConnection, conditions: list, shards: int
+    ) -> List[Tuple[Optional[int], Optional[int]]]:
+        """
+        按 ProjectID 的分位数把符合条件的项目切分为项目数相近的区间
 
-        result = await db.execute(stmt)
-        return result.scalars().all()
+        Args:
+            conn: 快照连接
+            conditions: 筛选条件
+            shards: 分片数
+
+        Returns:
+            [(after_id, upper_id), ...]，区间为 (after_id, upper_id]，None 表示不限，按 ProjectID 升序
+        """
+        if shards <= 1:
+            return [(None, None)]
+        fractions = [index / shards for index in range(1, shards)]
+        stmt = ProjectExportService._project_query(
+            select(
+                func.percentile_disc(literal(fractions, ARRAY(Float)))
+                .within_group(ProjectModel.ProjectID)
+                .cast(ARRAY(Integer))
+            ),
+            conditions,
+        )
+        cut_points = (await conn.execute(stmt)).scalar_one()
+        # 无数据时为 NULL；项目很少时相邻分位数可能相同
+        cut_points = sorted({point for point in cut_points or () if point is not None})
+        lowers = [None] + cut_points
+        uppers = cut_points + [None]
+        return list(zip(lowers, uppers))
 
     @staticmethod
-    async def get_test_results_batch(
-        db: AsyncSession, project_ids: List[int]
-    ) -> Dict[int, Any]:
+    async def get_project_batch(
+        conn: AsyncConnection,
+        conditions: list,
+        after_id: Optional[int],
+        limit: int,
+        upper_id: Optional[int] = None,
+    ) -> List[Sequence[Any]]:
         """
-        批量获取测试结果（避免 N+1 问题）
+        键集分页获取一批项目（按 ProjectID 升序）
 
         Args:
-            db: 数据库会话
-            project_ids: 项目ID列表
+            conn: 快照连接
+            conditions: 筛选条件
+            after_id: 上一批最后一个项目ID，None 表示从头开始
+            limit: 批大小
+            upper_id: 分片的最大项目ID（含），None 表示不限
+
+        Returns:
+            项目行列表（列顺序见 PROJECT_EXPORT_COLUMNS）
+        """
+        stmt = ProjectExportService._project_query(
+            select(*PROJECT_EXPORT_COLUMNS), conditions
+        ).order_by(ProjectModel.ProjectID).limit(limit)
+        if after_id is not None:
+            stmt = stmt.where(ProjectModel.ProjectID > after_id)
+        if upper_id is not None:
+            stmt = stmt.where(ProjectModel.ProjectID <= upper_id)
+
+        result = await conn.execute(stmt)
+        return result.all()
+
+    @staticmethod
+    async def get_compositions_batch(
+        conn: AsyncConnection, project_ids: List[int]
+    ) -> Dict[int, List[Sequence[Any]]]:
+        """
+        批量获取配方成分（含原料/填料名称）
 
         Returns:
-            {project_id: test_result} 映射字典
+            {project_id: [成分行, ...]}，成分按 CompositionID 排序
         """
         if not project_ids:
             return {}
 
-        results_map = {}
+        result = await conn.execute(
+            COMPOSITION_EXPORT_STATEMENT, {"project_ids": project_ids}
+        )
+        compositions_map: Dict[int, List[Sequence[Any]]] = {}
+        for row in result:
+            compositions_map.setdefault(row[0], []).append(row)
+        return compositions_map
 
-        # 批量查询各类型测试结果
-        for model_class in [
-            TestResultInkModel,
-            TestResultCoatingModel,
-            TestResult3DPrintModel,
-            TestResultCompositeModel,
-        ]:
-            stmt = select(model_class).where(model_class.ProjectID_FK.in_(project_ids))
-            result = await db.execute(stmt)
-            test_results = result.scalars().all()
+    @staticmethod
+    async def get_test_result_rows_batch(
+        conn: AsyncConnection, project_ids: List[int]
+    ) -> Dict[int, Tuple[TestResultPlan, Sequence[Any]]]:
+        """
+        批量获取测试结果原始值
 
-            for tr in test_results:
-                project_id = tr.ProjectID_FK
-                if project_id not in results_map:
-                    results_map[project_id] = tr
+        Returns:
+            {project_id: (命中的列计划, 按 plan.keys 顺序排列的值)}
+        """
+        if not project_ids:
+            return {}
 
+        results_map: Dict[int, Tuple[TestResultPlan, Sequence[Any]]] = {}
+        for plan in ProjectExportService.TEST_RESULT_PLANS:
+            result = await conn.execute(plan.statement, {"project_ids": project_ids})
+            for row in result:
+                if row[0] not in results_map:
+                    results_map[row[0]] = (plan, row[1:])
         return results_map
 
     @staticmethod
-    async def stream_export_csv(
-        db: AsyncSession, query_params: ProjectQueryParams
-    ) -> AsyncGenerator[str, None]:
+    async def get_test_results_batch(
+        conn: AsyncConnection, project_ids: List[int]
+    ) -> Dict[int, str]:
+        """
+        批量获取测试结果，按列计划格式化为 "字段=值; ..." 字符串
+
+        Returns:
+            {project_id: 测试数据字符串}
+        """
+        rows_map = await ProjectExportService.get_test_result_rows_batch(conn, project_ids)
+        return {
+            project_id: plan.format(values)
+            for project_id, (plan, values) in rows_map.items()
+        }
+
+    @staticmethod
+    def build_project_rows(
+        project: Sequence[Any],
+        compositions: List[Sequence[Any]],
+        test_result_str: str,
+    ) -> List[List[Any]]:
         """
-        流式导出CSV（按批次处理，节省内存）
+        生成一个项目的导出行（每个成分一行，无成分时输出一行基本信息）
 
         Args:
-            db: 数据库会话
-            query_params: 查询参数
+            project: 项目行（PROJECT_EXPORT_COLUMNS）
+            compositions: 成分行（COMPOSITION_EXPORT_STATEMENT）
+            test_result_str: 测试数据字符串
 
-        Yields:
-            CSV行数据（字符串）
+        Returns:
+            已做表格公式注入防护的行列表
         """
-        # 添加 UTF-8 BOM
-        yield "\ufeff"
-
-        # 生成表头
-        header_cols = [
-            "项目ID",
-            "项目名称",
-            "项目类型",
-            "配方编号",
-            "配方设计师",
-            "配方日期",
-            "目标基材",
-            "成分序号",
-            "成分类型",
-            "成分名称",
-            "重量百分比(%)",
-            "掺入方法",
-            "成分备注",
-            "总重量百分比(%)",
-            "测试数据",
+        sanitize = ExportHelper.sanitize_spreadsheet_value
+        project_id, name, type_name, code, formulator, formulation_date, substrate = project
+        # 项目字段每个项目只处理一次，成分行复用
+        base = [
+            project_id,
+            sanitize(name),
+            sanitize(type_name),
+            sanitize(code),
+            sanitize(formulator),
+            str(formulation_date) if formulation_date else "",
+            sanitize(substrate),
         ]
+        test_result_str = sanitize(test_result_str)
+
+        if not compositions:
+            return [base + ["", "", "", "", "", "", "0.00", test_result_str]]
+
+        weights = [float(comp[2]) for comp in compositions]
+        total_weight = f"{sum(weights):.2f}"
+        rows = []
+        for idx, comp in enumerate(compositions):
+            _, material_id, _, addition_method, remarks, material_name, filler_name = comp
+            rows.append(base + [
+                idx + 1,
+                "原料" if material_id else "填料",
+                sanitize(material_name or filler_name),
+                weights[idx],
+                sanitize(addition_method),
+                sanitize(remarks),
+                total_weight if idx == 0 else "",
+                test_result_str if idx == 0 else "",
+            ])
+        return rows
+
+    @staticmethod
+    def build_typed_project_rows(
+        project: Sequence[Any],
+        compositions: List[Sequence[Any]],
+        test_result: Optional[Tuple[TestResultPlan, Sequence[Any]]],
+    ) -> List[List[Any]]:
+        """
+        生成一个项目的列式导出行（值保持原始类型，列顺序见 TYPED_COLUMNS）
 
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(header_cols)
-        yield output.getvalue()
-        output.close()
+        与文本格式不同，项目字段、合计重量和测试属性在每个成分行上都会重复，
+        便于按任意行直接筛选。
 
-        # 分批处理项目
-        offset = 0
+        Args:
+            project: 项目行（PROJECT_EXPORT_COLUMNS）
+            compositions: 成分行（COMPOSITION_EXPORT_STATEMENT）
+            test_result: get_test_result_rows_batch 返回的 (列计划, 值)，无测试结果时为 None
+        """
+        tests: List[Any] = [None] * len(ProjectExportService.TEST_RESULT_COLUMNS)
+        if test_result is not None:
+            plan, values = test_result
+            for slot, value in zip(ProjectExportService.TEST_RESULT_SLOTS[plan.model], values):
+                tests[slot] = value
+        base = list(project)
+
+        if not compositions:
+            return [base + [None, None, None, None, None, None, 0.0] + tests]
+
+        weights = [float(comp[2]) for comp in compositions]
+        total_weight = sum(weights)
+        rows = []
+        for idx, comp in enumerate(compositions):
+            _, material_id, _, addition_method, remarks, material_name, filler_name = comp
+            rows.append(base + [
+                idx + 1,
+                "原料" if material_id else "填料",
+                material_name or filler_name,
+                weights[idx],
+                addition_method,
+                remarks,
+                total_weight,
+            ] + tests)
+        return rows
+
+    @staticmethod
+    async def iter_range_rows(
+        conn: AsyncConnection,
+        conditions: list,
+        batch_size: int,
+        typed: bool = False,
+        progress: Optional[ExportProgress] = None,
+        after_id: Optional[int] = None,
+        upper_id: Optional[int] = None,
+        label: str = "",
+    ) -> AsyncGenerator[List[List[Any]], None]:
+        """
+        在已打开的快照连接上按批生成一个 ProjectID 区间 (after_id, upper_id] 的导出行
+
+        Args:
+            conn: 快照连接
+            conditions: 筛选条件
+            batch_size: 每批项目数
+            typed: True 时生成列式导出行（build_typed_project_rows），否则生成文本行
+            progress: 进度对象，每批后更新
+            after_id: 区间下界（不含），None 表示从头开始
+            upper_id: 区间上界（含），None 表示不限
+            label: 日志中的分片标识
+
+        Yields:
+            一批项目展开后的导出行
+        """
         total_exported = 0
+        batch_count = 0
 
-        while total_exported < ProjectExportService.MAX_EXPORT_COUNT:
-            # 批量获取项目及关联数据
-            projects = await ProjectExportService.get_projects_with_relations_batch(
-                db=db,
-                query_params=query_params,
-                offset=offset,
-                limit=ProjectExportService.BATCH_SIZE,
+        while True:
+            projects = await ProjectExportService.get_project_batch(
+                conn, conditions, after_id, batch_size, upper_id
             )
-
             if not projects:
-                break  # 没有更多数据
+                break
 
-            # 批量获取测试结果
-            project_ids = [p.ProjectID for p in projects]
-            test_results_map = await ProjectExportService.get_test_results_batch(
-                db, project_ids
+            project_ids = [p[0] for p in projects]
+            compositions_map = await ProjectExportService.get_compositions_batch(
+                conn, project_ids
             )
 
-            # 处理当前批次
-            output = io.StringIO()
-            writer = csv.writer(output)
-
-            for project in projects:
-                # 获取测试结果字符串
-                test_result_str = ""
-                if project.ProjectID in test_results_map:
-                    test_result = test_results_map[project.ProjectID]
-                    test_dict = {}
-                    for key in dir(test_result):
-                        if not key.startswith("_") and key not in [
-                            "ResultID",
-                            "ProjectID_FK",
-                            "metadata",
-                            "registry",
-                        ]:
-                            value = getattr(test_result, key, None)
-                            if value and not callable(value):
-                                test_dict[key] = value
-
-                    test_items = [f"{k}={v}" for k, v in test_dict.items() if v]
-                    test_result_str = "; ".join(test_items)
-
-                # 获取配方成分
-                compositions = project.compositions or []
-                total_weight = (
-                    sum(float(c.WeightPercentage) for c in compositions)
-                    if compositions
-                    else 0
+            rows = []
+            if typed:
+                test_rows_map = await ProjectExportService.get_test_result_rows_batch(
+                    conn, project_ids
                 )
-
-                if compositions:
-                    # 每个成分一行
-                    for idx, comp in enumerate(compositions):
-                        comp_type = "原料" if comp.MaterialID_FK else "填料"
-                        comp_name = ""
-                        if comp.material:
-                            comp_name = comp.material.TradeName
-                        elif comp.filler:
-                            comp_name = comp.filler.TradeName
-
-                        row = [
-                            project.ProjectID,
-                            project.ProjectName,
-                            project.project_type.TypeName
-                            if project.project_type
-                            else "",
-                            project.FormulaCode or "",
-                            project.FormulatorName or "",
-                            str(project.FormulationDate)
-                            if project.FormulationDate
-                            else "",
-                            project.SubstrateApplication or "",
-                            idx + 1,
-                            comp_type,
-                            comp_name,
-                            float(comp.WeightPercentage),
-                            comp.AdditionMethod or "",
-                            comp.Remarks or "",
-                            f"{total_weight:.2f}" if idx == 0 else "",
-                            test_result_str if idx == 0 else "",
-                        ]
-                        sanitized_row = [
-                            ExportHelper.sanitize_spreadsheet_value(value)
-                            for value in row
-                        ]
-                        writer.writerow(sanitized_row)
-                else:
-                    # 没有成分，输出项目基本信息
-                    row = [
-                        project.ProjectID,
-                        project.ProjectName,
-                        project.project_type.TypeName if project.project_type else "",
-                        project.FormulaCode or "",
-                        project.FormulatorName or "",
-                        str(project.FormulationDate) if project.FormulationDate else "",
-                        project.SubstrateApplication or "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "0.00",
-                        test_result_str,
-                    ]
-                    sanitized_row = [
-                        ExportHelper.sanitize_spreadsheet_value(value) for value in row
-                    ]
-                    writer.writerow(sanitized_row)
-
-            # 输出当前批次
-            yield output.getvalue()
-            output.close()
-
-            # 更新计数器
+                for project in projects:
+                    rows.extend(
+                        ProjectExportService.build_typed_project_rows(
+                            project,
+                            compositions_map.get(project[0], []),
+                            test_rows_map.get(project[0]),
+                        )
+                    )
+            else:
+                test_results_map = await ProjectExportService.get_test_results_batch(
+                    conn, project_ids
+                )
+                for project in projects:
+                    rows.extend(
+                        ProjectExportService.build_project_rows(
+                            project,
+                            compositions_map.get(project[0], []),
+                            test_results_map.get(project[0], ""),
+                        )
+                    )
+            if progress is not None:
+                progress.processed_items += len(projects)
+                progress.rows_written += len(rows)
+            yield rows
+
+            after_id = project_ids[-1]
             total_exported += len(projects)
-            offset += ProjectExportService.BATCH_SIZE
-
-            logger.info(f"Export progress: {total_exported} 个project")
+            batch_count += 1
+            if batch_count % ProjectExportService.PROGRESS_LOG_INTERVAL == 0:
+                logger.info(f"Export progress{label}: {total_exported} 个project")
 
-            # 如果本批次数据不足，说明已经到达末尾
-            if len(projects) < ProjectExportService.BATCH_SIZE:
+            if len(projects) < batch_size:
                 break
 
+        logger.info(f"Export finished{label}: {total_exported} 个project")
+
     @staticmethod
-    async def stream_export_txt(
-        db: AsyncSession, query_params: ProjectQueryParams
-    ) -> AsyncGenerator[str, None]:
+    async def iter_row_batches(
+        query_params: ProjectQueryParams,
+        batch_size: Optional[int] = None,
+        typed: bool = False,
+        progress: Optional[ExportProgress] = None,
+    ) -> AsyncGenerator[List[List[Any]], None]:
         """
-        流式导出TXT（按批次处理，节省内存）
+        按批生成导出行（整个导出在一个快照事务内完成）
 
         Args:
-            db: 数据库会话
             query_params: 查询参数
+            batch_size: 每批项目数，默认 BATCH_SIZE
+            typed: True 时生成列式导出行（build_typed_project_rows），否则生成文本行
+            progress: 进度对象，传入时先统计项目总数，并在每批后更新
 
         Yields:
-            TXT行数据（字符串）
+            一批项目展开后的导出行
         """
-        # 添加 UTF-8 BOM
-        yield "\ufeff"
-
-        # 生成表头
-        header_cols = [
-            "项目ID",
-            "项目名称",
-            "项目类型",
-            "配方编号",
-            "配方设计师",
-            "配方日期",
-            "目标基材",
-            "成分序号",
-            "成分类型",
-            "成分名称",
-            "重量百分比(%)",
-            "掺入方法",
-            "成分备注",
-            "总重量百分比(%)",
-            "测试数据",
-        ]
-        yield "\t".join(header_cols) + "\n"
+        batch_size = batch_size or ProjectExportService.BATCH_SIZE
+        conditions = ProjectExportService.build_conditions(query_params)
 
-        # 分批处理项目
-        offset = 0
-        total_exported = 0
-
-        while total_exported < ProjectExportService.MAX_EXPORT_COUNT:
-            # 批量获取项目及关联数据
-            projects = await ProjectExportService.get_projects_with_relations_batch(
-                db=db,
-                query_params=query_params,
-                offset=offset,
-                limit=ProjectExportService.BATCH_SIZE,
+        async with ProjectExportService.snapshot_connection() as conn:
+            if progress is not None:
+                progress.total_items = await ProjectExportService.count_projects(
+                    conn, conditions
+                )
+            rows_iter = ProjectExportService.iter_range_rows(
+                conn, conditions, batch_size, typed, progress
             )
+            async with aclosing(rows_iter):
+                async for rows in rows_iter:
+                    yield rows
 
-            if not projects:
-                break
+    @staticmethod
+    async def stream_export(
+        query_params: ProjectQueryParams,
+        writer_class: Type[ExportWriter],
+        progress: Optional[ExportProgress] = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        流式导出
 
-            # 批量获取测试结果
-            project_ids = [p.ProjectID for p in projects]
-            test_results_map = await ProjectExportService.get_test_results_batch(
-                db, project_ids
-            )
+        Args:
+            query_params: 查询参数
+            writer_class: 导出写入器（见 app.utils.export_writers.EXPORT_WRITERS）
+            progress: 进度对象（导出任务使用），可选
+
+        Yields:
+            文件数据块
+        """
+        typed = writer_class.columnar
+        writer = writer_class(
+            ProjectExportService.TYPED_COLUMNS if typed else ProjectExportService.HEADER_COLUMNS
+        )
+        yield writer.begin()
+
+        batches = ProjectExportService.iter_row_batches(
+            query_params, typed=typed, progress=progress
+        )
+        async with aclosing(batches):
+            async for rows in batches:
+                chunk = writer.write_rows(rows)
+                if chunk:
+                    yield chunk
+
+        tail = writer.finish()
+        if tail:
+            yield tail
+
+    @staticmethod
+    async def export_shard(task: "ExportShardTask") -> None:
+        """
+        执行一个并行导出分片（在分片进程中运行）：导入快照，查询、生成行并编码，写入分片缓冲文件
+
+        split 时编码为完整文件（表头 + 数据 + 文件尾），否则只编码数据行，由请求协程拼接表头。
+        异常写入缓冲文件，由请求协程抛出。
+        """
+        writer_class = get_export_writer(task.export_format)
+        typed = writer_class.columnar
+        writer = writer_class(
+            ProjectExportService.TYPED_COLUMNS if typed else ProjectExportService.HEADER_COLUMNS
+        )
+        spool = SpoolWriter(task.spool_path, task.max_bytes)
+        progress = ExportProgress()
+        try:
+            conditions = ProjectExportService.build_conditions(task.query_params)
+            async with ProjectExportService.snapshot_connection(task.snapshot_id) as conn:
+                spool.start()
+                if task.split:
+                    spool.write(writer.begin())
+                rows_iter = ProjectExportService.iter_range_rows(
+                    conn, conditions, task.batch_size, typed, progress,
+                    task.after_id, task.upper_id, label=task.label,
+                )
+                async with aclosing(rows_iter):
+                    async for rows in rows_iter:
+                        spool.write(
+                            writer.write_rows(rows), progress.processed_items, progress.rows_written
+                        )
+                if task.split:
+                    spool.write(writer.finish())
+            spool.finish()
+        except ExportCancelledError:
+            logger.info(f"Export shard cancelled{task.label}")
+        except Exception as exc:
+            spool.fail(exc)
+        finally:
+            spool.close()
+
+    @staticmethod
+    async def stream_export_parallel(
+        query_params: ProjectQueryParams,
+        writer_class: Type[ExportWriter],
+        shards: Optional[int] = None,
+        split: bool = False,
+        progress: Optional[ExportProgress] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        并行流式导出（按 ProjectID 区间分片，每个分片在分片进程中执行）
+
+        协调连接导出事务快照、统计项目数并按分位数切分区间；每个分片提交到分片进程池，
+        用独立连接导入同一快照后查询、生成行并编码，写入分片缓冲文件（见 app.utils.export_spool）。
+        请求协程只按分片顺序读出编码好的数据块，查询结果处理和编码不占用事件循环。
+
+        协调连接 + 分片连接从 export_connection_budget 申请：空闲额度不足时减少分片数，
+        不足两个（协调连接 + 一个分片）时排队等待。
+
+        Args:
+            query_params: 查询参数
+            writer_class: 导出写入器
+            shards: 分片数，默认 EXPORT_PARALLEL_SHARDS，不超过 EXPORT_PARALLEL_MAX_SHARDS；
+                项目少时按 MIN_SHARD_PROJECTS 减少分片
+            split: False 时按分片顺序拼接为一个文件（行顺序与 stream_export 相同，
+                仅支持 concatenable 的格式）；True 时每个分片单独编码为一个完整文件（各带表头），
+                打包为 ZIP 输出
+            progress: 进度对象，可选
+            batch_size: 每批项目数，默认 BATCH_SIZE
+
+        Yields:
+            文件数据块（split 时为 ZIP 数据块）
 
-            # 构建当前批次的TXT内容
-            batch_lines = []
-
-            for project in projects:
-                # 获取测试结果字符串
-                test_result_str = ""
-                if project.ProjectID in test_results_map:
-                    test_result = test_results_map[project.ProjectID]
-                    test_dict = {}
-                    for key in dir(test_result):
-                        if not key.startswith("_") and key not in [
-                            "ResultID",
-                            "ProjectID_FK",
-                            "metadata",
-                            "registry",
-                        ]:
-                            value = getattr(test_result, key, None)
-                            if value and not callable(value):
-                                test_dict[key] = value
-
-                    test_items = [f"{k}={v}" for k, v in test_dict.items() if v]
-                    test_result_str = "; ".join(test_items)
-
-                # 获取配方成分
-                compositions = project.compositions or []
-                total_weight = (
-                    sum(float(c.WeightPercentage) for c in compositions)
-                    if compositions
-                    else 0
+        Raises:
+            ValueError: 不可拼接的格式按顺序拼接导出
+            ExportSpoolFullError: 分片缓冲文件超过 EXPORT_SPOOL_MAX_BYTES
+        """
+        if not split and not writer_class.concatenable:
+            raise ValueError(f"{writer_class.format} 导出不能按分片拼接，请使用 split")
+        shards = min(shards or settings.EXPORT_PARALLEL_SHARDS, settings.EXPORT_PARALLEL_MAX_SHARDS)
+        batch_size = batch_size or ProjectExportService.BATCH_SIZE
+        conditions = ProjectExportService.build_conditions(query_params)
+
+        spools: List[ExportSpool] = []
+        futures: List[asyncio.Future] = []
+
+        async def check_shards() -> None:
+            """汇总各分片进度；任一分片失败时立即抛出其异常"""
+            items = rows = 0
+            for spool, future in zip(spools, futures):
+                status, shard_items, shard_rows = spool.state()
+                if status == STATUS_FAILED:
+                    raise await spool.error()
+                if future.done() and future.exception() is not None:
+                    raise future.exception()
+                items += shard_items
+                rows += shard_rows
+            if progress is not None:
+                progress.processed_items = items
+                progress.rows_written = rows
+
+        async with export_connection_budget.acquire(shards + 1, minimum=2) as granted:
+            try:
+                async with ProjectExportService.snapshot_connection() as coordinator:
+                    snapshot_id = await ProjectExportService.export_snapshot(coordinator)
+                    total = await ProjectExportService.count_projects(coordinator, conditions)
+                    if progress is not None:
+                        progress.total_items = total
+                    shard_count = max(
+                        1, min(granted - 1, total // ProjectExportService.MIN_SHARD_PROJECTS)
+                    )
+                    shard_bounds = await ProjectExportService.get_shard_bounds(
+                        coordinator, conditions, shard_count
+                    )
+                    executor = get_shard_executor()
+                    for index, (after_id, upper_id) in enumerate(shard_bounds):
+                        task = ExportShardTask(
+                            snapshot_id=snapshot_id,
+                            query_params=query_params,
+                            export_format=writer_class.format,
+                            after_id=after_id,
+                            upper_id=upper_id,
+                            split=split,
+                            batch_size=batch_size,
+                            spool_path=create_spool_file(),
+                            max_bytes=settings.EXPORT_SPOOL_MAX_BYTES // len(shard_bounds),
+                            label=f" [shard {index + 1}]",
+                        )
+                        future = asyncio.wrap_future(executor.submit(run_export_shard, task))
+                        futures.append(future)
+                        spools.append(ExportSpool(task.spool_path, future.done))
+                    # 导出快照的事务要保持到所有分片导入快照之后
+                    await asyncio.gather(*(spool.wait_started() for spool in spools))
+                logger.info(
+                    f"Parallel export started: {total} 个project, {len(shard_bounds)} 个分片"
+                    f"（申请到 {granted} 个连接）"
                 )
 
-                if compositions:
-                    for idx, comp in enumerate(compositions):
-                        comp_type = "原料" if comp.MaterialID_FK else "填料"
-                        comp_name = ""
-                        if comp.material:
-                            comp_name = comp.material.TradeName
-                        elif comp.filler:
-                            comp_name = comp.filler.TradeName
-
-                        row_data = [
-                            str(project.ProjectID),
-                            project.ProjectName,
-                            project.project_type.TypeName
-                            if project.project_type
-                            else "",
-                            project.FormulaCode or "",
-                            project.FormulatorName or "",
-                            str(project.FormulationDate)
-                            if project.FormulationDate
-                            else "",
-                            project.SubstrateApplication or "",
-                            str(idx + 1),
-                            comp_type,
-                            comp_name,
-                            str(float(comp.WeightPercentage)),
-                            comp.AdditionMethod or "",
-                            comp.Remarks or "",
-                            f"{total_weight:.2f}" if idx == 0 else "",
-                            test_result_str if idx == 0 else "",
-                        ]
-                        sanitized_row = [
-                            str(ExportHelper.sanitize_spreadsheet_value(value))
-                            for value in row_data
-                        ]
-                        batch_lines.append("\t".join(sanitized_row) + "\n")
+                if split:
+                    archive = ZipExportArchive()
+                    for index, spool in enumerate(spools):
+                        yield archive.open_entry(
+                            f"projects_export_part{index + 1:02d}.{writer_class.extension}",
+                            compress=not writer_class.compressed,
+                        )
+                        async for chunk in spool:
+                            data = archive.write(chunk)
+                            if data:
+                                yield data
+                            await check_shards()
+                        yield archive.close_entry()
+                    yield archive.finish()
                 else:
-                    row_data = [
-                        str(project.ProjectID),
-                        project.ProjectName,
-                        project.project_type.TypeName if project.project_type else "",
-                        project.FormulaCode or "",
-                        project.FormulatorName or "",
-                        str(project.FormulationDate) if project.FormulationDate else "",
-                        project.SubstrateApplication or "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
-                        "0.00",
-                        test_result_str,
-                    ]
-                    sanitized_row = [
-                        str(ExportHelper.sanitize_spreadsheet_value(value))
-                        for value in row_data
-                    ]
-                    batch_lines.append("\t".join(sanitized_row) + "\n")
-
-            # 输出当前批次
-            yield "".join(batch_lines)
-
-            # 更新计数器
-            total_exported += len(projects)
-            offset += ProjectExportService.BATCH_SIZE
+                    writer = writer_class(
+                        ProjectExportService.TYPED_COLUMNS
+                        if writer_class.columnar
+                        else ProjectExportService.HEADER_COLUMNS
+                    )
+                    yield writer.begin()
+                    for spool in spools:
+                        async for chunk in spool:
+                            yield chunk
+                            await check_shards()
+                    tail = writer.finish()
+                    if tail:
+                        yield tail
+                await check_shards()
+            finally:
+                # 通知未完成的分片停止，等分片进程释放连接后再归还额度
+                for spool in spools:
+                    spool.cancel()
+                if futures:
+                    with suppress(Exception):
+                        await asyncio.gather(*futures, return_exceptions=True)
+                if any(
+                    future.done() and not future.cancelled()
+                    and isinstance(future.exception(), BrokenProcessPool)
+                    for future in futures
+                ):
+                    logger.error("Export shard pool is broken, recreating on next export")
+                    shutdown_shard_executor()
+                for spool in spools:
+                    spool.discard()
+
+
+@dataclass(frozen=True)
+class ExportShardTask:
+    """并行导出的一个分片（提交到分片进程执行，字段需可 pickle）"""
+
+    snapshot_id: str
+    query_params: ProjectQueryParams
+    export_format: str
+    after_id: Optional[int]
+    upper_id: Optional[int]
+    split: bool
+    batch_size: int
+    spool_path: str
+    max_bytes: Optional[int] = None
+    label: str = ""
+
+
+def run_export_shard(task: ExportShardTask) -> None:
+    """分片进程入口：每个分片一个事件循环，结束时关闭本进程的数据库连接（连接绑定在事件循环上）"""
+
+    async def run() -> None:
+        try:
+            await ProjectExportService.export_shard(task)
+        finally:
+            await async_engine.dispose()
+
+    asyncio.run(run())
+
+
+# 并行导出的分片进程池（spawn 启动，进程复用，导入应用模块的开销只在首次使用时产生）；
+# 进程数与连接额度一致，额度内的分片不会在进程池中排队
+_shard_executor: Optional[ProcessPoolExecutor] = None
+
+# 所有并行导出共享的连接额度（协调连接 + 分片连接）
+export_connection_budget = ConnectionBudget(settings.EXPORT_PARALLEL_MAX_CONNECTIONS)
+
+
+def _shard_worker_count() -> int:
+    return max(1, settings.EXPORT_PARALLEL_MAX_CONNECTIONS - 1)
+
+
+def _shard_worker_pid() -> int:
+    """预热任务：分片进程导入本模块后返回进程ID"""
+    return os.getpid()
+
+
+def get_shard_executor() -> Executor:
+    """分片进程池（首次使用时创建）"""
+    global _shard_executor
+    if _shard_executor is None:
+        _shard_executor = ProcessPoolExecutor(
+            max_workers=_shard_worker_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _shard_executor
 
-            logger.info(f"Export progress: {total_exported} 个project")
 
-            if len(projects) < ProjectExportService.BATCH_SIZE:
-                break
+async def warm_up_shard_executor() -> None:
+    """拉起全部分片进程并导入应用模块，之后的并行导出不再承担进程启动开销"""
+    executor = get_shard_executor()
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*[
+        loop.run_in_executor(executor, _shard_worker_pid) for _ in range(_shard_worker_count())
+    ])
+
+
+def shutdown_shard_executor() -> None:
+    """关闭分片进程池（应用退出或进程池损坏时调用）"""
+    global _shard_executor
+    executor, _shard_executor = _shard_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -8,7 +8,7 @@ from datetime import datetime, date
 from typing import Optional, List
 from sqlalchemy import (
     String, Integer, DateTime, Date, Text, ForeignKey, 
-    Numeric, Boolean, UniqueConstraint
+    Numeric, Float, Boolean, UniqueConstraint, Index, text
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -53,7 +53,25 @@ class ProjectTypeModel(Base):
 class ProjectModel(Base):
     """项目基本信息表"""
     __tablename__ = "tbl_ProjectInfo"
-    __table_args__ = {'comment': '项目基本信息表'}
+    __table_args__ = (
+        # 列表排序 + 键集分页使用的复合索引（排序字段, 主键）
+        Index("idx_project_formulation_date_id", "FormulationDate", "ProjectID"),
+        Index("idx_project_name_id", "ProjectName", "ProjectID"),
+        # 关键词搜索使用的 pg_trgm 索引
+        Index(
+            "idx_project_name_trgm",
+            "ProjectName",
+            postgresql_using="gin",
+            postgresql_ops={"ProjectName": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_project_formula_code_trgm",
+            "FormulaCode",
+            postgresql_using="gin",
+            postgresql_ops={"FormulaCode": "gin_trgm_ops"},
+        ),
+        {'comment': '项目基本信息表'},
+    )
     
     ProjectID: Mapped[int] = mapped_column(
         Integer,
@@ -215,7 +233,40 @@ class FormulaCompositionModel(Base):
 class TestResultInkModel(Base):
     """测试结果表 - 喷墨"""
     __tablename__ = "tbl_TestResults_Ink"
-    __table_args__ = {'comment': '测试结果数据表-喷墨'}
+    __table_args__ = (
+        # 测量数值的部分索引：范围筛选走索引扫描，带上 ProjectID_FK 可只读索引（其他测试结果表相同）
+        Index(
+            "idx_ink_viscosity_value",
+            "Ink_Viscosity_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Ink_Viscosity_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_ink_reactivity_value",
+            "Ink_Reactivity_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Ink_Reactivity_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_ink_particlesize_value",
+            "Ink_ParticleSize_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Ink_ParticleSize_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_ink_surfacetension_value",
+            "Ink_SurfaceTension_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Ink_SurfaceTension_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_ink_colorvalue_value",
+            "Ink_ColorValue_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Ink_ColorValue_Value" IS NOT NULL'),
+        ),
+        {'comment': '测试结果数据表-喷墨'},
+    )
     
     ResultID: Mapped[int] = mapped_column(
         Integer,
@@ -268,6 +319,98 @@ class TestResultInkModel(Base):
         comment="流变学说明或文件"
     )
     
+    # ---------- 测量值解析结果（写入时由 app.utils.measurements 计算）----------
+    
+    Ink_Viscosity_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="粘度数值（cP）"
+    )
+    
+    Ink_Viscosity_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="粘度单位"
+    )
+    
+    Ink_Viscosity_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="粘度解析状态"
+    )
+    
+    Ink_Reactivity_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="反应活性/固化时间数值（s）"
+    )
+    
+    Ink_Reactivity_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="反应活性/固化时间单位"
+    )
+    
+    Ink_Reactivity_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="反应活性/固化时间解析状态"
+    )
+    
+    Ink_ParticleSize_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="粒径数值（nm）"
+    )
+    
+    Ink_ParticleSize_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="粒径单位"
+    )
+    
+    Ink_ParticleSize_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="粒径解析状态"
+    )
+    
+    Ink_SurfaceTension_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="表面张力数值（mN/m）"
+    )
+    
+    Ink_SurfaceTension_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="表面张力单位"
+    )
+    
+    Ink_SurfaceTension_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="表面张力解析状态"
+    )
+    
+    Ink_ColorValue_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="色度(L*)数值（Lab*）"
+    )
+    
+    Ink_ColorValue_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="色度(L*)单位"
+    )
+    
+    Ink_ColorValue_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="色度(L*)解析状态"
+    )
+    
     TestDate: Mapped[Optional[date]] = mapped_column(
         Date,
         nullable=True,
@@ -297,7 +440,39 @@ class TestResultInkModel(Base):
 class TestResultCoatingModel(Base):
     """测试结果表 - 涂层"""
     __tablename__ = "tbl_TestResults_Coating"
-    __table_args__ = {'comment': '测试结果数据表-涂层'}
+    __table_args__ = (
+        Index(
+            "idx_coating_adhesion_value",
+            "Coating_Adhesion_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Coating_Adhesion_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_coating_transparency_value",
+            "Coating_Transparency_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Coating_Transparency_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_coating_surfacehardness_value",
+            "Coating_SurfaceHardness_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Coating_SurfaceHardness_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_coating_chemicalresistance_value",
+            "Coating_ChemicalResistance_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Coating_ChemicalResistance_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_coating_costestimate_value",
+            "Coating_CostEstimate_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Coating_CostEstimate_Value" IS NOT NULL'),
+        ),
+        {'comment': '测试结果数据表-涂层'},
+    )
     
     ResultID: Mapped[int] = mapped_column(
         Integer,
@@ -344,6 +519,98 @@ class TestResultCoatingModel(Base):
         comment="成本估算(€/kg)"
     )
     
+    # ---------- 测量值解析结果（写入时由 app.utils.measurements 计算）----------
+    
+    Coating_Adhesion_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="附着力数值"
+    )
+    
+    Coating_Adhesion_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="附着力单位"
+    )
+    
+    Coating_Adhesion_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="附着力解析状态"
+    )
+    
+    Coating_Transparency_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="透明度数值（%）"
+    )
+    
+    Coating_Transparency_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="透明度单位"
+    )
+    
+    Coating_Transparency_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="透明度解析状态"
+    )
+    
+    Coating_SurfaceHardness_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="表面硬度数值（H）"
+    )
+    
+    Coating_SurfaceHardness_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="表面硬度单位"
+    )
+    
+    Coating_SurfaceHardness_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="表面硬度解析状态"
+    )
+    
+    Coating_ChemicalResistance_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="耐化学性数值"
+    )
+    
+    Coating_ChemicalResistance_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="耐化学性单位"
+    )
+    
+    Coating_ChemicalResistance_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="耐化学性解析状态"
+    )
+    
+    Coating_CostEstimate_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="成本估算数值（EUR/kg）"
+    )
+    
+    Coating_CostEstimate_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="成本估算单位"
+    )
+    
+    Coating_CostEstimate_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="成本估算解析状态"
+    )
+    
     TestDate: Mapped[Optional[date]] = mapped_column(
         Date,
         nullable=True,
@@ -373,7 +640,39 @@ class TestResultCoatingModel(Base):
 class TestResult3DPrintModel(Base):
     """测试结果表 - 3D打印"""
     __tablename__ = "tbl_TestResults_3DPrint"
-    __table_args__ = {'comment': '测试结果数据表-3D打印'}
+    __table_args__ = (
+        Index(
+            "idx_print3d_shrinkage_value",
+            "Print3D_Shrinkage_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Print3D_Shrinkage_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_print3d_youngsmodulus_value",
+            "Print3D_YoungsModulus_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Print3D_YoungsModulus_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_print3d_flexuralstrength_value",
+            "Print3D_FlexuralStrength_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Print3D_FlexuralStrength_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_print3d_shorehardness_value",
+            "Print3D_ShoreHardness_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Print3D_ShoreHardness_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_print3d_impactresistance_value",
+            "Print3D_ImpactResistance_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Print3D_ImpactResistance_Value" IS NOT NULL'),
+        ),
+        {'comment': '测试结果数据表-3D打印'},
+    )
     
     ResultID: Mapped[int] = mapped_column(
         Integer,
@@ -420,6 +719,98 @@ class TestResult3DPrintModel(Base):
         comment="抗冲击性"
     )
     
+    # ---------- 测量值解析结果（写入时由 app.utils.measurements 计算）----------
+    
+    Print3D_Shrinkage_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="收缩率数值（%）"
+    )
+    
+    Print3D_Shrinkage_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="收缩率单位"
+    )
+    
+    Print3D_Shrinkage_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="收缩率解析状态"
+    )
+    
+    Print3D_YoungsModulus_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="杨氏模量数值（MPa）"
+    )
+    
+    Print3D_YoungsModulus_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="杨氏模量单位"
+    )
+    
+    Print3D_YoungsModulus_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="杨氏模量解析状态"
+    )
+    
+    Print3D_FlexuralStrength_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="弯曲强度数值（MPa）"
+    )
+    
+    Print3D_FlexuralStrength_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="弯曲强度单位"
+    )
+    
+    Print3D_FlexuralStrength_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="弯曲强度解析状态"
+    )
+    
+    Print3D_ShoreHardness_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="邵氏硬度数值（Shore）"
+    )
+    
+    Print3D_ShoreHardness_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="邵氏硬度单位"
+    )
+    
+    Print3D_ShoreHardness_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="邵氏硬度解析状态"
+    )
+    
+    Print3D_ImpactResistance_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="抗冲击性数值（kJ/m^2）"
+    )
+    
+    Print3D_ImpactResistance_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="抗冲击性单位"
+    )
+    
+    Print3D_ImpactResistance_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="抗冲击性解析状态"
+    )
+    
     TestDate: Mapped[Optional[date]] = mapped_column(
         Date,
         nullable=True,
@@ -449,7 +840,39 @@ class TestResult3DPrintModel(Base):
 class TestResultCompositeModel(Base):
     """测试结果表 - 复合材料"""
     __tablename__ = "tbl_TestResults_Composite"
-    __table_args__ = {'comment': '测试结果数据表-复合材料'}
+    __table_args__ = (
+        Index(
+            "idx_composite_flexuralstrength_value",
+            "Composite_FlexuralStrength_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Composite_FlexuralStrength_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_composite_youngsmodulus_value",
+            "Composite_YoungsModulus_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Composite_YoungsModulus_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_composite_impactresistance_value",
+            "Composite_ImpactResistance_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Composite_ImpactResistance_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_composite_conversionrate_value",
+            "Composite_ConversionRate_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Composite_ConversionRate_Value" IS NOT NULL'),
+        ),
+        Index(
+            "idx_composite_waterabsorption_value",
+            "Composite_WaterAbsorption_Value",
+            "ProjectID_FK",
+            postgresql_where=text('"Composite_WaterAbsorption_Value" IS NOT NULL'),
+        ),
+        {'comment': '测试结果数据表-复合材料'},
+    )
     
     ResultID: Mapped[int] = mapped_column(
         Integer,
@@ -496,6 +919,98 @@ class TestResultCompositeModel(Base):
         comment="吸水率/溶解度(可选)"
     )
     
+    # ---------- 测量值解析结果（写入时由 app.utils.measurements 计算）----------
+    
+    Composite_FlexuralStrength_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="弯曲强度数值（MPa）"
+    )
+    
+    Composite_FlexuralStrength_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="弯曲强度单位"
+    )
+    
+    Composite_FlexuralStrength_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="弯曲强度解析状态"
+    )
+    
+    Composite_YoungsModulus_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="杨氏模量数值（MPa）"
+    )
+    
+    Composite_YoungsModulus_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="杨氏模量单位"
+    )
+    
+    Composite_YoungsModulus_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="杨氏模量解析状态"
+    )
+    
+    Composite_ImpactResistance_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="抗冲击性数值（kJ/m^2）"
+    )
+    
+    Composite_ImpactResistance_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="抗冲击性单位"
+    )
+    
+    Composite_ImpactResistance_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="抗冲击性解析状态"
+    )
+    
+    Composite_ConversionRate_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="转化率数值（%）"
+    )
+    
+    Composite_ConversionRate_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="转化率单位"
+    )
+    
+    Composite_ConversionRate_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="转化率解析状态"
+    )
+    
+    Composite_WaterAbsorption_Value: Mapped[Optional[float]] = mapped_column(
+        Float,
+        nullable=True,
+        comment="吸水率数值（%）"
+    )
+    
+    Composite_WaterAbsorption_Unit: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="吸水率单位"
+    )
+    
+    Composite_WaterAbsorption_ParseStatus: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        nullable=True,
+        comment="吸水率解析状态"
+    )
+    
     TestDate: Mapped[Optional[date]] = mapped_column(
         Date,
         nullable=True,
@@ -520,3 +1035,116 @@ class TestResultCompositeModel(Base):
     #     comment="备用字段2"
     # )
 
+
+# ==================== 项目汇总表 ====================
+class ProjectSummaryModel(Base):
+    """
+    项目汇总表
+    每个项目一行，由数据库触发器维护（见 scripts/create_tables.py 与 Alembic 迁移），
+    用于列表的 has_compositions / has_test_results 筛选，避免多表反连接
+    """
+    __tablename__ = "tbl_ProjectSummary"
+    __table_args__ = (
+        # 部分索引：只收录满足条件的项目，供筛选和计数使用
+        Index(
+            "idx_project_summary_has_compositions",
+            "ProjectID_FK",
+            postgresql_where=text('"HasCompositions"'),
+        ),
+        Index(
+            "idx_project_summary_has_test_results",
+            "ProjectID_FK",
+            postgresql_where=text('"HasTestResults"'),
+        ),
+        {'comment': '项目汇总表（触发器维护）'},
+    )
+    
+    ProjectID_FK: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey('tbl_ProjectInfo.ProjectID', ondelete="CASCADE"),
+        primary_key=True,
+        comment="项目ID"
+    )
+    
+    CompositionCount: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+        comment="配方成分数量"
+    )
+    
+    TotalWeightPercentage: Mapped[float] = mapped_column(
+        Numeric(9, 4),
+        nullable=False,
+        server_default=text("0"),
+        comment="配方成分重量百分比合计"
+    )
+    
+    HasCompositions: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        server_default=text("false"),
+        comment="是否有配方成分"
+    )
+    
+    TestResultType: Mapped[Optional[str]] = mapped_column(
+        String(10),
+        nullable=True,
+        comment="已有测试结果的类型代码（INK/COAT/3DP/COMP）"
+    )
+    
+    HasTestResults: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        server_default=text("false"),
+        comment="是否有测试结果"
+    )
+    
+    LastTestDate: Mapped[Optional[date]] = mapped_column(
+        Date,
+        nullable=True,
+        comment="最近测试日期"
+    )
+    
+    UpdatedAt: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        server_default=text("CURRENT_TIMESTAMP"),
+        comment="汇总更新时间"
+    )
+    
+    def __repr__(self) -> str:
+        return f"<ProjectSummary {self.ProjectID_FK}>"
+
+
+class FormulaCodeSequenceModel(Base):
+    """
+    配方编码序号表
+    每个 (配方日期, 项目类型) 一行，记录已分配的最大序号；
+    创建项目时通过 INSERT ... ON CONFLICT DO UPDATE ... RETURNING 原子递增
+    """
+    __tablename__ = "tbl_FormulaCodeSequence"
+    __table_args__ = {'comment': '配方编码序号表'}
+    
+    FormulationDate: Mapped[date] = mapped_column(
+        Date,
+        primary_key=True,
+        comment="配方设计日期"
+    )
+    
+    ProjectType_FK: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey('tbl_Config_ProjectTypes.TypeID', ondelete="CASCADE"),
+        primary_key=True,
+        comment="项目类型ID"
+    )
+    
+    LastValue: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default=text("0"),
+        comment="已分配的最大序号"
+    )
+    
+    def __repr__(self) -> str:
+        return f"<FormulaCodeSequence {self.FormulationDate} {self.ProjectType_FK}: {self.LastValue}>"
@@ -0,0 +1,437 @@
+# -*- coding: utf-8 -*-
+"""
+项目报告图片服务
+
+- 组装报告输入（项目信息、配方成分、测试结果），与渲染进程池之间只传可 pickle 的普通数据
+- 渲染结果按输入内容寻址缓存（见 app.utils.report_cache）：输入和渲染设置不变时
+  直接返回缓存文件；缓存键同时作为 ETag，客户端带 If-None-Match 时无需读取文件
+- 同一缓存键的并发请求只渲染一次
+- 批量报告：按批读取项目、配方成分和测试结果（每批固定几次查询），
+  以渲染进程数为并发提交渲染，先完成的报告先写入流式 ZIP
+- 图表数据：成分柱状图和雷达图的数据以 JSON 返回由前端绘图，不经过渲染进程池
+"""
+
+import asyncio
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.modules.projects.crud import ProjectCRUD
+from app.api.v1.modules.projects.export_service import ProjectExportService
+from app.api.v1.modules.projects.model import ProjectModel
+from app.api.v1.modules.projects.schema import (
+    CompositionChartData,
+    ProjectChartDataResponse,
+    ProjectReportBatchRequest,
+    RadarChartData,
+)
+from app.api.v1.modules.test_results.service import TestResultService
+from app.config.settings import settings
+from app.core.custom_exceptions import (
+    RecordNotFoundException,
+    ServiceUnavailableException,
+    ValidationException,
+)
+from app.core.database import AsyncSessionLocal
+from app.core.logger import logger
+from app.utils.chart_data import RADAR_REFERENCE, composition_series, radar_series
+from app.utils.export_writers import ExportProgress, ZipExportArchive
+from app.utils.report_canvas import ReportProfile, get_report_profile
+from app.utils.report_cache import report_image_cache
+from app.utils.report_renderer import (
+    render_project_report,
+    render_settings,
+    report_render_pool,
+)
+
+# 报告中替换的特殊字符（报告字体不一定包含这些字形）
+TEST_RESULT_CHAR_REPLACEMENTS = {
+    "²": "^2",
+    "³": "^3",
+    "°": "deg",
+    "℃": "C",
+    "μ": "u",
+    "·": ".",
+    "～": "~",
+    "—": "-",
+}
+
+# 不在报告中展示的测试结果字段
+TEST_RESULT_EXCLUDED_FIELDS = ("ResultID", "ProjectID_FK", "TestDate", "Notes")
+
+# 批量报告：渲染进程池排队已满时的重试间隔（秒）和最多重试次数
+BATCH_BUSY_RETRY_SECONDS = 0.5
+BATCH_BUSY_MAX_RETRIES = 120
+
+# 批量报告 ZIP 中记录未找到/渲染失败项目的文件
+BATCH_ERRORS_FILE = "report_errors.txt"
+
+
+@dataclass(frozen=True)
+class ProjectReportInputs:
+    """渲染一个项目报告所需的全部输入（决定缓存键）"""
+
+    project_data: Dict[str, Any]
+    compositions: List[Dict[str, Any]]
+    test_results: Dict[str, Any]
+    project_type: str
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "project_data": self.project_data,
+            "compositions": self.compositions,
+            "test_results": self.test_results,
+            "project_type": self.project_type,
+        }
+
+
+@dataclass(frozen=True)
+class ProjectReportImage:
+    """渲染结果：content 为 None 时表示客户端缓存仍有效（304）"""
+
+    etag: str
+    content: Optional[bytes]
+    profile: ReportProfile
+    cached: bool = False
+
+
+class _RenderAbandoned(Exception):
+    """发起渲染的请求被取消，共用该渲染的等待者需要重新发起"""
+
+
+class ProjectReportService:
+    """项目报告图片服务类"""
+
+    # 正在渲染的缓存键 -> 渲染任务（同一报告的并发请求共用）
+    _inflight: Dict[str, "asyncio.Future[bytes]"] = {}
+
+    @staticmethod
+    def clean_test_results(values: Dict[str, Any]) -> Dict[str, Any]:
+        """测试结果转为报告数据：去掉内部字段，替换报告字体不支持的字符"""
+        test_results = {}
+        for key, value in values.items():
+            if key.startswith("_") or key in TEST_RESULT_EXCLUDED_FIELDS:
+                continue
+            if isinstance(value, str):
+                for old_char, new_char in TEST_RESULT_CHAR_REPLACEMENTS.items():
+                    value = value.replace(old_char, new_char)
+            test_results[key] = value
+        return test_results
+
+    @staticmethod
+    def to_inputs(project: ProjectModel, test_result: Any = None) -> ProjectReportInputs:
+        """项目对象（需预加载项目类型和配方成分）和测试结果响应转为报告输入"""
+        project_data = {
+            "ProjectID": project.ProjectID,
+            "ProjectName": project.ProjectName,
+            "TypeName": project.project_type.TypeName if project.project_type else "N/A",
+            "FormulaCode": project.FormulaCode,
+            "FormulatorName": project.FormulatorName,
+            "FormulationDate": project.FormulationDate,
+            "SubstrateApplication": project.SubstrateApplication,
+        }
+
+        compositions = [
+            {
+                "WeightPercentage": float(comp.WeightPercentage),
+                "MaterialName": comp.material.TradeName if comp.material else None,
+                "FillerName": comp.filler.TradeName if comp.filler else None,
+                "Remarks": comp.Remarks if comp.Remarks else "",
+            }
+            for comp in project.compositions or []
+        ]
+
+        test_results: Dict[str, Any] = {}
+        if test_result:
+            test_results = ProjectReportService.clean_test_results(test_result.__dict__)
+
+        return ProjectReportInputs(
+            project_data, compositions, test_results, project_data["TypeName"]
+        )
+
+    @staticmethod
+    async def build_inputs(db: AsyncSession, project_id: int) -> ProjectReportInputs:
+        """
+        读取项目、配方成分和测试结果，组装报告输入
+
+        Raises:
+            RecordNotFoundException: 项目不存在
+        """
+        project = await ProjectCRUD.get_by_id(db, project_id)
+        if not project:
+            raise RecordNotFoundException("Project", project_id)
+
+        test_result = None
+        if project.project_type:
+            try:
+                test_result = await TestResultService.get_test_result(db, project_id)
+            except Exception:
+                # 获取测试结果失败时继续生成图片，只是不包含测试结果
+                pass
+
+        return ProjectReportService.to_inputs(project, test_result)
+
+    @staticmethod
+    def cache_key(inputs: ProjectReportInputs, profile: ReportProfile) -> str:
+        """报告缓存键（输入 + 渲染档位设置的内容哈希），同时用作 ETag"""
+        return report_image_cache.make_key(inputs.as_dict(), render_settings(profile.name))
+
+    @staticmethod
+    async def render(inputs: ProjectReportInputs, key: str, profile: ReportProfile) -> bytes:
+        """
+        在渲染进程池中渲染并写入缓存（同一缓存键的并发请求只渲染一次）
+
+        发起渲染的请求被取消时只有它自己收到 CancelledError，等待同一渲染的请求重新发起渲染
+        """
+        inflight = ProjectReportService._inflight.get(key)
+        while inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except _RenderAbandoned:
+                inflight = ProjectReportService._inflight.get(key)
+
+        future: "asyncio.Future[bytes]" = asyncio.get_running_loop().create_future()
+        ProjectReportService._inflight[key] = future
+        try:
+            content = await report_render_pool.run(
+                render_project_report,
+                inputs.project_data,
+                inputs.compositions,
+                inputs.test_results,
+                inputs.project_type,
+                profile.name,
+            )
+            await report_image_cache.put(key, content)
+            future.set_result(content)
+            return content
+        except Exception as exc:
+            future.set_exception(exc)
+            # 没有其他等待者时避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                # 发起渲染的请求被取消：通知等待者重试，CancelledError 只在发起者中抛出
+                future.set_exception(_RenderAbandoned())
+                future.exception()
+            if ProjectReportService._inflight.get(key) is future:
+                del ProjectReportService._inflight[key]
+
+    @staticmethod
+    async def get_report_image(
+        db: AsyncSession,
+        project_id: int,
+        if_none_match: Optional[str] = None,
+        profile: Optional[str] = None,
+    ) -> ProjectReportImage:
+        """
+        获取项目报告图片
+
+        Args:
+            db: 数据库会话
+            project_id: 项目ID
+            if_none_match: 请求的 If-None-Match 头
+            profile: 渲染档位名称，None 为默认档位
+
+        Returns:
+            ProjectReportImage（ETag 命中时 content 为 None）
+
+        Raises:
+            ValidationException: 未知的渲染档位
+        """
+        report_profile = get_report_profile(profile)
+        inputs = await ProjectReportService.build_inputs(db, project_id)
+        key = ProjectReportService.cache_key(inputs, report_profile)
+        etag = f'"{key}"'
+        if report_image_cache.etag_matches(if_none_match, etag):
+            return ProjectReportImage(etag, None, report_profile, cached=True)
+
+        content = await report_image_cache.get(key)
+        if content is not None:
+            return ProjectReportImage(etag, content, report_profile, cached=True)
+
+        content = await ProjectReportService.render(inputs, key, report_profile)
+        return ProjectReportImage(etag, content, report_profile)
+
+    @staticmethod
+    def to_chart_data(inputs: ProjectReportInputs) -> ProjectChartDataResponse:
+        """报告输入转为图表数据（与服务端绘图使用相同的标准化刻度）"""
+        return ProjectChartDataResponse(
+            project_id=inputs.project_data["ProjectID"],
+            project_type=inputs.project_type,
+            radar=RadarChartData(
+                **radar_series(inputs.test_results, inputs.project_type),
+                reference=RADAR_REFERENCE,
+            ),
+            compositions=CompositionChartData(**composition_series(inputs.compositions)),
+        )
+
+    @staticmethod
+    async def get_chart_data(db: AsyncSession, project_id: int) -> ProjectChartDataResponse:
+        """
+        获取项目报告图表数据（成分柱状图、测试结果雷达图），由前端绘图，不经过渲染进程池
+
+        Raises:
+            RecordNotFoundException: 项目不存在
+        """
+        inputs = await ProjectReportService.build_inputs(db, project_id)
+        return ProjectReportService.to_chart_data(inputs)
+
+    # ==================== 批量报告 ====================
+
+    @staticmethod
+    async def resolve_batch_project_ids(
+        db: AsyncSession, request: ProjectReportBatchRequest
+    ) -> List[int]:
+        """
+        批量报告的项目ID（指定ID列表时按列表顺序，否则按筛选条件、ProjectID 升序）
+
+        Raises:
+            ValidationException: 项目数超过 REPORT_BATCH_MAX_PROJECTS
+        """
+        max_projects = settings.REPORT_BATCH_MAX_PROJECTS
+        if request.project_ids:
+            project_ids = request.project_ids
+        else:
+            stmt = ProjectExportService._project_query(
+                select(ProjectModel.ProjectID),
+                ProjectExportService.build_conditions(request),
+            ).order_by(ProjectModel.ProjectID).limit(max_projects + 1)
+            project_ids = list((await db.execute(stmt)).scalars().all())
+
+        if len(project_ids) > max_projects:
+            raise ValidationException(
+                f"单次最多导出 {max_projects} 个项目的报告，请缩小筛选范围",
+                details={"max_projects": max_projects},
+            )
+        return project_ids
+
+    @staticmethod
+    async def iter_batch_inputs(
+        project_ids: List[int], load_size: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, Optional[ProjectReportInputs]]]:
+        """
+        按批读取报告输入，依次产出 (项目ID, 报告输入)，项目不存在时报告输入为 None
+
+        每批使用独立的会话（项目 + 预加载 3 次查询，测试结果每种项目类型 1 次查询），
+        渲染期间不占用数据库连接。
+        """
+        load_size = max(1, load_size or settings.REPORT_BATCH_LOAD_SIZE)
+        for start in range(0, len(project_ids), load_size):
+            chunk = project_ids[start:start + load_size]
+            async with AsyncSessionLocal() as db:
+                projects = await ProjectCRUD.get_by_ids(db, chunk)
+                test_results = await TestResultService.get_test_results_by_projects(
+                    db,
+                    {
+                        project.ProjectID: project.project_type.TypeName
+                        for project in projects
+                        if project.project_type
+                    },
+                )
+                inputs = {
+                    project.ProjectID: ProjectReportService.to_inputs(
+                        project, test_results.get(project.ProjectID)
+                    )
+                    for project in projects
+                }
+            for project_id in chunk:
+                yield project_id, inputs.get(project_id)
+
+    @staticmethod
+    async def render_for_batch(inputs: ProjectReportInputs, profile: ReportProfile) -> bytes:
+        """
+        批量报告中的单个报告：先查缓存，未命中时渲染
+
+        渲染进程池排队已满时等待重试，不因单个报告请求占满队列而中断整个批量导出。
+        """
+        key = ProjectReportService.cache_key(inputs, profile)
+        content = await report_image_cache.get(key)
+        if content is not None:
+            return content
+        for _ in range(BATCH_BUSY_MAX_RETRIES):
+            try:
+                return await ProjectReportService.render(inputs, key, profile)
+            except ServiceUnavailableException:
+                await asyncio.sleep(BATCH_BUSY_RETRY_SECONDS)
+        return await ProjectReportService.render(inputs, key, profile)
+
+    @staticmethod
+    async def stream_report_zip(
+        request: ProjectReportBatchRequest,
+        progress: Optional[ExportProgress] = None,
+        project_ids: Optional[List[int]] = None,
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        批量报告 ZIP 流（每个项目一个 project_<ID>.<扩展名>，按完成顺序写入）
+
+        Args:
+            request: 项目ID列表或筛选条件
+            progress: 进度对象（导出任务使用），total_items 为项目数，每完成一个报告更新
+            project_ids: 已解析的项目ID（接口中提前校验数量时传入）
+            concurrency: 同时渲染的报告数，默认 REPORT_BATCH_CONCURRENCY
+
+        未找到或渲染失败的项目不中断导出，记录在 ZIP 末尾的 report_errors.txt 中。
+        """
+        if project_ids is None:
+            async with AsyncSessionLocal() as db:
+                project_ids = await ProjectReportService.resolve_batch_project_ids(db, request)
+        if progress is None:
+            progress = ExportProgress()
+        progress.total_items = len(project_ids)
+        profile = get_report_profile(request.profile)
+        concurrency = max(1, concurrency or settings.REPORT_BATCH_CONCURRENCY)
+
+        archive = ZipExportArchive()
+        errors: List[str] = []
+        pending: Dict["asyncio.Task[bytes]", int] = {}
+
+        def archive_done(done) -> bytes:
+            """已完成的渲染写入 ZIP，返回对应的 ZIP 数据"""
+            chunks = []
+            for task in done:
+                project_id = pending.pop(task)
+                progress.processed_items += 1
+                error = task.exception()
+                if error is not None:
+                    logger.error(f"Batch report for project {project_id} failed: {error}")
+                    errors.append(f"{project_id}\t{type(error).__name__}: {error}")
+                    continue
+                # 图片已压缩，按存储方式写入
+                chunks.append(archive.open_entry(
+                    f"project_{project_id}.{profile.extension}", compress=False
+                ))
+                chunks.append(archive.write(task.result()))
+                chunks.append(archive.close_entry())
+                progress.rows_written += 1
+            return b"".join(chunks)
+
+        try:
+            async with aclosing(ProjectReportService.iter_batch_inputs(project_ids)) as inputs_stream:
+                async for project_id, inputs in inputs_stream:
+                    if inputs is None:
+                        progress.processed_items += 1
+                        errors.append(f"{project_id}\tProject not found")
+                        continue
+                    task = asyncio.create_task(ProjectReportService.render_for_batch(inputs, profile))
+                    pending[task] = project_id
+                    if len(pending) >= concurrency:
+                        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        yield archive_done(done)
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                yield archive_done(done)
+
+            if errors:
+                yield archive.open_entry(BATCH_ERRORS_FILE)
+                yield archive.write(("\n".join(errors) + "\n").encode("utf-8"))
+                yield archive.close_entry()
+            yield archive.finish()
+        finally:
+            # 客户端断开或导出失败：不再等待尚未完成的渲染
+            for task in pending:
+                task.cancel()
@@ -5,11 +5,12 @@
 """
 
 from datetime import date
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from decimal import Decimal
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 from app.core.base_schema import BaseSchema, TimestampSchema
+from app.utils.report_canvas import REPORT_PROFILES
 
 
 # ==================== 项目类型Schema ====================
@@ -60,6 +61,38 @@ class ProjectQueryParams(BaseModel):
     keyword: Optional[str] = Field(None, description="关键词（项目名称或配方编码）")
     has_compositions: Optional[bool] = Field(None, description="是否有配方成分")
     has_test_results: Optional[bool] = Field(None, description="是否有测试结果")
+    test_field: Optional[str] = Field(None, description="测试指标范围筛选的字段（如 Ink_Viscosity）")
+    test_min: Optional[float] = Field(None, description="测试指标下限（含）")
+    test_max: Optional[float] = Field(None, description="测试指标上限（含）")
+    test_unit: Optional[str] = Field(None, description="上下限的单位（如 mPa·s），不传为该字段的标准单位")
+
+
+class ProjectReportBatchRequest(ProjectQueryParams):
+    """批量导出项目报告图片请求（指定项目ID列表，或按项目列表筛选条件选择项目）"""
+    project_ids: Optional[List[int]] = Field(
+        None, min_length=1, description="项目ID列表，指定时忽略其余筛选条件"
+    )
+    profile: Optional[str] = Field(None, description="渲染档位: thumbnail / screen / print，默认 screen")
+
+    @field_validator("project_ids")
+    @classmethod
+    def validate_project_ids(cls, v: Optional[List[int]]) -> Optional[List[int]]:
+        if v is None:
+            return v
+        if any(project_id <= 0 for project_id in v):
+            raise ValueError("项目ID必须为正整数")
+        # 去重并保持顺序
+        return list(dict.fromkeys(v))
+
+    @field_validator("profile")
+    @classmethod
+    def validate_profile(cls, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return v
+        v = v.strip().lower()
+        if v not in REPORT_PROFILES:
+            raise ValueError(f"渲染档位可选: {', '.join(REPORT_PROFILES)}")
+        return v
 
 
 # ==================== 项目响应Schema ====================
@@ -79,15 +112,97 @@ class ProjectBasicResponse(BaseSchema):
         from_attributes = True
 
 
+# 列表批量校验/序列化（一次调用处理整页，而非逐行 model_validate）
+PROJECT_LIST_ADAPTER = TypeAdapter(List[ProjectBasicResponse])
+
+
 class ProjectDetailResponse(ProjectBasicResponse):
     """项目详细信息响应（包含配方成分）"""
     compositions: List["CompositionResponse"] = Field(default=[], description="配方成分列表")
 
 
+# ==================== 分面统计Schema ====================
+class FacetBucket(BaseModel):
+    """分面统计项"""
+    value: Optional[str] = Field(None, description="分面取值（为空表示未设置）")
+    count: int = Field(..., description="项目数量")
+
+
+class ProjectFacetsResponse(BaseModel):
+    """项目分面统计响应"""
+    types: List[FacetBucket] = Field(default=[], description="按项目类型统计")
+    formulators: List[FacetBucket] = Field(default=[], description="按配方设计师统计")
+    months: List[FacetBucket] = Field(default=[], description="按配方月份(YYYY-MM)统计")
+    total: int = Field(0, description="符合当前筛选条件的项目总数")
+
+
+# ==================== 测试指标统计Schema ====================
+class PropertyStats(BaseModel):
+    """测试指标统计值（直方图区间见 PropertyAnalytics.bin_edges）"""
+    count: int = Field(0, description="有数值的测试结果数")
+    mean: Optional[float] = Field(None, description="均值")
+    std: Optional[float] = Field(None, description="样本标准差（少于2个值时为空）")
+    min: Optional[float] = Field(None, description="最小值")
+    max: Optional[float] = Field(None, description="最大值")
+    percentiles: Dict[str, float] = Field(default={}, description="分位数，如 p5 / p50 / p95")
+    histogram: List[int] = Field(default=[], description="直方图各区间的数量")
+
+
+class ProjectTypePropertyStats(PropertyStats):
+    """某一项目类型的测试指标统计"""
+    project_type: Optional[str] = Field(None, description="项目类型（为空表示未设置）")
+
+
+class PropertyAnalytics(BaseModel):
+    """一个测试指标的统计结果"""
+    field: str = Field(..., description="测试结果字段名")
+    label: str = Field(..., description="指标名称")
+    unit: str = Field("", description="标准单位（统计值均已换算为该单位）")
+    bin_edges: List[float] = Field(default=[], description="直方图区间边界（比区间数多1，最后一个区间包含右端点）")
+    overall: PropertyStats = Field(..., description="全部项目类型合计")
+    by_type: List[ProjectTypePropertyStats] = Field(default=[], description="按项目类型统计")
+
+
+class ProjectAnalyticsResponse(BaseModel):
+    """跨项目测试指标统计响应"""
+    total: int = Field(0, description="参与统计的测试结果数（符合筛选条件）")
+    bins: int = Field(..., description="直方图区间数")
+    percentiles: List[int] = Field(default=[], description="统计的分位点（百分数）")
+    properties: List[PropertyAnalytics] = Field(default=[], description="各指标统计")
+
+
+# ==================== 图表数据Schema ====================
+class RadarChartData(BaseModel):
+    """测试结果雷达图数据（各列表等长，按指标顺序排列）"""
+    fields: List[str] = Field(default=[], description="测试结果字段名")
+    names: List[str] = Field(default=[], description="指标名称")
+    units: List[str] = Field(default=[], description="单位")
+    min: List[float] = Field(default=[], description="行业标准下限")
+    max: List[float] = Field(default=[], description="行业标准上限")
+    measured: List[float] = Field(default=[], description="测试值（取测试结果中的第一个数字）")
+    values: List[float] = Field(default=[], description="按行业标准范围标准化后的值(0-100)")
+    reference: float = Field(..., description="参考线（标准化值）")
+
+
+class CompositionChartData(BaseModel):
+    """配方成分柱状图数据（各列表等长，按成分顺序排列）"""
+    names: List[str] = Field(default=[], description="成分名称")
+    kinds: List[str] = Field(default=[], description="成分类别: material / filler")
+    percentages: List[float] = Field(default=[], description="重量百分比(%)")
+    total: float = Field(0, description="总重量百分比(%)")
+
+
+class ProjectChartDataResponse(BaseModel):
+    """项目报告图表数据响应（供前端绘图）"""
+    project_id: int = Field(..., description="项目ID")
+    project_type: str = Field(..., description="项目类型")
+    radar: RadarChartData = Field(..., description="测试结果雷达图")
+    compositions: CompositionChartData = Field(..., description="配方成分柱状图")
+
+
 # ==================== 配方成分Schema ====================
-class CompositionCreateRequest(BaseModel):
-    """创建配方成分请求"""
-    project_id: int = Field(..., gt=0, description="项目ID")
+class CompositionItem(BaseModel):
+    """配方成分字段（创建请求与批量导入共用）"""
     material_id: Optional[int] = Field(None, gt=0, description="原料ID（必须大于0）")
     filler_id: Optional[int] = Field(None, gt=0, description="填料ID（必须大于0）")
     weight_percentage: Decimal = Field(
@@ -136,6 +251,11 @@ class CompositionCreateRequest(BaseModel):
         return v
 
 
+class CompositionCreateRequest(CompositionItem):
+    """创建配方成分请求"""
+    project_id: int = Field(..., gt=0, description="项目ID")
+
+
 class CompositionUpdateRequest(BaseModel):
     """更新配方成分请求"""
     material_id: Optional[int] = Field(None, gt=0, description="原料ID（必须大于0）")
@@ -165,6 +285,24 @@ class CompositionUpdateRequest(BaseModel):
         return v
 
 
+class CompositionReplaceItem(CompositionItem):
+    """整体替换配方成分时的单个目标成分"""
+    composition_id: Optional[int] = Field(
+        None,
+        gt=0,
+        description="已有成分ID；为空时按原料/填料匹配已有成分，未匹配则新增"
+    )
+
+
+class CompositionReplaceRequest(BaseModel):
+    """整体替换项目配方成分请求"""
+    compositions: List[CompositionReplaceItem] = Field(
+        default=[],
+        max_length=1000,
+        description="目标配方成分列表（未列出的已有成分将被删除）"
+    )
+
+
 class CompositionResponse(BaseSchema):
     """配方成分响应"""
     CompositionID: int = Field(..., description="成分ID", alias="CompositionID")
@@ -248,3 +386,45 @@ class BatchDeleteRequest(BaseModel):
     """批量删除请求"""
     ids: List[int] = Field(..., min_length=1, description="要删除的ID列表")
 
+
+# ==================== 批量导入Schema ====================
+class BulkProjectItem(ProjectCreateRequest):
+    """批量导入的单个项目（可包含配方成分与测试结果）"""
+    compositions: List[CompositionItem] = Field(default=[], description="配方成分列表")
+    test_result: Optional[Dict[str, Any]] = Field(
+        None,
+        description="测试结果，字段名与测试结果接口一致（如 Ink_Viscosity、TestDate），按项目类型写入对应表"
+    )
+
+
+# 批量导入项一次校验（错误的 loc 以项在列表中的位置开头）
+BULK_PROJECT_ITEMS_ADAPTER = TypeAdapter(List[BulkProjectItem])
+
+
+class BulkProjectCreateRequest(BaseModel):
+    """批量导入项目请求"""
+    items: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=10000,
+        description="项目列表，每项结构同 BulkProjectItem；逐项校验，无效项不影响其他项"
+    )
+
+
+class BulkItemResult(BaseModel):
+    """批量导入单项结果"""
+    index: int = Field(..., description="在请求 items 中的位置")
+    success: bool = Field(False, description="是否导入成功")
+    project_id: Optional[int] = Field(None, description="新项目ID")
+    formula_code: Optional[str] = Field(None, description="新项目配方编码")
+    compositions_created: int = Field(0, description="写入的配方成分数量")
+    test_result_created: bool = Field(False, description="是否写入测试结果")
+    error: Optional[str] = Field(None, description="失败原因")
+
+
+class BulkProjectCreateResponse(BaseModel):
+    """批量导入项目响应"""
+    total: int = Field(..., description="请求项目数")
+    created: int = Field(..., description="成功导入数")
+    failed: int = Field(..., description="失败数")
+    items: List[BulkItemResult] = Field(default=[], description="逐项结果")
@@ -4,7 +4,8 @@
 业务逻辑层 - 处理业务逻辑
 """
 
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import ValidationError as PydanticValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, DataError
 
@@ -18,14 +19,27 @@ from app.api.v1.modules.projects.schema import (
     ProjectUpdateRequest,
     ProjectQueryParams,
     ProjectBasicResponse,
+    PROJECT_LIST_ADAPTER,
     ProjectDetailResponse,
+    ProjectFacetsResponse,
+    FacetBucket,
     ProjectTypeResponse,
     CompositionCreateRequest,
     CompositionUpdateRequest,
     CompositionResponse,
-    BatchDeleteRequest
+    CompositionReplaceRequest,
+    BatchDeleteRequest,
+    BulkProjectItem,
+    BULK_PROJECT_ITEMS_ADAPTER,
+    BulkProjectCreateRequest,
+    BulkProjectCreateResponse,
+    BulkItemResult,
 )
+from app.api.v1.modules.test_results.crud import TestResultCRUD
+from app.api.v1.modules.test_results.schema import TEST_RESULT_REQUESTS
 from app.core.logger import logger
+from app.config.settings import settings
+from app.core.query_cache import make_cache_key, query_cache
 from app.core.custom_exceptions import (
     RecordNotFoundException,
     DuplicateRecordException,
@@ -44,8 +58,12 @@ class ProjectService:
         db: AsyncSession,
         page: int,
         page_size: int,
-        query_params: ProjectQueryParams
-    ) -> Tuple[List[ProjectBasicResponse], int]:
+        query_params: ProjectQueryParams,
+        sort_by: str = "ProjectID",
+        sort_order: str = "desc",
+        after: Optional[str] = None,
+        count_mode: Optional[str] = None
+    ) -> Tuple[List[ProjectBasicResponse], int, Optional[str]]:
         """
         获取项目列表（分页）
         
@@ -54,11 +72,15 @@ class ProjectService:
             page: 页码
             page_size: 每页数量
             query_params: 查询参数
+            sort_by: 排序字段
+            sort_order: 排序方向
+            after: 游标（传入时使用键集分页）
+            count_mode: 总数统计方式
         
         Returns:
-            (项目列表, 总数)
+            (项目列表, 总数, 下一页游标)
         """
-        projects, total = await ProjectCRUD.get_list_paginated(
+        projects, total, next_cursor = await ProjectCRUD.get_list_paginated(
             db=db,
             page=page,
             page_size=page_size,
@@ -68,21 +90,56 @@ class ProjectService:
             date_end=query_params.date_end,
             keyword=query_params.keyword,
             has_compositions=query_params.has_compositions,
-            has_test_results=query_params.has_test_results
+            has_test_results=query_params.has_test_results,
+            test_field=query_params.test_field,
+            test_min=query_params.test_min,
+            test_max=query_params.test_max,
+            test_unit=query_params.test_unit,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            after=after,
+            count_mode=count_mode
         )
         
-        # 转换为响应模型
-        project_list = []
-        for project in projects:
-            # 手动构建响应数据，包含关联的类型名称
-            project_data = ProjectBasicResponse.model_validate(project)
-            # 如果有关联的项目类型，添加类型名称
-            if project.project_type:
-                project_data.TypeName = project.project_type.TypeName
-            project_list.append(project_data)
+        # 整页批量转换为响应模型（行中已包含联表得到的 TypeName）
+        project_list = PROJECT_LIST_ADAPTER.validate_python(projects)
         
         logger.info(f"queryproject列表successful: page{page}, per page{page_size}items, total{total}items")
-        return project_list, total
+        return project_list, total, next_cursor
+    
+    @staticmethod
+    async def get_project_facets(
+        db: AsyncSession,
+        query_params: ProjectQueryParams
+    ) -> ProjectFacetsResponse:
+        """
+        获取项目分面统计（按筛选条件指纹缓存，项目相关写操作后失效）
+        
+        Args:
+            db: 数据库会话
+            query_params: 查询参数
+        
+        Returns:
+            分面统计结果
+        """
+        filters = query_params.model_dump()
+        cache_key = ("facets", make_cache_key(**filters))
+        cached = query_cache.get("projects", cache_key)
+        if cached is not None:
+            return cached
+        
+        generation = query_cache.generation("projects")
+        facets = await ProjectCRUD.get_facet_counts(db, **filters)
+        response = ProjectFacetsResponse(
+            types=[FacetBucket(value=v, count=c) for v, c in facets["types"]],
+            formulators=[FacetBucket(value=v, count=c) for v, c in facets["formulators"]],
+            months=[FacetBucket(value=v, count=c) for v, c in facets["months"]],
+            total=facets["total"],
+        )
+        query_cache.set_if_current(
+            "projects", cache_key, response, settings.PROJECT_FACETS_CACHE_TTL, generation
+        )
+        return response
     
     @staticmethod
     async def get_project_detail(
@@ -150,6 +207,7 @@ class ProjectService:
             )
             
             await db.commit()
+            query_cache.invalidate("projects")
             await db.refresh(project)
             
             logger.info(f"projectcreatesuccessful: {project.ProjectName} ({project.FormulaCode})")
@@ -219,6 +277,7 @@ class ProjectService:
         try:
             await ProjectCRUD.update_project(db, project_id, **update_data)
             await db.commit()
+            query_cache.invalidate("projects")
             
             logger.info(f"projectupdatesuccessful: ID {project_id}")
             
@@ -272,6 +331,7 @@ class ProjectService:
         try:
             await ProjectCRUD.delete_project(db, project_id)
             await db.commit()
+            query_cache.invalidate("projects")
             logger.info(f"projectdeletedsuccessful: ID {project_id}")
             return True
         except IntegrityError as e:
@@ -305,6 +365,7 @@ class ProjectService:
         try:
             count = await ProjectCRUD.batch_delete_projects(db, delete_data.ids)
             await db.commit()
+            query_cache.invalidate("projects")
             logger.info(f"batchdeletedprojectsuccessful: deleted{count}items")
             return count
         except IntegrityError as e:
@@ -320,6 +381,207 @@ class ProjectService:
                 message="Failed to batch delete projects due to database error"
             )
     
+    @staticmethod
+    async def bulk_create_projects(
+        db: AsyncSession,
+        request: BulkProjectCreateRequest
+    ) -> BulkProjectCreateResponse:
+        """
+        批量导入项目（含配方成分与测试结果）
+        
+        逐项校验后，所有有效项在同一事务中以集合式插入写入：
+        项目、配方成分、各类型测试结果各为一条 INSERT ... SELECT FROM unnest(...) 语句，
+        FormulaCode 序号按 (日期, 类型) 一次性预留。插入期间暂停汇总触发器，
+        提交前对新项目统一重算一次汇总。无效项在结果中标明原因，不影响其他项。
+        
+        Args:
+            db: 数据库会话
+            request: 批量导入请求
+        
+        Returns:
+            逐项导入结果
+        
+        Raises:
+            IntegrityConstraintException: 数据完整性约束违规（整批回滚）
+            DatabaseException: 数据库操作失败（整批回滚）
+        """
+        # 逐项结果先用字典累积，最后统一构造响应（避免数千个模型逐字段赋值校验）
+        results: List[Dict[str, Any]] = [{"index": i} for i in range(len(request.items))]
+        
+        parsed = ProjectService._validate_bulk_items(request.items, results)
+        
+        type_codes = {t.TypeID: t.TypeCode for t in await ProjectTypeCRUD.get_all(db)}
+        existing_materials, existing_fillers = await CompositionCRUD.get_existing_reference_ids(
+            db,
+            [c.material_id for _, item in parsed for c in item.compositions if c.material_id],
+            [c.filler_id for _, item in parsed for c in item.compositions if c.filler_id],
+        )
+        
+        valid: List[Tuple[int, BulkProjectItem, Optional[Dict[str, Any]]]] = []
+        for i, item in parsed:
+            try:
+                test_row = ProjectService._check_bulk_item(
+                    item, type_codes, existing_materials, existing_fillers
+                )
+            except ValueError as e:
+                results[i]["error"] = str(e)
+                continue
+            valid.append((i, item, test_row))
+        
+        if valid:
+            try:
+                await ProjectCRUD.defer_summary_refresh(db)
+                created = await ProjectCRUD.bulk_create(db, [
+                    {
+                        "ProjectName": item.project_name,
+                        "ProjectType_FK": item.project_type_fk,
+                        "SubstrateApplication": item.substrate_application,
+                        "FormulatorName": item.formulator_name,
+                        "FormulationDate": item.formulation_date,
+                    }
+                    for _, item, _ in valid
+                ])
+                
+                composition_rows = []
+                test_rows: Dict[type, List[dict]] = {}
+                for (i, item, test_row), (project_id, formula_code) in zip(valid, created):
+                    results[i].update(
+                        project_id=project_id,
+                        formula_code=formula_code,
+                        compositions_created=len(item.compositions),
+                    )
+                    composition_rows.extend(
+                        CompositionService._composition_row(project_id, comp)
+                        for comp in item.compositions
+                    )
+                    if test_row is not None:
+                        model = TestResultCRUD.get_model_by_type_code(type_codes[item.project_type_fk])
+                        test_rows.setdefault(model, []).append({**test_row, "ProjectID_FK": project_id})
+                        results[i]["test_result_created"] = True
+                
+                await CompositionCRUD.bulk_create(db, composition_rows)
+                for model, rows in test_rows.items():
+                    await TestResultCRUD.bulk_create(db, model, rows)
+                await ProjectCRUD.refresh_summaries(db, [project_id for project_id, _ in created])
+                
+                await db.commit()
+                query_cache.invalidate("projects")
+            except IntegrityError as e:
+                await db.rollback()
+                logger.warning(f"批量导入projectfailed - 数据完整性error: {e}")
+                raise IntegrityConstraintException(
+                    message="Bulk import violated a data constraint; no projects were created"
+                )
+            except DataError as e:
+                await db.rollback()
+                logger.warning(f"批量导入projectfailed - 数据格式error: {e}")
+                raise ValidationException(
+                    message="Invalid data format in bulk import; no projects were created"
+                )
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"批量导入projectfailed - 未知error: {type(e).__name__}: {e}", exc_info=True)
+                raise DatabaseException(
+                    message="Failed to bulk import projects due to database error"
+                )
+            
+            for i, _, _ in valid:
+                results[i]["success"] = True
+        
+        created_count = len(valid)
+        logger.info(
+            f"批量导入projectcompleted: {created_count} created, "
+            f"{len(results) - created_count} failed"
+        )
+        return BulkProjectCreateResponse(
+            total=len(results),
+            created=created_count,
+            failed=len(results) - created_count,
+            items=[BulkItemResult.model_construct(**r) for r in results],
+        )
+    
+    @staticmethod
+    def _check_bulk_item(
+        item: BulkProjectItem,
+        type_codes: Dict[int, str],
+        existing_materials: set,
+        existing_fillers: set
+    ) -> Optional[Dict[str, Any]]:
+        """
+        校验批量导入项的引用与测试结果
+        
+        Returns:
+            待写入的测试结果行（无测试结果时为 None）
+        
+        Raises:
+            ValueError: 校验失败（消息作为该项的错误原因）
+        """
+        if item.project_type_fk not in type_codes:
+            raise ValueError(f"Project type {item.project_type_fk} does not exist")
+        
+        for n, comp in enumerate(item.compositions):
+            if not comp.material_id and not comp.filler_id:
+                raise ValueError(
+                    f"compositions[{n}]: at least one of material_id or filler_id must be provided"
+                )
+            if comp.material_id and comp.material_id not in existing_materials:
+                raise ValueError(f"compositions[{n}]: material {comp.material_id} does not exist")
+            if comp.filler_id and comp.filler_id not in existing_fillers:
+                raise ValueError(f"compositions[{n}]: filler {comp.filler_id} does not exist")
+        
+        if not item.test_result:
+            return None
+        
+        request_schema = TEST_RESULT_REQUESTS.get(type_codes[item.project_type_fk])
+        if request_schema is None:
+            raise ValueError(
+                f"Project type {type_codes[item.project_type_fk]} does not support test results"
+            )
+        unknown = set(item.test_result) - set(request_schema.model_fields)
+        if unknown:
+            raise ValueError(f"test_result: unknown fields {sorted(unknown)}")
+        try:
+            return request_schema.model_validate(item.test_result).model_dump(exclude_unset=True)
+        except PydanticValidationError as e:
+            raise ValueError(f"test_result: {ProjectService._format_validation_error(e.errors())}")
+    
+    @staticmethod
+    def _validate_bulk_items(
+        items: List[Dict[str, Any]],
+        results: List[Dict[str, Any]]
+    ) -> List[Tuple[int, BulkProjectItem]]:
+        """
+        校验批量导入项（整个列表一次校验，不逐项调用 model_validate）
+        
+        有无效项时按错误位置把原因写入 results，其余项再一次校验。
+        
+        Returns:
+            有效项的 (位置, 项) 列表
+        """
+        indexes = list(range(len(items)))
+        while indexes:
+            try:
+                parsed = BULK_PROJECT_ITEMS_ADAPTER.validate_python([items[i] for i in indexes])
+                return list(zip(indexes, parsed))
+            except PydanticValidationError as e:
+                errors: Dict[int, List[Dict[str, Any]]] = {}
+                for err in e.errors():
+                    position, *loc = err["loc"]
+                    errors.setdefault(indexes[position], []).append({**err, "loc": tuple(loc)})
+                for i, item_errors in errors.items():
+                    results[i]["error"] = ProjectService._format_validation_error(item_errors)
+                indexes = [i for i in indexes if i not in errors]
+        return []
+    
+    @staticmethod
+    def _format_validation_error(errors: List[Dict[str, Any]]) -> str:
+        """将 Pydantic 校验错误（ValidationError.errors()）压缩为单行说明"""
+        parts = []
+        for err in errors:
+            loc = ".".join(str(x) for x in err.get("loc", ()))
+            parts.append(f"{loc}: {err.get('msg')}" if loc else str(err.get("msg")))
+        return "; ".join(parts)
+    
     @staticmethod
     async def get_project_types(
         db: AsyncSession
@@ -423,6 +685,7 @@ class CompositionService:
             )
             
             await db.commit()
+            query_cache.invalidate("projects")
             logger.info(f"formula成分createsuccessful: projectID {composition_data.project_id}")
             
             return CompositionResponse.model_validate(composition)
@@ -464,6 +727,7 @@ class CompositionService:
                 raise RecordNotFoundException("Composition", composition_id)
             
             await db.commit()
+            query_cache.invalidate("projects")
             await db.refresh(composition)
             logger.info(f"formula成分updatesuccessful: ID {composition_id}")
             
@@ -476,6 +740,164 @@ class CompositionService:
             logger.error(f"Failed to update composition: {e}")
             raise DatabaseException(f"Failed to update composition: {str(e)}")
     
+    @staticmethod
+    async def replace_compositions(
+        db: AsyncSession,
+        project_id: int,
+        replace_data: CompositionReplaceRequest
+    ) -> Tuple[List[CompositionResponse], Dict[str, int]]:
+        """
+        整体替换项目的配方成分
+        
+        服务端计算目标列表与现有成分的差异，在同一事务中执行
+        一条批量 DELETE、一条批量 UPDATE 和一条批量 INSERT。
+        目标成分先按 composition_id 对应已有成分，未指定ID时按 (原料, 填料) 匹配
+        尚未对应的已有成分，仍未匹配的作为新增；未被对应的已有成分被删除。
+        
+        Args:
+            db: 数据库会话
+            project_id: 项目ID
+            replace_data: 目标成分列表
+        
+        Returns:
+            (替换后的成分列表, {"created": n, "updated": n, "deleted": n, "unchanged": n})
+        
+        Raises:
+            RecordNotFoundException: 项目不存在
+            ValidationException: 成分数据无效
+        """
+        items = replace_data.compositions
+        for n, item in enumerate(items):
+            if not item.material_id and not item.filler_id:
+                raise ValidationException(
+                    f"compositions[{n}]: at least one of material_id or filler_id must be provided"
+                )
+        
+        try:
+            if not await ProjectCRUD.lock_for_update(db, project_id):
+                raise RecordNotFoundException("Project", project_id)
+            
+            existing_materials, existing_fillers = await CompositionCRUD.get_existing_reference_ids(
+                db,
+                [item.material_id for item in items if item.material_id],
+                [item.filler_id for item in items if item.filler_id],
+            )
+            for n, item in enumerate(items):
+                if item.material_id and item.material_id not in existing_materials:
+                    raise ValidationException(f"compositions[{n}]: material {item.material_id} does not exist")
+                if item.filler_id and item.filler_id not in existing_fillers:
+                    raise ValidationException(f"compositions[{n}]: filler {item.filler_id} does not exist")
+            
+            current = await CompositionCRUD.get_rows_by_project_id(db, project_id)
+            to_insert, to_update, to_delete, unchanged = CompositionService._diff_compositions(
+                project_id, current, items
+            )
+            
+            deleted = await CompositionCRUD.bulk_delete(db, project_id, to_delete)
+            updated = await CompositionCRUD.bulk_update(db, project_id, to_update)
+            created = await CompositionCRUD.bulk_create(db, to_insert)
+            
+            await db.commit()
+            if created or updated or deleted:
+                query_cache.invalidate("projects")
+            
+            stats = {"created": created, "updated": updated, "deleted": deleted, "unchanged": unchanged}
+            logger.info(f"formula成分replacesuccessful: projectID {project_id} {stats}")
+        except (RecordNotFoundException, ValidationException):
+            await db.rollback()
+            raise
+        except IntegrityError as e:
+            await db.rollback()
+            logger.warning(f"formula成分replacefailed - 数据完整性error: {e}")
+            raise IntegrityConstraintException(
+                message="Referenced material or filler does not exist or data constraint violated"
+            )
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Failed to replace compositions: {e}")
+            raise DatabaseException(f"Failed to replace compositions: {str(e)}")
+        
+        compositions = await CompositionService.get_compositions_by_project(db, project_id)
+        return compositions, stats
+    
+    @staticmethod
+    def _diff_compositions(
+        project_id: int,
+        current: List[dict],
+        items: list
+    ) -> Tuple[List[dict], List[dict], List[int], int]:
+        """
+        计算目标成分与现有成分的差异
+        
+        Args:
+            project_id: 项目ID
+            current: 现有成分行（get_rows_by_project_id 的结果）
+            items: 目标成分（CompositionReplaceItem 列表）
+        
+        Returns:
+            (待新增行, 待更新行, 待删除ID列表, 未变化数量)
+        
+        Raises:
+            ValidationException: composition_id 不属于该项目或重复出现
+        """
+        current_by_id = {row["CompositionID"]: row for row in current}
+        matched: Dict[int, Any] = {}
+        pending = []
+        
+        for n, item in enumerate(items):
+            if item.composition_id is None:
+                pending.append(item)
+                continue
+            if item.composition_id not in current_by_id:
+                raise ValidationException(
+                    f"compositions[{n}]: composition {item.composition_id} does not belong to project {project_id}"
+                )
+            if item.composition_id in matched:
+                raise ValidationException(
+                    f"compositions[{n}]: composition {item.composition_id} appears more than once"
+                )
+            matched[item.composition_id] = item
+        
+        # 未指定ID的目标成分按 (原料, 填料) 对应尚未匹配的已有成分
+        free_by_key: Dict[Tuple, List[int]] = {}
+        for row in current:
+            if row["CompositionID"] not in matched:
+                key = (row["MaterialID_FK"], row["FillerID_FK"])
+                free_by_key.setdefault(key, []).append(row["CompositionID"])
+        
+        to_insert = []
+        for item in pending:
+            free_ids = free_by_key.get((item.material_id, item.filler_id))
+            if free_ids:
+                matched[free_ids.pop(0)] = item
+            else:
+                to_insert.append(CompositionService._composition_row(project_id, item))
+        
+        to_update = []
+        unchanged = 0
+        for composition_id, item in matched.items():
+            row = CompositionService._composition_row(project_id, item)
+            old = current_by_id[composition_id]
+            if all(old[name] == value for name, value in row.items()):
+                unchanged += 1
+            else:
+                to_update.append({"CompositionID": composition_id, **row})
+        
+        to_delete = [cid for cid in current_by_id if cid not in matched]
+        return to_insert, to_update, to_delete, unchanged
+    
+    @staticmethod
+    def _composition_row(project_id: int, item) -> dict:
+        """目标成分 -> 表行数据"""
+        return {
+            "ProjectID_FK": project_id,
+            "MaterialID_FK": item.material_id,
+            "FillerID_FK": item.filler_id,
+            "WeightPercentage": item.weight_percentage,
+            "AdditionMethod": item.addition_method,
+            "Remarks": item.remarks,
+        }
+    
     @staticmethod
     async def delete_composition(
         db: AsyncSession,
@@ -497,6 +919,7 @@ class CompositionService:
                 raise RecordNotFoundException("Composition", composition_id)
             
             await db.commit()
+            query_cache.invalidate("projects")
             logger.info(f"formula成分deletedsuccessful: ID {composition_id}")
             return True
             
@@ -3,8 +3,8 @@
 测试结果管理CRUD操作
 """
 
-from typing import Optional, Union
-from sqlalchemy import select
+from typing import Any, Dict, List, Optional, Union
+from sqlalchemy import select, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.modules.projects.model import (
@@ -14,8 +14,18 @@ from app.api.v1.modules.projects.model import (
     TestResultCompositeModel
 )
 from app.core.logger import logger
+from app.utils.bulk_insert import unnest_select
+from app.utils.measurements import shadow_values
 
 
+# 项目类型代码 -> 测试结果表
+TEST_RESULT_MODELS: Dict[str, type] = {
+    "INK": TestResultInkModel,
+    "COAT": TestResultCoatingModel,
+    "3DP": TestResult3DPrintModel,
+    "COMP": TestResultCompositeModel,
+}
+
 class TestResultCRUD:
     """测试结果CRUD操作类"""
     
@@ -47,7 +57,7 @@ class TestResultCRUD:
         try:
             result = TestResultInkModel(
                 ProjectID_FK=project_id,
-                **kwargs
+                **TestResultCRUD.with_parsed_values(kwargs)
             )
             db.add(result)
             await db.flush()
@@ -69,7 +79,7 @@ class TestResultCRUD:
             if not result:
                 return False
             
-            for key, value in kwargs.items():
+            for key, value in TestResultCRUD.with_parsed_values(kwargs).items():
                 if hasattr(result, key):
                     setattr(result, key, value)
             
@@ -107,7 +117,7 @@ class TestResultCRUD:
         try:
             result = TestResultCoatingModel(
                 ProjectID_FK=project_id,
-                **kwargs
+                **TestResultCRUD.with_parsed_values(kwargs)
             )
             db.add(result)
             await db.flush()
@@ -129,7 +139,7 @@ class TestResultCRUD:
             if not result:
                 return False
             
-            for key, value in kwargs.items():
+            for key, value in TestResultCRUD.with_parsed_values(kwargs).items():
                 if hasattr(result, key):
                     setattr(result, key, value)
             
@@ -167,7 +177,7 @@ class TestResultCRUD:
         try:
             result = TestResult3DPrintModel(
                 ProjectID_FK=project_id,
-                **kwargs
+                **TestResultCRUD.with_parsed_values(kwargs)
             )
             db.add(result)
             await db.flush()
@@ -189,7 +199,7 @@ class TestResultCRUD:
             if not result:
                 return False
             
-            for key, value in kwargs.items():
+            for key, value in TestResultCRUD.with_parsed_values(kwargs).items():
                 if hasattr(result, key):
                     setattr(result, key, value)
             
@@ -227,7 +237,7 @@ class TestResultCRUD:
         try:
             result = TestResultCompositeModel(
                 ProjectID_FK=project_id,
-                **kwargs
+                **TestResultCRUD.with_parsed_values(kwargs)
             )
             db.add(result)
             await db.flush()
@@ -249,7 +259,7 @@ class TestResultCRUD:
             if not result:
                 return False
             
-            for key, value in kwargs.items():
+            for key, value in TestResultCRUD.with_parsed_values(kwargs).items():
                 if hasattr(result, key):
                     setattr(result, key, value)
             
@@ -261,6 +271,81 @@ class TestResultCRUD:
     
     # ==================== 通用方法 ====================
     
+    @staticmethod
+    def with_parsed_values(values: Dict[str, Any]) -> Dict[str, Any]:
+        """写入值加上其中测量字段的解析结果影子列（数值、单位、解析状态）"""
+        return {**values, **shadow_values(values)}
+    
+    @staticmethod
+    def get_model_by_type_code(type_code: Optional[str]) -> Optional[type]:
+        """根据项目类型代码（INK/COAT/3DP/COMP）获取测试结果表模型"""
+        return TEST_RESULT_MODELS.get((type_code or "").upper())
+    
+    @staticmethod
+    async def bulk_create(
+        db: AsyncSession,
+        model: type,
+        rows: List[dict]
+    ) -> int:
+        """
+        批量创建测试结果（unnest 数组展开为单条 INSERT，不逐行 flush/refresh）
+        测量字段的解析结果影子列随行一并写入
+        
+        Args:
+            db: 数据库会话
+            model: 测试结果表模型
+            rows: 行数据（列名 -> 值，需包含 ProjectID_FK）
+        
+        Returns:
+            插入行数
+        """
+        if not rows:
+            return 0
+        try:
+            rows = [TestResultCRUD.with_parsed_values(row) for row in rows]
+            columns = sorted({name for row in rows for name in row})
+            await db.execute(
+                insert(model).from_select(columns, unnest_select(model.__table__, columns, rows))
+            )
+            return len(rows)
+        except Exception as e:
+            logger.error(f"批量createtestresultfailed: {e}")
+            raise
+    
+    @staticmethod
+    def get_model_by_type_name(project_type: Optional[str]) -> Optional[type]:
+        """根据项目类型名称（支持中英文）获取测试结果表模型"""
+        if project_type in ["喷墨", "Inkjet"]:
+            return TestResultInkModel
+        elif project_type in ["涂层", "Coating"]:
+            return TestResultCoatingModel
+        elif project_type in ["3D打印", "3D Printing"]:
+            return TestResult3DPrintModel
+        elif project_type in ["复合材料", "Composite"]:
+            return TestResultCompositeModel
+        return None
+    
+    @staticmethod
+    async def get_results_by_project_ids(
+        db: AsyncSession,
+        model: type,
+        project_ids: List[int]
+    ) -> Dict[int, object]:
+        """
+        批量获取同一测试结果表中多个项目的测试结果
+        
+        Returns:
+            项目ID -> 测试结果对象
+        """
+        if not project_ids:
+            return {}
+        try:
+            result = await db.execute(select(model).where(model.ProjectID_FK.in_(project_ids)))
+            return {row.ProjectID_FK: row for row in result.scalars().all()}
+        except Exception as e:
+            logger.error(f"批量querytestresultfailed: {e}")
+            raise
+    
     @staticmethod
     async def get_result_by_project_type(
         db: AsyncSession,
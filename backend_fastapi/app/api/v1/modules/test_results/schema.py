@@ -3,7 +3,7 @@
 测试结果管理Schema
 """
 
-from typing import Optional
+from typing import Dict, Optional
 from datetime import date
 from pydantic import BaseModel, Field
 
@@ -57,6 +57,15 @@ class TestResultCompositeRequest(BaseModel):
     Notes: Optional[str] = Field(None, description="备注")
 
 
+# 项目类型代码 -> 测试结果请求Schema
+TEST_RESULT_REQUESTS: Dict[str, type] = {
+    "INK": TestResultInkRequest,
+    "COAT": TestResultCoatingRequest,
+    "3DP": TestResult3DPrintRequest,
+    "COMP": TestResultCompositeRequest,
+}
+
+
 # ==================== 测试结果响应Schema ====================
 
 class TestResultInkResponse(BaseSchema):
@@ -64,10 +73,15 @@ class TestResultInkResponse(BaseSchema):
     ResultID: int = Field(..., description="结果ID", alias="ResultID")
     ProjectID_FK: int = Field(..., description="项目ID", alias="ProjectID_FK")
     Ink_Viscosity: Optional[str] = Field(None, alias="Ink_Viscosity")
+    Ink_Viscosity_Value: Optional[float] = Field(None, description="粘度数值（cP）", alias="Ink_Viscosity_Value")
     Ink_Reactivity: Optional[str] = Field(None, alias="Ink_Reactivity")
+    Ink_Reactivity_Value: Optional[float] = Field(None, description="反应活性/固化时间数值（s）", alias="Ink_Reactivity_Value")
     Ink_ParticleSize: Optional[str] = Field(None, alias="Ink_ParticleSize")
+    Ink_ParticleSize_Value: Optional[float] = Field(None, description="粒径数值（nm）", alias="Ink_ParticleSize_Value")
     Ink_SurfaceTension: Optional[str] = Field(None, alias="Ink_SurfaceTension")
+    Ink_SurfaceTension_Value: Optional[float] = Field(None, description="表面张力数值（mN/m）", alias="Ink_SurfaceTension_Value")
     Ink_ColorValue: Optional[str] = Field(None, alias="Ink_ColorValue")
+    Ink_ColorValue_Value: Optional[float] = Field(None, description="色度(L*)数值（Lab*）", alias="Ink_ColorValue_Value")
     Ink_RheologyNote: Optional[str] = Field(None, alias="Ink_RheologyNote")
     TestDate: Optional[date] = Field(None, alias="TestDate")
     Notes: Optional[str] = Field(None, alias="Notes")
@@ -82,10 +96,15 @@ class TestResultCoatingResponse(BaseSchema):
     ResultID: int = Field(..., description="结果ID", alias="ResultID")
     ProjectID_FK: int = Field(..., description="项目ID", alias="ProjectID_FK")
     Coating_Adhesion: Optional[str] = Field(None, alias="Coating_Adhesion")
+    Coating_Adhesion_Value: Optional[float] = Field(None, description="附着力数值", alias="Coating_Adhesion_Value")
     Coating_Transparency: Optional[str] = Field(None, alias="Coating_Transparency")
+    Coating_Transparency_Value: Optional[float] = Field(None, description="透明度数值（%）", alias="Coating_Transparency_Value")
     Coating_SurfaceHardness: Optional[str] = Field(None, alias="Coating_SurfaceHardness")
+    Coating_SurfaceHardness_Value: Optional[float] = Field(None, description="表面硬度数值（H）", alias="Coating_SurfaceHardness_Value")
     Coating_ChemicalResistance: Optional[str] = Field(None, alias="Coating_ChemicalResistance")
+    Coating_ChemicalResistance_Value: Optional[float] = Field(None, description="耐化学性数值", alias="Coating_ChemicalResistance_Value")
     Coating_CostEstimate: Optional[str] = Field(None, alias="Coating_CostEstimate")
+    Coating_CostEstimate_Value: Optional[float] = Field(None, description="成本估算数值（EUR/kg）", alias="Coating_CostEstimate_Value")
     TestDate: Optional[date] = Field(None, alias="TestDate")
     Notes: Optional[str] = Field(None, alias="Notes")
     
@@ -99,10 +118,15 @@ class TestResult3DPrintResponse(BaseSchema):
     ResultID: int = Field(..., description="结果ID", alias="ResultID")
     ProjectID_FK: int = Field(..., description="项目ID", alias="ProjectID_FK")
     Print3D_Shrinkage: Optional[str] = Field(None, alias="Print3D_Shrinkage")
+    Print3D_Shrinkage_Value: Optional[float] = Field(None, description="收缩率数值（%）", alias="Print3D_Shrinkage_Value")
     Print3D_YoungsModulus: Optional[str] = Field(None, alias="Print3D_YoungsModulus")
+    Print3D_YoungsModulus_Value: Optional[float] = Field(None, description="杨氏模量数值（MPa）", alias="Print3D_YoungsModulus_Value")
     Print3D_FlexuralStrength: Optional[str] = Field(None, alias="Print3D_FlexuralStrength")
+    Print3D_FlexuralStrength_Value: Optional[float] = Field(None, description="弯曲强度数值（MPa）", alias="Print3D_FlexuralStrength_Value")
     Print3D_ShoreHardness: Optional[str] = Field(None, alias="Print3D_ShoreHardness")
+    Print3D_ShoreHardness_Value: Optional[float] = Field(None, description="邵氏硬度数值（Shore）", alias="Print3D_ShoreHardness_Value")
     Print3D_ImpactResistance: Optional[str] = Field(None, alias="Print3D_ImpactResistance")
+    Print3D_ImpactResistance_Value: Optional[float] = Field(None, description="抗冲击性数值（kJ/m^2）", alias="Print3D_ImpactResistance_Value")
     TestDate: Optional[date] = Field(None, alias="TestDate")
     Notes: Optional[str] = Field(None, alias="Notes")
     
@@ -116,10 +140,15 @@ class TestResultCompositeResponse(BaseSchema):
     ResultID: int = Field(..., description="结果ID", alias="ResultID")
     ProjectID_FK: int = Field(..., description="项目ID", alias="ProjectID_FK")
     Composite_FlexuralStrength: Optional[str] = Field(None, alias="Composite_FlexuralStrength")
+    Composite_FlexuralStrength_Value: Optional[float] = Field(None, description="弯曲强度数值（MPa）", alias="Composite_FlexuralStrength_Value")
     Composite_YoungsModulus: Optional[str] = Field(None, alias="Composite_YoungsModulus")
+    Composite_YoungsModulus_Value: Optional[float] = Field(None, description="杨氏模量数值（MPa）", alias="Composite_YoungsModulus_Value")
     Composite_ImpactResistance: Optional[str] = Field(None, alias="Composite_ImpactResistance")
+    Composite_ImpactResistance_Value: Optional[float] = Field(None, description="抗冲击性数值（kJ/m^2）", alias="Composite_ImpactResistance_Value")
     Composite_ConversionRate: Optional[str] = Field(None, alias="Composite_ConversionRate")
+    Composite_ConversionRate_Value: Optional[float] = Field(None, description="转化率数值（%）", alias="Composite_ConversionRate_Value")
     Composite_WaterAbsorption: Optional[str] = Field(None, alias="Composite_WaterAbsorption")
+    Composite_WaterAbsorption_Value: Optional[float] = Field(None, description="吸水率数值（%）", alias="Composite_WaterAbsorption_Value")
     TestDate: Optional[date] = Field(None, alias="TestDate")
     Notes: Optional[str] = Field(None, alias="Notes")
     
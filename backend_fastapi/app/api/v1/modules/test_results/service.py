@@ -3,7 +3,7 @@
 测试结果管理Service
 """
 
-from typing import Union
+from typing import Dict, List, Union
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.modules.test_results.crud import TestResultCRUD
@@ -15,6 +15,7 @@ from app.api.v1.modules.test_results.schema import (
 )
 from app.api.v1.modules.projects.crud import ProjectCRUD
 from app.core.logger import logger
+from app.core.query_cache import query_cache
 from app.core.custom_exceptions import (
     RecordNotFoundException,
     DatabaseException,
@@ -46,7 +47,14 @@ class TestResultService:
         if not result:
             return None
         
-        # 转换为响应模型（支持中英文项目类型）
+        return TestResultService.to_response(project_type, result)
+    
+    @staticmethod
+    def to_response(
+        project_type: str,
+        result
+    ) -> Union[TestResultInkResponse, TestResultCoatingResponse, TestResult3DPrintResponse, TestResultCompositeResponse, None]:
+        """测试结果对象转换为对应项目类型的响应模型（支持中英文项目类型）"""
         if project_type in ["喷墨", "Inkjet"]:
             return TestResultInkResponse.model_validate(result)
         elif project_type in ["涂层", "Coating"]:
@@ -58,6 +66,34 @@ class TestResultService:
         
         return None
     
+    @staticmethod
+    async def get_test_results_by_projects(
+        db: AsyncSession,
+        project_types: Dict[int, str]
+    ) -> Dict[int, Union[TestResultInkResponse, TestResultCoatingResponse, TestResult3DPrintResponse, TestResultCompositeResponse]]:
+        """
+        批量获取测试结果（每种项目类型一次查询）
+        
+        Args:
+            db: 数据库会话
+            project_types: 项目ID -> 项目类型名称
+        
+        Returns:
+            项目ID -> 测试结果响应（没有测试结果的项目不在结果中）
+        """
+        ids_by_type: Dict[str, List[int]] = {}
+        for project_id, project_type in project_types.items():
+            if TestResultCRUD.get_model_by_type_name(project_type) is not None:
+                ids_by_type.setdefault(project_type, []).append(project_id)
+        
+        responses = {}
+        for project_type, project_ids in ids_by_type.items():
+            model = TestResultCRUD.get_model_by_type_name(project_type)
+            results = await TestResultCRUD.get_results_by_project_ids(db, model, project_ids)
+            for project_id, result in results.items():
+                responses[project_id] = TestResultService.to_response(project_type, result)
+        return responses
+    
     @staticmethod
     async def create_or_update_ink_result(
         db: AsyncSession,
@@ -79,12 +115,14 @@ class TestResultService:
                 update_data = test_data.model_dump(exclude_unset=True)
                 await TestResultCRUD.update_ink_result(db, project_id, **update_data)
                 await db.commit()
+                query_cache.invalidate("projects")
                 result = await TestResultCRUD.get_ink_result(db, project_id)
             else:
                 # 创建
                 create_data = test_data.model_dump()
                 result = await TestResultCRUD.create_ink_result(db, project_id, **create_data)
                 await db.commit()
+                query_cache.invalidate("projects")
             
             logger.info(f"喷墨testresult{'update' if existing else 'create'}successful: projectID {project_id}")
             return TestResultInkResponse.model_validate(result)
@@ -114,11 +152,13 @@ class TestResultService:
                 update_data = test_data.model_dump(exclude_unset=True)
                 await TestResultCRUD.update_coating_result(db, project_id, **update_data)
                 await db.commit()
+                query_cache.invalidate("projects")
                 result = await TestResultCRUD.get_coating_result(db, project_id)
             else:
                 create_data = test_data.model_dump()
                 result = await TestResultCRUD.create_coating_result(db, project_id, **create_data)
                 await db.commit()
+                query_cache.invalidate("projects")
             
             logger.info(f"涂层testresult{'update' if existing else 'create'}successful: projectID {project_id}")
             return TestResultCoatingResponse.model_validate(result)
@@ -148,11 +188,13 @@ class TestResultService:
                 update_data = test_data.model_dump(exclude_unset=True)
                 await TestResultCRUD.update_3dprint_result(db, project_id, **update_data)
                 await db.commit()
+                query_cache.invalidate("projects")
                 result = await TestResultCRUD.get_3dprint_result(db, project_id)
             else:
                 create_data = test_data.model_dump()
                 result = await TestResultCRUD.create_3dprint_result(db, project_id, **create_data)
                 await db.commit()
+                query_cache.invalidate("projects")
             
             logger.info(f"3D打印testresult{'update' if existing else 'create'}successful: projectID {project_id}")
             return TestResult3DPrintResponse.model_validate(result)
@@ -182,11 +224,13 @@ class TestResultService:
                 update_data = test_data.model_dump(exclude_unset=True)
                 await TestResultCRUD.update_composite_result(db, project_id, **update_data)
                 await db.commit()
+                query_cache.invalidate("projects")
                 result = await TestResultCRUD.get_composite_result(db, project_id)
             else:
                 create_data = test_data.model_dump()
                 result = await TestResultCRUD.create_composite_result(db, project_id, **create_data)
                 await db.commit()
+                query_cache.invalidate("projects")
             
             logger.info(f"复合材料testresult{'update' if existing else 'create'}successful: projectID {project_id}")
             return TestResultCompositeResponse.model_validate(result)
@@ -7,6 +7,8 @@ from typing import Any, Optional, Generic, TypeVar
 from pydantic import BaseModel, Field
 from fastapi.responses import JSONResponse
 
+from app.core import json_codec
+
 
 T = TypeVar('T')
 
@@ -19,7 +21,14 @@ class ResponseModel(BaseModel, Generic[T]):
     success: bool = Field(default=True, description="是否成功")
 
 
-class SuccessResponse(JSONResponse):
+class FastJSONResponse(JSONResponse):
+    """使用 json_codec（优先 orjson）序列化的 JSON 响应"""
+
+    def render(self, content: Any) -> bytes:
+        return json_codec.dumps(content)
+
+
+class SuccessResponse(FastJSONResponse):
     """成功响应"""
     
     def __init__(
@@ -38,7 +47,7 @@ class SuccessResponse(JSONResponse):
         super().__init__(content=content, status_code=code, **kwargs)
 
 
-class ErrorResponse(JSONResponse):
+class ErrorResponse(FastJSONResponse):
     """错误响应"""
     
     def __init__(
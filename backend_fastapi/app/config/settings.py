@@ -69,6 +69,12 @@ class Settings(BaseSettings):
     ALLOW_HEADERS: List[str] = ["*"]
     ALLOW_CREDENTIALS: bool = True
 
+    # ==================== 响应压缩配置 ====================
+    COMPRESSION_ENABLE: bool = os.getenv("COMPRESSION_ENABLE", "true").lower() == "true"
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))  # 小于该字节数不压缩
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 安装 brotli 包时启用
+
     # ==================== JWT认证配置 ====================
     SECRET_KEY: str = os.getenv("SECRET_KEY", DEFAULT_SECRET_KEY)
     ALGORITHM: str = "HS256"
@@ -130,9 +136,65 @@ class Settings(BaseSettings):
         ".csv",
     ]
 
+    # ==================== 导出配置 ====================
+    # csv 导出的平铺数据（原料、填料、项目基本信息）由数据库 COPY 直接生成
+    EXPORT_USE_COPY: bool = os.getenv("EXPORT_USE_COPY", "true").lower() == "true"
+    # 并行导出：按 ProjectID 区间分片，每个分片在分片进程中用独立连接查询和编码（另加一个协调连接池连接）
+    EXPORT_PARALLEL_SHARDS: int = int(os.getenv("EXPORT_PARALLEL_SHARDS", "4"))  # 未指定分片数时的默认值
+    EXPORT_PARALLEL_MAX_SHARDS: int = int(os.getenv("EXPORT_PARALLEL_MAX_SHARDS", "8"))  # 单次导出的分片数上限
+    EXPORT_PARALLEL_MAX_CONNECTIONS: int = int(os.getenv("EXPORT_PARALLEL_MAX_CONNECTIONS", "9"))  # 每个服务进程所有并行导出同时占用的连接上限（分片进程数 = 该值 - 1）
+    EXPORT_SPOOL_MAX_BYTES: int = int(os.getenv("EXPORT_SPOOL_MAX_BYTES", str(10 * 1024 ** 3)))  # 单次并行导出分片缓冲文件的总字节上限，超出时导出失败
+
+    # ==================== 导出任务配置 ====================
+    # 导出文件目录（不要放在 static 下，下载需经过鉴权接口）
+    EXPORT_JOB_DIR: Path = Path(
+        os.getenv("EXPORT_JOB_DIR", str(BASE_DIR / "data" / "exports"))
+    )
+    EXPORT_JOB_CONCURRENCY: int = int(os.getenv("EXPORT_JOB_CONCURRENCY", "2"))  # 每个进程同时执行的导出任务数
+    EXPORT_JOB_REUSE_SECONDS: int = int(os.getenv("EXPORT_JOB_REUSE_SECONDS", "600"))  # 相同请求在该时间内复用已有任务/文件
+    EXPORT_JOB_RETENTION_SECONDS: int = int(
+        os.getenv("EXPORT_JOB_RETENTION_SECONDS", str(24 * 3600))
+    )  # 导出文件保留时间
+    EXPORT_JOB_PURGE_INTERVAL: int = int(os.getenv("EXPORT_JOB_PURGE_INTERVAL", "3600"))  # 定期清理过期导出文件的间隔（秒）
+    EXPORT_JOB_STALE_SECONDS: int = int(os.getenv("EXPORT_JOB_STALE_SECONDS", "300"))  # 运行中任务超过该时间未更新进度视为中断
+    EXPORT_JOB_PROGRESS_INTERVAL: float = 1.0  # 进度写库间隔（秒）
+
+    # ==================== 报告渲染配置 ====================
+    # 项目报告图片（matplotlib + PIL）在独立进程池中渲染，不阻塞事件循环
+    REPORT_RENDER_WORKERS: int = int(
+        os.getenv("REPORT_RENDER_WORKERS", str(min(2, os.cpu_count() or 1)))
+    )  # 每个服务进程的渲染进程数
+    REPORT_RENDER_MAX_PENDING: int = int(os.getenv("REPORT_RENDER_MAX_PENDING", "8"))  # 排队+渲染中的请求上限，超出返回 503
+    REPORT_RENDER_RETRY_AFTER: int = int(os.getenv("REPORT_RENDER_RETRY_AFTER", "5"))  # 503 响应的 Retry-After（秒）
+    REPORT_RENDER_PREWARM: bool = os.getenv("REPORT_RENDER_PREWARM", "true").lower() == "true"  # 启动时预热渲染进程
+    # 默认渲染档位: thumbnail / screen / print（分辨率与输出格式见 app.utils.report_canvas）
+    REPORT_DEFAULT_PROFILE: str = os.getenv("REPORT_DEFAULT_PROFILE", "screen")
+    # 渲染结果按输入内容哈希缓存在本地磁盘，超出容量按最近访问时间淘汰
+    REPORT_CACHE_ENABLE: bool = os.getenv("REPORT_CACHE_ENABLE", "true").lower() == "true"
+    REPORT_CACHE_DIR: Path = Path(
+        os.getenv("REPORT_CACHE_DIR", str(BASE_DIR / "data" / "report_cache"))
+    )
+    REPORT_CACHE_MAX_BYTES: int = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))  # 缓存目录容量上限
+    # 批量报告（ZIP）：按批读取项目数据，与单个报告共用渲染进程池和缓存
+    REPORT_BATCH_MAX_PROJECTS: int = int(os.getenv("REPORT_BATCH_MAX_PROJECTS", "1000"))  # 单次批量导出的项目数上限
+    REPORT_BATCH_LOAD_SIZE: int = int(os.getenv("REPORT_BATCH_LOAD_SIZE", "100"))  # 每批读取的项目数
+    REPORT_BATCH_CONCURRENCY: int = int(
+        os.getenv("REPORT_BATCH_CONCURRENCY", str(min(2, os.cpu_count() or 1)))
+    )  # 单个批量导出同时提交的渲染数（不超过渲染进程数时不会挤占单个报告请求的排队名额）
+
     # ==================== 分页配置 ====================
     PAGE_SIZE_DEFAULT: int = 20
     PAGE_SIZE_OPTIONS: List[int] = [10, 20, 50, 100]
+    # 列表总数统计方式: exact(精确COUNT) / estimated(执行计划估算) / cached(按筛选条件缓存)
+    LIST_COUNT_MODE: str = os.getenv("LIST_COUNT_MODE", "cached")
+    LIST_COUNT_CACHE_TTL: int = int(os.getenv("LIST_COUNT_CACHE_TTL", "30"))  # 缓存秒数
+    LIST_COUNT_EXACT_THRESHOLD: int = int(
+        os.getenv("LIST_COUNT_EXACT_THRESHOLD", "10000")
+    )  # 估算值低于该阈值时改用精确COUNT
+    PROJECT_FACETS_CACHE_TTL: int = int(os.getenv("PROJECT_FACETS_CACHE_TTL", "60"))  # 分面统计缓存秒数
+    PROJECT_ANALYTICS_SNAPSHOT_TTL: int = int(
+        os.getenv("PROJECT_ANALYTICS_SNAPSHOT_TTL", "600")
+    )  # 测试指标统计的列式快照缓存秒数（项目/测试结果写操作后立即失效）
 
     # ==================== 认证中间件配置 ====================
     AUTH_MIDDLEWARE_ENABLE: bool = False
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+响应压缩中间件
+按 Accept-Encoding 协商 brotli / gzip，对超过阈值的可压缩响应进行压缩：
+
+- brotli 需要安装 brotli 包，未安装时只提供 gzip
+- 只压缩文本类内容（JSON、CSV、HTML 等），图片、压缩包等已压缩格式直接透传
+- NDJSON / SSE 等逐条推送的流不压缩，避免压缩缓冲导致事件延迟
+- 已设置 Content-Encoding 的响应和部分内容响应（206 / Content-Range）不处理
+- 声明 Cache-Control: no-transform 的响应不处理（如支持断点续传的文件下载，
+  压缩后字节偏移和 ETag 都会变化，Range 续传无法对齐）
+- 流式响应逐块压缩，不缓冲整个响应体
+"""
+
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 取决于部署环境
+    brotli = None
+
+
+# 可压缩的内容类型（前缀匹配）
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/problem+json",
+    "application/javascript",
+    "application/xml",
+    "text/",
+    "image/svg+xml",
+)
+
+# 逐条推送的流式类型，压缩会延迟事件送达
+STREAMING_EVENT_TYPES = (
+    "application/x-ndjson",
+    "text/event-stream",
+)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    解析 Accept-Encoding 头为 {编码: q值}
+
+    Args:
+        header: Accept-Encoding 头的值
+
+    Returns:
+        编码名（小写）到权重的映射
+    """
+    encodings: Dict[str, float] = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        encodings[token] = q
+    return encodings
+
+
+def select_encoding(header: str) -> Optional[str]:
+    """
+    根据 Accept-Encoding 选择压缩编码，同权重时优先 br
+
+    Returns:
+        "br"、"gzip" 或 None（不压缩）
+    """
+    accepted = parse_accept_encoding(header or "")
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    """判断内容类型是否需要压缩"""
+    content_type = (content_type or "").lower()
+    if content_type.startswith(STREAMING_EVENT_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class _Compressor:
+    """gzip / brotli 增量压缩器的统一封装"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 输出带 gzip 头的数据流
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """按 Accept-Encoding 压缩响应的 ASGI 中间件"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = select_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None or "range" in request_headers:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            self.app, encoding, self.minimum_size, self.gzip_level, self.brotli_quality
+        )
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    """单个请求的压缩处理（延迟发送响应头，直到确定是否压缩）"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encoding: str,
+        minimum_size: int,
+        gzip_level: int,
+        brotli_quality: int,
+    ) -> None:
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.send: Optional[Send] = None
+        self.initial_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def _should_compress(self, message: Message) -> bool:
+        headers = Headers(raw=message["headers"])
+        status = message.get("status", 200)
+        return (
+            status not in (204, 206, 304)
+            and "content-encoding" not in headers
+            and "content-range" not in headers
+            and "no-transform" not in headers.get("cache-control", "").lower()
+            and is_compressible(headers.get("content-type", ""))
+        )
+
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.initial_message = message
+            self.passthrough = not self._should_compress(message)
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.minimum_size:
+                # 小响应不压缩
+                await self.send(self.initial_message)
+                await self.send(message)
+                self.passthrough = True
+                return
+
+            self.compressor = _Compressor(self.encoding, self.gzip_level, self.brotli_quality)
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers and not headers["etag"].startswith("W/"):
+                # 编码后的表示与原始实体不再逐字节相同
+                headers["ETag"] = "W/" + headers["etag"]
+
+            data = self.compressor.compress(body)
+            if not more_body:
+                data += self.compressor.finish()
+                headers["Content-Length"] = str(len(data))
+            elif "content-length" in headers:
+                del headers["Content-Length"]
+
+            await self.send(self.initial_message)
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -4,7 +4,7 @@
 提供更细粒度的异常处理，便于错误追踪和处理
 """
 
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 from fastapi import status
 
 
@@ -16,10 +16,12 @@ class BaseAPIException(Exception):
         message: str,
         status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR,
         details: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
     ):
         self.message = message
         self.status_code = status_code
         self.details = details
+        self.headers = headers  # 附加的响应头（如 Retry-After）
         super().__init__(self.message)
 
 
@@ -146,6 +148,18 @@ class InvalidTokenException(AuthenticationException):
         super().__init__(message="Invalid token")
 
 
+class ServiceUnavailableException(BaseAPIException):
+    """服务繁忙（排队已满等），客户端可在 retry_after 秒后重试"""
+
+    def __init__(self, message: str = "Service busy, please retry later", retry_after: int = 5):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details={"retry_after": retry_after},
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
 # ==================== 外部服务相关异常 ====================
 class ExternalServiceException(BaseAPIException):
     """外部服务异常"""
@@ -4,7 +4,7 @@
 提供同步和异步数据库引擎
 """
 
-from sqlalchemy import create_engine, Engine
+from sqlalchemy import create_engine, Engine, event, text
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
@@ -15,6 +15,7 @@ from sqlalchemy.ext.asyncio import (
 from typing import AsyncGenerator
 
 from app.config.settings import settings
+from app.core.json_codec import dumps_str, loads, register_asyncpg_codecs
 from app.core.logger import logger
 
 
@@ -33,7 +34,9 @@ engine: Engine = create_engine(
     pool_recycle=settings.POOL_RECYCLE,
     pool_size=settings.POOL_SIZE,
     max_overflow=settings.MAX_OVERFLOW,
-    pool_timeout=settings.POOL_TIMEOUT
+    pool_timeout=settings.POOL_TIMEOUT,
+    json_serializer=dumps_str,
+    json_deserializer=loads
 )
 
 # 同步会话工厂
@@ -54,9 +57,18 @@ async_engine: AsyncEngine = create_async_engine(
     pool_size=settings.POOL_SIZE,
     max_overflow=settings.MAX_OVERFLOW,
     pool_timeout=settings.POOL_TIMEOUT,
+    json_serializer=dumps_str,
+    json_deserializer=loads,
     future=True
 )
 
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _register_json_codecs(dbapi_connection, connection_record):
+    """新建连接时注册 json/jsonb 编解码器（覆盖方言默认注册的版本）"""
+    dbapi_connection.run_async(register_asyncpg_codecs)
+
+
 # 异步会话工厂
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine,
@@ -103,6 +115,8 @@ async def init_database():
     """初始化数据库表"""
     try:
         async with async_engine.begin() as conn:
+            # 关键词搜索的 gin_trgm_ops 索引依赖 pg_trgm 扩展
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
             # 创建所有表（生产环境应使用Alembic迁移）
             await conn.run_sync(Base.metadata.create_all)
         logger.info("✅ database表初始化successful")
@@ -94,7 +94,8 @@ def register_exception_handlers(app: FastAPI) -> None:
                 "msg": exc.message,
                 "success": False,
                 "details": exc.details
-            }
+            },
+            headers=exc.headers
         )
     
     # ==================== 2. FastAPI参数验证异常 ====================
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+JSON 编解码层
+统一响应体、NDJSON 流和 JSONB 列使用的 JSON 实现：
+
+- 安装了 orjson 时使用 orjson（序列化直接产出 UTF-8 bytes，速度约为标准库的数倍）
+- 未安装时回退到标准库 json，输出格式保持一致（紧凑分隔符、不转义非ASCII字符）
+
+两种实现都支持 datetime/date/Decimal/UUID/Enum/Pydantic 模型等常见类型。
+"""
+
+import dataclasses
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Union
+from uuid import UUID
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 取决于部署环境
+    orjson = None
+
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(obj: Any) -> Any:
+    """处理两种实现都不能原生序列化的类型"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    # 以下类型 orjson 原生支持，仅标准库回退时会走到这里
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj: Any) -> bytes:
+        """序列化为 UTF-8 JSON bytes"""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """反序列化 JSON（接受 bytes 或 str）"""
+        return orjson.loads(data)
+
+else:  # pragma: no cover - 取决于部署环境
+
+    def dumps(obj: Any) -> bytes:
+        """序列化为 UTF-8 JSON bytes"""
+        return json.dumps(
+            obj, default=_default, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """反序列化 JSON（接受 bytes 或 str）"""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+def dumps_str(obj: Any) -> str:
+    """序列化为 JSON 字符串（供 SQLAlchemy json_serializer 等需要 str 的接口使用）"""
+    return dumps(obj).decode("utf-8")
+
+
+def dumps_line(obj: Any) -> bytes:
+    """序列化为一行 NDJSON（末尾带换行符）"""
+    return dumps(obj) + b"\n"
+
+
+async def register_asyncpg_codecs(connection: Any) -> None:
+    """
+    在 asyncpg 连接上注册 json/jsonb 类型编解码器
+
+    SQLAlchemy 自带的编解码器会先把二进制值 decode 成 str 再解析，
+    这里直接把 bytes 交给 loads，省去一次拷贝。
+
+    Args:
+        connection: asyncpg 原生连接
+    """
+
+    def _jsonb_encoder(value: str) -> bytes:
+        # jsonb 二进制格式以版本号 \x01 开头
+        return b"\x01" + value.encode("utf-8")
+
+    def _jsonb_decoder(value: bytes) -> Any:
+        return loads(value[1:])
+
+    await connection.set_type_codec(
+        "jsonb",
+        encoder=_jsonb_encoder,
+        decoder=_jsonb_decoder,
+        schema="pg_catalog",
+        format="binary",
+    )
+    await connection.set_type_codec(
+        "json",
+        encoder=str.encode,
+        decoder=loads,
+        schema="pg_catalog",
+        format="binary",
+    )
@@ -9,6 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import time
 from app.config.settings import settings
+from app.core.compression import CompressionMiddleware
 from app.core.logger import logger
 from app.core.security import decode_token
 
@@ -32,6 +33,23 @@ def register_cors(app: FastAPI) -> None:
         logger.info("✅ CORS middleware registered")
 
 
+def register_compression(app: FastAPI) -> None:
+    """
+    注册响应压缩中间件（按 Accept-Encoding 选择 br/gzip）
+
+    Args:
+        app: FastAPI应用实例
+    """
+    if settings.COMPRESSION_ENABLE:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+            gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+            brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        )
+        logger.info("✅ Compression middleware registered")
+
+
 def register_request_logger(app: FastAPI) -> None:
     """
     注册请求日志中间件
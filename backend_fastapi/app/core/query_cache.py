@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+进程内查询结果缓存
+按命名空间（通常是表/模块名）组织，支持TTL过期与写操作后的整体失效
+
+仅缓存可容忍短时间不一致的数据（如列表总数、统计结果），多进程部署时
+各进程独立缓存，依靠TTL收敛。
+"""
+
+import json
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def make_cache_key(**params: Any) -> str:
+    """
+    将查询参数规范化为缓存键
+    忽略值为 None 的参数，字符串去除首尾空白，键按名称排序
+
+    Args:
+        **params: 查询参数
+
+    Returns:
+        缓存键字符串
+    """
+    normalized = {}
+    for name, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+            if not value:
+                continue
+        elif isinstance(value, (date, datetime, Decimal)):
+            value = str(value)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            value = sorted(str(item) for item in value)
+        normalized[name] = value
+    return json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class TTLQueryCache:
+    """带TTL和容量上限的命名空间缓存"""
+
+    def __init__(self, max_entries: int = 2048) -> None:
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._max_entries = max_entries
+
+    def get(self, namespace: str, key: Hashable) -> Optional[Any]:
+        """读取缓存，不存在或已过期返回 None"""
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop((namespace, key), None)
+            return None
+        self._entries.move_to_end((namespace, key))
+        return value
+
+    def set(self, namespace: str, key: Hashable, value: Any, ttl: float) -> None:
+        """写入缓存，超过容量时淘汰最久未使用的条目"""
+        self._entries[(namespace, key)] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end((namespace, key))
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def generation(self, namespace: str) -> int:
+        """
+        命名空间的失效代数
+        查询前记录代数，写入缓存前比较，避免把失效前读到的旧结果写回缓存
+        """
+        return self._generations.get(namespace, 0)
+
+    def set_if_current(
+        self, namespace: str, key: Hashable, value: Any, ttl: float, generation: int
+    ) -> None:
+        """仅当命名空间在查询期间未被失效时写入缓存"""
+        if self.generation(namespace) == generation:
+            self.set(namespace, key, value, ttl)
+
+    def invalidate(self, *namespaces: str) -> None:
+        """使指定命名空间的全部缓存失效"""
+        targets = set(namespaces)
+        for namespace in targets:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        for cache_key in [k for k in self._entries if k[0] in targets]:
+            self._entries.pop(cache_key, None)
+
+    def clear(self) -> None:
+        """清空全部缓存"""
+        for namespace in {k[0] for k in self._entries} | set(self._generations):
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        self._entries.clear()
+
+
+query_cache = TTLQueryCache()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+列表总数统计策略
+为分页列表提供三种总数来源，并在返回值上标明实际使用的方式：
+
+- exact: 精确 COUNT(*)
+- estimated: 无筛选条件时读取 pg_class.reltuples，有筛选条件时读取执行计划的估算行数；
+  估算值低于阈值时改用精确 COUNT（小结果集精确统计成本低，估算误差却可能很大）
+- cached: 按命名空间 + 规范化筛选条件缓存精确 COUNT 结果，写操作后失效
+"""
+
+import json
+from enum import Enum
+from typing import Any, Optional
+
+from sqlalchemy import literal_column, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.config.settings import settings
+from app.core.logger import logger
+from app.core.query_cache import query_cache
+
+
+class CountMode(str, Enum):
+    """总数统计方式"""
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+
+
+class TotalCount(int):
+    """带统计方式标记的总数，可直接当作 int 使用"""
+
+    kind: str
+
+    def __new__(cls, value: int, kind: str = CountMode.EXACT.value) -> "TotalCount":
+        obj = super().__new__(cls, max(int(value), 0))
+        obj.kind = kind
+        return obj
+
+
+def resolve_count_mode(mode: Optional[str]) -> CountMode:
+    """解析请求/配置中的统计方式，未知值回退为 exact"""
+    try:
+        return CountMode(mode or settings.LIST_COUNT_MODE)
+    except ValueError:
+        return CountMode.EXACT
+
+
+def total_kind(total: Any) -> str:
+    """获取总数的统计方式（普通 int 视为 exact）"""
+    return getattr(total, "kind", CountMode.EXACT.value)
+
+
+async def count_total(
+    db: AsyncSession,
+    count_stmt: Select,
+    *,
+    namespace: str,
+    cache_key: str,
+    table_name: Optional[str] = None,
+    filtered: bool = True,
+    mode: Optional[str] = None,
+) -> TotalCount:
+    """
+    按指定策略统计列表总数
+
+    Args:
+        db: 数据库会话
+        count_stmt: 精确统计语句（SELECT count(...) FROM ... WHERE ...）
+        namespace: 缓存命名空间，写操作通过 query_cache.invalidate(namespace) 失效
+        cache_key: 规范化后的筛选条件（见 make_cache_key）
+        table_name: 主表名，无筛选条件时用于读取 pg_class.reltuples
+        filtered: 是否带有筛选条件
+        mode: 统计方式，None 时使用配置 LIST_COUNT_MODE
+
+    Returns:
+        TotalCount
+    """
+    count_mode = resolve_count_mode(mode)
+
+    if count_mode == CountMode.CACHED:
+        cached = query_cache.get(namespace, ("count", cache_key))
+        if cached is not None:
+            return TotalCount(cached, CountMode.CACHED.value)
+        generation = query_cache.generation(namespace)
+        total = await _exact_count(db, count_stmt)
+        query_cache.set_if_current(
+            namespace,
+            ("count", cache_key),
+            total,
+            settings.LIST_COUNT_CACHE_TTL,
+            generation,
+        )
+        return TotalCount(total, CountMode.EXACT.value)
+
+    if count_mode == CountMode.ESTIMATED:
+        estimate = None
+        try:
+            if not filtered and table_name:
+                estimate = await _table_estimate(db, table_name)
+            if estimate is None:
+                estimate = await _plan_estimate(db, count_stmt)
+        except Exception as e:
+            logger.warning(f"估算总数failed，改用精确COUNT: {e}")
+            estimate = None
+        if estimate is not None and estimate >= settings.LIST_COUNT_EXACT_THRESHOLD:
+            return TotalCount(estimate, CountMode.ESTIMATED.value)
+
+    return TotalCount(await _exact_count(db, count_stmt), CountMode.EXACT.value)
+
+
+async def _exact_count(db: AsyncSession, count_stmt: Select) -> int:
+    result = await db.execute(count_stmt)
+    return int(result.scalar() or 0)
+
+
+async def _table_estimate(db: AsyncSession, table_name: str) -> Optional[int]:
+    """读取表的统计行数；从未 ANALYZE 过的表（reltuples < 0）返回 None"""
+    result = await db.execute(
+        text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": f'"{table_name}"'},
+    )
+    reltuples = result.scalar()
+    if reltuples is None or reltuples < 0:
+        return None
+    return int(reltuples)
+
+
+async def _plan_estimate(db: AsyncSession, count_stmt: Select) -> Optional[int]:
+    """用执行计划估算命中行数（EXPLAIN 不执行查询）"""
+    rows_stmt = count_stmt.with_only_columns(
+        literal_column("1"), maintain_column_froms=True
+    )
+    conn = await db.connection()
+    compiled = rows_stmt.compile(
+        dialect=conn.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    params = compiled.params
+    if compiled.positiontup is not None:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    if not plan:
+        return None
+    return int(plan[0]["Plan"]["Plan Rows"])
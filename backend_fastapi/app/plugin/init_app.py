@@ -9,6 +9,7 @@ from fastapi.staticfiles import StaticFiles
 
 from app.core.middlewares import (
     register_cors,
+    register_compression,
     register_request_logger,
     register_auth_middleware,
 )
@@ -29,6 +30,9 @@ def register_middlewares(app: FastAPI) -> None:
     # CORS中间件
     register_cors(app)
 
+    # 响应压缩中间件
+    register_compression(app)
+
     # 请求日志中间件
     register_request_logger(app)
 
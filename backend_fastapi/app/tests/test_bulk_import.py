@@ -0,0 +1,171 @@
+"""Bulk project import tests."""
+
+from __future__ import annotations
+
+import unittest
+from datetime import date
+from types import SimpleNamespace
+from unittest import mock
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.modules.projects.crud import COMPOSITION_BULK_COLUMNS, ProjectCRUD
+from app.api.v1.modules.projects.model import FormulaCompositionModel, TestResultInkModel
+from app.api.v1.modules.projects.schema import BulkProjectCreateRequest, BulkProjectItem
+from app.api.v1.modules.projects.service import ProjectService
+from app.api.v1.modules.test_results.crud import TestResultCRUD
+from app.utils.bulk_insert import unnest_select
+
+TYPE_CODES = {1: "INK", 2: "COAT"}
+
+
+def _item(**overrides) -> BulkProjectItem:
+    data = {
+        "project_name": "P1",
+        "project_type_fk": 1,
+        "formulator_name": "Zhang San",
+        "formulation_date": date(2024, 1, 1),
+    }
+    data.update(overrides)
+    return BulkProjectItem.model_validate(data)
+
+
+class UnnestInsertTests(unittest.TestCase):
+    def test_statement_text_is_independent_of_row_count(self) -> None:
+        def compile_rows(n: int):
+            rows = [
+                {"ProjectID_FK": i, "MaterialID_FK": 1, "WeightPercentage": 10}
+                for i in range(n)
+            ]
+            stmt = insert(FormulaCompositionModel).from_select(
+                COMPOSITION_BULK_COLUMNS,
+                unnest_select(FormulaCompositionModel.__table__, COMPOSITION_BULK_COLUMNS, rows),
+            )
+            return stmt.compile(dialect=postgresql.dialect())
+
+        small, large = compile_rows(2), compile_rows(500)
+        self.assertEqual(str(small), str(large))
+        self.assertIn("unnest(CAST(", str(large))
+        self.assertIn("AS INTEGER[]", str(large))
+        self.assertEqual(len(large.params), len(COMPOSITION_BULK_COLUMNS))
+        self.assertEqual(large.params["unnest_0"], list(range(500)))
+        self.assertEqual(large.params["unnest_2"], [None] * 500)
+
+
+class BulkItemCheckTests(unittest.TestCase):
+    def test_valid_item_returns_test_result_row(self) -> None:
+        row = ProjectService._check_bulk_item(
+            _item(
+                compositions=[{"material_id": 1, "weight_percentage": "12.5"}],
+                test_result={"Ink_Viscosity": "12 cP", "TestDate": "2024-02-01"},
+            ),
+            TYPE_CODES,
+            {1},
+            set(),
+        )
+        self.assertEqual(row["Ink_Viscosity"], "12 cP")
+        self.assertEqual(row["TestDate"], date(2024, 2, 1))
+        self.assertIs(TestResultCRUD.get_model_by_type_code("ink"), TestResultInkModel)
+
+    def test_item_without_test_result(self) -> None:
+        self.assertIsNone(ProjectService._check_bulk_item(_item(), TYPE_CODES, set(), set()))
+
+    def test_invalid_references_are_reported(self) -> None:
+        cases = [
+            (_item(project_type_fk=9), "Project type 9"),
+            (_item(compositions=[{"weight_percentage": 1}]), "compositions[0]"),
+            (_item(compositions=[{"filler_id": 7, "weight_percentage": 1}]), "filler 7"),
+            (_item(test_result={"Coating_Adhesion": "5B"}), "unknown fields"),
+        ]
+        for item, message in cases:
+            with self.subTest(message=message):
+                with self.assertRaises(ValueError) as ctx:
+                    ProjectService._check_bulk_item(item, TYPE_CODES, {1}, set())
+                self.assertIn(message, str(ctx.exception))
+
+
+class BulkValidationTests(unittest.TestCase):
+    def test_invalid_items_are_reported_by_position(self) -> None:
+        valid = {
+            "project_name": "P1",
+            "project_type_fk": 1,
+            "formulator_name": "Zhang San",
+            "formulation_date": "2024-01-01",
+            "compositions": [{"material_id": 1, "weight_percentage": "12.5"}],
+        }
+        invalid = {**valid, "project_name": " ", "compositions": [{"weight_percentage": "101"}]}
+        items = [valid, invalid, {**valid, "project_name": "P3"}, "not an object"]
+        results = [{"index": i} for i in range(len(items))]
+
+        parsed = ProjectService._validate_bulk_items(items, results)
+
+        self.assertEqual([i for i, _ in parsed], [0, 2])
+        self.assertEqual(parsed[1][1].project_name, "P3")
+        with self.assertRaises(ValidationError) as ctx:
+            BulkProjectItem.model_validate(invalid)
+        # 与逐项校验的说明一致（loc 不含项的位置）
+        self.assertEqual(
+            results[1]["error"], ProjectService._format_validation_error(ctx.exception.errors())
+        )
+        self.assertIn("compositions.0.weight_percentage", results[1]["error"])
+        self.assertIn("error", results[3])
+        self.assertNotIn("error", results[0])
+
+
+class BulkSummaryRefreshTests(unittest.IsolatedAsyncioTestCase):
+    async def test_summaries_are_refreshed_once_after_all_inserts(self) -> None:
+        service = "app.api.v1.modules.projects.service"
+        calls = mock.Mock()
+        types = [SimpleNamespace(TypeID=1, TypeCode="INK")]
+        request = BulkProjectCreateRequest(items=[
+            {
+                "project_name": f"P{n}",
+                "project_type_fk": 1,
+                "formulator_name": "Zhang San",
+                "formulation_date": "2024-01-01",
+                "compositions": [{"material_id": 1, "weight_percentage": "50"}],
+                "test_result": {"Ink_Viscosity": "12 cP"},
+            }
+            for n in range(2)
+        ])
+        for name in ("defer", "projects", "compositions", "test_results", "refresh"):
+            setattr(calls, name, mock.AsyncMock())
+        calls.projects.return_value = [(11, "A-01"), (12, "A-02")]
+        db = mock.AsyncMock()
+        with mock.patch(f"{service}.ProjectTypeCRUD.get_all", mock.AsyncMock(return_value=types)), \
+                mock.patch(f"{service}.CompositionCRUD.get_existing_reference_ids",
+                           mock.AsyncMock(return_value=({1}, set()))), \
+                mock.patch(f"{service}.ProjectCRUD.defer_summary_refresh", calls.defer), \
+                mock.patch(f"{service}.ProjectCRUD.bulk_create", calls.projects), \
+                mock.patch(f"{service}.CompositionCRUD.bulk_create", calls.compositions), \
+                mock.patch(f"{service}.TestResultCRUD.bulk_create", calls.test_results), \
+                mock.patch(f"{service}.ProjectCRUD.refresh_summaries", calls.refresh), \
+                mock.patch(f"{service}.query_cache.invalidate"):
+            response = await ProjectService.bulk_create_projects(db, request)
+
+        self.assertEqual(response.created, 2)
+        self.assertEqual(
+            [c[0] for c in calls.mock_calls],
+            ["defer", "projects", "compositions", "test_results", "refresh"],
+        )
+        self.assertEqual(calls.refresh.call_args.args[1], [11, 12])
+        db.commit.assert_awaited_once()
+
+    async def test_refresh_statement_recomputes_and_restores_triggers(self) -> None:
+        db = mock.AsyncMock()
+        await ProjectCRUD.defer_summary_refresh(db)
+        await ProjectCRUD.refresh_summaries(db, [3, 4])
+        defer, refresh = (
+            call.args[0].compile(dialect=postgresql.dialect()) for call in db.execute.await_args_list
+        )
+        self.assertIn("set_config", str(defer))
+        self.assertIn(True, defer.params.values())
+        self.assertIn("fn_recompute_project_summary", str(refresh))
+        self.assertIn([3, 4], refresh.params.values())
+        self.assertIn("off", refresh.params.values())
+
+
+if __name__ == "__main__":
+    unittest.main()
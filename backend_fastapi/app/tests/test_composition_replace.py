@@ -0,0 +1,100 @@
+"""Composition replace-all diff tests."""
+
+from __future__ import annotations
+
+import unittest
+from decimal import Decimal
+
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.modules.projects.crud import CompositionCRUD
+from app.api.v1.modules.projects.schema import CompositionReplaceItem
+from app.api.v1.modules.projects.service import CompositionService
+from app.core.custom_exceptions import ValidationException
+
+
+def _row(cid, material=None, filler=None, weight="10.0000", remarks=None):
+    return {
+        "CompositionID": cid,
+        "ProjectID_FK": 1,
+        "MaterialID_FK": material,
+        "FillerID_FK": filler,
+        "WeightPercentage": Decimal(weight),
+        "AdditionMethod": None,
+        "Remarks": remarks,
+    }
+
+
+def _item(**data) -> CompositionReplaceItem:
+    data.setdefault("weight_percentage", "10")
+    return CompositionReplaceItem.model_validate(data)
+
+
+class CompositionDiffTests(unittest.TestCase):
+    def test_diff_matches_by_id_then_by_material_and_filler(self) -> None:
+        current = [_row(1, material=5), _row(2, material=6), _row(3, filler=7)]
+        items = [
+            _item(composition_id=1, material_id=5),
+            _item(material_id=6, weight_percentage="25", remarks="x"),
+            _item(material_id=5, filler_id=7, weight_percentage="3"),
+        ]
+
+        to_insert, to_update, to_delete, unchanged = CompositionService._diff_compositions(
+            1, current, items
+        )
+
+        self.assertEqual(unchanged, 1)
+        self.assertEqual([r["CompositionID"] for r in to_update], [2])
+        self.assertEqual(to_update[0]["WeightPercentage"], Decimal("25"))
+        self.assertEqual(to_update[0]["Remarks"], "x")
+        self.assertEqual(len(to_insert), 1)
+        self.assertEqual((to_insert[0]["MaterialID_FK"], to_insert[0]["FillerID_FK"]), (5, 7))
+        self.assertEqual(to_delete, [3])
+
+    def test_empty_target_deletes_everything(self) -> None:
+        to_insert, to_update, to_delete, unchanged = CompositionService._diff_compositions(
+            1, [_row(1, material=5), _row(2, filler=7)], []
+        )
+        self.assertEqual((to_insert, to_update, unchanged), ([], [], 0))
+        self.assertEqual(to_delete, [1, 2])
+
+    def test_foreign_or_duplicate_ids_are_rejected(self) -> None:
+        current = [_row(1, material=5)]
+        with self.assertRaises(ValidationException):
+            CompositionService._diff_compositions(1, current, [_item(composition_id=9, material_id=5)])
+        with self.assertRaises(ValidationException):
+            CompositionService._diff_compositions(
+                1,
+                current,
+                [_item(composition_id=1, material_id=5), _item(composition_id=1, material_id=5)],
+            )
+
+
+class CompositionBulkStatementTests(unittest.IsolatedAsyncioTestCase):
+    async def test_update_and_delete_are_single_set_based_statements(self) -> None:
+        statements = []
+
+        class _Result:
+            rowcount = 2
+
+        class _Session:
+            async def execute(self, stmt, *args):
+                statements.append(stmt)
+                return _Result()
+
+        db = _Session()
+        rows = [{**_row(1, material=5), "WeightPercentage": Decimal("1")}, _row(2, filler=7)]
+        self.assertEqual(await CompositionCRUD.bulk_update(db, 1, rows), 2)
+        self.assertEqual(await CompositionCRUD.bulk_delete(db, 1, [3, 4]), 2)
+
+        update_sql, delete_sql = (
+            " ".join(str(s.compile(dialect=postgresql.dialect())).split()) for s in statements
+        )
+        self.assertIn('UPDATE "tbl_FormulaComposition" SET', update_sql)
+        self.assertIn("FROM (SELECT unnest_rows.", update_sql)
+        self.assertIn('"tbl_FormulaComposition"."CompositionID" = v."CompositionID"', update_sql)
+        self.assertIn('"CompositionID" = ANY (CAST(', delete_sql)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,314 @@
+"""Asynchronous export job submission, artifact writing and download tests."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.modules.exports import controller as export_controller
+from app.api.v1.modules.exports.crud import ExportJobCRUD
+from app.api.v1.modules.exports.schema import ExportJobCreateRequest, ExportJobStatus
+from app.api.v1.modules.exports.service import (
+    ExportArtifactFile,
+    ExportJobService,
+)
+from app.core.compression import CompressionMiddleware
+from app.core.custom_exceptions import (
+    FileNotFoundError,
+    InvalidOperationException,
+    ValidationException,
+)
+from app.core.database import get_db
+from app.core.security import get_current_user_id
+from app.utils.export_writers import ExportProgress
+
+
+def _job(**fields):
+    now = datetime(2026, 10, 17, 12, 0, 0)
+    values = dict(
+        JobID=5,
+        Resource="projects",
+        Format="csv",
+        Compression=None,
+        Filters={},
+        RequestKey="k",
+        Status=ExportJobStatus.pending.value,
+        TotalItems=None,
+        ProcessedItems=0,
+        RowsWritten=0,
+        BytesWritten=0,
+        FileName=None,
+        FilePath=None,
+        FileSize=None,
+        ErrorMessage=None,
+        CreatedAt=now,
+        StartedAt=None,
+        UpdatedAt=now,
+        FinishedAt=None,
+        ExpiresAt=None,
+    )
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+class _FakeSession:
+    def __init__(self):
+        self.commits = 0
+
+    async def execute(self, stmt):
+        return None
+
+    async def commit(self):
+        self.commits += 1
+
+    async def refresh(self, obj):
+        return None
+
+
+class RequestKeyTests(unittest.TestCase):
+    def test_equivalent_filters_share_a_key(self) -> None:
+        _, a = ExportJobService._validate_request(
+            ExportJobCreateRequest(filters={"project_type": "Inkjet", "keyword": " ink "})
+        )
+        _, b = ExportJobService._validate_request(
+            ExportJobCreateRequest(format="CSV", filters={"keyword": "ink", "project_type": "Inkjet"})
+        )
+        self.assertEqual(
+            ExportJobService.build_request_key("projects", "csv", None, a),
+            ExportJobService.build_request_key("projects", "csv", None, b),
+        )
+
+    def test_format_and_compression_change_the_key(self) -> None:
+        keys = {
+            ExportJobService.build_request_key("projects", fmt, compression, {})
+            for fmt in ("csv", "xlsx")
+            for compression in (None, "gzip")
+        }
+        self.assertEqual(len(keys), 4)
+
+    def test_invalid_requests_are_rejected(self) -> None:
+        with self.assertRaises(ValidationException):
+            ExportJobService._validate_request(ExportJobCreateRequest(resource="users"))
+        with self.assertRaises(ValidationException):
+            ExportJobService._validate_request(ExportJobCreateRequest(format="pdf"))
+        with self.assertRaises(ValidationException):
+            ExportJobService._validate_request(ExportJobCreateRequest(filters={"nope": 1}))
+        with self.assertRaises(ValueError):
+            ExportJobCreateRequest(compression="zip")
+
+
+class ArtifactFileTests(unittest.TestCase):
+    def test_gzip_artifact_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "5" / "out.csv.gz.part"
+            artifact = ExportArtifactFile(path, "gzip", "out.csv")
+            artifact.write(b"a,b\n")
+            artifact.write(b"1,2\n")
+            artifact.close()
+            self.assertEqual(artifact.bytes_written, 8)
+            self.assertEqual(gzip.decompress(path.read_bytes()), b"a,b\n1,2\n")
+
+    def test_discard_removes_partial_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "out.csv.part"
+            artifact = ExportArtifactFile(path, None, "out.csv")
+            artifact.write(b"partial")
+            artifact.discard()
+            self.assertFalse(path.exists())
+
+    def test_progress_fraction(self) -> None:
+        self.assertIsNone(ExportProgress().fraction)
+        self.assertEqual(ExportProgress(total_items=0).fraction, 1.0)
+        self.assertEqual(ExportProgress(total_items=4, processed_items=1).fraction, 0.25)
+
+
+@mock.patch("app.api.v1.modules.exports.service.ExportJobService.purge_expired_jobs", mock.AsyncMock())
+class SubmitJobTests(unittest.TestCase):
+    def _submit(self, existing):
+        db = _FakeSession()
+        crud = "app.api.v1.modules.exports.service.ExportJobCRUD"
+        with mock.patch(f"{crud}.find_reusable_job", mock.AsyncMock(return_value=existing)), \
+                mock.patch(f"{crud}.create_job", mock.AsyncMock(return_value=_job(JobID=9))) as create, \
+                mock.patch(f"{crud}.update_job", mock.AsyncMock()) as update, \
+                mock.patch("app.api.v1.modules.exports.service.ExportJobRunner.submit") as submit:
+            response = asyncio.run(
+                ExportJobService.submit_job(db, ExportJobCreateRequest(format="csv"), 1)
+            )
+        return response, create, update, submit
+
+    def test_running_job_is_reused(self) -> None:
+        running = _job(Status=ExportJobStatus.running.value, TotalItems=10, ProcessedItems=5)
+        response, create, _, submit = self._submit(running)
+        self.assertTrue(response.reused)
+        self.assertEqual(response.job_id, 5)
+        self.assertEqual(response.progress, 0.5)
+        create.assert_not_called()
+        submit.assert_not_called()
+
+    def test_succeeded_job_with_file_is_reused(self) -> None:
+        with tempfile.NamedTemporaryFile() as tmp:
+            done = _job(Status=ExportJobStatus.succeeded.value, FilePath=tmp.name)
+            response, create, _, _ = self._submit(done)
+        self.assertTrue(response.reused)
+        self.assertEqual(response.download_url, "/api/v1/exports/5/download")
+        create.assert_not_called()
+
+    def test_missing_artifact_starts_a_new_job(self) -> None:
+        done = _job(Status=ExportJobStatus.succeeded.value, FilePath="/nonexistent/export.csv")
+        response, create, update, submit = self._submit(done)
+        self.assertFalse(response.reused)
+        self.assertEqual(response.job_id, 9)
+        self.assertEqual(update.await_args.kwargs["Status"], ExportJobStatus.expired.value)
+        create.assert_awaited_once()
+        submit.assert_called_once_with(9)
+
+
+class InterruptedJobTests(unittest.TestCase):
+    def test_unfinished_jobs_are_failed(self) -> None:
+        db = mock.AsyncMock()
+        db.execute.return_value = SimpleNamespace(rowcount=2)
+        before = datetime(2026, 10, 17, 12, 0, 0)
+        count = asyncio.run(ExportJobCRUD.fail_unfinished_jobs(db, before, "interrupted"))
+        self.assertEqual(count, 2)
+        stmt = db.execute.await_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.assertIn('"Status" IN (__[POSTCOMPILE_Status_1])', sql)
+        self.assertIn('"UpdatedAt" < %(UpdatedAt_1)s', sql)
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        self.assertEqual(params["Status_1"], ["pending", "running"])
+        self.assertEqual(params["Status"], "failed")
+
+    def _fail_interrupted(self, workers: int) -> datetime:
+        session = mock.MagicMock()
+        session.__aenter__ = mock.AsyncMock(return_value=mock.AsyncMock())
+        session.__aexit__ = mock.AsyncMock(return_value=False)
+        service = "app.api.v1.modules.exports.service"
+        with mock.patch(f"{service}.AsyncSessionLocal", return_value=session), \
+                mock.patch(f"{service}.ExportJobCRUD.fail_unfinished_jobs", mock.AsyncMock(return_value=1)) as fail, \
+                mock.patch(f"{service}.settings.WORKERS", workers), \
+                mock.patch(f"{service}.settings.RELOAD", False):
+            self.assertEqual(asyncio.run(ExportJobService.fail_interrupted_jobs()), 1)
+        return fail.await_args.args[1]
+
+    def test_single_worker_fails_every_unfinished_job(self) -> None:
+        self.assertGreater(self._fail_interrupted(1), datetime.now() - timedelta(seconds=5))
+
+    def test_multiple_workers_only_fail_stale_jobs(self) -> None:
+        self.assertLess(self._fail_interrupted(4), datetime.now() - timedelta(seconds=60))
+
+
+class PurgeLoopTests(unittest.TestCase):
+    def test_purges_in_batches_until_done(self) -> None:
+        db = mock.AsyncMock()
+        session = mock.MagicMock()
+        session.__aenter__ = mock.AsyncMock(return_value=db)
+        session.__aexit__ = mock.AsyncMock(return_value=False)
+        service = "app.api.v1.modules.exports.service"
+        with mock.patch(f"{service}.AsyncSessionLocal", return_value=session), \
+                mock.patch.object(ExportJobService, "purge_expired_jobs", mock.AsyncMock(side_effect=[100, 3])) as purge, \
+                mock.patch(f"{service}.asyncio.sleep", mock.AsyncMock(side_effect=asyncio.CancelledError)), \
+                self.assertRaises(asyncio.CancelledError):
+            asyncio.run(ExportJobService.purge_loop(60))
+        self.assertEqual(purge.await_count, 2)
+        self.assertEqual(db.commit.await_count, 2)
+
+
+class DownloadTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware, minimum_size=100)
+        app.include_router(export_controller.router, prefix="/exports")
+        app.dependency_overrides[get_current_user_id] = lambda: 1
+        app.dependency_overrides[get_db] = lambda: None
+        cls.client = TestClient(app)
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "projects_export.csv"
+        self.body = b"".join(f"{i},row-{i}\n".encode() for i in range(500))
+        self.path.write_bytes(self.body)
+        patcher = mock.patch(
+            "app.api.v1.modules.exports.service.ExportJobService.get_download",
+            mock.AsyncMock(return_value=(self.path, "projects_export.csv", "text/csv; charset=utf-8")),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_full_download_is_not_recompressed(self) -> None:
+        response = self.client.get("/exports/5/download", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("content-encoding", response.headers)
+        self.assertEqual(response.headers["accept-ranges"], "bytes")
+        self.assertEqual(response.content, self.body)
+
+    def test_range_request_resumes_download(self) -> None:
+        first = self.client.get("/exports/5/download")
+        response = self.client.get(
+            "/exports/5/download",
+            headers={"Range": "bytes=100-", "If-Range": first.headers["etag"]},
+        )
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(
+            response.headers["content-range"], f"bytes 100-{len(self.body) - 1}/{len(self.body)}"
+        )
+        self.assertEqual(response.content, self.body[100:])
+
+
+class GetDownloadTests(unittest.TestCase):
+    def _get(self, job):
+        with mock.patch(
+            "app.api.v1.modules.exports.service.ExportJobCRUD.get_job_by_id",
+            mock.AsyncMock(return_value=job),
+        ):
+            return asyncio.run(ExportJobService.get_download(_FakeSession(), job.JobID))
+
+    def test_unfinished_job_cannot_be_downloaded(self) -> None:
+        with self.assertRaises(InvalidOperationException):
+            self._get(_job(Status=ExportJobStatus.pending.value))
+
+    def test_expired_artifact_is_not_found_and_deleted(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "5" / "x.csv"
+            path.parent.mkdir()
+            path.write_bytes(b"a,b\n")
+            job = _job(
+                Status=ExportJobStatus.succeeded.value,
+                FilePath=str(path),
+                FileName="x.csv",
+                ExpiresAt=datetime.now() - timedelta(seconds=1),
+            )
+            service = "app.api.v1.modules.exports.service"
+            with mock.patch(f"{service}.settings.EXPORT_JOB_DIR", Path(tmp)), \
+                    mock.patch(f"{service}.ExportJobCRUD.update_job", mock.AsyncMock()) as update, \
+                    self.assertRaises(FileNotFoundError):
+                self._get(job)
+            self.assertFalse(path.parent.exists())
+            self.assertEqual(update.await_args.kwargs["Status"], ExportJobStatus.expired.value)
+
+    def test_gzip_artifact_uses_gzip_media_type(self) -> None:
+        with tempfile.NamedTemporaryFile() as tmp:
+            job = _job(
+                Status=ExportJobStatus.succeeded.value,
+                Compression="gzip",
+                FilePath=tmp.name,
+                FileName="x.csv.gz",
+                ExpiresAt=datetime.now() + timedelta(hours=1),
+            )
+            path, name, media_type = self._get(job)
+        self.assertEqual((name, media_type), ("x.csv.gz", "application/gzip"))
+
+
+if __name__ == "__main__":
+    unittest.main()
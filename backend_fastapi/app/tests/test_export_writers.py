@@ -0,0 +1,223 @@
+"""Export writer tests."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import unittest
+import zipfile
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.core.custom_exceptions import ValidationException
+from app.utils.export_helper import ExportHelper
+from app.utils.export_writers import (
+    ArrowExportWriter,
+    CsvExportWriter,
+    ExportColumn,
+    ParquetExportWriter,
+    TsvExportWriter,
+    XlsxExportWriter,
+    ZipExportArchive,
+    get_export_writer,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - 取决于测试环境
+    pa = None
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - 取决于测试环境
+    openpyxl = None
+
+
+class ExportWriterTests(unittest.TestCase):
+    def test_csv_writer_streams_header_and_batches(self) -> None:
+        writer = CsvExportWriter(["编号", "名称"])
+        data = writer.begin() + writer.write_rows([[1, "a,b"]]) + writer.write_rows([[2, "c"]])
+        data += writer.finish()
+        self.assertTrue(data.startswith("\ufeff".encode("utf-8")))
+        rows = list(csv.reader(io.StringIO(data.decode("utf-8-sig"))))
+        self.assertEqual(rows, [["编号", "名称"], ["1", "a,b"], ["2", "c"]])
+
+    def test_csv_writer_chunks_do_not_repeat_rows(self) -> None:
+        writer = CsvExportWriter(["a"])
+        writer.begin()
+        self.assertEqual(writer.write_rows([["x"]]), b"x\r\n")
+        self.assertEqual(writer.write_rows([["y"]]), b"y\r\n")
+
+    def test_tsv_writer(self) -> None:
+        writer = TsvExportWriter(["a", "b"])
+        data = writer.begin() + writer.write_rows([[1, 2.5], ["x", ""]])
+        self.assertEqual(data.decode("utf-8-sig"), "a\tb\n1\t2.5\nx\t\n")
+
+    def test_registry_lookup(self) -> None:
+        self.assertIs(get_export_writer("CSV"), CsvExportWriter)
+        self.assertIs(get_export_writer("txt"), TsvExportWriter)
+        self.assertIs(get_export_writer("xlsx"), XlsxExportWriter)
+        with self.assertRaises(ValidationException):
+            get_export_writer("doc")
+
+
+_TYPED_COLUMNS = [
+    ExportColumn("id", "int"),
+    ExportColumn("weight", "float"),
+    ExportColumn("made", "date"),
+    ExportColumn("name", "str"),
+    ExportColumn("coated", "bool"),
+]
+_TYPED_ROWS = [
+    (1, Decimal("60.5"), date(2026, 1, 1), "=x", 1),
+    (2, None, None, None, None),
+    (3, "", "", "y", 0),
+]
+
+
+async def _batches(batches):
+    for batch in batches:
+        yield batch
+
+
+def _stream(stream) -> bytes:
+    async def collect() -> bytes:
+        return b"".join([chunk async for chunk in stream])
+
+    return asyncio.run(collect())
+
+
+def _encode(writer_class, row_group_size: int, batches) -> bytes:
+    writer = writer_class(_TYPED_COLUMNS)
+    writer.ROW_GROUP_SIZE = row_group_size
+    data = writer.begin()
+    for rows in batches:
+        data += writer.write_rows(rows)
+    return data + writer.finish()
+
+
+@unittest.skipUnless(pa is not None, "pyarrow not installed")
+class ColumnarExportWriterTests(unittest.TestCase):
+    def assert_typed_table(self, table) -> None:
+        self.assertEqual(
+            [str(t) for t in table.schema.types],
+            ["int64", "double", "date32[day]", "string", "bool"],
+        )
+        self.assertEqual(table.column("weight").to_pylist(), [60.5, None, None])
+        self.assertEqual(table.column("made").to_pylist(), [date(2026, 1, 1), None, None])
+        self.assertEqual(table.column("name").to_pylist(), ["=x", None, "y"])
+        self.assertEqual(table.column("coated").to_pylist(), [True, None, False])
+
+    def test_parquet_round_trip_with_row_groups(self) -> None:
+        data = _encode(ParquetExportWriter, 2, [_TYPED_ROWS[:1], _TYPED_ROWS[1:]])
+        parquet = pq.ParquetFile(io.BytesIO(data))
+        self.assertEqual(parquet.metadata.num_row_groups, 2)
+        self.assert_typed_table(parquet.read())
+
+    def test_arrow_round_trip(self) -> None:
+        data = _encode(ArrowExportWriter, 2, [_TYPED_ROWS])
+        reader = pa.ipc.open_file(data)
+        self.assertEqual(reader.num_record_batches, 2)
+        self.assert_typed_table(reader.read_all())
+
+    def test_rows_are_buffered_until_row_group_is_full(self) -> None:
+        writer = ParquetExportWriter(_TYPED_COLUMNS)
+        writer.ROW_GROUP_SIZE = 10
+        writer.begin()
+        self.assertEqual(writer.write_rows(_TYPED_ROWS), b"")
+        self.assertTrue(writer.finish().endswith(b"PAR1"))
+
+    def test_helper_exports_objects_in_batches(self) -> None:
+        items = [
+            SimpleNamespace(id=i, weight=Decimal("1.25"), made=None, name=f"m{i}", coated=None)
+            for i in range(5)
+        ]
+        data = _stream(ExportHelper.stream_export(
+            _batches([items[:2], items[2:4], items[4:]]), ArrowExportWriter, {}, _TYPED_COLUMNS
+        ))
+        table = pa.ipc.open_file(data).read_all()
+        self.assertEqual(table.column("id").to_pylist(), [0, 1, 2, 3, 4])
+        self.assertEqual(table.column("weight").to_pylist(), [1.25] * 5)
+
+    def test_registry_marks_columnar_formats(self) -> None:
+        self.assertTrue(get_export_writer("parquet").columnar)
+        self.assertTrue(get_export_writer("arrow").columnar)
+        self.assertFalse(get_export_writer("csv").columnar)
+
+
+def _read_workbook(data: bytes):
+    workbook = openpyxl.load_workbook(io.BytesIO(data))
+    return {sheet.title: list(sheet.values) for sheet in workbook}
+
+
+@unittest.skipUnless(openpyxl is not None, "openpyxl not installed")
+class XlsxExportWriterTests(unittest.TestCase):
+    def test_streamed_workbook_keeps_types_and_text(self) -> None:
+        writer = XlsxExportWriter(["编号", "名称", "重量"])
+        data = writer.begin()
+        data += writer.write_rows([[1, "a<&>b", Decimal("60.5")], [2, " padded ", ""]])
+        data += writer.write_rows([[3, "'=SUM(A1)\x01", None]])
+        data += writer.finish()
+        sheets = _read_workbook(data)
+        self.assertEqual(
+            sheets["Sheet1"],
+            [
+                ("编号", "名称", "重量"),
+                (1, "a<&>b", 60.5),
+                (2, " padded ", None),
+                (3, "'=SUM(A1)", None),
+            ],
+        )
+
+    def test_rows_roll_over_to_new_sheet_with_header(self) -> None:
+        writer = XlsxExportWriter(["a"])
+        writer.MAX_SHEET_ROWS = 3
+        data = writer.begin() + writer.write_rows([[i] for i in range(5)]) + writer.finish()
+        sheets = _read_workbook(data)
+        self.assertEqual(list(sheets), ["Sheet1", "Sheet2", "Sheet3"])
+        self.assertEqual(sheets["Sheet2"], [("a",), (2,), (3,)])
+        self.assertEqual(sheets["Sheet3"], [("a",), (4,)])
+
+    def test_output_is_streamed_per_batch(self) -> None:
+        writer = XlsxExportWriter(["a", "b"])
+        head = writer.begin()
+        body = b"".join(
+            writer.write_rows([[i, f"row {i}" * 20] for i in range(start, start + 2000)])
+            for start in range(0, 20000, 2000)
+        )
+        tail = writer.finish()
+        # 数据在写行时就已输出，文件尾只剩压缩器残余和工作簿结构
+        self.assertGreater(len(body), len(tail))
+        self.assertEqual(len(_read_workbook(head + body + tail)["Sheet1"]), 20001)
+
+    def test_helper_sanitizes_text_values(self) -> None:
+        items = [SimpleNamespace(id=1, name="=cmd", weight=Decimal("1.50"), note=None)]
+        mapping = {"id": "编号", "name": "名称", "weight": "重量", "note": "备注"}
+        data = _stream(ExportHelper.stream_export(_batches([items]), XlsxExportWriter, mapping, []))
+        self.assertEqual(_read_workbook(data)["Sheet1"][1], (1, "'=cmd", 1.5, None))
+        csv_data = _stream(ExportHelper.stream_export(_batches([items]), CsvExportWriter, mapping, []))
+        self.assertEqual(csv_data.decode("utf-8-sig").splitlines()[1], "1,'=cmd,1.50,")
+
+
+class ZipExportArchiveTests(unittest.TestCase):
+    def test_entries_are_streamed_and_stored_when_compressed(self) -> None:
+        archive = ZipExportArchive()
+        data = archive.open_entry("part01.csv")
+        data += archive.write(b"a,b\n" * 1000) + archive.close_entry()
+        data += archive.open_entry("part02.xlsx", compress=not XlsxExportWriter.compressed)
+        data += archive.write(b"PK-data") + archive.close_entry()
+        data += archive.finish()
+
+        result = zipfile.ZipFile(io.BytesIO(data))
+        self.assertIsNone(result.testzip())
+        first, second = result.infolist()
+        self.assertEqual(first.compress_type, zipfile.ZIP_DEFLATED)
+        self.assertEqual(second.compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(result.read("part01.csv"), b"a,b\n" * 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""FormulaCode sequence allocation tests."""
+
+from __future__ import annotations
+
+import unittest
+from datetime import date
+
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.modules.projects.crud import ProjectCRUD
+
+
+class FormulaCodeTests(unittest.TestCase):
+    def test_prefix_uses_initials_and_date(self) -> None:
+        self.assertEqual(
+            ProjectCRUD._formula_code_prefix("Zhang San", date(2024, 1, 1)),
+            "ZS-01012024-",
+        )
+        self.assertEqual(
+            ProjectCRUD._formula_code_prefix("li", date(2024, 12, 31)),
+            "LI-31122024-",
+        )
+
+    def test_create_statement_allocates_sequence_in_one_round_trip(self) -> None:
+        stmt = ProjectCRUD._build_create_statement(
+            project_name="P1",
+            project_type_fk=1,
+            formulator_name="Zhang San",
+            formulation_date=date(2024, 1, 1),
+        )
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        sql = " ".join(str(compiled).split())
+
+        self.assertTrue(sql.startswith("WITH formula_seq AS (INSERT INTO \"tbl_FormulaCodeSequence\""))
+        self.assertIn(
+            'ON CONFLICT ("FormulationDate", "ProjectType_FK") DO UPDATE SET "LastValue"',
+            sql,
+        )
+        self.assertIn('INSERT INTO "tbl_ProjectInfo"', sql)
+        self.assertIn("FROM formula_seq RETURNING", sql)
+        self.assertNotIn("count(", sql.lower())
+        self.assertIn("ZS-01012024-", compiled.params.values())
+
+
+if __name__ == "__main__":
+    unittest.main()
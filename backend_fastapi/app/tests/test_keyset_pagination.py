@@ -0,0 +1,90 @@
+"""Keyset pagination cursor and condition tests."""
+
+from __future__ import annotations
+
+import unittest
+from datetime import date
+
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.modules.projects.model import ProjectModel
+from app.core.custom_exceptions import ValidationException
+from app.utils.keyset import build_keyset_condition, decode_cursor, encode_cursor
+
+
+def _sql(clause) -> str:
+    return str(
+        clause.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+class KeysetCursorTests(unittest.TestCase):
+    def test_round_trip_with_date_value(self) -> None:
+        token = encode_cursor("FormulationDate", "asc", date(2024, 1, 2), 42)
+        decoded = decode_cursor(token, "FormulationDate", "asc")
+        self.assertEqual(decoded, {"value": "2024-01-02", "id": 42})
+
+    def test_rejects_cursor_from_other_sort(self) -> None:
+        token = encode_cursor("ProjectName", "asc", "abc", 7)
+        with self.assertRaises(ValidationException):
+            decode_cursor(token, "ProjectName", "desc")
+
+    def test_relevance_cursor_is_bound_to_keyword(self) -> None:
+        token = encode_cursor("relevance", "desc", 0.42, 7, keyword="resin")
+        self.assertEqual(decode_cursor(token, "relevance", "desc", "resin"), {"value": 0.42, "id": 7})
+        with self.assertRaises(ValidationException):
+            decode_cursor(token, "relevance", "desc", "epoxy")
+        with self.assertRaises(ValidationException):
+            decode_cursor(encode_cursor("relevance", "desc", 0.42, 7), "relevance", "desc", "resin")
+
+    def test_rejects_garbage_token(self) -> None:
+        with self.assertRaises(ValidationException):
+            decode_cursor("not-a-cursor", "ProjectID", "desc")
+
+
+class KeysetConditionTests(unittest.TestCase):
+    def test_primary_key_sort_uses_simple_comparison(self) -> None:
+        clause = build_keyset_condition(
+            ProjectModel.ProjectID, ProjectModel.ProjectID, 100, 100, descending=True
+        )
+        self.assertIn('"ProjectID" < 100', _sql(clause))
+
+    def test_row_value_comparison_for_secondary_sort(self) -> None:
+        clause = build_keyset_condition(
+            ProjectModel.ProjectName,
+            ProjectModel.ProjectID,
+            "abc",
+            5,
+            descending=False,
+        )
+        sql = _sql(clause)
+        self.assertIn('("tbl_ProjectInfo"."ProjectName", "tbl_ProjectInfo"."ProjectID") >', sql)
+        self.assertNotIn("IS NULL", sql)
+
+    def test_nullable_ascending_keeps_trailing_nulls(self) -> None:
+        clause = build_keyset_condition(
+            ProjectModel.FormulationDate,
+            ProjectModel.ProjectID,
+            date(2024, 1, 2),
+            5,
+            descending=False,
+            nullable=True,
+        )
+        self.assertIn('"FormulationDate" IS NULL', _sql(clause))
+
+    def test_null_cursor_descending_moves_to_non_null_rows(self) -> None:
+        clause = build_keyset_condition(
+            ProjectModel.FormulationDate,
+            ProjectModel.ProjectID,
+            None,
+            5,
+            descending=True,
+            nullable=True,
+        )
+        self.assertIn('"FormulationDate" IS NOT NULL', _sql(clause))
+
+
+if __name__ == "__main__":
+    unittest.main()
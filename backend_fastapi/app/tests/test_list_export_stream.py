@@ -0,0 +1,149 @@
+"""Batched streaming export tests for the materials and fillers lists."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from app.api.v1.modules.exports.service import EXPORT_SOURCES
+from app.api.v1.modules.fillers import controller as filler_controller
+from app.api.v1.modules.fillers.crud import FillerCRUD
+from app.api.v1.modules.fillers.schema import FillerQueryParams
+from app.api.v1.modules.fillers.service import FillerService
+from app.api.v1.modules.materials.crud import MaterialCRUD
+from app.api.v1.modules.materials.schema import (
+    MATERIAL_EXPORT_COLUMNS,
+    MATERIAL_EXPORT_MAPPING,
+    MaterialQueryParams,
+)
+from app.api.v1.modules.materials.service import MaterialService
+from app.utils.export_helper import ExportHelper
+from app.utils.export_writers import (
+    ArrowExportWriter,
+    CsvExportWriter,
+    ExportProgress,
+    TsvExportWriter,
+)
+from app.utils.pg_copy import compile_query
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - 取决于测试环境
+    pa = None
+
+
+def _material(material_id: int, trade_name: str = "Resin"):
+    return SimpleNamespace(
+        MaterialID=material_id,
+        TradeName=trade_name,
+        CategoryName="树脂",
+        Supplier="BASF",
+        CAS_Number=None,
+        Density=1.2,
+        Viscosity=None,
+        FunctionDescription="=SUM(A1)",
+    )
+
+
+class _Batches:
+    """记录是否被关闭的异步批次迭代器"""
+
+    def __init__(self, batches):
+        self.batches = batches
+        self.closed = False
+        self.pulled = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.pulled >= len(self.batches):
+            raise StopAsyncIteration
+        self.pulled += 1
+        return self.batches[self.pulled - 1]
+
+    async def aclose(self):
+        self.closed = True
+
+
+async def _collect(stream, limit=None):
+    chunks = []
+    async for chunk in stream:
+        chunks.append(chunk)
+        if limit and len(chunks) >= limit:
+            break
+    await stream.aclose()
+    return chunks
+
+
+class StreamExportTests(unittest.TestCase):
+    def test_text_export_writes_every_batch(self) -> None:
+        batches = _Batches([[_material(1), _material(2)], [], [_material(3)]])
+        stream = ExportHelper.stream_export(
+            batches, CsvExportWriter, MATERIAL_EXPORT_MAPPING, MATERIAL_EXPORT_COLUMNS
+        )
+        body = b"".join(asyncio.run(_collect(stream))).decode("utf-8-sig")
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], list(MATERIAL_EXPORT_MAPPING.values()))
+        self.assertEqual([row[0] for row in rows[1:]], ["1", "2", "3"])
+        self.assertIn("'=SUM(A1)", rows[1])
+        self.assertTrue(batches.closed)
+
+    @unittest.skipUnless(pa is not None, "pyarrow not installed")
+    def test_columnar_export_keeps_types(self) -> None:
+        batches = _Batches([[_material(1)], [_material(2)]])
+        stream = ExportHelper.stream_export(
+            batches, ArrowExportWriter, MATERIAL_EXPORT_MAPPING, MATERIAL_EXPORT_COLUMNS
+        )
+        table = pa.ipc.open_file(pa.BufferReader(b"".join(asyncio.run(_collect(stream))))).read_all()
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column(0).to_pylist(), [1, 2])
+
+    def test_early_close_closes_batches(self) -> None:
+        batches = _Batches([[_material(i)] for i in range(10)])
+        stream = ExportHelper.stream_export(
+            batches, TsvExportWriter, MATERIAL_EXPORT_MAPPING, MATERIAL_EXPORT_COLUMNS
+        )
+        asyncio.run(_collect(stream, limit=2))
+        self.assertLess(batches.pulled, 10)
+        self.assertTrue(batches.closed)
+
+
+class ExportRoutingTests(unittest.TestCase):
+    def test_list_query_is_not_truncated(self) -> None:
+        for stmt in (
+            MaterialCRUD.build_list_query(None, "BASF", None),
+            FillerCRUD.build_list_query("SiO2", None, None),
+        ):
+            sql, _ = compile_query(stmt)
+            self.assertIn("ORDER BY", sql)
+            self.assertNotIn("LIMIT", sql)
+
+    def test_copy_is_used_only_for_csv(self) -> None:
+        params = MaterialQueryParams()
+        with mock.patch("app.api.v1.modules.materials.service.settings.EXPORT_USE_COPY", True), \
+                mock.patch.object(MaterialService, "stream_export_csv") as copy:
+            progress = ExportProgress()
+            MaterialService.stream_export(params, CsvExportWriter, progress)
+            copy.assert_called_once_with(params, progress)
+            copy.reset_mock()
+            stream = MaterialService.stream_export(params, TsvExportWriter)
+            copy.assert_not_called()
+            asyncio.run(stream.aclose())
+
+    def test_filler_export_route_is_registered_once(self) -> None:
+        paths = [route.path for route in filler_controller.router.routes]
+        self.assertEqual(paths.count("/export"), 1)
+
+    def test_list_sources_are_available_for_export_jobs(self) -> None:
+        self.assertIs(EXPORT_SOURCES["materials"].params_model, MaterialQueryParams)
+        self.assertIs(EXPORT_SOURCES["fillers"].params_model, FillerQueryParams)
+        self.assertEqual(EXPORT_SOURCES["fillers"].stream, FillerService.stream_export)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""List projection read path tests."""
+
+from __future__ import annotations
+
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from app.api.v1.modules.fillers.crud import FillerCRUD
+from app.api.v1.modules.fillers.schema import FILLER_LIST_ADAPTER, FillerResponse
+from app.api.v1.modules.materials.crud import MaterialCRUD
+from app.api.v1.modules.materials.schema import MATERIAL_LIST_ADAPTER, MaterialResponse
+from app.api.v1.modules.projects.crud import ProjectCRUD
+from app.api.v1.modules.projects.schema import PROJECT_LIST_ADAPTER, ProjectBasicResponse
+
+
+class ProjectionColumnsTests(unittest.TestCase):
+    def test_projection_covers_response_fields(self) -> None:
+        cases = [
+            (ProjectCRUD.LIST_COLUMNS, ProjectBasicResponse),
+            (MaterialCRUD.LIST_COLUMNS, MaterialResponse),
+            (FillerCRUD.LIST_COLUMNS, FillerResponse),
+        ]
+        for columns, response in cases:
+            with self.subTest(response=response.__name__):
+                names = {column.key for column in columns}
+                required = {
+                    name for name, field in response.model_fields.items()
+                    if field.is_required()
+                }
+                self.assertLessEqual(required, names)
+                self.assertLessEqual(names, set(response.model_fields))
+
+
+class ListAdapterTests(unittest.TestCase):
+    def test_project_rows_validate_in_one_call(self) -> None:
+        rows = [
+            {
+                "ProjectID": 1,
+                "ProjectName": "P1",
+                "ProjectType_FK": 2,
+                "TypeName": "喷墨",
+                "SubstrateApplication": None,
+                "FormulatorName": "Ann Lee",
+                "FormulationDate": date(2026, 1, 2),
+                "FormulaCode": "AL-02012026-INK-01",
+                "sort_value": 1,
+            }
+        ]
+        projects = PROJECT_LIST_ADAPTER.validate_python(rows)
+        self.assertIsInstance(projects[0], ProjectBasicResponse)
+        self.assertEqual(projects[0].TypeName, "喷墨")
+        dumped = PROJECT_LIST_ADAPTER.dump_python(projects, mode="json")
+        self.assertEqual(dumped[0]["FormulationDate"], "2026-01-02")
+        self.assertNotIn("sort_value", dumped[0])
+
+    def test_material_and_filler_rows_keep_joined_names(self) -> None:
+        materials = MATERIAL_LIST_ADAPTER.validate_python(
+            [{"MaterialID": 1, "TradeName": "M1", "CategoryName": "树脂", "Density": Decimal("1.05")}]
+        )
+        fillers = FILLER_LIST_ADAPTER.validate_python(
+            [{"FillerID": 1, "TradeName": "F1", "FillerTypeName": "二氧化硅"}]
+        )
+        self.assertEqual(materials[0].CategoryName, "树脂")
+        self.assertEqual(fillers[0].FillerTypeName, "二氧化硅")
+
+
+if __name__ == "__main__":
+    unittest.main()
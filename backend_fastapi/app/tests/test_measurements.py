@@ -0,0 +1,136 @@
+"""Unit-aware test result parser, shadow columns and range filter tests."""
+
+from __future__ import annotations
+
+import unittest
+
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.modules.projects.crud import ProjectCRUD
+from app.api.v1.modules.projects.export_service import TestResultPlan
+from app.api.v1.modules.projects.model import TestResultInkModel
+from app.core.custom_exceptions import ValidationException
+from app.utils.chart_data import INDUSTRY_STANDARDS, radar_series
+from app.utils.measurements import (
+    DETAIL_COLUMNS,
+    FIELDS_BY_NAME,
+    PARSE_CONVERTED,
+    PARSE_INVALID,
+    PARSE_NO_UNIT,
+    PARSE_OK,
+    PARSE_RANGE,
+    PARSE_UNKNOWN_UNIT,
+    convert_to_unit,
+    parse_measurement,
+    shadow_values,
+)
+
+
+class ParseMeasurementTests(unittest.TestCase):
+    def test_values_are_converted_to_canonical_unit(self) -> None:
+        cases = [
+            ("Ink_Viscosity", "21 cP", 21.0, "cP", PARSE_OK),
+            ("Ink_Viscosity", "21 mPa·s", 21.0, "cP", PARSE_OK),
+            ("Ink_Viscosity", "0.5 Pa.s", 500.0, "cP", PARSE_CONVERTED),
+            ("Ink_Viscosity", "10-20 cP", 15.0, "cP", PARSE_RANGE),
+            ("Ink_ParticleSize", "0.25 μm", 250.0, "nm", PARSE_CONVERTED),
+            ("Ink_SurfaceTension", "32", 32.0, "mN/m", PARSE_NO_UNIT),
+            ("Ink_ColorValue", "L*=52.1, a*=1.2", 52.1, "Lab*", PARSE_OK),
+            ("Coating_SurfaceHardness", "2H", 2.0, "H", PARSE_OK),
+            ("Coating_SurfaceHardness", "HB", 0.0, "H", PARSE_OK),
+            ("Print3D_YoungsModulus", "2.1 GPa", 2100.0, "MPa", PARSE_CONVERTED),
+            ("Print3D_ShoreHardness", "Shore D 80", 80.0, "Shore D", PARSE_OK),
+            ("Composite_WaterAbsorption", "0,5 %", 0.5, "%", PARSE_OK),
+            ("Ink_Viscosity", "15cP @25°C", 15.0, "cP", PARSE_OK),
+            ("Ink_Viscosity", "21 cP at 25 C", 21.0, "cP", PARSE_OK),
+            ("Coating_SurfaceHardness", "3H (ASTM D3363)", 3.0, "H", PARSE_OK),
+            ("Coating_SurfaceHardness", "HB (ASTM D3363)", 0.0, "H", PARSE_OK),
+            ("Print3D_ShoreHardness", "80 Shore D", 80.0, "Shore D", PARSE_OK),
+        ]
+        for field, raw, value, unit, status in cases:
+            with self.subTest(field=field, raw=raw):
+                parsed = parse_measurement(field, raw)
+                self.assertAlmostEqual(parsed.value, value)
+                self.assertEqual((parsed.unit, parsed.status), (unit, status))
+
+    def test_unparsable_values(self) -> None:
+        self.assertEqual(parse_measurement("Ink_Viscosity", "Good").status, PARSE_INVALID)
+        unknown = parse_measurement("Ink_Viscosity", "21 furlongs")
+        self.assertIsNone(unknown.value)
+        self.assertEqual(unknown.status, PARSE_UNKNOWN_UNIT)
+        self.assertIsNone(parse_measurement("Ink_Viscosity", None).status)
+
+    def test_convert_to_unit(self) -> None:
+        self.assertEqual(convert_to_unit("Ink_Viscosity", 1, "Pa·s"), 1000.0)
+        self.assertEqual(convert_to_unit("Ink_Viscosity", 12, None), 12.0)
+        with self.assertRaises(ValueError):
+            convert_to_unit("Ink_Viscosity", 1, "nm")
+        with self.assertRaises(ValueError):
+            convert_to_unit("Unknown", 1, None)
+
+    def test_canonical_units_match_radar_standards(self) -> None:
+        for standards in INDUSTRY_STANDARDS.values():
+            for field, standard in standards.items():
+                self.assertEqual(FIELDS_BY_NAME[field].unit, standard["unit"])
+
+
+class ShadowValueTests(unittest.TestCase):
+    def test_only_present_fields_are_written(self) -> None:
+        values = shadow_values({"Ink_Viscosity": "0.5 Pa.s", "Notes": "x"})
+        self.assertEqual(values, {
+            "Ink_Viscosity_Value": 500.0,
+            "Ink_Viscosity_Unit": "cP",
+            "Ink_Viscosity_ParseStatus": PARSE_CONVERTED,
+        })
+
+    def test_radar_prefers_parsed_value_column(self) -> None:
+        series = radar_series({"Ink_Viscosity": "garbled", "Ink_Viscosity_Value": 50.0}, "Inkjet")
+        self.assertEqual(series["measured"], [50.0])
+        series = radar_series({"Ink_ParticleSize": "0.25 um"}, "Inkjet")
+        self.assertEqual(series["measured"], [250.0])
+
+    def test_radar_parses_rows_without_shadow_values(self) -> None:
+        row = {"Ink_Viscosity": "0.5 Pa.s", "Ink_Viscosity_Value": None, "Ink_Viscosity_ParseStatus": None}
+        self.assertEqual(radar_series(row, "Inkjet")["measured"], [500.0])
+        row = {"Ink_Viscosity": "Good", "Ink_Viscosity_Value": None, "Ink_Viscosity_ParseStatus": PARSE_INVALID}
+        self.assertEqual(radar_series(row, "Inkjet")["measured"], [])
+
+    def test_export_plan_keeps_value_but_not_detail_columns(self) -> None:
+        plan = TestResultPlan.from_model(TestResultInkModel)
+        self.assertIn("Ink_Viscosity_Value", plan.keys)
+        self.assertFalse(DETAIL_COLUMNS & set(plan.keys))
+        row = ["21 cP" if key == "Ink_Viscosity" else 21.0 if key == "Ink_Viscosity_Value" else None
+               for key in plan.keys]
+        self.assertEqual(plan.format(row), "Ink_Viscosity=21 cP")
+
+
+class RangeConditionTests(unittest.TestCase):
+    def _sql(self, **kwargs) -> str:
+        conditions = ProjectCRUD._build_list_conditions(**kwargs)
+        self.assertEqual(len(conditions), 1)
+        return str(conditions[0].compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        ))
+
+    def test_bounds_are_converted_and_use_value_column(self) -> None:
+        sql = self._sql(test_field="Ink_Viscosity", test_min=0.01, test_max=0.02, test_unit="Pa·s")
+        self.assertIn('"Ink_Viscosity_Value" >= 10.0', sql)
+        self.assertIn('"Ink_Viscosity_Value" <= 20.0', sql)
+        self.assertIn('"ProjectID" IN (SELECT "tbl_TestResults_Ink"."ProjectID_FK"', sql)
+
+    def test_open_ended_range(self) -> None:
+        sql = self._sql(test_field="Print3D_YoungsModulus", test_min=2, test_unit="GPa")
+        self.assertIn('"Print3D_YoungsModulus_Value" >= 2000.0', sql)
+        self.assertNotIn("<=", sql)
+
+    def test_invalid_field_or_unit(self) -> None:
+        with self.assertRaises(ValidationException):
+            ProjectCRUD._build_list_conditions(test_field="ProjectName", test_min=1)
+        with self.assertRaises(ValidationException):
+            ProjectCRUD._build_list_conditions(test_field="Ink_Viscosity", test_min=1, test_unit="nm")
+        with self.assertRaises(ValidationException):
+            ProjectCRUD._build_list_conditions(test_field="Ink_Viscosity")
+
+
+if __name__ == "__main__":
+    unittest.main()
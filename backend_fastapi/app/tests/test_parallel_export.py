@@ -0,0 +1,313 @@
+"""Range-sharded parallel project export, shard spool and connection budget tests."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from app.api.v1.modules.projects import export_service
+from app.api.v1.modules.projects.export_service import ProjectExportService
+from app.api.v1.modules.projects.schema import ProjectQueryParams
+from app.utils.connection_budget import ConnectionBudget
+from app.utils.export_spool import (
+    STATUS_DONE,
+    STATUS_RUNNING,
+    ExportCancelledError,
+    ExportSpool,
+    ExportSpoolFullError,
+    SpoolWriter,
+    create_spool_file,
+)
+from app.utils.export_writers import CsvExportWriter, ExportProgress, XlsxExportWriter
+
+SNAPSHOT_ID = "00000003-0000001B-1"
+SHARD_BOUNDS = [(None, 10), (10, 20), (20, None)]
+
+
+class _ScalarResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one(self):
+        return self.value
+
+
+class _ScalarConnection:
+    def __init__(self, value):
+        self.value = value
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        return _ScalarResult(self.value)
+
+
+class _Snapshot:
+    def __init__(self, snapshot_id, opened):
+        self.snapshot_id = snapshot_id
+        self.opened = opened
+
+    async def __aenter__(self):
+        self.opened.append(self.snapshot_id)
+        return mock.Mock()
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _shard_rows(after_id, upper_id):
+    """假分片数据：每个区间 3 批，每批 2 个项目"""
+    start = 0 if after_id is None else after_id
+    ids = list(range(start + 1, start + 7))
+    return [ids[i:i + 2] for i in range(0, 6, 2)]
+
+
+class ExportSpoolTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = create_spool_file(self.tmp.name)
+        self.writer = SpoolWriter(self.path, max_bytes=1000)
+        self.done = False
+        self.spool = ExportSpool(self.path, lambda: self.done, poll_interval=0.001)
+
+    def tearDown(self) -> None:
+        self.writer.close()
+        self.spool.discard()
+        self.tmp.cleanup()
+
+    async def test_frames_keep_order_and_report_progress(self) -> None:
+        self.writer.start()
+        for item in range(3):
+            self.writer.write(b"chunk-%d" % item, items=item + 1, rows=10 * (item + 1))
+        self.writer.finish()
+        self.assertEqual(self.spool.state(), (STATUS_DONE, 3, 30))
+        self.assertEqual([chunk async for chunk in self.spool], [b"chunk-0", b"chunk-1", b"chunk-2"])
+        self.spool.discard()
+        self.assertFalse(os.path.exists(self.path))
+
+    async def test_consumer_waits_for_producer_in_another_thread(self) -> None:
+        def produce():
+            self.writer.start()
+            for item in range(4):
+                time.sleep(0.01)
+                self.writer.write(bytes([item]))
+            self.writer.finish()
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        await self.spool.wait_started()
+        self.assertIn(self.spool.state()[0], (STATUS_RUNNING, STATUS_DONE))
+        self.assertEqual([chunk async for chunk in self.spool], [b"\x00", b"\x01", b"\x02", b"\x03"])
+        thread.join()
+
+    async def test_error_is_raised_after_buffered_items(self) -> None:
+        self.writer.write(b"a")
+        self.writer.fail(RuntimeError("boom"))
+        with self.assertRaises(RuntimeError):
+            await self.spool.wait_started()
+        received = []
+        with self.assertRaises(RuntimeError):
+            async for item in self.spool:
+                received.append(item)
+        self.assertEqual(received, [b"a"])
+
+    async def test_byte_cap_fails_the_writer(self) -> None:
+        self.writer.write(b"x" * 900)
+        with self.assertRaises(ExportSpoolFullError):
+            self.writer.write(b"x" * 200)
+
+    async def test_cancel_stops_the_writer(self) -> None:
+        self.writer.write(b"a")
+        self.spool.cancel()
+        with self.assertRaises(ExportCancelledError):
+            self.writer.write(b"b")
+
+    async def test_producer_exit_without_end_frame_is_an_error(self) -> None:
+        self.writer.write(b"a")
+        self.done = True
+        self.assertEqual(await self.spool.__anext__(), b"a")
+        with self.assertRaises(RuntimeError):
+            await self.spool.__anext__()
+
+
+class ConnectionBudgetTests(unittest.IsolatedAsyncioTestCase):
+    async def test_grant_shrinks_to_what_is_free(self) -> None:
+        budget = ConnectionBudget(5)
+        async with budget.acquire(4) as first:
+            async with budget.acquire(9, minimum=1) as second:
+                self.assertEqual((first, second, budget.available), (4, 1, 0))
+        self.assertEqual(budget.available, 5)
+
+    async def test_waits_until_minimum_is_free_in_arrival_order(self) -> None:
+        budget = ConnectionBudget(3)
+        granted = []
+
+        async def request(name, wanted, minimum):
+            async with budget.acquire(wanted, minimum=minimum) as count:
+                granted.append((name, count))
+                await asyncio.sleep(0.01)
+
+        async with budget.acquire(3):
+            tasks = [
+                asyncio.create_task(request("big", 3, 3)),
+                asyncio.create_task(request("small", 1, 1)),
+            ]
+            await asyncio.sleep(0.01)
+            self.assertEqual((granted, budget.waiting), ([], 2))
+        await asyncio.gather(*tasks)
+        self.assertEqual(granted, [("big", 3), ("small", 1)])
+        self.assertEqual(budget.available, 3)
+
+    async def test_cancelled_waiter_leaves_the_queue(self) -> None:
+        budget = ConnectionBudget(2)
+        async with budget.acquire(2):
+            waiter = asyncio.create_task(budget.acquire(2).__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiter
+            self.assertEqual(budget.waiting, 0)
+        async with budget.acquire(2) as count:
+            self.assertEqual(count, 2)
+
+
+class ShardBoundsTests(unittest.IsolatedAsyncioTestCase):
+    async def test_cut_points_become_half_open_ranges(self) -> None:
+        conn = _ScalarConnection([10, 10, 20])
+        bounds = await ProjectExportService.get_shard_bounds(conn, [], 4)
+        self.assertEqual(bounds, SHARD_BOUNDS)
+        self.assertIn("percentile_disc", str(conn.statements[0]))
+
+    async def test_single_shard_or_no_rows(self) -> None:
+        conn = _ScalarConnection(None)
+        self.assertEqual(await ProjectExportService.get_shard_bounds(conn, [], 1), [(None, None)])
+        self.assertEqual(conn.statements, [])
+        self.assertEqual(await ProjectExportService.get_shard_bounds(conn, [], 3), [(None, None)])
+
+    async def test_project_batch_respects_upper_bound(self) -> None:
+        class _Rows:
+            def all(self):
+                return []
+
+        conn = mock.Mock(execute=mock.AsyncMock(return_value=_Rows()))
+        await ProjectExportService.get_project_batch(conn, [], 5, 100, upper_id=20)
+        sql = str(conn.execute.await_args.args[0])
+        self.assertIn('"tbl_ProjectInfo"."ProjectID" >', sql)
+        self.assertIn('"tbl_ProjectInfo"."ProjectID" <=', sql)
+
+
+class ParallelExportTests(unittest.IsolatedAsyncioTestCase):
+    def _patches(self, opened, fail_shard=None, bounds=SHARD_BOUNDS):
+        async def iter_range_rows(conn, conditions, batch_size, typed, progress,
+                                  after_id=None, upper_id=None, label=""):
+            for ids in _shard_rows(after_id, upper_id):
+                if fail_shard is not None and after_id == fail_shard:
+                    raise RuntimeError("shard failed")
+                await asyncio.sleep(0)
+                if progress is not None:
+                    progress.processed_items += len(ids)
+                yield [[project_id, f"P{project_id}"] for project_id in ids]
+
+        service = ProjectExportService
+        self.get_shard_bounds = mock.AsyncMock(return_value=bounds)
+        return [
+            mock.patch.object(
+                service, "snapshot_connection",
+                side_effect=lambda snapshot_id=None: _Snapshot(snapshot_id, opened),
+            ),
+            mock.patch.object(service, "export_snapshot", mock.AsyncMock(return_value=SNAPSHOT_ID)),
+            mock.patch.object(service, "count_projects", mock.AsyncMock(return_value=18)),
+            mock.patch.object(service, "get_shard_bounds", self.get_shard_bounds),
+            mock.patch.object(service, "iter_range_rows", side_effect=iter_range_rows),
+            mock.patch.object(service, "MIN_SHARD_PROJECTS", 1),
+            # 分片在线程中执行（同一进程内，上面的 mock 对分片同样生效）
+            mock.patch.object(export_service, "get_shard_executor", return_value=self.executor),
+            mock.patch.object(
+                export_service, "create_spool_file",
+                functools.partial(create_spool_file, self.tmp.name),
+            ),
+        ]
+
+    def setUp(self) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=8)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.executor.shutdown(wait=True)
+        self.tmp.cleanup()
+
+    async def _run(self, opened, writer_class=CsvExportWriter, **kwargs):
+        patches = self._patches(
+            opened, kwargs.pop("fail_shard", None), kwargs.pop("bounds", SHARD_BOUNDS)
+        )
+        for patcher in patches:
+            patcher.start()
+        try:
+            stream = ProjectExportService.stream_export_parallel(
+                ProjectQueryParams(), writer_class, shards=3, **kwargs
+            )
+            return b"".join([chunk async for chunk in stream])
+        finally:
+            for patcher in patches:
+                patcher.stop()
+            # 分片缓冲文件在导出结束（包括失败）时删除
+            self.assertEqual(os.listdir(self.tmp.name), [])
+
+    async def test_ordered_output_matches_shard_order(self) -> None:
+        opened = []
+        progress = ExportProgress()
+        data = await self._run(opened, progress=progress)
+        lines = data.decode("utf-8-sig").splitlines()
+        self.assertEqual(lines[0].split(","), ProjectExportService.HEADER_COLUMNS)
+        ids = [int(line.split(",")[0]) for line in lines[1:]]
+        expected = [i for bounds in SHARD_BOUNDS for batch in _shard_rows(*bounds) for i in batch]
+        self.assertEqual(ids, expected)
+        # 协调连接导出快照，三个分片连接导入同一快照
+        self.assertEqual(opened, [None, SNAPSHOT_ID, SNAPSHOT_ID, SNAPSHOT_ID])
+        self.assertEqual((progress.total_items, progress.processed_items), (18, 18))
+
+    async def test_split_output_is_a_zip_with_one_file_per_shard(self) -> None:
+        data = await self._run([], split=True)
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        self.assertIsNone(archive.testzip())
+        names = archive.namelist()
+        self.assertEqual(names, [f"projects_export_part0{i}.csv" for i in (1, 2, 3)])
+        for name, bounds in zip(names, SHARD_BOUNDS):
+            lines = archive.read(name).decode("utf-8-sig").splitlines()
+            self.assertEqual(lines[0].split(","), ProjectExportService.HEADER_COLUMNS)
+            self.assertEqual(len(lines), 7)
+            self.assertEqual(int(lines[1].split(",")[0]), _shard_rows(*bounds)[0][0])
+
+    async def test_shard_failure_fails_the_export(self) -> None:
+        with self.assertRaises(RuntimeError):
+            await self._run([], fail_shard=10)
+
+    async def test_spool_byte_cap_fails_the_export(self) -> None:
+        with mock.patch.object(export_service.settings, "EXPORT_SPOOL_MAX_BYTES", 60):
+            with self.assertRaises(ExportSpoolFullError):
+                await self._run([])
+
+    async def test_shard_count_is_limited_by_free_connections(self) -> None:
+        budget = ConnectionBudget(3)
+        with mock.patch.object(export_service, "export_connection_budget", budget):
+            await self._run([], bounds=[(None, 10), (10, None)])
+        # 协调连接 + 2 个分片
+        self.assertEqual(self.get_shard_bounds.await_args.args[2], 2)
+        self.assertEqual(budget.available, 3)
+
+    async def test_ordered_output_requires_concatenable_format(self) -> None:
+        with self.assertRaises(ValueError):
+            await self._run([], writer_class=XlsxExportWriter)
+
+
+if __name__ == "__main__":
+    unittest.main()
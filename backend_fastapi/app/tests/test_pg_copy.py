@@ -0,0 +1,160 @@
+"""COPY-based CSV export query building and streaming tests."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import unittest
+from unittest import mock
+
+from app.api.v1.modules.fillers.crud import FillerCRUD
+from app.api.v1.modules.fillers.schema import FILLER_EXPORT_MAPPING
+from app.api.v1.modules.materials.crud import MaterialCRUD
+from app.api.v1.modules.materials.schema import MATERIAL_EXPORT_MAPPING
+from app.api.v1.modules.projects.export_service import ProjectExportService
+from app.api.v1.modules.projects.schema import ProjectQueryParams
+from app.utils import pg_copy
+from app.utils.export_writers import ExportProgress
+from app.utils.pg_copy import compile_query, stream_copy_csv
+
+
+class _FakeDriverConnection:
+    def __init__(self, chunks, error=None, block=False, count=None):
+        self.chunks = chunks
+        self.error = error
+        self.block = block
+        self.count = count
+        self.calls = []
+
+    async def fetchval(self, sql, *args):
+        self.calls.append((sql, args))
+        return self.count
+
+    async def copy_from_query(self, sql, *args, output, format, header):
+        self.calls.append((sql, args, format, header))
+        for chunk in self.chunks:
+            await output(bytearray(chunk))
+        if self.block:
+            await asyncio.Event().wait()
+        if self.error:
+            raise self.error
+        return f"COPY {self.count}"
+
+
+class _FakeConnection:
+    def __init__(self, driver):
+        self._raw = mock.Mock(driver_connection=driver)
+        self.invalidated = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get_raw_connection(self):
+        return self._raw
+
+    async def invalidate(self):
+        self.invalidated = True
+
+
+def _patch_engine(driver):
+    connection = _FakeConnection(driver)
+    engine = mock.Mock(dialect=pg_copy.async_engine.dialect)
+    engine.connect.return_value = connection
+    return mock.patch.object(pg_copy, "async_engine", engine), connection
+
+
+async def _collect(stream, limit=None):
+    chunks = []
+    async for chunk in stream:
+        chunks.append(chunk)
+        if limit and len(chunks) >= limit:
+            break
+    await stream.aclose()
+    return chunks
+
+
+class ExportQueryTests(unittest.TestCase):
+    def test_material_query_renames_and_sanitizes_text_columns(self) -> None:
+        stmt = MaterialCRUD.build_export_query(MATERIAL_EXPORT_MAPPING, supplier="BASF")
+        sql, args = compile_query(stmt)
+        self.assertEqual(
+            [column.name for column in stmt.selected_columns], list(MATERIAL_EXPORT_MAPPING.values())
+        )
+        self.assertIn('"tbl_RawMaterials"."MaterialID" AS "原料ID"', sql)
+        self.assertIn("btrim(", sql)
+        self.assertNotIn("LIMIT", sql)
+        self.assertIn("$1", sql)
+        self.assertIn("BASF", args)
+        placeholders = {int(n) for n in re.findall(r"\$(\d+)", sql)}
+        self.assertEqual(placeholders, set(range(1, len(args) + 1)))
+
+    def test_numeric_columns_are_not_sanitized(self) -> None:
+        sql, _ = compile_query(FillerCRUD.build_export_query(FILLER_EXPORT_MAPPING))
+        self.assertIn('"tbl_InorganicFillers"."IsSilanized" AS "是否硅烷化"', sql)
+        self.assertIn('"tbl_InorganicFillers"."SurfaceArea" AS "比表面积"', sql)
+
+    def test_project_headers_keep_whitespace_and_format_dates(self) -> None:
+        stmt = ProjectExportService.build_header_query(ProjectQueryParams(formulator="Ann"))
+        sql, args = compile_query(stmt)
+        self.assertEqual(
+            [column.name for column in stmt.selected_columns],
+            ProjectExportService.HEADER_COLUMNS[:7],
+        )
+        self.assertIn("to_char(", sql)
+        self.assertNotIn("btrim(", sql)
+        self.assertIn('ORDER BY "tbl_ProjectInfo"."ProjectID"', sql)
+        self.assertIn("Ann", args)
+
+
+class StreamCopyTests(unittest.TestCase):
+    def test_streams_bom_then_copy_chunks(self) -> None:
+        driver = _FakeDriverConnection([b"a,b\n", b"1,2\n"])
+        patcher, connection = _patch_engine(driver)
+        stmt = MaterialCRUD.build_export_query(MATERIAL_EXPORT_MAPPING)
+        with patcher:
+            chunks = asyncio.run(_collect(stream_copy_csv(stmt)))
+        self.assertEqual(chunks, [pg_copy.UTF8_BOM, b"a,b\n", b"1,2\n"])
+        self.assertTrue(all(type(chunk) is bytes for chunk in chunks))
+        self.assertEqual(driver.calls[0][2:], ("csv", True))
+        self.assertFalse(connection.invalidated)
+
+    def test_copy_error_is_raised_to_consumer(self) -> None:
+        driver = _FakeDriverConnection([b"a\n"], error=RuntimeError("boom"))
+        patcher, _ = _patch_engine(driver)
+        stmt = MaterialCRUD.build_export_query(MATERIAL_EXPORT_MAPPING)
+        with patcher, self.assertRaises(RuntimeError):
+            asyncio.run(_collect(stream_copy_csv(stmt, bom=False)))
+
+    def test_client_disconnect_cancels_copy_and_invalidates_connection(self) -> None:
+        driver = _FakeDriverConnection([b"a\n"], block=True)
+        patcher, connection = _patch_engine(driver)
+        stmt = MaterialCRUD.build_export_query(MATERIAL_EXPORT_MAPPING)
+        with patcher:
+            chunks = asyncio.run(_collect(stream_copy_csv(stmt, bom=False), limit=1))
+        self.assertEqual(chunks, [b"a\n"])
+        self.assertTrue(connection.invalidated)
+
+    def test_progress_counts_rows_per_chunk(self) -> None:
+        driver = _FakeDriverConnection([b"a,b\n1,", b"2\n3,4\n"], count=2)
+        patcher, _ = _patch_engine(driver)
+        stmt = MaterialCRUD.build_export_query(MATERIAL_EXPORT_MAPPING)
+        progress = ExportProgress()
+        seen = []
+
+        async def run() -> None:
+            stream = stream_copy_csv(stmt, bom=False, progress=progress)
+            async for _ in stream:
+                seen.append((progress.total_items, progress.rows_written))
+
+        with patcher:
+            asyncio.run(run())
+        self.assertTrue(driver.calls[0][0].startswith("SELECT count(*)"))
+        self.assertEqual(seen, [(2, 0), (2, 2)])
+        self.assertEqual((progress.processed_items, progress.fraction), (2, 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
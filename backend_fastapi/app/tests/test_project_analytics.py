@@ -0,0 +1,107 @@
+"""Cross-project test property analytics tests."""
+
+from __future__ import annotations
+
+import unittest
+from datetime import date
+
+import numpy as np
+
+from app.api.v1.modules.projects.analytics_service import (
+    ProjectAnalyticsService,
+    PropertySnapshot,
+    analyze_snapshot,
+    summarize,
+)
+from app.api.v1.modules.projects.schema import ProjectQueryParams
+from app.core.custom_exceptions import ValidationException
+
+NAN = np.nan
+
+
+def _snapshot() -> PropertySnapshot:
+    days = [(date(2025, month, 1) - date(1970, 1, 1)).days for month in (1, 6, 12)]
+    return PropertySnapshot(
+        table_name="tbl_TestResults_3DPrint",
+        fields=("Print3D_Shrinkage", "Print3D_FlexuralStrength"),
+        project_ids=np.array([1, 2, 3, 4, 5], dtype=np.int64),
+        type_ids=np.array([3, 3, 3, 0, 3], dtype=np.int64),
+        dates=np.array([*days, days[0], NAN], dtype=np.float64),
+        values=np.array([
+            [1.0, 50.0],
+            [2.0, 70.0],
+            [NAN, 90.0],
+            [4.0, 110.0],
+            [3.0, NAN],
+        ]),
+        type_names={3: "3D Printing", 4: "Composite"},
+    )
+
+
+class SummarizeTests(unittest.TestCase):
+    def test_statistics_and_histogram(self) -> None:
+        values = np.array([1.0, 2.0, 3.0, 4.0])
+        stats = summarize(values, np.histogram_bin_edges(values, 3))
+        self.assertEqual(stats.count, 4)
+        self.assertEqual(stats.mean, 2.5)
+        self.assertAlmostEqual(stats.std, np.std(values, ddof=1))
+        self.assertEqual((stats.min, stats.max), (1.0, 4.0))
+        self.assertEqual(stats.percentiles["p50"], 2.5)
+        self.assertEqual(stats.histogram, [1, 1, 2])
+
+    def test_empty_and_single_value(self) -> None:
+        self.assertEqual(summarize(np.array([]), np.zeros(3)).histogram, [0, 0])
+        single = summarize(np.array([7.0]), np.histogram_bin_edges([7.0], 2))
+        self.assertIsNone(single.std)
+        self.assertEqual(sum(single.histogram), 1)
+
+
+class AnalyzeSnapshotTests(unittest.TestCase):
+    def test_overall_and_by_type_share_bin_edges(self) -> None:
+        snapshot = _snapshot()
+        mask = np.ones(snapshot.size, dtype=bool)
+        [strength] = analyze_snapshot(snapshot, mask, ["Print3D_FlexuralStrength"], 2)
+        self.assertEqual(strength.unit, "MPa")
+        self.assertEqual(strength.bin_edges, [50.0, 80.0, 110.0])
+        self.assertEqual(strength.overall.count, 4)
+        self.assertEqual(strength.overall.histogram, [2, 2])
+        by_type = {stats.project_type: stats for stats in strength.by_type}
+        self.assertEqual(by_type["3D Printing"].histogram, [2, 1])
+        self.assertEqual(by_type[None].count, 1)
+
+    def test_nan_values_are_skipped(self) -> None:
+        snapshot = _snapshot()
+        mask = np.array([True, True, True, False, True])
+        [shrinkage] = analyze_snapshot(snapshot, mask, ["Print3D_Shrinkage"], 4)
+        self.assertEqual(shrinkage.overall.count, 3)
+        self.assertEqual(shrinkage.overall.mean, 2.0)
+
+
+class SnapshotMaskTests(unittest.TestCase):
+    def test_type_and_date_filters(self) -> None:
+        snapshot = _snapshot()
+        mask = ProjectAnalyticsService.snapshot_mask(
+            snapshot,
+            ProjectQueryParams(project_type="3D Printing", date_start=date(2025, 2, 1)),
+        )
+        self.assertEqual(mask.tolist(), [False, True, True, False, False])
+        mask = ProjectAnalyticsService.snapshot_mask(snapshot, ProjectQueryParams(date_end=date(2025, 1, 1)))
+        self.assertEqual(mask.tolist(), [True, False, False, True, False])
+        self.assertTrue(ProjectAnalyticsService.snapshot_mask(snapshot, ProjectQueryParams()).all())
+
+    def test_resolve_fields(self) -> None:
+        grouped = ProjectAnalyticsService.resolve_fields(None, "3D Printing")
+        self.assertEqual(list(grouped), ["tbl_TestResults_3DPrint"])
+        self.assertEqual(len(grouped["tbl_TestResults_3DPrint"]), 5)
+        self.assertEqual(len(ProjectAnalyticsService.resolve_fields(None, None)), 4)
+        grouped = ProjectAnalyticsService.resolve_fields(" Ink_Viscosity,Composite_WaterAbsorption,Ink_Viscosity ", None)
+        self.assertEqual(grouped, {
+            "tbl_TestResults_Ink": ["Ink_Viscosity"],
+            "tbl_TestResults_Composite": ["Composite_WaterAbsorption"],
+        })
+        with self.assertRaises(ValidationException):
+            ProjectAnalyticsService.resolve_fields("ProjectName", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
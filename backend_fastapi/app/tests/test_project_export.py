@@ -0,0 +1,214 @@
+"""Project export row building and batch query tests."""
+
+from __future__ import annotations
+
+import unittest
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.modules.projects import controller as project_controller
+from app.api.v1.modules.projects.export_service import (
+    ProjectExportService,
+    TestResultPlan,
+)
+from app.api.v1.modules.projects.model import TestResultInkModel
+from app.api.v1.modules.projects.schema import ProjectQueryParams
+from app.core.exceptions import register_exception_handlers
+from app.core.security import get_current_user_id
+
+
+def _project(project_id: int = 7):
+    return (project_id, "=cmd", "Inkjet", "AB-01012026-INK-01", "Ann", date(2026, 1, 1), None)
+
+
+def _composition(material: bool, weight: str, name: str):
+    return (
+        7,
+        1 if material else None,
+        Decimal(weight),
+        None,
+        None,
+        name if material else None,
+        None if material else name,
+    )
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class _FakeConnection:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        return _FakeResult(self.batches.pop(0) if self.batches else [])
+
+
+class ExportRowTests(unittest.TestCase):
+    def test_one_row_per_composition_with_totals_on_first(self) -> None:
+        rows = ProjectExportService.build_project_rows(
+            _project(),
+            [_composition(True, "60.5", "Resin"), _composition(False, "39.5", "Silica")],
+            "Ink_Viscosity=12",
+        )
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0][1], "'=cmd")
+        self.assertEqual(rows[0][7:11], [1, "原料", "Resin", 60.5])
+        self.assertEqual(rows[0][13:], ["100.00", "Ink_Viscosity=12"])
+        self.assertEqual(rows[1][8:10], ["填料", "Silica"])
+        self.assertEqual(rows[1][13:], ["", ""])
+
+    def test_project_without_compositions_gets_single_row(self) -> None:
+        rows = ProjectExportService.build_project_rows(_project(), [], "")
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(len(rows[0]), len(ProjectExportService.HEADER_COLUMNS))
+        self.assertEqual(rows[0][13], "0.00")
+
+    def test_typed_rows_keep_raw_values_and_spread_test_properties(self) -> None:
+        plan = next(
+            p for p in ProjectExportService.TEST_RESULT_PLANS if p.model is TestResultInkModel
+        )
+        values = tuple(
+            "12" if key == "Ink_Viscosity" else date(2026, 2, 1) if key == "TestDate" else None
+            for key in plan.keys
+        )
+        rows = ProjectExportService.build_typed_project_rows(
+            _project(),
+            [_composition(True, "60.5", "Resin"), _composition(False, "39.5", "Silica")],
+            (plan, values),
+        )
+        names = [column.name for column in ProjectExportService.TYPED_COLUMNS]
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(len(rows[0]), len(names))
+        row = dict(zip(names, rows[1]))
+        self.assertEqual(row["ProjectName"], "=cmd")
+        self.assertEqual(row["FormulationDate"], date(2026, 1, 1))
+        self.assertEqual(row["WeightPercentage"], 39.5)
+        self.assertEqual(row["TotalWeightPercentage"], 100.0)
+        self.assertEqual(row["Ink_Viscosity"], "12")
+        self.assertEqual(row["TestDate"], date(2026, 2, 1))
+        self.assertIsNone(row["Coating_Adhesion"])
+
+    def test_typed_row_without_compositions_or_tests(self) -> None:
+        rows = ProjectExportService.build_typed_project_rows(_project(), [], None)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][7:14], [None, None, None, None, None, None, 0.0])
+        self.assertTrue(all(value is None for value in rows[0][14:]))
+
+
+
+class TestResultPlanTests(unittest.TestCase):
+    def test_plan_is_built_from_mapper_columns(self) -> None:
+        plan = TestResultPlan.from_model(TestResultInkModel)
+        self.assertEqual(list(plan.keys), sorted(plan.keys))
+        self.assertNotIn("ResultID", plan.keys)
+        self.assertNotIn("ProjectID_FK", plan.keys)
+        self.assertIn("Ink_Viscosity", plan.keys)
+        selected = [c.name for c in plan.statement.selected_columns]
+        self.assertEqual(selected, ["ProjectID_FK", *plan.keys])
+
+    def test_shared_fields_are_merged_into_one_column(self) -> None:
+        names = [c.name for c in ProjectExportService.TEST_RESULT_COLUMNS]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(names.count("TestDate"), 1)
+        kinds = {c.name: c.kind for c in ProjectExportService.TEST_RESULT_COLUMNS}
+        self.assertEqual(kinds["TestDate"], "date")
+        for plan in ProjectExportService.TEST_RESULT_PLANS:
+            slots = ProjectExportService.TEST_RESULT_SLOTS[plan.model]
+            self.assertEqual([names[i] for i in slots], list(plan.keys))
+
+    def test_format_skips_empty_values(self) -> None:
+        plan = TestResultPlan(TestResultInkModel, ("A", "B", "Notes"), None)
+        self.assertEqual(plan.format(("1", "2", None)), "A=1; B=2")
+        self.assertEqual(plan.format((None, "", None)), "")
+
+
+class ExportBatchTests(unittest.IsolatedAsyncioTestCase):
+    async def test_batches_use_keyset_without_offset(self) -> None:
+        conn = _FakeConnection([[_project(1), _project(2)], [_project(3)]])
+
+        class _Snapshot:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        with mock.patch.object(
+            ProjectExportService, "snapshot_connection", return_value=_Snapshot()
+        ), mock.patch.object(
+            ProjectExportService, "get_compositions_batch", mock.AsyncMock(return_value={})
+        ), mock.patch.object(
+            ProjectExportService, "get_test_results_batch", mock.AsyncMock(return_value={})
+        ):
+            batches = [
+                rows
+                async for rows in ProjectExportService.iter_row_batches(
+                    ProjectQueryParams(), batch_size=2
+                )
+            ]
+
+        self.assertEqual([len(b) for b in batches], [2, 1])
+        first, second = (str(s) for s in conn.statements)
+        self.assertNotIn("OFFSET", first)
+        self.assertNotIn("OFFSET", second)
+        self.assertNotIn('"ProjectID" >', first)
+        self.assertIn('"tbl_ProjectInfo"."ProjectID" >', second)
+        self.assertEqual(
+            conn.statements[1].compile().params["ProjectID_1"], 2
+        )
+
+
+class ExportEndpointTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        app = FastAPI()
+        register_exception_handlers(app)
+        app.include_router(project_controller.router, prefix="/projects")
+        app.dependency_overrides[get_current_user_id] = lambda: 1
+        cls.client = TestClient(app)
+
+    def test_test_value_range_is_passed_to_export(self) -> None:
+        async def chunks():
+            yield b"ok"
+
+        with mock.patch.object(
+            ProjectExportService, "stream_export", return_value=chunks()
+        ) as stream_export:
+            response = self.client.get(
+                "/projects/export",
+                params={"test_field": "Ink_Viscosity", "test_min": 10, "test_max": 20, "test_unit": "mPa·s"},
+            )
+        self.assertEqual(response.status_code, 200)
+        query_params = stream_export.call_args.args[0]
+        self.assertEqual(
+            (query_params.test_field, query_params.test_min, query_params.test_max, query_params.test_unit),
+            ("Ink_Viscosity", 10, 20, "mPa·s"),
+        )
+
+    def test_test_field_without_bounds_is_rejected(self) -> None:
+        with mock.patch.object(ProjectExportService, "stream_export") as stream_export:
+            response = self.client.get("/projects/export", params={"test_field": "Ink_Viscosity"})
+        self.assertEqual(response.status_code, 422)
+        stream_export.assert_not_called()
+
+    def test_ordered_parallel_export_requires_concatenable_format(self) -> None:
+        with mock.patch.object(ProjectExportService, "stream_export_parallel") as stream_parallel:
+            response = self.client.get("/projects/export", params={"format": "xlsx", "parallel": 2})
+        self.assertEqual(response.status_code, 422)
+        stream_parallel.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""Batch project report ZIP streaming and batched data loading tests."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import unittest
+import zipfile
+from types import SimpleNamespace
+from unittest import mock
+
+from app.api.v1.modules.exports.service import EXPORT_SOURCES
+from app.api.v1.modules.projects.report_service import (
+    BATCH_ERRORS_FILE,
+    ProjectReportInputs,
+    ProjectReportService,
+)
+from app.api.v1.modules.projects.schema import ProjectReportBatchRequest
+from app.api.v1.modules.test_results.service import TestResultService
+from app.core.custom_exceptions import ServiceUnavailableException, ValidationException
+from app.utils.export_writers import ExportProgress, ZipExportArchive
+from app.utils.report_canvas import REPORT_PROFILES
+
+
+def _inputs(project_id: int) -> ProjectReportInputs:
+    return ProjectReportInputs({"ProjectID": project_id}, [], {}, "Inkjet")
+
+
+class BatchZipTests(unittest.IsolatedAsyncioTestCase):
+    async def _collect(self, project_ids, render, concurrency=2, progress=None):
+        async def iter_inputs(ids, load_size=None):
+            for project_id in ids:
+                yield project_id, None if project_id == 404 else _inputs(project_id)
+
+        with mock.patch.object(ProjectReportService, "iter_batch_inputs", side_effect=iter_inputs), \
+                mock.patch.object(ProjectReportService, "render_for_batch", side_effect=render):
+            stream = ProjectReportService.stream_report_zip(
+                ProjectReportBatchRequest(profile="print"), progress=progress,
+                project_ids=project_ids, concurrency=concurrency,
+            )
+            data = b"".join([chunk async for chunk in stream])
+        return zipfile.ZipFile(io.BytesIO(data))
+
+    async def test_reports_are_written_as_they_complete(self) -> None:
+        delays = {1: 0.03, 2: 0.0, 3: 0.0}
+
+        async def render(inputs, profile):
+            project_id = inputs.project_data["ProjectID"]
+            await asyncio.sleep(delays[project_id])
+            return f"png-{project_id}".encode()
+
+        progress = ExportProgress()
+        archive = await self._collect([1, 2, 3], render, progress=progress)
+        self.assertIsNone(archive.testzip())
+        # 项目 1 渲染最慢，最后写入
+        self.assertEqual(archive.namelist(), ["project_2.png", "project_3.png", "project_1.png"])
+        self.assertEqual(archive.read("project_1.png"), b"png-1")
+        self.assertEqual(archive.getinfo("project_1.png").compress_type, zipfile.ZIP_STORED)
+        self.assertEqual((progress.total_items, progress.processed_items), (3, 3))
+        self.assertEqual(progress.rows_written, 3)
+
+    async def test_missing_and_failed_projects_are_listed(self) -> None:
+        async def render(inputs, profile):
+            if inputs.project_data["ProjectID"] == 2:
+                raise RuntimeError("render failed")
+            return b"png"
+
+        archive = await self._collect([1, 404, 2], render)
+        self.assertEqual(archive.namelist(), ["project_1.png", BATCH_ERRORS_FILE])
+        errors = archive.read(BATCH_ERRORS_FILE).decode().splitlines()
+        self.assertEqual(errors, ["404\tProject not found", "2\tRuntimeError: render failed"])
+
+    async def test_busy_pool_is_retried(self) -> None:
+        render = mock.AsyncMock(side_effect=[ServiceUnavailableException(), b"png"])
+        with mock.patch.object(ProjectReportService, "render", render), \
+                mock.patch("app.api.v1.modules.projects.report_service.report_image_cache") as cache, \
+                mock.patch("app.api.v1.modules.projects.report_service.BATCH_BUSY_RETRY_SECONDS", 0):
+            cache.get = mock.AsyncMock(return_value=None)
+            cache.make_key.return_value = "k"
+            profile = REPORT_PROFILES["print"]
+            self.assertEqual(await ProjectReportService.render_for_batch(_inputs(1), profile), b"png")
+        self.assertEqual(render.await_count, 2)
+
+
+class BatchLoadingTests(unittest.IsolatedAsyncioTestCase):
+    async def test_test_results_loaded_once_per_project_type(self) -> None:
+        rows = {
+            1: SimpleNamespace(ResultID=11, ProjectID_FK=1, Ink_Viscosity="10 cP"),
+            3: SimpleNamespace(ResultID=13, ProjectID_FK=3, Ink_Viscosity="12 cP"),
+        }
+        get_results = mock.AsyncMock(side_effect=[rows, {}])
+        with mock.patch(
+            "app.api.v1.modules.test_results.crud.TestResultCRUD.get_results_by_project_ids",
+            get_results,
+        ):
+            results = await TestResultService.get_test_results_by_projects(
+                None, {1: "Inkjet", 2: "Coating", 3: "Inkjet", 4: "Unknown"}
+            )
+        self.assertEqual(get_results.await_count, 2)
+        self.assertEqual(get_results.await_args_list[0].args[2], [1, 3])
+        self.assertEqual(sorted(results), [1, 3])
+        self.assertEqual(results[3].Ink_Viscosity, "12 cP")
+
+    async def test_project_limit(self) -> None:
+        request = ProjectReportBatchRequest(project_ids=[3, 1, 3, 2])
+        self.assertEqual(request.project_ids, [3, 1, 2])
+        with mock.patch("app.api.v1.modules.projects.report_service.settings") as settings:
+            settings.REPORT_BATCH_MAX_PROJECTS = 2
+            with self.assertRaises(ValidationException):
+                await ProjectReportService.resolve_batch_project_ids(None, request)
+
+
+class ReportExportSourceTests(unittest.TestCase):
+    def test_report_source_only_accepts_zip(self) -> None:
+        source = EXPORT_SOURCES["project_reports"]
+        self.assertIs(source.get_writer("zip"), ZipExportArchive)
+        with self.assertRaises(ValidationException):
+            source.get_writer("csv")
+        with self.assertRaises(ValidationException):
+            EXPORT_SOURCES["projects"].get_writer("zip")
+
+
+if __name__ == "__main__":
+    unittest.main()
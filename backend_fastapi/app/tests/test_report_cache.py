@@ -0,0 +1,157 @@
+"""Content-addressed report image cache and ETag revalidation tests."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+
+from app.api.v1.modules.projects import report_service
+from app.api.v1.modules.projects.report_service import (
+    ProjectReportInputs,
+    ProjectReportService,
+)
+from app.utils.report_cache import ReportImageCache
+
+INPUTS = ProjectReportInputs(
+    project_data={"ProjectID": 1, "ProjectName": "Ink A", "FormulationDate": datetime.date(2024, 5, 1)},
+    compositions=[{"WeightPercentage": 40.0, "MaterialName": "Resin", "FillerName": None, "Remarks": ""}],
+    test_results={"Viscosity": "20 s", "Adhesion": Decimal("4.5")},
+    project_type="Ink",
+)
+RENDER_SETTINGS = {"version": 1, "format": "png", "dpi": 300}
+
+
+class CacheKeyTests(unittest.TestCase):
+    def test_key_is_stable_and_order_independent(self) -> None:
+        key = ReportImageCache.make_key(INPUTS.as_dict(), RENDER_SETTINGS)
+        reordered = dict(reversed(list(INPUTS.as_dict().items())))
+        self.assertEqual(key, ReportImageCache.make_key(reordered, dict(RENDER_SETTINGS)))
+        self.assertEqual(len(key), 64)
+
+    def test_key_changes_with_inputs_and_settings(self) -> None:
+        key = ReportImageCache.make_key(INPUTS.as_dict(), RENDER_SETTINGS)
+        changed = INPUTS.as_dict()
+        changed["test_results"] = {**INPUTS.test_results, "Viscosity": "21 s"}
+        self.assertNotEqual(key, ReportImageCache.make_key(changed, RENDER_SETTINGS))
+        self.assertNotEqual(
+            key, ReportImageCache.make_key(INPUTS.as_dict(), {**RENDER_SETTINGS, "version": 2})
+        )
+
+    def test_etag_matching(self) -> None:
+        etag = '"abc"'
+        self.assertTrue(ReportImageCache.etag_matches('"abc"', etag))
+        self.assertTrue(ReportImageCache.etag_matches('"x", W/"abc"', etag))
+        self.assertTrue(ReportImageCache.etag_matches("*", etag))
+        self.assertFalse(ReportImageCache.etag_matches('"abd"', etag))
+        self.assertFalse(ReportImageCache.etag_matches(None, etag))
+
+
+class DiskCacheTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    async def test_roundtrip_and_disabled_cache(self) -> None:
+        cache = ReportImageCache(Path(self.tmp.name), max_bytes=1024)
+        self.assertIsNone(await cache.get("ab" * 32))
+        await cache.put("ab" * 32, b"png")
+        self.assertEqual(await cache.get("ab" * 32), b"png")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        disabled = ReportImageCache(Path(self.tmp.name), max_bytes=1024, enabled=False)
+        self.assertIsNone(await disabled.get("ab" * 32))
+
+    async def test_least_recently_used_files_are_evicted(self) -> None:
+        cache = ReportImageCache(Path(self.tmp.name), max_bytes=300)
+        keys = [f"{i:02d}" * 32 for i in range(3)]
+        for age, key in enumerate(keys):
+            await cache.put(key, b"x" * 100)
+            os.utime(cache.path_for(key), (1000 + age, 1000 + age))
+        # 读取最早写入的文件，使其成为最近访问
+        self.assertIsNotNone(await cache.get(keys[0]))
+
+        await cache.put("ff" * 32, b"y" * 100)
+        self.assertFalse(cache.path_for(keys[1]).exists())
+        self.assertTrue(cache.path_for(keys[0]).exists())
+        self.assertTrue(cache.path_for("ff" * 32).exists())
+        self.assertLessEqual(cache.metrics()["total_bytes"], 270)
+        self.assertGreaterEqual(cache.evictions, 1)
+
+
+class ReportImageServiceTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = ReportImageCache(Path(tmp.name), max_bytes=1 << 20)
+        self.pool = mock.Mock(run=mock.AsyncMock(return_value=b"rendered"))
+        for patcher in (
+            mock.patch.object(report_service, "report_image_cache", self.cache),
+            mock.patch.object(report_service, "report_render_pool", self.pool),
+            mock.patch.object(ProjectReportService, "build_inputs", mock.AsyncMock(return_value=INPUTS)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_render_once_then_cache_hit_then_not_modified(self) -> None:
+        first = await ProjectReportService.get_report_image(None, 1)
+        self.assertEqual((first.content, first.cached), (b"rendered", False))
+
+        second = await ProjectReportService.get_report_image(None, 1)
+        self.assertEqual((second.content, second.cached), (b"rendered", True))
+        self.assertEqual(second.etag, first.etag)
+
+        revalidated = await ProjectReportService.get_report_image(None, 1, first.etag)
+        self.assertIsNone(revalidated.content)
+        self.assertEqual(self.pool.run.await_count, 1)
+
+    async def test_concurrent_requests_share_one_render(self) -> None:
+        async def slow_render(*args):
+            await asyncio.sleep(0.01)
+            return b"rendered"
+
+        self.pool.run.side_effect = slow_render
+        results = await asyncio.gather(
+            *[ProjectReportService.get_report_image(None, 1) for _ in range(3)]
+        )
+        self.assertEqual({result.content for result in results}, {b"rendered"})
+        self.assertEqual(self.pool.run.await_count, 1)
+
+    async def test_cancelled_owner_does_not_cancel_waiters(self) -> None:
+        started = asyncio.Event()
+
+        async def slow_render(*args):
+            started.set()
+            await asyncio.sleep(0.2)
+            return b"rendered"
+
+        self.pool.run.side_effect = slow_render
+        owner = asyncio.create_task(ProjectReportService.get_report_image(None, 1))
+        await started.wait()
+        waiters = [asyncio.create_task(ProjectReportService.get_report_image(None, 1)) for _ in range(2)]
+        await asyncio.sleep(0.05)  # 等待者读完缓存，开始等待同一渲染
+        owner.cancel()
+
+        results = await asyncio.gather(*waiters)
+        self.assertTrue(owner.cancelled())
+        self.assertEqual({result.content for result in results}, {b"rendered"})
+        # 等待者中只有一个重新渲染
+        self.assertEqual(self.pool.run.await_count, 2)
+        self.assertEqual(ProjectReportService._inflight, {})
+
+
+class CleanTestResultsTests(unittest.TestCase):
+    def test_internal_fields_dropped_and_characters_replaced(self) -> None:
+        cleaned = ProjectReportService.clean_test_results(
+            {"_sa_instance_state": object(), "ResultID": 1, "Notes": "n", "Gloss": "60°", "Value": 3}
+        )
+        self.assertEqual(cleaned, {"Gloss": "60deg", "Value": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Single-canvas project report renderer, profile and chart data tests."""
+
+from __future__ import annotations
+
+import io
+import unittest
+
+from PIL import Image
+
+from app.api.v1.modules.projects.report_service import ProjectReportInputs, ProjectReportService
+from app.core.custom_exceptions import ValidationException
+from app.utils.chart_data import INDUSTRY_STANDARDS, composition_series, radar_series
+from app.utils.chart_generator import ChartGenerator
+from app.utils.report_canvas import (
+    PAGE_WIDTH,
+    REPORT_PROFILES,
+    get_report_profile,
+    render_report,
+)
+from app.utils.report_renderer import render_settings
+
+PROJECT = {"ProjectID": 1, "ProjectName": "Demo", "FormulaCode": "F-001", "ProjectType": "Inkjet"}
+COMPOSITIONS = [
+    {"MaterialName": "Solvent A", "WeightPercentage": 60.0},
+    {"FillerName": "Pigment B", "WeightPercentage": 40.0},
+]
+TEST_RESULTS = {"Ink_Viscosity": "12.5 cP", "Ink_ParticleSize": "250nm", "Ink_SurfaceTension": "n/a"}
+
+
+class ReportProfileTests(unittest.TestCase):
+    def test_lookup(self) -> None:
+        self.assertEqual(get_report_profile(" Print ").name, "print")
+        self.assertEqual(get_report_profile("print").media_type, "image/png")
+        with self.assertRaises(ValidationException):
+            get_report_profile("poster")
+
+    def test_profile_changes_cache_settings(self) -> None:
+        self.assertNotEqual(render_settings("screen"), render_settings("print"))
+
+
+class RenderReportTests(unittest.TestCase):
+    def test_profiles_render_expected_format_and_width(self) -> None:
+        for name in ("thumbnail", "screen"):
+            profile = REPORT_PROFILES[name]
+            with self.subTest(profile=name):
+                data = render_report(PROJECT, COMPOSITIONS, TEST_RESULTS, "Inkjet", profile)
+                image = Image.open(io.BytesIO(data))
+                self.assertEqual(image.format.lower(), profile.format)
+                self.assertEqual(image.width, int(PAGE_WIDTH * profile.dpi))
+
+    def test_empty_report(self) -> None:
+        profile = REPORT_PROFILES["thumbnail"]
+        image = Image.open(io.BytesIO(render_report({}, [], {}, "N/A", profile)))
+        self.assertEqual(image.width, int(PAGE_WIDTH * profile.dpi))
+
+
+class RadarValuesTests(unittest.TestCase):
+    def test_values_are_normalized_and_unparsable_skipped(self) -> None:
+        categories, values = ChartGenerator.get_radar_values(TEST_RESULTS, "Inkjet")
+        self.assertEqual(categories, ["Viscosity", "Particle Size"])
+        self.assertEqual(values, [12.5, 50.0])
+        self.assertIs(ChartGenerator.INDUSTRY_STANDARDS, INDUSTRY_STANDARDS)
+
+    def test_values_are_clipped(self) -> None:
+        series = radar_series({"Ink_Viscosity": "-5", "Ink_ParticleSize": "900 nm"}, "Inkjet")
+        self.assertEqual(series["measured"], [-5.0, 900.0])
+        self.assertEqual(series["values"], [0.0, 100.0])
+        self.assertEqual(radar_series({}, "Unknown")["values"], [])
+
+
+class ChartDataTests(unittest.TestCase):
+    def test_chart_data_matches_report_inputs(self) -> None:
+        inputs = ProjectReportInputs(PROJECT, COMPOSITIONS, TEST_RESULTS, "Inkjet")
+        data = ProjectReportService.to_chart_data(inputs).model_dump()
+        self.assertEqual(data["project_id"], 1)
+        self.assertEqual(data["radar"]["fields"], ["Ink_Viscosity", "Ink_ParticleSize"])
+        self.assertEqual(data["radar"]["units"], ["cP", "nm"])
+        self.assertEqual(data["radar"]["reference"], 80)
+        self.assertEqual(data["compositions"], {
+            "names": ["Solvent A", "Pigment B"],
+            "kinds": ["material", "filler"],
+            "percentages": [60.0, 40.0],
+            "total": 100.0,
+        })
+        self.assertEqual(composition_series([])["total"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Report render process pool backpressure and metrics tests."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.custom_exceptions import ServiceUnavailableException
+from app.core.exceptions import register_exception_handlers
+from app.utils.report_renderer import RenderPool
+
+
+class RenderPoolTests(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.pool = RenderPool(workers=1, max_pending=1, retry_after=7, initializer=None)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.pool.shutdown()
+
+    async def test_result_and_timings_are_recorded(self) -> None:
+        await self.pool.start()
+        self.assertEqual(await self.pool.run(pow, 2, 10), 1024)
+        metrics = self.pool.metrics()
+        self.assertGreaterEqual(metrics["completed"], 1)
+        self.assertIsNotNone(metrics["render_ms_p95"])
+        self.assertEqual(metrics["pending"], 0)
+
+    async def test_full_queue_is_rejected_with_retry_after(self) -> None:
+        busy = asyncio.create_task(self.pool.run(time.sleep, 0.5))
+        await asyncio.sleep(0)
+        self.assertEqual(self.pool.pending, 1)
+        with self.assertRaises(ServiceUnavailableException) as ctx:
+            await self.pool.run(pow, 2, 2)
+        await busy
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(ctx.exception.headers, {"Retry-After": "7"})
+        self.assertGreaterEqual(self.pool.metrics()["rejected"], 1)
+        self.assertEqual(self.pool.pending, 0)
+
+    async def test_cancelled_request_keeps_slot_until_render_finishes(self) -> None:
+        busy = asyncio.create_task(self.pool.run(time.sleep, 0.5))
+        await asyncio.sleep(0.1)
+        busy.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await busy
+        # 渲染进程仍在执行，名额未释放
+        self.assertEqual(self.pool.pending, 1)
+        with self.assertRaises(ServiceUnavailableException):
+            await self.pool.run(pow, 2, 2)
+        for _ in range(40):
+            if not self.pool.pending:
+                break
+            await asyncio.sleep(0.05)
+        self.assertEqual(await self.pool.run(pow, 2, 2), 4)
+
+    async def test_worker_errors_propagate(self) -> None:
+        failed = self.pool.metrics()["failed"]
+        with self.assertRaises(ValueError):
+            await self.pool.run(int, "not a number")
+        self.assertEqual(self.pool.metrics()["failed"], failed + 1)
+
+
+class RetryAfterHeaderTests(unittest.TestCase):
+    def test_handler_sends_retry_after(self) -> None:
+        app = FastAPI()
+        register_exception_handlers(app)
+
+        @app.get("/busy")
+        async def busy():
+            raise ServiceUnavailableException(retry_after=3)
+
+        response = TestClient(app).get("/busy")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["retry-after"], "3")
+        self.assertEqual(response.json()["details"], {"retry_after": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
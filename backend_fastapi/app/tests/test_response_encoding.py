@@ -0,0 +1,133 @@
+"""Fast JSON codec and response compression tests."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.common.response import SuccessResponse
+from app.core import json_codec
+from app.core.compression import CompressionMiddleware, select_encoding
+
+
+class JsonCodecTests(unittest.TestCase):
+    def test_dumps_is_compact_utf8(self) -> None:
+        data = json_codec.dumps({"名称": "配方", "n": [1, 2]})
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(data.decode("utf-8"), '{"名称":"配方","n":[1,2]}')
+
+    def test_dumps_handles_common_types(self) -> None:
+        payload = {
+            "d": date(2026, 1, 2),
+            "dt": datetime(2026, 1, 2, 3, 4, 5),
+            "dec": Decimal("1.25"),
+            "id": UUID("12345678-1234-5678-1234-567812345678"),
+        }
+        decoded = json_codec.loads(json_codec.dumps(payload))
+        self.assertEqual(decoded["d"], "2026-01-02")
+        self.assertEqual(decoded["dt"], "2026-01-02T03:04:05")
+        self.assertEqual(decoded["dec"], 1.25)
+        self.assertEqual(decoded["id"], "12345678-1234-5678-1234-567812345678")
+
+    def test_dumps_line_is_one_ndjson_record(self) -> None:
+        line = json_codec.dumps_line({"type": "delta", "content": "中文"})
+        self.assertTrue(line.endswith(b"\n"))
+        self.assertEqual(line.count(b"\n"), 1)
+        self.assertEqual(json.loads(line), {"type": "delta", "content": "中文"})
+
+    def test_loads_accepts_bytes_and_str(self) -> None:
+        self.assertEqual(json_codec.loads(b'{"a":1}'), {"a": 1})
+        self.assertEqual(json_codec.loads('{"a":1}'), {"a": 1})
+
+    def test_success_response_body(self) -> None:
+        response = SuccessResponse(data={"total": 3}, msg="查询成功")
+        self.assertEqual(
+            json.loads(response.body),
+            {"code": 200, "msg": "查询成功", "data": {"total": 3}, "success": True},
+        )
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/big")
+    async def big():
+        return SuccessResponse(data={"list": [{"name": "x" * 20}] * 50})
+
+    @app.get("/small")
+    async def small():
+        return SuccessResponse(data={"ok": True})
+
+    @app.get("/stream")
+    async def stream():
+        async def rows():
+            for i in range(200):
+                yield f"{i},row-{i}\n"
+        return StreamingResponse(rows(), media_type="text/csv")
+
+    @app.get("/events")
+    async def events():
+        async def rows():
+            for i in range(200):
+                yield json_codec.dumps_line({"i": i})
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    @app.get("/image")
+    async def image():
+        return PlainTextResponse("x" * 500, media_type="image/png")
+
+    return app
+
+
+class CompressionMiddlewareTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = TestClient(_build_app())
+
+    def test_select_encoding_honours_q_values(self) -> None:
+        self.assertEqual(select_encoding("gzip, deflate"), "gzip")
+        self.assertIsNone(select_encoding("gzip;q=0"))
+        self.assertIsNone(select_encoding("identity"))
+        self.assertEqual(select_encoding("*"), select_encoding("br, gzip"))
+
+    def test_large_json_is_gzipped(self) -> None:
+        response = self.client.get("/big", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["vary"])
+        self.assertEqual(len(response.json()["data"]["list"]), 50)
+
+    def test_small_response_is_not_compressed(self) -> None:
+        response = self.client.get("/small", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("content-encoding", response.headers)
+
+    def test_no_accept_encoding_passes_through(self) -> None:
+        response = self.client.get("/big", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("content-encoding", response.headers)
+
+    def test_streaming_csv_is_compressed_incrementally(self) -> None:
+        with self.client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+            self.assertEqual(response.headers["content-encoding"], "gzip")
+            self.assertNotIn("content-length", response.headers)
+            raw = b"".join(response.iter_raw())
+        lines = gzip.decompress(raw).decode("utf-8").splitlines()
+        self.assertEqual(len(lines), 200)
+        self.assertEqual(lines[-1], "199,row-199")
+
+    def test_ndjson_and_binary_types_are_not_compressed(self) -> None:
+        for path in ("/events", "/image"):
+            with self.subTest(path=path):
+                response = self.client.get(path, headers={"Accept-Encoding": "gzip"})
+                self.assertNotIn("content-encoding", response.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
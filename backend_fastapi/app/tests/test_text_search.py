@@ -0,0 +1,42 @@
+"""Trigram keyword search helper tests."""
+
+from __future__ import annotations
+
+import unittest
+
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.modules.materials.crud import MaterialCRUD
+from app.utils.text_search import escape_like, keyword_condition, similarity_rank
+
+
+def _sql(clause) -> str:
+    return str(
+        clause.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+class TextSearchTests(unittest.TestCase):
+    def test_escape_like_wildcards(self) -> None:
+        self.assertEqual(escape_like("50%_a\\b"), "50\\%\\_a\\\\b")
+
+    def test_keyword_condition_is_case_insensitive_infix(self) -> None:
+        compiled = keyword_condition(
+            MaterialCRUD.KEYWORD_COLUMNS, "  acryl  late "
+        ).compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        self.assertIn('"TradeName" ILIKE', sql)
+        self.assertIn('"CAS_Number" ILIKE', sql)
+        self.assertNotIn(" LIKE ", sql.replace("ILIKE", ""))
+        self.assertIn("%acryl late%", compiled.params.values())
+
+    def test_similarity_rank_takes_best_column(self) -> None:
+        sql = _sql(similarity_rank(MaterialCRUD.KEYWORD_COLUMNS, "acryl"))
+        self.assertTrue(sql.startswith("greatest("))
+        self.assertEqual(sql.count("similarity("), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
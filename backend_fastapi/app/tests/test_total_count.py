@@ -0,0 +1,102 @@
+"""Total count strategy and query cache tests."""
+
+from __future__ import annotations
+
+import unittest
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import func, select
+
+from app.api.v1.modules.materials.model import MaterialModel
+from app.core import total_count
+from app.core.query_cache import TTLQueryCache, make_cache_key
+from app.core.total_count import TotalCount, count_total, total_kind
+
+
+class QueryCacheTests(unittest.TestCase):
+    def test_cache_key_ignores_empty_filters_and_order(self) -> None:
+        self.assertEqual(
+            make_cache_key(b=" x ", a=date(2024, 1, 2), c=None, d=""),
+            make_cache_key(a="2024-01-02", b="x"),
+        )
+
+    def test_invalidate_drops_namespace_only(self) -> None:
+        cache = TTLQueryCache()
+        cache.set("projects", "k", 1, ttl=60)
+        cache.set("materials", "k", 2, ttl=60)
+        cache.invalidate("projects")
+        self.assertIsNone(cache.get("projects", "k"))
+        self.assertEqual(cache.get("materials", "k"), 2)
+
+    def test_stale_generation_is_not_written_back(self) -> None:
+        cache = TTLQueryCache()
+        generation = cache.generation("projects")
+        cache.invalidate("projects")
+        cache.set_if_current("projects", "k", 10, ttl=60, generation=generation)
+        self.assertIsNone(cache.get("projects", "k"))
+
+    def test_expired_entries_are_dropped(self) -> None:
+        cache = TTLQueryCache()
+        cache.set("projects", "k", 1, ttl=-1)
+        self.assertIsNone(cache.get("projects", "k"))
+
+
+class TotalCountTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.stmt = select(func.count(MaterialModel.MaterialID)).select_from(
+            MaterialModel
+        )
+        self.cache = TTLQueryCache()
+        patcher = patch.object(total_count, "query_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_total_count_behaves_like_int(self) -> None:
+        total = TotalCount(42, "estimated")
+        self.assertEqual(total + 1, 43)
+        self.assertEqual(total_kind(total), "estimated")
+        self.assertEqual(total_kind(7), "exact")
+
+    async def test_cached_mode_serves_second_call_from_cache(self) -> None:
+        with patch.object(
+            total_count, "_exact_count", AsyncMock(return_value=12)
+        ) as exact:
+            first = await count_total(
+                None, self.stmt, namespace="materials", cache_key="{}", mode="cached"
+            )
+            second = await count_total(
+                None, self.stmt, namespace="materials", cache_key="{}", mode="cached"
+            )
+        self.assertEqual((first, first.kind), (12, "exact"))
+        self.assertEqual((second, second.kind), (12, "cached"))
+        self.assertEqual(exact.await_count, 1)
+
+    async def test_estimated_mode_uses_reltuples_without_filters(self) -> None:
+        with patch.object(
+            total_count, "_table_estimate", AsyncMock(return_value=500000)
+        ), patch.object(total_count, "_exact_count", AsyncMock(return_value=0)) as exact:
+            total = await count_total(
+                None,
+                self.stmt,
+                namespace="materials",
+                cache_key="{}",
+                table_name="tbl_RawMaterials",
+                filtered=False,
+                mode="estimated",
+            )
+        self.assertEqual((total, total.kind), (500000, "estimated"))
+        exact.assert_not_awaited()
+
+    async def test_estimated_mode_falls_back_to_exact_for_small_sets(self) -> None:
+        with patch.object(
+            total_count, "_plan_estimate", AsyncMock(return_value=15)
+        ), patch.object(total_count, "_exact_count", AsyncMock(return_value=9)):
+            total = await count_total(
+                None, self.stmt, namespace="materials", cache_key="{}", mode="estimated"
+            )
+        self.assertEqual((total, total.kind), (9, "exact"))
+
+
+if __name__ == "__main__":
+    unittest.main()
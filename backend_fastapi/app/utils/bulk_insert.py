@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+批量插入工具
+把多行数据按列打包为 PostgreSQL 数组参数，用 unnest() 展开为行集：
+
+    INSERT INTO t (a, b) SELECT a, b FROM unnest(CAST($1 AS INTEGER[]), CAST($2 AS TEXT[])) AS rows(a, b)
+
+与多行 VALUES 相比，语句文本与行数无关（可复用编译缓存和预编译语句），
+参数个数固定为列数，不受 32767 个绑定参数的限制；
+与 executemany 相比只有一次往返，语句级触发器也只触发一次。
+"""
+
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import ARRAY, Table, bindparam, cast, func, select
+from sqlalchemy.sql import Select
+
+
+def unnest_select(table: Table, columns: Sequence[str], rows: List[Dict[str, Any]]) -> Select:
+    """
+    生成按列展开多行数据的 SELECT，供 insert(...).from_select(columns, ...) 使用
+
+    Args:
+        table: 目标表（用于确定各列的数组类型）
+        columns: 列名，顺序即 SELECT 输出顺序
+        rows: 行数据（列名 -> 值，缺失的列按 NULL 处理）
+
+    Returns:
+        SELECT 语句
+    """
+    arrays = [
+        cast(
+            bindparam(f"unnest_{i}", value=[row.get(name) for row in rows]),
+            ARRAY(table.c[name].type),
+        )
+        for i, name in enumerate(columns)
+    ]
+    source = func.unnest(*arrays).table_valued(*columns).render_derived(name="unnest_rows")
+    return select(*[source.c[name] for name in columns])
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+图表数据（不依赖 matplotlib）
+
+雷达图标准化与成分序列计算，供服务端绘图（ChartGenerator、report_canvas）和
+前端绘图的图表数据接口共用，两边的刻度保持一致。
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from app.utils.measurements import STATUS_SUFFIX, VALUE_SUFFIX, parse_measurement
+
+# 行业标准配置（用于雷达图）- 支持中英文项目类型
+INDUSTRY_STANDARDS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    '喷墨': {
+        'Ink_Viscosity': {'name': 'Viscosity', 'min': 0, 'max': 100, 'unit': 'cP'},
+        'Ink_Reactivity': {'name': 'Reactivity', 'min': 0, 'max': 100, 'unit': 's'},
+        'Ink_ParticleSize': {'name': 'Particle Size', 'min': 0, 'max': 500, 'unit': 'nm'},
+        'Ink_SurfaceTension': {'name': 'Surface Tension', 'min': 0, 'max': 50, 'unit': 'mN/m'},
+        'Ink_ColorValue': {'name': 'Colorimetry', 'min': 0, 'max': 100, 'unit': 'Lab*'},
+    },
+    'Inkjet': {
+        'Ink_Viscosity': {'name': 'Viscosity', 'min': 0, 'max': 100, 'unit': 'cP'},
+        'Ink_Reactivity': {'name': 'Reactivity', 'min': 0, 'max': 100, 'unit': 's'},
+        'Ink_ParticleSize': {'name': 'Particle Size', 'min': 0, 'max': 500, 'unit': 'nm'},
+        'Ink_SurfaceTension': {'name': 'Surface Tension', 'min': 0, 'max': 50, 'unit': 'mN/m'},
+        'Ink_ColorValue': {'name': 'Colorimetry', 'min': 0, 'max': 100, 'unit': 'Lab*'},
+    },
+    '涂层': {
+        'Coating_Adhesion': {'name': 'Adhesion', 'min': 0, 'max': 100, 'unit': ''},
+        'Coating_Transparency': {'name': 'Transparency', 'min': 0, 'max': 100, 'unit': '%'},
+        'Coating_SurfaceHardness': {'name': 'Surface Hardness', 'min': 0, 'max': 10, 'unit': 'H'},
+        'Coating_ChemicalResistance': {'name': 'Chemical Resistance', 'min': 0, 'max': 100, 'unit': ''},
+        'Coating_CostEstimate': {'name': 'Cost Estimate', 'min': 0, 'max': 100, 'unit': 'EUR/kg'},
+    },
+    'Coating': {
+        'Coating_Adhesion': {'name': 'Adhesion', 'min': 0, 'max': 100, 'unit': ''},
+        'Coating_Transparency': {'name': 'Transparency', 'min': 0, 'max': 100, 'unit': '%'},
+        'Coating_SurfaceHardness': {'name': 'Surface Hardness', 'min': 0, 'max': 10, 'unit': 'H'},
+        'Coating_ChemicalResistance': {'name': 'Chemical Resistance', 'min': 0, 'max': 100, 'unit': ''},
+        'Coating_CostEstimate': {'name': 'Cost Estimate', 'min': 0, 'max': 100, 'unit': 'EUR/kg'},
+    },
+    '3D打印': {
+        'Print3D_Shrinkage': {'name': 'Shrinkage', 'min': 0, 'max': 10, 'unit': '%'},
+        'Print3D_YoungsModulus': {'name': "Young's Modulus", 'min': 0, 'max': 5000, 'unit': 'MPa'},
+        'Print3D_FlexuralStrength': {'name': 'Flexural Strength', 'min': 0, 'max': 200, 'unit': 'MPa'},
+        'Print3D_ShoreHardness': {'name': 'Shore Hardness', 'min': 0, 'max': 100, 'unit': 'Shore'},
+        'Print3D_ImpactResistance': {'name': 'Impact Resistance', 'min': 0, 'max': 100, 'unit': 'kJ/m^2'},
+    },
+    '3D Printing': {
+        'Print3D_Shrinkage': {'name': 'Shrinkage', 'min': 0, 'max': 10, 'unit': '%'},
+        'Print3D_YoungsModulus': {'name': "Young's Modulus", 'min': 0, 'max': 5000, 'unit': 'MPa'},
+        'Print3D_FlexuralStrength': {'name': 'Flexural Strength', 'min': 0, 'max': 200, 'unit': 'MPa'},
+        'Print3D_ShoreHardness': {'name': 'Shore Hardness', 'min': 0, 'max': 100, 'unit': 'Shore'},
+        'Print3D_ImpactResistance': {'name': 'Impact Resistance', 'min': 0, 'max': 100, 'unit': 'kJ/m^2'},
+    },
+    '复合材料': {
+        'Composite_FlexuralStrength': {'name': 'Flexural Strength', 'min': 0, 'max': 200, 'unit': 'MPa'},
+        'Composite_YoungsModulus': {'name': "Young's Modulus", 'min': 0, 'max': 5000, 'unit': 'MPa'},
+        'Composite_ImpactResistance': {'name': 'Impact Resistance', 'min': 0, 'max': 100, 'unit': 'kJ/m^2'},
+        'Composite_ConversionRate': {'name': 'Degree of Conversion', 'min': 0, 'max': 100, 'unit': '%'},
+        'Composite_WaterAbsorption': {'name': 'Water Absorption', 'min': 0, 'max': 10, 'unit': '%'},
+    },
+    'Composite': {
+        'Composite_FlexuralStrength': {'name': 'Flexural Strength', 'min': 0, 'max': 200, 'unit': 'MPa'},
+        'Composite_YoungsModulus': {'name': "Young's Modulus", 'min': 0, 'max': 5000, 'unit': 'MPa'},
+        'Composite_ImpactResistance': {'name': 'Impact Resistance', 'min': 0, 'max': 100, 'unit': 'kJ/m^2'},
+        'Composite_ConversionRate': {'name': 'Degree of Conversion', 'min': 0, 'max': 100, 'unit': '%'},
+        'Composite_WaterAbsorption': {'name': 'Water Absorption', 'min': 0, 'max': 10, 'unit': '%'},
+    }
+}
+
+# 雷达图参考线（标准化值）
+RADAR_REFERENCE = 80
+
+
+def _measured_value(test_results: Dict[str, Any], field: str) -> float:
+    """
+    测试值（标准单位）：优先取数据库中的解析数值列；
+    解析数值和解析状态都为空时（未入库或未写解析列的数据）现场解析原始字符串，
+    无法解析时为 NaN
+    """
+    value = test_results.get(field + VALUE_SUFFIX)
+    if value is None and test_results.get(field + STATUS_SUFFIX) is None:
+        value = parse_measurement(field, test_results.get(field)).value
+    return np.nan if value is None else float(value)
+
+
+def radar_series(test_results: Dict[str, Any], project_type: str) -> Dict[str, Any]:
+    """
+    雷达图数据：取换算到标准单位的测试值，按行业标准范围标准化到 0-100
+
+    Args:
+        test_results: 测试结果数据
+        project_type: 项目类型
+
+    Returns:
+        fields / names / units / min / max / measured / values 等长列表，
+        无法解析的指标被跳过
+    """
+    standards = INDUSTRY_STANDARDS.get(project_type, {})
+    fields = list(standards)
+    measured = np.array([_measured_value(test_results, field) for field in fields], dtype=float)
+    low = np.array([standards[field]['min'] for field in fields], dtype=float)
+    high = np.array([standards[field]['max'] for field in fields], dtype=float)
+
+    # 标准化到0-100范围
+    normalized = np.clip((measured - low) / (high - low) * 100, 0, 100)
+    valid = ~np.isnan(measured)
+    kept = [field for field, keep in zip(fields, valid) if keep]
+    return {
+        'fields': kept,
+        'names': [standards[field]['name'] for field in kept],
+        'units': [standards[field]['unit'] for field in kept],
+        'min': low[valid].tolist(),
+        'max': high[valid].tolist(),
+        'measured': measured[valid].tolist(),
+        'values': normalized[valid].tolist(),
+    }
+
+
+def radar_values(test_results: Dict[str, Any], project_type: str) -> Tuple[List[str], List[float]]:
+    """雷达图 (指标名称列表, 标准化值列表)"""
+    series = radar_series(test_results, project_type)
+    return series['names'], series['values']
+
+
+def composition_series(compositions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    成分柱状图数据
+
+    Args:
+        compositions: 配方成分（MaterialName / FillerName / WeightPercentage）
+
+    Returns:
+        names / kinds（material / filler）/ percentages 等长列表，以及 total 总重量百分比
+    """
+    percentages = np.array(
+        [float(comp.get('WeightPercentage') or 0) for comp in compositions], dtype=float
+    )
+    return {
+        'names': [comp.get('MaterialName') or comp.get('FillerName') or 'Unknown' for comp in compositions],
+        'kinds': ['material' if comp.get('MaterialName') else 'filler' for comp in compositions],
+        'percentages': np.round(percentages, 4).tolist(),
+        'total': round(float(percentages.sum()), 4),
+    }
@@ -12,9 +12,11 @@ import matplotlib.font_manager as fm
 from matplotlib.patches import Rectangle
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import date
 
+from app.utils.chart_data import INDUSTRY_STANDARDS, radar_values
+
 
 # 设置中文字体支持
 plt.rcParams['font.sans-serif'] = ['SimHei', 'DejaVu Sans', 'Arial Unicode MS', 'Microsoft YaHei']
@@ -24,66 +26,9 @@ plt.rcParams['axes.unicode_minus'] = False  # 解决负号显示问题
 class ChartGenerator:
     """图表生成器"""
     
-    # 行业标准配置（用于雷达图）- 支持中英文项目类型
-    INDUSTRY_STANDARDS = {
-        '喷墨': {
-            'Ink_Viscosity': {'name': 'Viscosity', 'min': 0, 'max': 100, 'unit': 'cP'},
-            'Ink_Reactivity': {'name': 'Reactivity', 'min': 0, 'max': 100, 'unit': 's'},
-            'Ink_ParticleSize': {'name': 'Particle Size', 'min': 0, 'max': 500, 'unit': 'nm'},
-            'Ink_SurfaceTension': {'name': 'Surface Tension', 'min': 0, 'max': 50, 'unit': 'mN/m'},
-            'Ink_ColorValue': {'name': 'Colorimetry', 'min': 0, 'max': 100, 'unit': 'Lab*'},
-        },
-        'Inkjet': {
-            'Ink_Viscosity': {'name': 'Viscosity', 'min': 0, 'max': 100, 'unit': 'cP'},
-            'Ink_Reactivity': {'name': 'Reactivity', 'min': 0, 'max': 100, 'unit': 's'},
-            'Ink_ParticleSize': {'name': 'Particle Size', 'min': 0, 'max': 500, 'unit': 'nm'},
-            'Ink_SurfaceTension': {'name': 'Surface Tension', 'min': 0, 'max': 50, 'unit': 'mN/m'},
-            'Ink_ColorValue': {'name': 'Colorimetry', 'min': 0, 'max': 100, 'unit': 'Lab*'},
-        },
-        '涂层': {
-            'Coating_Adhesion': {'name': 'Adhesion', 'min': 0, 'max': 100, 'unit': ''},
-            'Coating_Transparency': {'name': 'Transparency', 'min': 0, 'max': 100, 'unit': '%'},
-            'Coating_SurfaceHardness': {'name': 'Surface Hardness', 'min': 0, 'max': 10, 'unit': 'H'},
-            'Coating_ChemicalResistance': {'name': 'Chemical Resistance', 'min': 0, 'max': 100, 'unit': ''},
-            'Coating_CostEstimate': {'name': 'Cost Estimate', 'min': 0, 'max': 100, 'unit': 'EUR/kg'},
-        },
-        'Coating': {
-            'Coating_Adhesion': {'name': 'Adhesion', 'min': 0, 'max': 100, 'unit': ''},
-            'Coating_Transparency': {'name': 'Transparency', 'min': 0, 'max': 100, 'unit': '%'},
-            'Coating_SurfaceHardness': {'name': 'Surface Hardness', 'min': 0, 'max': 10, 'unit': 'H'},
-            'Coating_ChemicalResistance': {'name': 'Chemical Resistance', 'min': 0, 'max': 100, 'unit': ''},
-            'Coating_CostEstimate': {'name': 'Cost Estimate', 'min': 0, 'max': 100, 'unit': 'EUR/kg'},
-        },
-        '3D打印': {
-            'Print3D_Shrinkage': {'name': 'Shrinkage', 'min': 0, 'max': 10, 'unit': '%'},
-            'Print3D_YoungsModulus': {'name': "Young's Modulus", 'min': 0, 'max': 5000, 'unit': 'MPa'},
-            'Print3D_FlexuralStrength': {'name': 'Flexural Strength', 'min': 0, 'max': 200, 'unit': 'MPa'},
-            'Print3D_ShoreHardness': {'name': 'Shore Hardness', 'min': 0, 'max': 100, 'unit': 'Shore'},
-            'Print3D_ImpactResistance': {'name': 'Impact Resistance', 'min': 0, 'max': 100, 'unit': 'kJ/m^2'},
-        },
-        '3D Printing': {
-            'Print3D_Shrinkage': {'name': 'Shrinkage', 'min': 0, 'max': 10, 'unit': '%'},
-            'Print3D_YoungsModulus': {'name': "Young's Modulus", 'min': 0, 'max': 5000, 'unit': 'MPa'},
-            'Print3D_FlexuralStrength': {'name': 'Flexural Strength', 'min': 0, 'max': 200, 'unit': 'MPa'},
-            'Print3D_ShoreHardness': {'name': 'Shore Hardness', 'min': 0, 'max': 100, 'unit': 'Shore'},
-            'Print3D_ImpactResistance': {'name': 'Impact Resistance', 'min': 0, 'max': 100, 'unit': 'kJ/m^2'},
-        },
-        '复合材料': {
-            'Composite_FlexuralStrength': {'name': 'Flexural Strength', 'min': 0, 'max': 200, 'unit': 'MPa'},
-            'Composite_YoungsModulus': {'name': "Young's Modulus", 'min': 0, 'max': 5000, 'unit': 'MPa'},
-            'Composite_ImpactResistance': {'name': 'Impact Resistance', 'min': 0, 'max': 100, 'unit': 'kJ/m^2'},
-            'Composite_ConversionRate': {'name': 'Degree of Conversion', 'min': 0, 'max': 100, 'unit': '%'},
-            'Composite_WaterAbsorption': {'name': 'Water Absorption', 'min': 0, 'max': 10, 'unit': '%'},
-        },
-        'Composite': {
-            'Composite_FlexuralStrength': {'name': 'Flexural Strength', 'min': 0, 'max': 200, 'unit': 'MPa'},
-            'Composite_YoungsModulus': {'name': "Young's Modulus", 'min': 0, 'max': 5000, 'unit': 'MPa'},
-            'Composite_ImpactResistance': {'name': 'Impact Resistance', 'min': 0, 'max': 100, 'unit': 'kJ/m^2'},
-            'Composite_ConversionRate': {'name': 'Degree of Conversion', 'min': 0, 'max': 100, 'unit': '%'},
-            'Composite_WaterAbsorption': {'name': 'Water Absorption', 'min': 0, 'max': 10, 'unit': '%'},
-        }
-    }
-    
+    # 行业标准配置（用于雷达图）- 支持中英文项目类型，定义见 app.utils.chart_data
+    INDUSTRY_STANDARDS = INDUSTRY_STANDARDS
+
     @staticmethod
     def create_project_info_table(project_data: Dict[str, Any]) -> Image.Image:
         """
@@ -244,6 +189,23 @@ class ChartGenerator:
         buf.seek(0)
         return buf.getvalue()
     
+    @staticmethod
+    def get_radar_values(
+        test_results: Dict[str, Any],
+        project_type: str
+    ) -> Tuple[List[str], List[float]]:
+        """
+        雷达图数据：取测试值字符串中的第一个数字，按行业标准范围标准化到 0-100
+        
+        Args:
+            test_results: 测试结果数据
+            project_type: 项目类型
+            
+        Returns:
+            (指标名称列表, 标准化值列表)，无法解析的指标被跳过
+        """
+        return radar_values(test_results, project_type)
+    
     @staticmethod
     def create_test_result_radar_chart(
         test_results: Dict[str, Any],
@@ -272,28 +234,7 @@ class ChartGenerator:
             ax.axis('off')
         else:
             # 准备数据
-            categories = []
-            values = []
-            
-            for field, standard in standards.items():
-                value_str = test_results.get(field)
-                if value_str:
-                    try:
-                        # 尝试从字符串中提取数值
-                        import re
-                        numbers = re.findall(r'-?\d+\.?\d*', str(value_str))
-                        if numbers:
-                            value = float(numbers[0])
-                            # 标准化到0-100范围
-                            max_val = standard['max']
-                            min_val = standard['min']
-                            normalized_value = ((value - min_val) / (max_val - min_val)) * 100
-                            normalized_value = max(0, min(100, normalized_value))  # 限制在0-100
-                            
-                            categories.append(standard['name'])
-                            values.append(normalized_value)
-                    except:
-                        pass
+            categories, values = ChartGenerator.get_radar_values(test_results, project_type)
             
             if not categories:
                 # 没有有效数据
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+进程内的数据库连接额度
+
+并行导出一次需要多个连接（协调连接 + 每个分片一个连接），各请求分别取连接时没有全局上限，
+并发导出会耗尽连接池和数据库连接数。ConnectionBudget 在进程内统一分配：
+
+- 一次申请多个额度，整体分配，不会出现各自持有一部分后互相等待
+- 空闲额度不足时按空闲数减少分配（调用方相应减少分片数），不足 minimum 时按先后顺序排队
+"""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Optional
+
+
+class ConnectionBudget:
+    """
+    数据库连接额度
+
+    Args:
+        limit: 额度总数
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self._available = self.limit
+        self._waiters: Deque[asyncio.Event] = deque()
+
+    @property
+    def available(self) -> int:
+        """空闲额度"""
+        return self._available
+
+    @property
+    def waiting(self) -> int:
+        """排队中的申请数"""
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def acquire(self, wanted: int, minimum: Optional[int] = None) -> AsyncIterator[int]:
+        """
+        申请额度，退出时归还
+
+        Args:
+            wanted: 希望申请的额度（超过 limit 时按 limit）
+            minimum: 至少需要的额度，默认等于 wanted
+
+        Yields:
+            实际分配的额度（minimum ~ wanted）
+        """
+        wanted = min(max(1, wanted), self.limit)
+        minimum = wanted if minimum is None else min(max(1, minimum), wanted)
+
+        # 有人排队时也排在后面，避免额度一空出来就被后到的小额申请抢走
+        if self._waiters or self._available < minimum:
+            event = asyncio.Event()
+            self._waiters.append(event)
+            try:
+                while self._waiters[0] is not event or self._available < minimum:
+                    event.clear()
+                    await event.wait()
+            finally:
+                self._waiters.remove(event)
+                self._wake()
+
+        granted = min(wanted, self._available)
+        self._available -= granted
+        try:
+            yield granted
+        finally:
+            self._available += granted
+            self._wake()
+
+    def _wake(self) -> None:
+        """唤醒队首的等待者"""
+        if self._waiters:
+            self._waiters[0].set()
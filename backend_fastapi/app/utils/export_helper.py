@@ -5,9 +5,22 @@
 
 import csv
 import io
-from typing import List, Dict, Any
+from contextlib import aclosing
+from decimal import Decimal
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Sequence,
+    Type,
+)
 from datetime import datetime
 
+from app.utils.export_writers import ExportColumn, ExportWriter
+
 
 class ExportHelper:
     """数据导出辅助类"""
@@ -18,7 +31,7 @@ class ExportHelper:
     def sanitize_spreadsheet_value(value: Any) -> Any:
         if value is None:
             return ""
-        if isinstance(value, (int, float)):
+        if isinstance(value, (int, float, Decimal)):
             return value
         text = str(value)
         stripped = text.lstrip()
@@ -143,6 +156,78 @@ class ExportHelper:
         else:
             return ExportHelper.export_to_csv(data, columns, filename)
 
+    @staticmethod
+    def text_row_builder(column_mapping: Dict[str, str]) -> Callable[[Any], List[Any]]:
+        """
+        文本/表格格式（csv/txt/xlsx）的行生成函数
+
+        值按字段名读取，空值输出为空，日期时间格式化为字符串，并做表格公式注入防护。
+
+        Args:
+            column_mapping: 列名映射字典 {model_field: export_column_name}
+        """
+        sanitize = ExportHelper.sanitize_spreadsheet_value
+        fields = list(column_mapping)
+
+        def export_value(value: Any) -> Any:
+            if isinstance(value, datetime):
+                return value.strftime("%Y-%m-%d %H:%M:%S")
+            return sanitize(value)
+
+        def build_row(item: Any) -> List[Any]:
+            return [export_value(getattr(item, field, None)) for field in fields]
+
+        return build_row
+
+    @staticmethod
+    def columnar_row_builder(columns: Sequence[ExportColumn]) -> Callable[[Any], List[Any]]:
+        """列式格式（parquet/arrow）的行生成函数：按 ExportColumn.name 读取属性，保持原始类型"""
+        names = [column.name for column in columns]
+
+        def build_row(item: Any) -> List[Any]:
+            return [getattr(item, name, None) for name in names]
+
+        return build_row
+
+    @staticmethod
+    async def stream_export(
+        batches: AsyncIterator[Sequence[Any]],
+        writer_class: Type[ExportWriter],
+        column_mapping: Dict[str, str],
+        columns: Sequence[ExportColumn],
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        把按批读取的对象编码为导出文件，供 StreamingResponse 输出（内存占用只与批大小相关）
+
+        列式写入器使用 columns（带类型），其余写入器使用 column_mapping（文本化 + 公式注入防护）。
+        响应中断时关闭 batches，及时释放数据库游标。
+
+        Args:
+            batches: 对象批次的异步迭代器（如服务端游标分批读取的结果）
+            writer_class: 写入器
+            column_mapping: 列名映射字典 {model_field: export_column_name}
+            columns: 列式导出的列定义
+
+        Yields:
+            文件数据块
+        """
+        if writer_class.columnar:
+            build_row = ExportHelper.columnar_row_builder(columns)
+            writer = writer_class(columns)
+        else:
+            build_row = ExportHelper.text_row_builder(column_mapping)
+            writer = writer_class(list(column_mapping.values()))
+
+        yield writer.begin()
+        async with aclosing(batches):
+            async for items in batches:
+                chunk = writer.write_rows(build_row(item) for item in items)
+                if chunk:
+                    yield chunk
+        tail = writer.finish()
+        if tail:
+            yield tail
+
     @staticmethod
     def prepare_export_data(
         items: List[Any], column_mapping: Dict[str, str] = None
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+并行导出的分片缓冲文件
+
+每个分片在分片进程中查询、生成行并编码，编码后的数据追加写入该分片的缓冲文件，
+请求协程按分片顺序读出。排在后面的分片不必等前面的分片发送完，边生成边落盘。
+
+文件布局：
+
+- 文件头（固定 32 字节）：状态、已处理项数、已写行数、取消标志。原地覆盖写，
+  请求协程据此得知分片是否已导入快照、进度和失败，不需要读取数据
+- 之后是顺序追加的帧：类型（1 字节）+ 内容长度 + 内容；D 数据、E 结束、X 错误（pickle 的异常）
+
+写入端（SpoolWriter）在分片进程中同步写文件；读取端（ExportSpool）读取数据帧在线程中执行，
+不阻塞事件循环。单个缓冲文件超过 max_bytes 时写入端抛出 ExportSpoolFullError，导出失败。
+"""
+
+import asyncio
+import os
+import pickle
+import struct
+import tempfile
+from contextlib import suppress
+from typing import Callable, Optional, Tuple
+
+# 文件头：状态、已处理项数、已写行数、取消标志
+_HEADER = struct.Struct("<qqqq")
+_PROGRESS = struct.Struct("<qqq")
+_CANCEL = struct.Struct("<q")
+_CANCEL_OFFSET = _PROGRESS.size
+
+# 帧头：帧类型、内容长度
+_FRAME = struct.Struct("<cQ")
+FRAME_DATA = b"D"
+FRAME_END = b"E"
+FRAME_ERROR = b"X"
+
+# 分片状态
+STATUS_STARTING = 0  # 分片进程尚未导入快照
+STATUS_RUNNING = 1
+STATUS_DONE = 2
+STATUS_FAILED = 3
+
+# 读取端没有新数据时的轮询间隔（秒）
+SPOOL_POLL_INTERVAL = 0.02
+
+
+class ExportSpoolFullError(Exception):
+    """分片缓冲文件超过字节上限"""
+
+
+class ExportCancelledError(Exception):
+    """读取端已取消导出（写入端在下一次写入时收到）"""
+
+
+def create_spool_file(directory: Optional[str] = None) -> str:
+    """创建缓冲文件（写入初始文件头），返回路径"""
+    fd, path = tempfile.mkstemp(prefix="export-shard-", suffix=".spool", dir=directory)
+    with os.fdopen(fd, "wb") as file:
+        file.write(_HEADER.pack(STATUS_STARTING, 0, 0, 0))
+    return path
+
+
+class SpoolWriter:
+    """
+    写入端（在分片进程中使用）
+
+    Args:
+        path: create_spool_file 创建的缓冲文件
+        max_bytes: 帧数据的字节上限，None 为不限
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._fd = os.open(path, os.O_RDWR)
+        self._offset = _HEADER.size
+        self._status = STATUS_STARTING
+        self._items = 0
+        self._rows = 0
+
+    @property
+    def size(self) -> int:
+        """已写入的帧字节数"""
+        return self._offset - _HEADER.size
+
+    def _write_header(self) -> None:
+        os.pwrite(self._fd, _PROGRESS.pack(self._status, self._items, self._rows), 0)
+
+    def _append(self, kind: bytes, data: bytes) -> None:
+        view = memoryview(_FRAME.pack(kind, len(data)) + data)
+        while view:
+            written = os.pwrite(self._fd, view, self._offset)
+            self._offset += written
+            view = view[written:]
+
+    def cancelled(self) -> bool:
+        return _CANCEL.unpack(os.pread(self._fd, _CANCEL.size, _CANCEL_OFFSET))[0] != 0
+
+    def start(self) -> None:
+        """分片已导入快照"""
+        self._status = STATUS_RUNNING
+        self._write_header()
+
+    def write(self, data: bytes, items: Optional[int] = None, rows: Optional[int] = None) -> None:
+        """
+        追加一个数据帧并更新进度
+
+        Args:
+            data: 编码后的数据（为空时只更新进度）
+            items / rows: 已处理项数、已写行数（累计值），None 为不变
+
+        Raises:
+            ExportCancelledError: 读取端已取消
+            ExportSpoolFullError: 超过 max_bytes
+        """
+        if self.cancelled():
+            raise ExportCancelledError("export cancelled")
+        if data:
+            if self.max_bytes is not None and self.size + _FRAME.size + len(data) > self.max_bytes:
+                raise ExportSpoolFullError(
+                    f"并行导出分片缓冲超过上限 {self.max_bytes} 字节，请缩小导出范围或调大 EXPORT_SPOOL_MAX_BYTES"
+                )
+            self._append(FRAME_DATA, data)
+        if items is not None:
+            self._items = items
+        if rows is not None:
+            self._rows = rows
+        self._write_header()
+
+    def finish(self) -> None:
+        """数据写完"""
+        self._append(FRAME_END, b"")
+        self._status = STATUS_DONE
+        self._write_header()
+
+    def fail(self, error: BaseException) -> None:
+        """写入错误帧，读取端读到该帧时抛出 error"""
+        try:
+            payload = pickle.dumps(error, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            payload = pickle.dumps(RuntimeError(repr(error)), protocol=pickle.HIGHEST_PROTOCOL)
+        self._append(FRAME_ERROR, payload)
+        self._status = STATUS_FAILED
+        self._write_header()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class ExportSpool:
+    """
+    读取端（在请求协程中使用，异步迭代数据帧）
+
+    Args:
+        path: 缓冲文件
+        producer_done: 写入端任务是否已结束（结束后仍没有结束帧视为分片进程异常退出）
+        poll_interval: 没有新数据时的轮询间隔（秒）
+    """
+
+    def __init__(
+        self,
+        path: str,
+        producer_done: Callable[[], bool],
+        poll_interval: float = SPOOL_POLL_INTERVAL,
+    ) -> None:
+        self.path = path
+        self.poll_interval = poll_interval
+        self._producer_done = producer_done
+        self._fd: Optional[int] = os.open(path, os.O_RDWR)
+        self._offset = _HEADER.size
+        self._finished = False
+
+    def state(self) -> Tuple[int, int, int]:
+        """(状态, 已处理项数, 已写行数)；只读固定长度的文件头"""
+        status, items, rows, _ = _HEADER.unpack(os.pread(self._fd, _HEADER.size, 0))
+        return status, items, rows
+
+    def _read_frame(self) -> Optional[Tuple[bytes, bytes]]:
+        """读取下一个完整的帧，写入端还没写完时返回 None"""
+        header = os.pread(self._fd, _FRAME.size, self._offset)
+        if len(header) < _FRAME.size:
+            return None
+        kind, length = _FRAME.unpack(header)
+        body = os.pread(self._fd, length, self._offset + _FRAME.size) if length else b""
+        if len(body) < length:
+            return None
+        self._offset += _FRAME.size + length
+        return kind, body
+
+    def _find_error(self) -> BaseException:
+        """跳过未读的数据帧，返回错误帧中的异常（不移动读取位置）"""
+        offset = self._offset
+        while True:
+            header = os.pread(self._fd, _FRAME.size, offset)
+            if len(header) < _FRAME.size:
+                return RuntimeError("export shard failed")
+            kind, length = _FRAME.unpack(header)
+            if kind == FRAME_ERROR:
+                return pickle.loads(os.pread(self._fd, length, offset + _FRAME.size))
+            offset += _FRAME.size + length
+
+    async def error(self) -> BaseException:
+        """失败分片的异常"""
+        return await asyncio.to_thread(self._find_error)
+
+    async def wait_started(self) -> None:
+        """等待分片导入快照；分片失败时抛出其异常"""
+        while True:
+            done = self._producer_done()
+            status = self.state()[0]
+            if status == STATUS_FAILED:
+                raise await self.error()
+            if status != STATUS_STARTING:
+                return
+            if done:
+                raise RuntimeError("export shard exited before importing the snapshot")
+            await asyncio.sleep(self.poll_interval)
+
+    def __aiter__(self) -> "ExportSpool":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self._finished:
+            raise StopAsyncIteration
+        while True:
+            # 先取写入端状态再读：写入端结束前写入的帧一定能读到
+            done = self._producer_done()
+            frame = await asyncio.to_thread(self._read_frame)
+            if frame is not None:
+                break
+            if done:
+                self._finished = True
+                raise RuntimeError("export shard exited without finishing its output")
+            await asyncio.sleep(self.poll_interval)
+
+        kind, body = frame
+        if kind == FRAME_DATA:
+            return body
+        self._finished = True
+        if kind == FRAME_ERROR:
+            raise pickle.loads(body)
+        raise StopAsyncIteration
+
+    def cancel(self) -> None:
+        """通知写入端停止（写入端在下一次写入时抛出 ExportCancelledError）"""
+        if self._fd is not None:
+            os.pwrite(self._fd, _CANCEL.pack(1), _CANCEL_OFFSET)
+
+    def discard(self) -> None:
+        """关闭并删除缓冲文件"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        with suppress(FileNotFoundError):
+            os.remove(self.path)
@@ -0,0 +1,610 @@
+# -*- coding: utf-8 -*-
+"""
+流式导出写入器
+把按批产生的导出行编码为文件数据块，供 StreamingResponse 逐块输出
+
+写入器按格式注册在 EXPORT_WRITERS 中，每次导出创建一个实例：
+
+    writer = get_export_writer("csv")(header_columns)
+    yield writer.begin()
+    for rows in batches:
+        yield writer.write_rows(rows)
+    yield writer.finish()
+
+文本格式（csv/txt）接收已格式化的行和表头名；列式格式（parquet/arrow，columnar=True）
+接收 ExportColumn 列定义和原始类型的值，按行组缓冲后编码为 Arrow 记录批次，
+需要安装 pyarrow。
+"""
+
+import csv
+import io
+import math
+import re
+import zipfile
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type, Union
+
+from app.core.custom_exceptions import ValidationException
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - 取决于部署环境
+    pa = None
+    pq = None
+
+
+@dataclass
+class ExportProgress:
+    """导出进度（由导出服务在每批后更新，供导出任务汇报进度）"""
+
+    total_items: Optional[int] = None  # 待导出的记录总数（项目数等），未知时为 None
+    processed_items: int = 0  # 已处理的记录数
+    rows_written: int = 0  # 已写出的数据行数
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """完成比例（0~1），总数未知时为 None"""
+        if self.total_items is None:
+            return None
+        if self.total_items == 0:
+            return 1.0
+        return min(self.processed_items / self.total_items, 1.0)
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    """
+    列式导出的列定义
+
+    kind 取值: int / float / str / date / datetime / bool
+    """
+
+    name: str
+    kind: str = "str"
+
+    KINDS = ("int", "float", "str", "date", "datetime", "bool")
+
+    @classmethod
+    def from_sql_column(cls, name: str, column: Any) -> "ExportColumn":
+        """按 SQLAlchemy 列类型推断列类型，无法识别的类型按字符串处理"""
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return cls(name, "str")
+        if python_type is bool:
+            return cls(name, "bool")
+        if python_type is int:
+            return cls(name, "int")
+        if python_type in (float, Decimal):
+            return cls(name, "float")
+        if python_type is datetime:
+            return cls(name, "datetime")
+        if python_type is date:
+            return cls(name, "date")
+        return cls(name, "str")
+
+
+class ExportWriter:
+    """导出写入器基类"""
+
+    format: str = ""
+    extension: str = ""
+    media_type: str = "application/octet-stream"
+    columnar: bool = False  # True 时接收原始类型值和 ExportColumn 列定义
+    compressed: bool = False  # 输出本身已压缩（打包为 ZIP 时不再压缩）
+    concatenable: bool = False  # write_rows 的输出与写入器状态无关，多个实例分别编码的数据行可直接拼接
+    requires: str = ""  # 依赖的可选包
+
+    def __init__(self, columns: Sequence[Union[str, ExportColumn]]) -> None:
+        self.specs: List[ExportColumn] = [
+            column if isinstance(column, ExportColumn) else ExportColumn(column)
+            for column in columns
+        ]
+        self.columns: List[str] = [spec.name for spec in self.specs]
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """依赖是否已安装"""
+        return True
+
+    def begin(self) -> bytes:
+        """文件头（BOM、表头等）"""
+        return b""
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> bytes:
+        """编码一批数据行"""
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        """文件尾"""
+        return b""
+
+
+class CsvExportWriter(ExportWriter):
+    """CSV（UTF-8 BOM，便于 Excel 识别中文）"""
+
+    format = "csv"
+    extension = "csv"
+    media_type = "text/csv; charset=utf-8"
+    concatenable = True
+
+    def __init__(self, columns: Sequence[str]) -> None:
+        super().__init__(columns)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate(0)
+        return data
+
+    def begin(self) -> bytes:
+        self._writer.writerow(self.columns)
+        return "\ufeff".encode("utf-8") + self._drain()
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> bytes:
+        self._writer.writerows(rows)
+        return self._drain()
+
+
+class TsvExportWriter(ExportWriter):
+    """制表符分隔文本（UTF-8 BOM）"""
+
+    format = "txt"
+    extension = "txt"
+    media_type = "text/plain; charset=utf-8"
+    concatenable = True
+
+    def begin(self) -> bytes:
+        return ("\ufeff" + "\t".join(self.columns) + "\n").encode("utf-8")
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> bytes:
+        return "".join(
+            "\t".join([str(value) for value in row]) + "\n" for row in rows
+        ).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    只追加的内存输出流，供 pyarrow 写入
+    每次写完一个记录批次后取出已写入的数据，缓冲区不随文件增长
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _to_float(value: Any) -> Optional[float]:
+    return None if value is None or value == "" else float(value)
+
+
+def _to_int(value: Any) -> Optional[int]:
+    return None if value is None or value == "" else int(value)
+
+
+def _to_str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _to_bool(value: Any) -> Optional[bool]:
+    return None if value is None or value == "" else bool(value)
+
+
+def _to_date(value: Any) -> Optional[date]:
+    if value is None or value == "":
+        return None
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _identity(value: Any) -> Any:
+    return None if value == "" else value
+
+
+# 列类型 -> 值转换（Decimal、数据库字符串等统一为 Arrow 能直接接收的 Python 类型）
+_VALUE_CONVERTERS = {
+    "int": _to_int,
+    "float": _to_float,
+    "str": _to_str,
+    "date": _to_date,
+    "datetime": _identity,
+    "bool": _to_bool,
+}
+
+
+def _arrow_type(kind: str) -> Any:
+    return {
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "str": pa.string(),
+        "date": pa.date32(),
+        "datetime": pa.timestamp("us"),
+        "bool": pa.bool_(),
+    }[kind]
+
+
+class ArrowBatchExportWriter(ExportWriter):
+    """
+    列式写入器基类
+    行先缓冲，满 ROW_GROUP_SIZE 行后按列转成一个 Arrow 记录批次写出，
+    内存占用只与行组大小有关
+    """
+
+    columnar = True
+    compressed = True
+    requires = "pyarrow"
+    ROW_GROUP_SIZE = 65536
+
+    def __init__(self, columns: Sequence[Union[str, ExportColumn]]) -> None:
+        super().__init__(columns)
+        if pa is None:
+            raise ValidationException(f"导出格式 {self.format} 需要安装 {self.requires}")
+        self.schema = pa.schema(
+            [pa.field(spec.name, _arrow_type(spec.kind)) for spec in self.specs]
+        )
+        self._converters = [_VALUE_CONVERTERS[spec.kind] for spec in self.specs]
+        self._rows: List[Sequence[Any]] = []
+        self._sink = _ChunkSink()
+        self._writer: Any = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return pa is not None
+
+    def _open(self, sink: _ChunkSink) -> Any:
+        """创建 pyarrow 写入器"""
+        raise NotImplementedError
+
+    def _to_array(self, index: int, values: Sequence[Any]) -> Any:
+        """
+        一列值转为 Arrow 数组
+        值已是目标类型时整列直接转换；含 Decimal、空字符串等时逐个转换后重试
+        """
+        arrow_type = self.schema.types[index]
+        try:
+            return pa.array(values, type=arrow_type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            convert = self._converters[index]
+            return pa.array([convert(value) for value in values], type=arrow_type)
+
+    def _write_batch(self, rows: Sequence[Sequence[Any]]) -> None:
+        columns = list(zip(*rows))
+        arrays = [self._to_array(index, values) for index, values in enumerate(columns)]
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+
+    def begin(self) -> bytes:
+        self._writer = self._open(self._sink)
+        return self._sink.drain()
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> bytes:
+        self._rows.extend(rows)
+        size = self.ROW_GROUP_SIZE
+        if len(self._rows) >= size:
+            full = len(self._rows) - len(self._rows) % size
+            for start in range(0, full, size):
+                self._write_batch(self._rows[start:start + size])
+            del self._rows[:full]
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        if self._rows:
+            self._write_batch(self._rows)
+            self._rows = []
+        self._writer.close()
+        return self._sink.drain()
+
+
+class ParquetExportWriter(ArrowBatchExportWriter):
+    """Parquet（每个行组一个记录批次，snappy 压缩）"""
+
+    format = "parquet"
+    extension = "parquet"
+    media_type = "application/vnd.apache.parquet"
+
+    def _open(self, sink: _ChunkSink) -> Any:
+        return pq.ParquetWriter(sink, self.schema, compression="snappy")
+
+
+class ArrowExportWriter(ArrowBatchExportWriter):
+    """Arrow IPC 文件格式（Feather v2，记录批次按 zstd 压缩）"""
+
+    format = "arrow"
+    extension = "arrow"
+    media_type = "application/vnd.apache.arrow.file"
+
+    def _open(self, sink: _ChunkSink) -> Any:
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        return pa.ipc.new_file(sink, self.schema, options=options)
+
+
+_XLSX_ILLEGAL_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    "{sheets}"
+    "</Types>"
+)
+
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    "<sheets>{sheets}</sheets>"
+    "</workbook>"
+)
+
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    "{sheets}"
+    '<Relationship Id="rIdStyles" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    "</Relationships>"
+)
+
+# 两种单元格样式：0 常规，1 加粗（表头）
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    "</styleSheet>"
+)
+
+# 工作表开头：冻结首行表头
+_XLSX_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    "</sheetView></sheetViews>"
+    "<sheetData>"
+)
+
+_XLSX_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+def _xlsx_column_letter(index: int) -> str:
+    """列序号（从 0 开始）转 Excel 列字母"""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _xlsx_text(value: str) -> str:
+    text = _XLSX_ILLEGAL_CHARS.sub("", value)[: XlsxExportWriter.MAX_CELL_CHARS]
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+class XlsxExportWriter(ExportWriter):
+    """
+    Excel 工作簿（.xlsx），流式写出
+
+    工作表 XML 边生成边写入 ZIP 条目，ZIP 写到不可回退的输出流（使用数据描述符），
+    每批行写完即可输出对应的压缩数据，内存占用与总行数无关。
+    字符串使用内联字符串（不建共享字符串表），数值写为数字单元格。
+    超过 Excel 单表行数上限时自动续写到下一个工作表，每个工作表都带表头。
+    """
+
+    format = "xlsx"
+    extension = "xlsx"
+    compressed = True
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+    MAX_SHEET_ROWS = 1048576  # Excel 单个工作表行数上限（含表头）
+    MAX_CELL_CHARS = 32767  # Excel 单元格字符数上限
+    COMPRESS_LEVEL = 1  # 工作表 XML 重复度高，最低压缩级别已足够
+
+    def __init__(self, columns: Sequence[Union[str, ExportColumn]]) -> None:
+        super().__init__(columns)
+        self._letters = [_xlsx_column_letter(i) for i in range(len(self.columns))]
+        self._sink = _ChunkSink()
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._sheet: Any = None
+        self._sheet_count = 0
+        self._sheet_rows = 0
+
+    def _cell(self, letter: str, row_number: int, value: Any) -> str:
+        if value is None or value == "":
+            return ""
+        if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+            if not math.isfinite(value):
+                # NaN / Infinity 不是合法的数字单元格
+                return f'<c r="{letter}{row_number}" t="inlineStr"><is><t>{value}</t></is></c>'
+            return f'<c r="{letter}{row_number}"><v>{value}</v></c>'
+        text = _xlsx_text(str(value))
+        space = ' xml:space="preserve"' if text != text.strip() else ""
+        return f'<c r="{letter}{row_number}" t="inlineStr"><is><t{space}>{text}</t></is></c>'
+
+    def _open_sheet(self) -> None:
+        self._sheet_count += 1
+        self._sheet = self._zip.open(
+            f"xl/worksheets/sheet{self._sheet_count}.xml", "w", force_zip64=True
+        )
+        header = "".join(
+            f'<c r="{letter}1" s="1" t="inlineStr"><is><t>{_xlsx_text(name)}</t></is></c>'
+            for letter, name in zip(self._letters, self.columns)
+        )
+        self._sheet.write((_XLSX_SHEET_HEAD + f'<row r="1">{header}</row>').encode("utf-8"))
+        self._sheet_rows = 1
+
+    def _close_sheet(self) -> None:
+        self._sheet.write(_XLSX_SHEET_TAIL.encode("utf-8"))
+        self._sheet.close()
+
+    def begin(self) -> bytes:
+        self._zip = zipfile.ZipFile(
+            self._sink, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=self.COMPRESS_LEVEL
+        )
+        self._open_sheet()
+        return self._sink.drain()
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> bytes:
+        parts: List[str] = []
+        letters = self._letters
+        cell = self._cell
+        for row in rows:
+            if self._sheet_rows >= self.MAX_SHEET_ROWS:
+                self._sheet.write("".join(parts).encode("utf-8"))
+                parts = []
+                self._close_sheet()
+                self._open_sheet()
+            self._sheet_rows += 1
+            number = self._sheet_rows
+            cells = "".join([cell(letter, number, value) for letter, value in zip(letters, row)])
+            parts.append(f'<row r="{number}">{cells}</row>')
+        self._sheet.write("".join(parts).encode("utf-8"))
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._close_sheet()
+        indexes = range(1, self._sheet_count + 1)
+        parts = {
+            "[Content_Types].xml": _XLSX_CONTENT_TYPES.format(sheets="".join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType='
+                '"application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in indexes
+            )),
+            "_rels/.rels": _XLSX_ROOT_RELS,
+            "xl/workbook.xml": _XLSX_WORKBOOK.format(sheets="".join(
+                f'<sheet name="Sheet{i}" sheetId="{i}" r:id="rId{i}"/>' for i in indexes
+            )),
+            "xl/_rels/workbook.xml.rels": _XLSX_WORKBOOK_RELS.format(sheets="".join(
+                f'<Relationship Id="rId{i}" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                f'Target="worksheets/sheet{i}.xml"/>'
+                for i in indexes
+            )),
+            "xl/styles.xml": _XLSX_STYLES,
+        }
+        for name, content in parts.items():
+            self._zip.writestr(name, content)
+        self._zip.close()
+        return self._sink.drain()
+
+
+class ZipExportArchive:
+    """
+    流式 ZIP 打包（多文件导出）
+
+    条目依次写入，ZIP 写到不可回退的输出流（使用数据描述符），
+    每次写入后即可取出对应的压缩数据：
+
+        archive = ZipExportArchive()
+        yield archive.open_entry("part01.csv", compress=True)
+        yield archive.write(chunk)
+        yield archive.close_entry()
+        yield archive.finish()
+    """
+
+    format = "zip"
+    extension = "zip"
+    media_type = "application/zip"
+    COMPRESS_LEVEL = 1
+
+    def __init__(self) -> None:
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, "w")
+        self._entry: Any = None
+
+    def open_entry(self, name: str, compress: bool = True) -> bytes:
+        """开始一个条目（已压缩的格式按存储方式写入）"""
+        info = zipfile.ZipInfo(name, date_time=datetime.now().timetuple()[:6])
+        if compress:
+            info.compress_type = zipfile.ZIP_DEFLATED
+            # ZipInfo 没有公开的压缩级别参数（3.13 起为 compress_level，旧名仍可用）
+            info._compresslevel = self.COMPRESS_LEVEL
+        self._entry = self._zip.open(info, "w", force_zip64=True)
+        return self._sink.drain()
+
+    def write(self, data: bytes) -> bytes:
+        self._entry.write(data)
+        return self._sink.drain()
+
+    def close_entry(self) -> bytes:
+        self._entry.close()
+        self._entry = None
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        """写出中央目录"""
+        self._zip.close()
+        return self._sink.drain()
+
+
+# 导出格式 -> 写入器
+EXPORT_WRITERS: Dict[str, Type[ExportWriter]] = {
+    CsvExportWriter.format: CsvExportWriter,
+    TsvExportWriter.format: TsvExportWriter,
+    ParquetExportWriter.format: ParquetExportWriter,
+    ArrowExportWriter.format: ArrowExportWriter,
+    XlsxExportWriter.format: XlsxExportWriter,
+}
+
+
+def get_export_writer(export_format: str) -> Type[ExportWriter]:
+    """
+    按格式获取写入器类
+
+    Raises:
+        ValidationException: 不支持的导出格式，或该格式依赖的包未安装
+    """
+    writer_class = EXPORT_WRITERS.get((export_format or "").lower())
+    if writer_class is None:
+        raise ValidationException(
+            f"不支持的导出格式: {export_format}，可选: {', '.join(EXPORT_WRITERS)}"
+        )
+    if not writer_class.is_available():
+        raise ValidationException(
+            f"导出格式 {writer_class.format} 需要安装 {writer_class.requires}"
+        )
+    return writer_class
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+键集（游标）分页工具
+负责游标令牌的编解码，以及生成 "位于上一页最后一行之后" 的查询条件
+
+游标对客户端是不透明的 base64url 字符串，内部为 JSON:
+    {"s": 排序字段, "o": 排序方向, "v": 最后一行排序值, "id": 最后一行主键,
+     "k": 关键词哈希（仅按相关度排序时，排序值依赖关键词）}
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.custom_exceptions import ValidationException
+
+
+def _keyword_hash(keyword: str) -> str:
+    return hashlib.sha256(keyword.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(
+    sort_by: str,
+    sort_order: str,
+    value: Any,
+    last_id: int,
+    keyword: Optional[str] = None,
+) -> str:
+    """
+    编码游标令牌
+
+    Args:
+        sort_by: 排序字段名
+        sort_order: 排序方向（asc/desc）
+        value: 最后一行的排序字段值（日期会序列化为ISO字符串）
+        last_id: 最后一行的主键
+        keyword: 排序值所依赖的关键词（相关度排序），写入其哈希
+
+    Returns:
+        不透明的游标字符串
+    """
+    if hasattr(value, "isoformat"):
+        value = value.isoformat()
+    payload = {"s": sort_by, "o": sort_order, "v": value, "id": last_id}
+    if keyword is not None:
+        payload["k"] = _keyword_hash(keyword)
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(
+    token: str,
+    sort_by: str,
+    sort_order: str,
+    keyword: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    解码并校验游标令牌
+
+    Args:
+        token: 游标字符串
+        sort_by: 当前请求的排序字段（必须与游标一致）
+        sort_order: 当前请求的排序方向（必须与游标一致）
+        keyword: 当前请求中排序值所依赖的关键词（必须与生成游标时一致）
+
+    Returns:
+        {"value": 排序值, "id": 主键}
+
+    Raises:
+        ValidationException: 游标格式错误或与当前排序不匹配
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_id = int(payload["id"])
+        cursor_sort_by = payload["s"]
+        cursor_sort_order = payload["o"]
+        value = payload.get("v")
+        cursor_keyword = payload.get("k")
+    except (ValueError, KeyError, TypeError, binascii.Error, UnicodeError):
+        raise ValidationException("无效的分页游标", field="after")
+
+    if cursor_sort_by != sort_by or cursor_sort_order != sort_order:
+        raise ValidationException("分页游标与当前排序方式不匹配", field="after")
+    expected_keyword = _keyword_hash(keyword) if keyword is not None else None
+    if cursor_keyword != expected_keyword:
+        raise ValidationException("分页游标与当前搜索关键词不匹配", field="after")
+
+    return {"value": value, "id": last_id}
+
+
+def build_keyset_condition(
+    sort_column,
+    id_column,
+    last_value: Any,
+    last_id: int,
+    descending: bool,
+    nullable: bool = False,
+) -> ColumnElement:
+    """
+    生成键集分页条件，排序为 (sort_column, id_column) 同向
+
+    NULL 按 PostgreSQL 默认规则处理：ASC 时 NULLS LAST，DESC 时 NULLS FIRST。
+    非 NULL 部分使用行值比较，可直接命中 (sort_column, id_column) 复合索引。
+
+    Args:
+        sort_column: 排序列
+        id_column: 唯一的次级排序列（主键）
+        last_value: 上一页最后一行的排序值
+        last_id: 上一页最后一行的主键
+        descending: 是否降序
+        nullable: 排序列是否可能为NULL
+
+    Returns:
+        SQLAlchemy 条件表达式
+    """
+    if sort_column is id_column:
+        return id_column < last_id if descending else id_column > last_id
+
+    if last_value is None:
+        if descending:
+            # NULL 位于最前：剩余的 NULL 行 + 所有非 NULL 行
+            return or_(
+                and_(sort_column.is_(None), id_column < last_id),
+                sort_column.isnot(None),
+            )
+        # NULL 位于最后：只剩余的 NULL 行
+        return and_(sort_column.is_(None), id_column > last_id)
+
+    row = tuple_(sort_column, id_column)
+    key = tuple_(last_value, last_id)
+    if descending:
+        return row < key
+    if nullable:
+        return or_(row > key, sort_column.is_(None))
+    return row > key
+
+
+def parse_optional_value(value: Optional[Any], parser) -> Optional[Any]:
+    """将游标中的排序值还原为列类型（None 原样返回）"""
+    if value is None:
+        return None
+    try:
+        return parser(value)
+    except (TypeError, ValueError):
+        raise ValidationException("无效的分页游标", field="after")
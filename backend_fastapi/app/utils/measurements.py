@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+测试结果测量值解析
+
+测试结果表的测量字段（Ink_Viscosity、Print3D_YoungsModulus 等）是自由文本，如
+"12.5 mPa·s"、"Shore D 80"、"L*=52.1, a*=1.2, b*=-3.4"、"2H"。每个测量字段有三个影子列：
+
+- {字段}_Value: 换算为标准单位后的数值（可建索引、做范围查询）
+- {字段}_Unit: 数值的单位
+- {字段}_ParseStatus: 解析状态（见 PARSE_* 常量），原值为空时三列均为 NULL
+
+写入测试结果时由 shadow_values 计算影子列，已有数据由 backfill_parsed_values 批量回填
+（scripts/backfill_test_result_values.py）；
+图表和导出直接读取 {字段}_Value，不再各自用正则解析文本。
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Table, select, update
+from sqlalchemy.engine import Connection
+
+from app.utils.bulk_insert import unnest_select
+
+# 影子列后缀
+VALUE_SUFFIX = "_Value"
+UNIT_SUFFIX = "_Unit"
+STATUS_SUFFIX = "_ParseStatus"
+
+# 解析状态
+PARSE_OK = "ok"                      # 单位为标准单位
+PARSE_CONVERTED = "converted"        # 已换算为标准单位
+PARSE_NO_UNIT = "no_unit"            # 未写单位，按标准单位处理
+PARSE_RANGE = "range"                # 范围值（如 10-20 cP），取中值
+PARSE_UNKNOWN_UNIT = "unknown_unit"  # 有数值但单位无法识别，不写入数值
+PARSE_INVALID = "invalid"            # 没有数值（如 "Good"）
+
+
+@dataclass(frozen=True)
+class ParsedMeasurement:
+    """测量值解析结果"""
+
+    value: Optional[float]
+    unit: Optional[str]
+    status: Optional[str]
+
+
+EMPTY = ParsedMeasurement(None, None, None)
+
+
+# ==================== 单位 ====================
+# 单位别名（规范化后，见 _unit_key）-> (单位, 换算到标准单位的系数)
+
+_VISCOSITY = {
+    "cp": ("cP", 1.0), "mpas": ("cP", 1.0), "centipoise": ("cP", 1.0), "厘泊": ("cP", 1.0),
+    "pas": ("cP", 1000.0), "p": ("cP", 100.0), "poise": ("cP", 100.0),
+}
+_TIME = {
+    "s": ("s", 1.0), "sec": ("s", 1.0), "secs": ("s", 1.0), "second": ("s", 1.0),
+    "seconds": ("s", 1.0), "秒": ("s", 1.0), "ms": ("s", 0.001),
+    "min": ("s", 60.0), "mins": ("s", 60.0), "minute": ("s", 60.0), "minutes": ("s", 60.0),
+    "分钟": ("s", 60.0), "h": ("s", 3600.0), "hr": ("s", 3600.0), "hrs": ("s", 3600.0),
+    "hour": ("s", 3600.0), "hours": ("s", 3600.0), "小时": ("s", 3600.0),
+}
+_PARTICLE_SIZE = {
+    "nm": ("nm", 1.0), "um": ("nm", 1000.0), "micron": ("nm", 1000.0),
+    "microns": ("nm", 1000.0), "mm": ("nm", 1e6),
+}
+_SURFACE_TENSION = {
+    "mn/m": ("mN/m", 1.0), "dyn/cm": ("mN/m", 1.0), "dynes/cm": ("mN/m", 1.0),
+    "n/m": ("mN/m", 1000.0),
+}
+_COLOR = {"lab": ("Lab*", 1.0), "l": ("Lab*", 1.0), "cielab": ("Lab*", 1.0)}
+_PERCENT = {"%": ("%", 1.0), "wt%": ("%", 1.0), "percent": ("%", 1.0)}
+_STRESS = {
+    "mpa": ("MPa", 1.0), "n/mm2": ("MPa", 1.0), "gpa": ("MPa", 1000.0),
+    "kpa": ("MPa", 0.001), "pa": ("MPa", 1e-6), "psi": ("MPa", 0.00689476),
+    "ksi": ("MPa", 6.89476),
+}
+_IMPACT = {"kj/m2": ("kJ/m^2", 1.0), "j/m2": ("kJ/m^2", 0.001)}
+_COST = {"eur/kg": ("EUR/kg", 1.0), "eur/g": ("EUR/kg", 1000.0), "eur/t": ("EUR/kg", 0.001)}
+_ADHESION = {"b": ("B", 1.0)}  # ASTM D3359 划格法等级 0B-5B
+_PENCIL_HARDNESS = {"h": ("H", 1.0)}
+_SHORE = {
+    "shore": ("Shore", 1.0), "shorea": ("Shore A", 1.0), "shored": ("Shore D", 1.0),
+    "a": ("Shore A", 1.0), "d": ("Shore D", 1.0), "ha": ("Shore A", 1.0), "hd": ("Shore D", 1.0),
+}
+
+
+@dataclass(frozen=True)
+class MeasurementField:
+    """测量字段：标准单位（与 chart_data.INDUSTRY_STANDARDS 一致）和可识别的单位"""
+
+    name: str
+    unit: str
+    aliases: Dict[str, Tuple[str, float]]
+    label: str
+
+
+# 测试结果表 -> 测量字段
+MEASUREMENT_FIELDS: Dict[str, Tuple[MeasurementField, ...]] = {
+    "tbl_TestResults_Ink": (
+        MeasurementField("Ink_Viscosity", "cP", _VISCOSITY, "粘度"),
+        MeasurementField("Ink_Reactivity", "s", _TIME, "反应活性/固化时间"),
+        MeasurementField("Ink_ParticleSize", "nm", _PARTICLE_SIZE, "粒径"),
+        MeasurementField("Ink_SurfaceTension", "mN/m", _SURFACE_TENSION, "表面张力"),
+        MeasurementField("Ink_ColorValue", "Lab*", _COLOR, "色度(L*)"),
+    ),
+    "tbl_TestResults_Coating": (
+        MeasurementField("Coating_Adhesion", "", _ADHESION, "附着力"),
+        MeasurementField("Coating_Transparency", "%", _PERCENT, "透明度"),
+        MeasurementField("Coating_SurfaceHardness", "H", _PENCIL_HARDNESS, "表面硬度"),
+        MeasurementField("Coating_ChemicalResistance", "", {}, "耐化学性"),
+        MeasurementField("Coating_CostEstimate", "EUR/kg", _COST, "成本估算"),
+    ),
+    "tbl_TestResults_3DPrint": (
+        MeasurementField("Print3D_Shrinkage", "%", _PERCENT, "收缩率"),
+        MeasurementField("Print3D_YoungsModulus", "MPa", _STRESS, "杨氏模量"),
+        MeasurementField("Print3D_FlexuralStrength", "MPa", _STRESS, "弯曲强度"),
+        MeasurementField("Print3D_ShoreHardness", "Shore", _SHORE, "邵氏硬度"),
+        MeasurementField("Print3D_ImpactResistance", "kJ/m^2", _IMPACT, "抗冲击性"),
+    ),
+    "tbl_TestResults_Composite": (
+        MeasurementField("Composite_FlexuralStrength", "MPa", _STRESS, "弯曲强度"),
+        MeasurementField("Composite_YoungsModulus", "MPa", _STRESS, "杨氏模量"),
+        MeasurementField("Composite_ImpactResistance", "kJ/m^2", _IMPACT, "抗冲击性"),
+        MeasurementField("Composite_ConversionRate", "%", _PERCENT, "转化率"),
+        MeasurementField("Composite_WaterAbsorption", "%", _PERCENT, "吸水率"),
+    ),
+}
+
+# 字段名 -> 测量字段
+FIELDS_BY_NAME: Dict[str, MeasurementField] = {
+    field.name: field for fields in MEASUREMENT_FIELDS.values() for field in fields
+}
+
+# 字段名 -> 所在测试结果表
+TABLE_BY_FIELD: Dict[str, str] = {
+    field.name: table for table, fields in MEASUREMENT_FIELDS.items() for field in fields
+}
+
+# 全部数值影子列 / 单位与解析状态影子列
+VALUE_COLUMNS = frozenset(name + VALUE_SUFFIX for name in FIELDS_BY_NAME)
+DETAIL_COLUMNS = frozenset(
+    name + suffix for name in FIELDS_BY_NAME for suffix in (UNIT_SUFFIX, STATUS_SUFFIX)
+)
+
+
+# ==================== 解析 ====================
+
+_NUMBER = r"[-+]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:[.,]\d+)?(?:[eE][-+]?\d+)?"
+_MEASUREMENT_PATTERN = re.compile(
+    rf"(?P<value>{_NUMBER})"
+    rf"(?:\s*(?:±|\+/-)\s*{_NUMBER})?"                       # 误差 ±2
+    rf"(?:\s*(?:-|~|～|–|—|to)\s*(?P<upper>{_NUMBER}))?"      # 范围 10-20
+)
+# 铅笔硬度：9B ... B, HB, F, H ... 9H
+_PENCIL_PATTERN = re.compile(r"^\s*(?P<grade>\d*)\s*(?P<scale>HB|H|B|F)\s*$", re.IGNORECASE)
+# 单位在第一个分隔符处截断（"L*=52.1, a*=1.2" 只取第一个数，"15cP @25°C" 去掉测试条件）
+_UNIT_DELIMITERS = re.compile(r"[,;，；(（@]")
+_TEXT_REPLACEMENTS = (
+    ("€", " EUR "), ("²", "^2"), ("³", "^3"), ("μ", "u"), ("µ", "u"), ("＝", "="), ("：", ":"),
+)
+
+
+def _normalize_text(text: str) -> str:
+    for old, new in _TEXT_REPLACEMENTS:
+        text = text.replace(old, new)
+    return text
+
+
+def _to_float(text: str) -> float:
+    if "," in text:
+        # 1,234.5 为千分位；12,5 为小数逗号
+        text = text.replace(",", "") if re.search(r",\d{3}(?!\d)", text) else text.replace(",", ".")
+    return float(text)
+
+
+def _unit_key(unit: str) -> str:
+    """单位规范化：小写，去掉空白、乘号、点和上标符号"""
+    return re.sub(r"[\s·⋅.*^]", "", unit.lower())
+
+
+def _parse_pencil_hardness(text: str) -> Optional[ParsedMeasurement]:
+    """铅笔硬度换算为数值：nH = n，F = 0.5，HB = 0，nB = -n"""
+    match = _PENCIL_PATTERN.match(text)
+    if not match:
+        return None
+    scale = match.group("scale").upper()
+    grade = int(match.group("grade") or 1)
+    value = {"H": float(grade), "B": float(-grade), "F": 0.5, "HB": 0.0}[scale]
+    return ParsedMeasurement(value, "H", PARSE_OK)
+
+
+def parse_measurement(field_name: str, raw: Any) -> ParsedMeasurement:
+    """
+    解析测量值文本
+
+    取第一个数值（范围取中值，忽略 ± 误差），单位取数值之后到第一个分隔符之间的文本，
+    整段不是已知单位时取其中第一个词（如 "21 cP at 25 C"）；
+    数值之后没有单位时取数值之前的文本（如 "Shore D 80"）。
+
+    Args:
+        field_name: 测量字段名（不在 MEASUREMENT_FIELDS 中时不换算单位）
+        raw: 原始值
+
+    Returns:
+        ParsedMeasurement，原值为空时三项均为 None
+    """
+    if raw is None:
+        return EMPTY
+    text = str(raw).strip()
+    if not text:
+        return EMPTY
+
+    field = FIELDS_BY_NAME.get(field_name)
+    if field is not None and field.unit == "H":
+        pencil = _parse_pencil_hardness(_UNIT_DELIMITERS.split(text, 1)[0])  # HB (ASTM D3363)
+        if pencil is not None:
+            return pencil
+
+    text = _normalize_text(text)
+    match = _MEASUREMENT_PATTERN.search(text)
+    if not match:
+        return ParsedMeasurement(None, None, PARSE_INVALID)
+
+    value = _to_float(match.group("value"))
+    status = PARSE_OK
+    if match.group("upper"):
+        value = (value + _to_float(match.group("upper"))) / 2
+        status = PARSE_RANGE
+
+    suffix = _UNIT_DELIMITERS.split(text[match.end():], 1)[0].strip()
+    prefix = _UNIT_DELIMITERS.split(text[:match.start()])[-1].strip().rstrip("=:").strip()
+    if suffix.startswith("/") and prefix:
+        unit = prefix + suffix  # EUR 12/kg
+    elif suffix:
+        unit = suffix
+    elif field is not None and _unit_key(prefix) in field.aliases:
+        unit = prefix  # Shore D 80、L*=52.1
+    else:
+        unit = ""  # 前面的文本不是单位（如 "approx. 20"）
+
+    if field is None:
+        return ParsedMeasurement(value, unit or None, status)
+    if not unit:
+        return ParsedMeasurement(
+            value, field.unit or None, PARSE_NO_UNIT if status == PARSE_OK else status
+        )
+
+    alias = field.aliases.get(_unit_key(unit))
+    if alias is None:
+        # 多词单位（"Shore D"、"mPa s"）整段优先，其次取第一个词
+        alias = field.aliases.get(_unit_key(unit.split()[0]))
+    if alias is None:
+        return ParsedMeasurement(None, unit[:20], PARSE_UNKNOWN_UNIT)
+    unit_name, factor = alias
+    if factor != 1.0:
+        value *= factor
+        if status == PARSE_OK:
+            status = PARSE_CONVERTED
+    return ParsedMeasurement(value, unit_name, status)
+
+
+def convert_to_unit(field_name: str, value: float, unit: Optional[str]) -> float:
+    """
+    把指定单位的数值换算为字段的标准单位（范围筛选的上下限用）
+
+    Raises:
+        ValueError: 未知字段或无法识别的单位
+    """
+    field = FIELDS_BY_NAME.get(field_name)
+    if field is None:
+        raise ValueError(f"Unknown measurement field: {field_name}")
+    key = _unit_key(_normalize_text(unit or ""))
+    if not key or key == _unit_key(field.unit):
+        return value
+    alias = field.aliases.get(key)
+    if alias is None:
+        raise ValueError(f"Unknown unit for {field_name}: {unit}")
+    return value * alias[1]
+
+
+def shadow_values(values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    计算写入值中测量字段的影子列
+
+    Args:
+        values: 列名 -> 值（只处理其中的测量字段，未出现的字段不改动）
+
+    Returns:
+        影子列名 -> 值
+    """
+    shadows: Dict[str, Any] = {}
+    for name, raw in values.items():
+        if name not in FIELDS_BY_NAME:
+            continue
+        parsed = parse_measurement(name, raw)
+        shadows[name + VALUE_SUFFIX] = parsed.value
+        shadows[name + UNIT_SUFFIX] = parsed.unit
+        shadows[name + STATUS_SUFFIX] = parsed.status
+    return shadows
+
+
+# ==================== 回填 ====================
+
+def _shadow_columns(fields: Iterable[MeasurementField]) -> List[str]:
+    return [
+        field.name + suffix
+        for field in fields
+        for suffix in (VALUE_SUFFIX, UNIT_SUFFIX, STATUS_SUFFIX)
+    ]
+
+
+def backfill_parsed_values(connection: Connection, table: Table, batch_size: int = 5000) -> int:
+    """
+    按主键键集分批重新解析测试结果表的测量字段，只更新影子列有变化的行
+
+    每批一次 SELECT + 一次 UPDATE ... FROM unnest(...)；解析规则调整后可重复执行。
+    由调用方控制事务（scripts/backfill_test_result_values.py 每张表一个事务）。
+
+    Args:
+        connection: 同步数据库连接
+        table: 测试结果表
+        batch_size: 每批行数
+
+    Returns:
+        更新的行数
+    """
+    fields = MEASUREMENT_FIELDS[table.name]
+    shadow_columns = _shadow_columns(fields)
+    source_columns = [field.name for field in fields]
+    key = table.c.ResultID
+
+    updated = 0
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(key, *[table.c[name] for name in source_columns + shadow_columns])
+            .where(key > last_id)
+            .order_by(key)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return updated
+        last_id = rows[-1][0]
+
+        changes = []
+        for row in rows:
+            raw = dict(zip(source_columns, row[1:1 + len(source_columns)]))
+            current = dict(zip(shadow_columns, row[1 + len(source_columns):]))
+            shadows = shadow_values(raw)
+            if shadows != current:
+                changes.append({"ResultID": row[0], **shadows})
+        if changes:
+            source = unnest_select(table, ["ResultID"] + shadow_columns, changes).subquery()
+            connection.execute(
+                update(table)
+                .where(key == source.c.ResultID)
+                .values({name: source.c[name] for name in shadow_columns})
+            )
+            updated += len(changes)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+报告图片缓存（按内容寻址）
+
+- 缓存键 = 渲染输入（项目信息、配方成分、测试结果、项目类型）和渲染设置的 SHA-256，
+  数据或版式任何变化都会得到新键，无需主动失效
+- 文件保存在本地磁盘（按键前两位分目录），写入先写临时文件再原子替换
+- 读取时更新文件 mtime，总大小超过上限时按 mtime 淘汰最久未访问的文件（LRU）
+- 缓存键同时用作 ETag，见 etag_matches
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.core.logger import logger
+
+# 超过上限后淘汰到上限的该比例，避免每次写入都扫描目录
+EVICT_TARGET_RATIO = 0.9
+
+CACHE_FILE_SUFFIX = ".img"
+
+
+class ReportImageCache:
+    """
+    报告图片磁盘缓存
+
+    Args:
+        directory: 缓存目录
+        max_bytes: 缓存文件总大小上限
+        enabled: False 时 get 总是未命中，put 不写入
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, enabled: bool = True) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max(0, max_bytes)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None  # 首次写入时扫描目录得到
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(inputs: Dict[str, Any], render_settings: Dict[str, Any]) -> str:
+        """
+        计算缓存键
+
+        输入按键排序后序列化为 JSON，日期、Decimal 等按 str() 序列化，
+        相同内容在不同进程、不同字典顺序下得到相同的键。
+        """
+        payload = json.dumps(
+            {"inputs": inputs, "render": render_settings},
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """If-None-Match 是否匹配 ETag（支持逗号分隔的多个值、弱校验 W/ 前缀和 *）"""
+        if not if_none_match:
+            return False
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*":
+                return True
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if candidate == etag:
+                return True
+        return False
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{CACHE_FILE_SUFFIX}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """读取缓存，未命中返回 None"""
+        if not self.enabled:
+            return None
+        content = await asyncio.to_thread(self._read, key)
+        if content is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return content
+
+    async def put(self, key: str, content: bytes) -> None:
+        """写入缓存（写入失败只记录日志，不影响本次请求）"""
+        if not self.enabled or len(content) > self.max_bytes:
+            return
+        try:
+            await asyncio.to_thread(self._write, key, content)
+        except OSError as e:
+            logger.warning(f"Failed to write report cache {key}: {e}")
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "max_bytes": self.max_bytes,
+            "total_bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self.path_for(key)
+        try:
+            content = path.read_bytes()
+            # 更新访问时间，淘汰按 mtime 排序
+            os.utime(path)
+        except FileNotFoundError:
+            # 可能刚被淘汰
+            return None
+        return content
+
+    def _write(self, key: str, content: bytes) -> None:
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            try:
+                previous = path.stat().st_size
+            except FileNotFoundError:
+                previous = 0
+
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+
+            self._total_bytes += len(content) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict(int(self.max_bytes * EVICT_TARGET_RATIO))
+
+    def _scan(self) -> List[Tuple[float, int, Path]]:
+        """缓存文件列表 [(mtime, size, path)]"""
+        entries = []
+        if not self.directory.exists():
+            return entries
+        for path in self.directory.glob(f"*/*{CACHE_FILE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self, target_bytes: int) -> None:
+        """按 mtime 从旧到新删除文件，直到总大小不超过 target_bytes（调用方持有锁）"""
+        entries = sorted(self._scan(), key=lambda entry: entry[0])
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= target_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+        self._total_bytes = total
+
+
+# 项目报告图片缓存（同一目录可被多个服务进程共用）
+report_image_cache = ReportImageCache(
+    directory=settings.REPORT_CACHE_DIR,
+    max_bytes=settings.REPORT_CACHE_MAX_BYTES,
+    enabled=settings.REPORT_CACHE_ENABLE,
+)
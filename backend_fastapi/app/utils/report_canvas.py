@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+"""
+单画布项目报告渲染
+
+ChartGenerator 的报告由五张图分别生成：两张 300 DPI 的 matplotlib 图先编码为 PNG，
+拼接时再解码、LANCZOS 缩放到统一宽度并重新编码为一张很大的 PNG。
+这里把项目信息表、配料表、成分柱状图、测试结果表和雷达图按固定版式（英寸）
+绘制在同一个 matplotlib Figure 上，只光栅化一次，RGBA 缓冲区直接交给 PIL 编码。
+
+分辨率和输出格式由渲染档位（ReportProfile）决定：
+- thumbnail: 列表预览
+- screen: 页面展示（默认）
+- print: 打印/归档，300 DPI 无损 PNG
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.core.custom_exceptions import ValidationException
+
+# 版式（英寸）
+PAGE_WIDTH = 10.0
+MARGIN = 0.3
+PANEL_SPACING = 0.25
+TITLE_HEIGHT = 0.55
+ROW_HEIGHT = 0.36
+BAR_CHART_HEIGHT = 3.2
+BAR_LABEL_MARGIN = 1.3  # 旋转的成分名称和 x 轴标题
+RADAR_SIZE = 4.6
+RADAR_LABEL_MARGIN = 0.7
+
+TITLE_COLOR = '#333333'
+HEADER_FILL = '#f5f5f5'
+BORDER_COLOR = '#cccccc'
+TEXT_COLOR = '#666666'
+HINT_COLOR = '#999999'
+MATERIAL_COLOR = '#5470c6'
+FILLER_COLOR = '#91cc75'
+REFERENCE_COLOR = '#ee6666'
+
+
+@dataclass(frozen=True)
+class ReportProfile:
+    """
+    渲染档位
+
+    Args:
+        name: 档位名称
+        dpi: 光栅化分辨率（画布宽 10 英寸，宽度像素 = 10 * dpi）
+        format: 输出格式 png / webp / jpeg
+        quality: webp / jpeg 的编码质量
+    """
+
+    name: str
+    dpi: int
+    format: str
+    quality: int = 90
+
+    @property
+    def media_type(self) -> str:
+        return f"image/{self.format}"
+
+    @property
+    def extension(self) -> str:
+        return "jpg" if self.format == "jpeg" else self.format
+
+    def settings(self) -> Dict[str, Any]:
+        """影响输出结果的设置（参与报告缓存键计算）"""
+        return asdict(self)
+
+
+def _screen_format() -> str:
+    """屏幕档位优先使用 WebP（Pillow 未编译 WebP 支持时使用 PNG）"""
+    try:
+        from PIL import features
+
+        return "webp" if features.check("webp") else "png"
+    except Exception:
+        return "png"
+
+
+_SCREEN_FORMAT = _screen_format()
+
+# 档位名称 -> 渲染档位
+REPORT_PROFILES: Dict[str, ReportProfile] = {
+    "thumbnail": ReportProfile("thumbnail", dpi=40, format=_SCREEN_FORMAT, quality=75),
+    "screen": ReportProfile("screen", dpi=110, format=_SCREEN_FORMAT, quality=85),
+    "print": ReportProfile("print", dpi=300, format="png"),
+}
+
+DEFAULT_REPORT_PROFILE = settings.REPORT_DEFAULT_PROFILE
+
+
+def get_report_profile(name: Optional[str] = None) -> ReportProfile:
+    """
+    按名称获取渲染档位，None 时为默认档位
+
+    Raises:
+        ValidationException: 未知的档位名称
+    """
+    profile = REPORT_PROFILES.get((name or DEFAULT_REPORT_PROFILE).strip().lower())
+    if profile is None:
+        raise ValidationException(
+            f"不支持的报告档位: {name}，可选: {', '.join(REPORT_PROFILES)}", field="profile"
+        )
+    return profile
+
+
+def _table_rows_info(project_data: Dict[str, Any]) -> List[Tuple[str, str]]:
+    substrate = project_data.get('SubstrateApplication')
+    return [
+        ('Project ID', str(project_data.get('ProjectID', 'N/A'))),
+        ('Project Name', str(project_data.get('ProjectName') or 'N/A')),
+        ('Project Type', str(project_data.get('TypeName') or 'N/A')),
+        ('Formula Code', str(project_data.get('FormulaCode') or 'N/A')),
+        ('Formulator', str(project_data.get('FormulatorName') or 'N/A')),
+        ('Formulation Date', str(project_data.get('FormulationDate', 'N/A'))),
+        ('Substrate/Application', substrate[:30] if substrate else 'N/A'),
+    ]
+
+
+def _composition_name(comp: Dict[str, Any], limit: int) -> str:
+    name = comp.get('MaterialName') or comp.get('FillerName') or 'Unknown'
+    return name[:limit] + '...' if len(name) > limit else name
+
+
+class _ReportCanvas:
+    """按英寸坐标自上而下排列面板的画布"""
+
+    def __init__(self, total_height: float, dpi: int) -> None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.height = total_height
+        self.figure = Figure(figsize=(PAGE_WIDTH, total_height), dpi=dpi, facecolor='white')
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.cursor = MARGIN  # 距顶部的英寸数
+
+    def add_axes(self, left: float, top: float, width: float, height: float, **kwargs):
+        """按英寸坐标（距左、距顶）添加坐标轴"""
+        return self.figure.add_axes(
+            [
+                left / PAGE_WIDTH,
+                1 - (top + height) / self.height,
+                width / PAGE_WIDTH,
+                height / self.height,
+            ],
+            **kwargs,
+        )
+
+    def title(self, text: str) -> None:
+        self.figure.text(
+            0.5,
+            1 - (self.cursor + TITLE_HEIGHT / 2) / self.height,
+            text,
+            ha='center',
+            va='center',
+            fontsize=16,
+            fontweight='bold',
+            color=TITLE_COLOR,
+        )
+        self.cursor += TITLE_HEIGHT
+
+    def table(
+        self,
+        title: str,
+        col_labels: Optional[List[str]],
+        rows: List[List[str]],
+        col_widths: List[float],
+        header_column: bool = False,
+        hint: Optional[str] = None,
+    ) -> None:
+        """绘制表格面板；rows 为空时显示一行提示文字"""
+        self.title(title)
+        width = sum(col_widths)
+        num_rows = (len(rows) or 1) + (1 if col_labels else 0)
+        ax = self.add_axes((PAGE_WIDTH - width) / 2, self.cursor, width, num_rows * ROW_HEIGHT)
+        ax.axis('off')
+        self.cursor += num_rows * ROW_HEIGHT + PANEL_SPACING
+
+        if not rows:
+            if col_labels:
+                table = ax.table(
+                    cellText=[col_labels],
+                    colWidths=[w / width for w in col_widths],
+                    cellLoc='left',
+                    bbox=[0, 1 - 1 / num_rows, 1, 1 / num_rows],
+                )
+                self._style_table(table, header_row=True)
+            ax.add_patch(self._hint_box(0, 0, 1, 1 / num_rows))
+            ax.text(0.5, 0.5 / num_rows, hint or '', ha='center', va='center',
+                    fontsize=11, color=HINT_COLOR)
+            return
+
+        table = ax.table(
+            cellText=rows,
+            colLabels=col_labels,
+            colWidths=[w / width for w in col_widths],
+            cellLoc='left',
+            colLoc='left',
+            bbox=[0, 0, 1, 1],
+        )
+        self._style_table(table, header_row=bool(col_labels), header_column=header_column)
+
+    @staticmethod
+    def _hint_box(x: float, y: float, width: float, height: float):
+        from matplotlib.patches import Rectangle
+
+        return Rectangle((x, y), width, height, fill=False, edgecolor=BORDER_COLOR, linewidth=1)
+
+    @staticmethod
+    def _style_table(table, header_row: bool = False, header_column: bool = False) -> None:
+        table.auto_set_font_size(False)
+        for (row, col), cell in table.get_celld().items():
+            cell.set_edgecolor(BORDER_COLOR)
+            cell.set_linewidth(1)
+            cell.PAD = 0.04
+            is_header = (header_row and row == 0) or (header_column and col == 0)
+            text = cell.get_text()
+            text.set_fontsize(11)
+            if is_header:
+                cell.set_facecolor(HEADER_FILL)
+                text.set_color(TITLE_COLOR)
+                text.set_fontweight('bold')
+            else:
+                text.set_color(TEXT_COLOR)
+
+    def composition_bar_chart(self, compositions: List[Dict[str, Any]]) -> None:
+        self.title('Formula Composition')
+        left, width = 1.0, PAGE_WIDTH - 1.6
+        if not compositions:
+            ax = self.add_axes(left, self.cursor, width, ROW_HEIGHT * 2)
+            ax.axis('off')
+            ax.text(0.5, 0.5, 'No composition data available',
+                    ha='center', va='center', fontsize=13, color=HINT_COLOR)
+            self.cursor += ROW_HEIGHT * 2 + PANEL_SPACING
+            return
+
+        from matplotlib.patches import Patch
+
+        ax = self.add_axes(left, self.cursor, width, BAR_CHART_HEIGHT)
+        self.cursor += BAR_CHART_HEIGHT + BAR_LABEL_MARGIN + PANEL_SPACING
+
+        names = [_composition_name(comp, 15) for comp in compositions]
+        percentages = [float(comp.get('WeightPercentage', 0)) for comp in compositions]
+        colors = [MATERIAL_COLOR if comp.get('MaterialName') else FILLER_COLOR for comp in compositions]
+        positions = range(len(names))
+        bars = ax.bar(positions, percentages, color=colors, alpha=0.8, edgecolor='black')
+        for bar, percentage in zip(bars, percentages):
+            ax.text(bar.get_x() + bar.get_width() / 2., bar.get_height(), f'{percentage:.2f}%',
+                    ha='center', va='bottom', fontsize=9, fontweight='bold')
+
+        ax.set_xlabel('Component Name', fontsize=11, fontweight='bold')
+        ax.set_ylabel('Weight Percentage (%)', fontsize=11, fontweight='bold')
+        ax.set_xticks(list(positions))
+        ax.set_xticklabels(names, rotation=45, ha='right', fontsize=9)
+        ax.set_ylim(0, max(percentages + [1]) * 1.15)
+        ax.yaxis.grid(True, linestyle='--', alpha=0.7)
+        ax.set_axisbelow(True)
+        ax.legend(
+            handles=[
+                Patch(facecolor=MATERIAL_COLOR, label='Material'),
+                Patch(facecolor=FILLER_COLOR, label='Filler'),
+            ],
+            loc='upper right',
+            fontsize=9,
+        )
+
+    def radar_chart(self, test_results: Dict[str, Any], project_type: str) -> None:
+        import numpy as np
+
+        from app.utils.chart_generator import ChartGenerator
+
+        self.title(f'{project_type} - Test Results Radar Chart (Normalized: 0-100)')
+        standards = ChartGenerator.INDUSTRY_STANDARDS.get(project_type, {})
+        categories, values = ChartGenerator.get_radar_values(test_results, project_type)
+        if not categories:
+            if not standards or not test_results:
+                hint = f'No test data available for {project_type}'
+            else:
+                hint = 'Invalid test result data format'
+            ax = self.add_axes(1.0, self.cursor, PAGE_WIDTH - 2.0, ROW_HEIGHT * 2)
+            ax.axis('off')
+            ax.text(0.5, 0.5, hint, ha='center', va='center', fontsize=13, color=HINT_COLOR)
+            self.cursor += ROW_HEIGHT * 2 + PANEL_SPACING
+            return
+
+        top = self.cursor + RADAR_LABEL_MARGIN / 2
+        ax = self.add_axes((PAGE_WIDTH - RADAR_SIZE) / 2, top, RADAR_SIZE, RADAR_SIZE, projection='polar')
+        self.cursor += RADAR_SIZE + RADAR_LABEL_MARGIN + PANEL_SPACING
+
+        angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False)
+        closed_angles = np.append(angles, angles[0])
+        ax.plot(closed_angles, values + values[:1], 'o-', linewidth=2, label='Measured', color=MATERIAL_COLOR)
+        ax.fill(closed_angles, values + values[:1], alpha=0.25, color=MATERIAL_COLOR)
+        ax.plot(closed_angles, [80] * len(closed_angles), '--', linewidth=1.5,
+                label='Reference (80%)', color=REFERENCE_COLOR, alpha=0.7)
+        ax.set_xticks(angles)
+        ax.set_xticklabels(categories, fontsize=10)
+        ax.set_ylim(0, 100)
+        ax.set_yticks([20, 40, 60, 80, 100])
+        ax.set_yticklabels(['20', '40', '60', '80', '100'], fontsize=8)
+        ax.grid(True, linestyle='--', alpha=0.7)
+        ax.legend(loc='upper right', bbox_to_anchor=(1.45, 1.1), fontsize=9)
+
+    def encode(self, profile: ReportProfile) -> bytes:
+        """光栅化一次并按档位编码"""
+        import io
+
+        from PIL import Image
+
+        self.canvas.draw()
+        width, height = self.canvas.get_width_height()
+        image = Image.frombuffer('RGBA', (width, height), self.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+        image = image.convert('RGB')
+
+        buf = io.BytesIO()
+        if profile.format == 'png':
+            image.save(buf, format='PNG', compress_level=6)
+        elif profile.format == 'webp':
+            image.save(buf, format='WEBP', quality=profile.quality, method=4)
+        else:
+            image.save(buf, format='JPEG', quality=profile.quality, optimize=True)
+        return buf.getvalue()
+
+
+def _panel_heights(
+    compositions: List[Dict[str, Any]], test_results: Dict[str, Any], project_type: str
+) -> float:
+    """按内容计算画布总高度（英寸），与 _ReportCanvas 的面板排列一致"""
+    from app.utils.chart_generator import ChartGenerator
+
+    standards = ChartGenerator.INDUSTRY_STANDARDS.get(project_type, {})
+    info = TITLE_HEIGHT + 7 * ROW_HEIGHT
+    composition_table = TITLE_HEIGHT + (max(len(compositions), 1) + 1) * ROW_HEIGHT
+    test_rows = len(standards) if standards and test_results else 1
+    test_table = TITLE_HEIGHT + (test_rows + 1) * ROW_HEIGHT
+    if compositions:
+        bar_chart = TITLE_HEIGHT + BAR_CHART_HEIGHT + BAR_LABEL_MARGIN
+    else:
+        bar_chart = TITLE_HEIGHT + ROW_HEIGHT * 2
+    if ChartGenerator.get_radar_values(test_results, project_type)[0]:
+        radar = TITLE_HEIGHT + RADAR_SIZE + RADAR_LABEL_MARGIN
+    else:
+        radar = TITLE_HEIGHT + ROW_HEIGHT * 2
+    panels = info + composition_table + bar_chart + test_table + radar
+    return panels + PANEL_SPACING * 5 + MARGIN * 2 - PANEL_SPACING
+
+
+def render_report(
+    project_data: Dict[str, Any],
+    compositions: List[Dict[str, Any]],
+    test_results: Dict[str, Any],
+    project_type: str,
+    profile: ReportProfile,
+) -> bytes:
+    """
+    在单个画布上渲染项目报告（项目信息表、配料表、成分柱状图、测试结果表、雷达图）
+
+    测试结果中的特殊字符由调用方替换（见 ProjectReportService.clean_test_results）。
+
+    Returns:
+        按档位格式编码的图片字节数据
+    """
+    from app.utils.chart_generator import ChartGenerator
+
+    canvas = _ReportCanvas(_panel_heights(compositions, test_results, project_type), profile.dpi)
+
+    canvas.table(
+        'Project Information',
+        None,
+        [list(row) for row in _table_rows_info(project_data)],
+        col_widths=[2.4, 5.4],
+        header_column=True,
+    )
+    canvas.table(
+        'Composition Information',
+        ['No.', 'Component', 'Type', 'Weight%'],
+        [
+            [
+                str(idx),
+                _composition_name(comp, 20),
+                'Material' if comp.get('MaterialName') else 'Filler',
+                f"{float(comp.get('WeightPercentage', 0)):.2f}%",
+            ]
+            for idx, comp in enumerate(compositions, 1)
+        ],
+        col_widths=[0.7, 3.6, 1.7, 1.8],
+        hint='No composition data available',
+    )
+    canvas.composition_bar_chart(compositions)
+
+    standards = ChartGenerator.INDUSTRY_STANDARDS.get(project_type, {})
+    test_rows = []
+    if standards and test_results:
+        test_rows = [
+            [str(idx), standard['name'], str(test_results.get(field) or '-')[:35], standard['unit']]
+            for idx, (field, standard) in enumerate(standards.items(), 1)
+        ]
+    canvas.table(
+        'Test Results',
+        ['No.', 'Index', 'Value', 'Unit'],
+        test_rows,
+        col_widths=[0.7, 2.9, 2.8, 1.4],
+        hint='No test data available',
+    )
+    canvas.radar_chart(test_results, project_type)
+
+    return canvas.encode(profile)
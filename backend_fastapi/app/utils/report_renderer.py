@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+项目报告图片渲染（进程池）
+
+报告绘图（matplotlib 光栅化 + PIL 编码，见 app.utils.report_canvas）是纯 CPU 计算，
+在 async 接口里直接调用会阻塞整个 uvicorn 工作进程。渲染改为提交到 RenderPool：
+
+- 独立的进程池（spawn 启动，不继承事件循环和数据库连接），每个渲染进程启动时
+  导入 matplotlib 并渲染一次缩略图，字体缓存只加载一次
+- 排队 + 渲染中的请求数有上限，满了立即抛出 ServiceUnavailableException（503 + Retry-After），
+  不在事件循环里无限堆积
+- 记录排队深度、渲染耗时和等待耗时，见 RenderPool.metrics
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.core.custom_exceptions import ServiceUnavailableException
+from app.core.logger import logger
+
+# 耗时统计保留的最近样本数
+METRICS_WINDOW = 200
+
+# 报告版式版本：修改报告绘图/编码逻辑后递增，使已缓存的报告图片失效
+REPORT_RENDER_VERSION = 2
+
+
+def render_settings(profile: Optional[str] = None) -> Dict[str, Any]:
+    """影响渲染结果的设置（参与报告缓存键计算）"""
+    from app.utils.report_canvas import get_report_profile
+
+    return {"version": REPORT_RENDER_VERSION, **get_report_profile(profile).settings()}
+
+
+def warm_up_worker() -> None:
+    """渲染进程初始化：导入绘图库并渲染一次，加载字体缓存"""
+    from app.utils.report_canvas import REPORT_PROFILES, render_report
+
+    render_report({}, [], {}, "N/A", REPORT_PROFILES["thumbnail"])
+
+
+def _timed_call(func: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[Any, float, int]:
+    """在渲染进程中执行，返回 (结果, 渲染耗时秒, 进程ID)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start, os.getpid()
+
+
+def _percentile(samples: List[float], fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def render_project_report(
+    project_data: Dict[str, Any],
+    compositions: List[Dict[str, Any]],
+    test_results: Dict[str, Any],
+    project_type: str,
+    profile: Optional[str] = None,
+) -> bytes:
+    """
+    渲染项目报告（项目信息表、配料表、成分柱状图、测试结果表、雷达图绘制在同一画布上）
+
+    在渲染进程中执行，参数需可 pickle。
+
+    Args:
+        profile: 渲染档位名称（thumbnail / screen / print），None 为默认档位
+
+    Returns:
+        按档位格式编码的图片字节数据
+    """
+    from app.utils.report_canvas import get_report_profile, render_report
+
+    return render_report(
+        project_data, compositions, test_results, project_type, get_report_profile(profile)
+    )
+
+
+class RenderPool:
+    """
+    有界渲染进程池
+
+    Args:
+        workers: 渲染进程数
+        max_pending: 排队 + 渲染中的请求上限
+        retry_after: 拒绝时建议的重试间隔（秒）
+        initializer: 渲染进程初始化函数，None 时不预热
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_pending: int,
+        retry_after: int = 5,
+        initializer: Optional[Callable[[], None]] = warm_up_worker,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self.retry_after = retry_after
+        self.initializer = initializer
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._render_seconds: Deque[float] = deque(maxlen=METRICS_WINDOW)
+        self._wait_seconds: Deque[float] = deque(maxlen=METRICS_WINDOW)
+
+    @property
+    def pending(self) -> int:
+        """排队 + 渲染中的请求数"""
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer,
+            )
+        return self._executor
+
+    async def start(self, prewarm: bool = True) -> None:
+        """
+        创建进程池；prewarm 时等待所有渲染进程启动并完成初始化
+
+        进程池按需创建进程，同时提交 workers 个空任务即可把进程全部拉起。
+        """
+        executor = self._get_executor()
+        if not prewarm:
+            return
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(executor, os.getpid) for _ in range(self.workers)
+        ])
+        logger.info(
+            f"Report render pool ready: {self.workers} workers in {time.perf_counter() - start:.1f}s"
+        )
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        在渲染进程中执行 func(*args)
+
+        Raises:
+            ServiceUnavailableException: 排队已满，或渲染进程异常退出
+        """
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise ServiceUnavailableException(
+                "Report renderer is busy, please retry later", retry_after=self.retry_after
+            )
+
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        try:
+            future = self._get_executor().submit(_timed_call, func, args)
+            # 名额在渲染进程真正结束时释放，而不是在等待的请求结束时：请求被取消（客户端断开）后
+            # 已开始的渲染仍占用进程，不能让新请求越过排队上限。
+            # 先于 wrap_future 注册，等待者恢复执行前名额已释放
+            self._pending += 1
+            future.add_done_callback(lambda _: self._release_threadsafe(loop))
+            result, render_seconds, _ = await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            # 渲染进程被杀（OOM 等）：丢弃进程池，下次请求重建
+            self._failed += 1
+            logger.error("Report render pool is broken, recreating on next request")
+            self._discard_executor()
+            raise ServiceUnavailableException(
+                "Report renderer restarted, please retry", retry_after=self.retry_after
+            )
+        except Exception:
+            self._failed += 1
+            raise
+
+        elapsed = time.perf_counter() - submitted
+        self._completed += 1
+        self._render_seconds.append(render_seconds)
+        self._wait_seconds.append(max(0.0, elapsed - render_seconds))
+        return result
+
+    def _release(self) -> None:
+        self._pending -= 1
+
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop) -> None:
+        """渲染任务结束回调（在进程池的管理线程或事件循环线程中调用）"""
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            # 事件循环已关闭（应用退出）
+            pass
+
+    def metrics(self) -> Dict[str, Any]:
+        """排队深度与耗时统计（耗时为最近 METRICS_WINDOW 次，毫秒）"""
+        render = list(self._render_seconds)
+        wait = list(self._wait_seconds)
+
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "queued": max(0, self._pending - self.workers),
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "render_ms_avg": ms(sum(render) / len(render)) if render else None,
+            "render_ms_p50": ms(_percentile(render, 0.5)),
+            "render_ms_p95": ms(_percentile(render, 0.95)),
+            "wait_ms_p95": ms(_percentile(wait, 0.95)),
+        }
+
+    def _discard_executor(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """关闭进程池（应用退出时调用）"""
+        self._discard_executor()
+
+
+# 项目报告渲染进程池（每个服务进程一个）
+report_render_pool = RenderPool(
+    workers=settings.REPORT_RENDER_WORKERS,
+    max_pending=settings.REPORT_RENDER_MAX_PENDING,
+    retry_after=settings.REPORT_RENDER_RETRY_AFTER,
+)
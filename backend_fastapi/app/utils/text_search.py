@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+关键词搜索工具
+基于 PostgreSQL pg_trgm 扩展的中缀、大小写不敏感匹配与相似度排序
+
+配合 gin_trgm_ops GIN 索引使用：ILIKE '%kw%' 可以走索引（关键词至少3个字符时
+效果最好），similarity() 用于对命中结果按相关度排序。
+"""
+
+from typing import Sequence
+
+from sqlalchemy import func, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+# LIKE 转义字符
+LIKE_ESCAPE_CHAR = "\\"
+
+
+def normalize_keyword(keyword: str) -> str:
+    """去除首尾空白并合并连续空白"""
+    return " ".join((keyword or "").split())
+
+
+def escape_like(keyword: str) -> str:
+    """
+    转义 LIKE 通配符，使关键词中的 % 和 _ 按字面匹配
+
+    Args:
+        keyword: 用户输入的关键词
+
+    Returns:
+        转义后的关键词
+    """
+    return (
+        keyword.replace(LIKE_ESCAPE_CHAR, LIKE_ESCAPE_CHAR * 2)
+        .replace("%", LIKE_ESCAPE_CHAR + "%")
+        .replace("_", LIKE_ESCAPE_CHAR + "_")
+    )
+
+
+def keyword_condition(columns: Sequence, keyword: str) -> ColumnElement:
+    """
+    生成多列中缀匹配条件（任一列命中即可）
+
+    Args:
+        columns: 参与搜索的列
+        keyword: 关键词
+
+    Returns:
+        SQLAlchemy 条件表达式
+    """
+    pattern = f"%{escape_like(normalize_keyword(keyword))}%"
+    return or_(*[col.ilike(pattern, escape=LIKE_ESCAPE_CHAR) for col in columns])
+
+
+def similarity_rank(columns: Sequence, keyword: str) -> ColumnElement:
+    """
+    生成相似度排序表达式（取各列 similarity 的最大值，NULL 列按 0 计）
+
+    Args:
+        columns: 参与搜索的列
+        keyword: 关键词
+
+    Returns:
+        取值 0~1 的相似度表达式
+    """
+    normalized = normalize_keyword(keyword)
+    scores = [func.coalesce(func.similarity(col, normalized), 0) for col in columns]
+    if len(scores) == 1:
+        return scores[0]
+    return func.greatest(*scores)
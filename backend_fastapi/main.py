@@ -5,11 +5,12 @@ Advanced - PhotoPolymer Formulation Management Database
 主启动文件
 """
 
+import asyncio
 import os
 import uvicorn
 import typer
 from fastapi import FastAPI
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 shell_app = typer.Typer()
 
@@ -20,6 +21,9 @@ async def lifespan(app: FastAPI):
     from app.core.logger import logger
     from app.core.database import async_engine
     from app.config.settings import settings
+    from app.utils.report_renderer import report_render_pool
+    from app.api.v1.modules.exports.service import ExportJobService
+    from app.api.v1.modules.projects.export_service import shutdown_shard_executor
     
     # 启动时初始化
     logger.info("=" * 80)
@@ -28,11 +32,28 @@ async def lifespan(app: FastAPI):
     logger.info(f"🚀 Application starting... Environment: {settings.ENVIRONMENT}")
     logger.info(f"📖 API documentation: http://{settings.SERVER_HOST}:{settings.SERVER_PORT}{settings.DOCS_URL}")
     logger.info(f"📖 ReDoc documentation: http://{settings.SERVER_HOST}:{settings.SERVER_PORT}{settings.REDOC_URL}")
+
+    # 报告渲染进程池（预热后首个请求不再承担进程启动和字体加载）
+    await report_render_pool.start(prewarm=settings.REPORT_RENDER_PREWARM)
+
+    # 上次运行时未完成的导出任务已没有执行者，标记为失败（数据库不可用时不阻止启动）
+    try:
+        await ExportJobService.fail_interrupted_jobs()
+    except Exception as e:
+        logger.error(f"Failed to mark interrupted export jobs: {e}")
+
+    # 定期删除过保留期的导出文件（启动时先清理一次）
+    purge_task = asyncio.create_task(ExportJobService.purge_loop())
     
     yield
     
     # 关闭时清理
     logger.info("👋 Application shutting down...")
+    purge_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await purge_task
+    report_render_pool.shutdown()
+    shutdown_shard_executor()
     await async_engine.dispose()
     logger.info("Database connection closed")
 
@@ -40,6 +61,7 @@ async def lifespan(app: FastAPI):
 def create_app() -> FastAPI:
     """创建FastAPI应用"""
     from app.config.settings import settings
+    from app.common.response import FastJSONResponse
     from app.plugin.init_app import (
         register_middlewares,
         register_exceptions,
@@ -56,6 +78,7 @@ def create_app() -> FastAPI:
         docs_url=settings.DOCS_URL,
         redoc_url=settings.REDOC_URL,
         openapi_url="/api/v1/openapi.json",
+        default_response_class=FastJSONResponse,
         lifespan=lifespan
     )
     
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Backfill Parsed Test Result Values
+Re-parse the free-text measurement fields of the test result tables and write the
+{field}_Value / _Unit / _ParseStatus shadow columns, then ANALYZE each table so range
+filters get accurate row estimates.
+
+Run once after `alembic upgrade head` (migration 20261017_06 only adds the columns and
+indexes), and again whenever the parsing rules in app/utils/measurements.py change.
+Only rows whose shadow columns differ are updated, so re-runs are cheap:
+
+    python scripts/backfill_test_result_values.py
+    python scripts/backfill_test_result_values.py --tables tbl_TestResults_Ink --batch-size 2000
+"""
+
+import sys
+import os
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import time
+
+# Set environment before importing app modules
+os.environ.setdefault("ENVIRONMENT", "dev")
+
+from sqlalchemy import create_engine, text
+
+from app.config.settings import settings
+from app.utils.measurements import MEASUREMENT_FIELDS, backfill_parsed_values
+from app.api.v1.modules.projects.model import (
+    TestResultInkModel,
+    TestResultCoatingModel,
+    TestResult3DPrintModel,
+    TestResultCompositeModel,
+)
+
+TABLES = {
+    model.__tablename__: model.__table__
+    for model in (
+        TestResultInkModel,
+        TestResultCoatingModel,
+        TestResult3DPrintModel,
+        TestResultCompositeModel,
+    )
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill parsed test result values")
+    parser.add_argument("--tables", nargs="+", default=list(MEASUREMENT_FIELDS), choices=list(TABLES))
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DB_URI)
+    try:
+        for table_name in args.tables:
+            start = time.perf_counter()
+            # 每张表一个事务：中途失败时已完成的表保持回填结果
+            with engine.begin() as connection:
+                updated = backfill_parsed_values(connection, TABLES[table_name], args.batch_size)
+                connection.execute(text(f'ANALYZE "{table_name}"'))
+            print(f"{table_name:<28}{updated:>10,} rows updated{time.perf_counter() - start:>10.2f}s")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
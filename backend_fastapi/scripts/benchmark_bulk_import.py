@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Bulk Project Import Benchmark
+Measure ProjectService.bulk_create_projects throughput (projects/s) with realistic items:
+3 compositions per project (2 materials, 1 filler) and a test result matching the project
+type, project types cycling through INK/COAT/3DP/COMP.
+
+Besides the end-to-end rate, the time is split into Python work (validation, row building)
+and each SQL statement the import sends, so a slow stage shows up directly. Created projects
+are deleted afterwards unless --keep is given. Run against a database seeded by
+generate_test_data.py / generate_materials_fillers.py:
+
+    python scripts/benchmark_bulk_import.py --items 5000 --runs 3
+"""
+
+import sys
+import os
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+# Set environment before importing app modules
+os.environ["ENVIRONMENT"] = "dev"
+
+from sqlalchemy import delete, event, select
+
+from app.core.database import async_engine, AsyncSessionLocal
+from app.api.v1.modules.projects.model import ProjectModel, ProjectTypeModel
+from app.api.v1.modules.projects.schema import BulkProjectCreateRequest
+from app.api.v1.modules.projects.service import ProjectService
+from app.api.v1.modules.materials.model import MaterialModel
+from app.api.v1.modules.fillers.model import FillerModel
+
+# 测试结果字段 -> 取值模板（数值随机，贴近真实导入）
+TEST_RESULTS = {
+    "INK": {"Ink_Viscosity": "{:.1f} cP", "Ink_SurfaceTension": "{:.1f} mN/m", "Ink_ParticleSize": "{:.0f} nm"},
+    "COAT": {"Coating_Adhesion": "{:.0f}B", "Coating_SurfaceHardness": "{:.0f}H", "Coating_Transparency": "{:.1f}%"},
+    "3DP": {"Print3D_Shrinkage": "{:.2f}%", "Print3D_YoungsModulus": "{:.2f} GPa", "Print3D_ShoreHardness": "{:.0f} Shore D"},
+    "COMP": {"Composite_FlexuralStrength": "{:.1f} MPa", "Composite_YoungsModulus": "{:.2f} GPa", "Composite_WaterAbsorption": "{:.2f}%"},
+}
+
+# 语句耗时统计：{语句摘要: [次数, 秒]}
+statement_times: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+
+
+def statement_key(statement: str) -> str:
+    """INSERT INTO "tbl_X" ... -> 'INSERT tbl_X'"""
+    words = statement.split()
+    verb = words[0].upper() if words else "?"
+    table = next((w.strip('"(') for w in words if w.startswith('"tbl_')), "")
+    return f"{verb} {table}".strip()
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _before(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+def _after(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    entry = statement_times[statement_key(statement)]
+    entry[0] += 1
+    entry[1] += elapsed
+
+
+async def build_items(count: int) -> List[Dict[str, Any]]:
+    async with AsyncSessionLocal() as db:
+        types = (await db.execute(select(ProjectTypeModel.TypeID, ProjectTypeModel.TypeCode))).all()
+        material_ids = (await db.execute(
+            select(MaterialModel.MaterialID).order_by(MaterialModel.MaterialID).limit(500)
+        )).scalars().all()
+        filler_ids = (await db.execute(
+            select(FillerModel.FillerID).order_by(FillerModel.FillerID).limit(500)
+        )).scalars().all()
+    rng = random.Random(7)
+    items = []
+    for i in range(count):
+        type_id, type_code = types[i % len(types)]
+        item = {
+            "project_name": f"Bulk Bench {i}",
+            "project_type_fk": type_id,
+            "formulator_name": "Bulk Bench",
+            "formulation_date": str(date(2026, 1, 1) + timedelta(days=i % 28)),
+            "substrate_application": "benchmark",
+            "compositions": [
+                {"material_id": rng.choice(material_ids), "weight_percentage": "40.5"},
+                {"material_id": rng.choice(material_ids), "weight_percentage": "39.5"},
+                {"filler_id": rng.choice(filler_ids), "weight_percentage": "20"},
+            ],
+        }
+        if type_code in TEST_RESULTS:
+            item["test_result"] = {
+                name: template.format(rng.uniform(1, 5)) for name, template in TEST_RESULTS[type_code].items()
+            }
+            item["test_result"]["TestDate"] = "2026-02-01"
+        items.append(item)
+    return items
+
+
+async def run_once(items: List[Dict[str, Any]]) -> Tuple[float, float]:
+    """执行一次批量导入，返回 (墙钟秒, 本进程 CPU 秒)"""
+    request = BulkProjectCreateRequest(items=items)
+    async with AsyncSessionLocal() as db:
+        start, cpu_start = time.perf_counter(), time.process_time()
+        response = await ProjectService.bulk_create_projects(db, request)
+        elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+    if response.failed:
+        errors = {r.error for r in response.items if r.error}
+        raise SystemExit(f"{response.failed} items failed: {sorted(errors)[:3]}")
+    return elapsed, cpu
+
+
+async def cleanup() -> int:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            delete(ProjectModel).where(ProjectModel.FormulatorName == "Bulk Bench")
+        )
+        await db.commit()
+        return result.rowcount
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk project import")
+    parser.add_argument("--items", type=int, default=5000, help="projects per request")
+    parser.add_argument("--runs", type=int, default=3, help="timed requests")
+    parser.add_argument("--target", type=float, default=5000, help="target projects/s")
+    parser.add_argument("--keep", action="store_true", help="keep the created projects")
+    args = parser.parse_args()
+
+    items = await build_items(args.items)
+    await run_once(items[: min(200, args.items)])  # 预热连接和语句缓存
+    statement_times.clear()
+
+    timings = [await run_once(items) for _ in range(args.runs)]
+    median = statistics.median(wall for wall, _ in timings)
+    client_cpu = statistics.median(cpu for _, cpu in timings)
+    sql_total = sum(seconds for _, seconds in statement_times.values()) / args.runs
+
+    print("=" * 72)
+    print(f"BULK IMPORT BENCHMARK ({args.items:,} projects per request, median of {args.runs})")
+    print("=" * 72)
+    print(f"{'stage':<40}{'calls':>8}{'ms/request':>14}{'share':>9}")
+    print("-" * 72)
+    for key, (calls, seconds) in sorted(statement_times.items(), key=lambda kv: -kv[1][1]):
+        per_request = seconds / args.runs
+        print(f"{key:<40}{calls / args.runs:>8.0f}{per_request * 1000:>14.1f}{per_request / median:>8.0%}")
+    python_time = max(0.0, median - sql_total)
+    print(f"{'python (validation, row building)':<40}{'':>8}{python_time * 1000:>14.1f}{python_time / median:>8.0%}")
+    print("-" * 72)
+    # 语句耗时含参数编码与结果解码；本进程 CPU 之外的时间即数据库执行（及等待）时间
+    print(f"client CPU {client_cpu * 1000:.0f} ms, database/wait {(median - client_cpu) * 1000:.0f} ms per request")
+    rate = args.items / median
+    verdict = "OK" if rate >= args.target else "BELOW TARGET"
+    print(f"{median:.2f}s per request, {rate:,.0f} projects/s (target {args.target:,.0f}/s: {verdict})")
+    print("=" * 72)
+
+    if not args.keep:
+        print(f"cleanup: {await cleanup():,} projects deleted")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
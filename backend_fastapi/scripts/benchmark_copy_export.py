@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+COPY Export Benchmark
+Compare CSV export paths for the flat exports (materials, fillers):
+
+- export_to_csv: list service (projection + response models) -> prepare_export_data ->
+  ExportHelper.export_to_csv, the whole file built as one string
+- stream_export: server-side cursor batches (iter_export_batches) -> ExportHelper.stream_export
+  with CsvExportWriter, the path used when EXPORT_USE_COPY is off
+- copy: COPY (SELECT ...) TO STDOUT via asyncpg, renaming and sanitization done in SQL
+
+All paths read the same number of rows in the same order. Run against a database seeded
+by generate_materials_fillers.py:
+
+    python scripts/benchmark_copy_export.py --rows 500000 --runs 3
+"""
+
+import sys
+import os
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import asyncio
+import statistics
+import time
+from contextlib import aclosing
+from typing import Awaitable, Callable, List, Tuple
+
+# Set environment before importing app modules
+os.environ["ENVIRONMENT"] = "dev"
+
+from app.core.database import async_engine, AsyncSessionLocal
+from app.utils.export_helper import ExportHelper
+from app.utils.export_writers import CsvExportWriter
+from app.utils.pg_copy import stream_copy_csv
+from app.api.v1.modules.materials.crud import MaterialCRUD
+from app.api.v1.modules.materials.schema import (
+    MaterialQueryParams,
+    MATERIAL_EXPORT_COLUMNS,
+    MATERIAL_EXPORT_MAPPING,
+)
+from app.api.v1.modules.materials.service import MaterialService
+from app.api.v1.modules.fillers.crud import FillerCRUD
+from app.api.v1.modules.fillers.schema import (
+    FillerQueryParams,
+    FILLER_EXPORT_COLUMNS,
+    FILLER_EXPORT_MAPPING,
+)
+from app.api.v1.modules.fillers.service import FillerService
+
+
+async def fetch_list(name: str, rows: int) -> list:
+    async with AsyncSessionLocal() as db:
+        if name == "materials":
+            items, _ = await MaterialService.get_material_list(
+                db, 1, rows, MaterialQueryParams(), count_mode="cached"
+            )
+        else:
+            items, _ = await FillerService.get_filler_list(
+                db, 1, rows, FillerQueryParams(), count_mode="cached"
+            )
+    return items
+
+
+def mapping_for(name: str) -> dict:
+    return MATERIAL_EXPORT_MAPPING if name == "materials" else FILLER_EXPORT_MAPPING
+
+
+async def export_to_csv_path(name: str, rows: int) -> int:
+    items = await fetch_list(name, rows)
+    mapping = mapping_for(name)
+    data = ExportHelper.prepare_export_data(items, mapping)
+    content, _ = ExportHelper.export_to_csv(data, list(mapping.values()))
+    return len(content)
+
+
+async def limited_batches(name: str, rows: int):
+    """与导出相同的服务端游标分批读取，取够 rows 行后停止"""
+    if name == "materials":
+        batches = MaterialService.iter_export_batches(MaterialQueryParams())
+    else:
+        batches = FillerService.iter_export_batches(FillerQueryParams())
+    remaining = rows
+    async with aclosing(batches):
+        async for batch in batches:
+            yield batch[:remaining]
+            remaining -= len(batch)
+            if remaining <= 0:
+                break
+
+
+async def stream_export_path(name: str, rows: int) -> int:
+    columns = MATERIAL_EXPORT_COLUMNS if name == "materials" else FILLER_EXPORT_COLUMNS
+    stream = ExportHelper.stream_export(
+        limited_batches(name, rows), CsvExportWriter, mapping_for(name), columns
+    )
+    size = 0
+    async for chunk in stream:
+        size += len(chunk)
+    return size
+
+
+async def copy_path(name: str, rows: int) -> int:
+    crud = MaterialCRUD if name == "materials" else FillerCRUD
+    stmt = crud.build_export_query(mapping_for(name)).limit(rows)
+    size = 0
+    async for chunk in stream_copy_csv(stmt):
+        size += len(chunk)
+    return size
+
+
+# (名称, 导出函数)
+PATHS: List[Tuple[str, Callable[[str, int], Awaitable[int]]]] = [
+    ("export_to_csv", export_to_csv_path),
+    ("stream_export", stream_export_path),
+    ("copy", copy_path),
+]
+
+
+async def time_path(
+    export: Callable[[str, int], Awaitable[int]], name: str, rows: int, runs: int
+) -> Tuple[float, int]:
+    """返回 (中位耗时秒, 输出字节数)"""
+    timings: List[float] = []
+    size = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        size = await export(name, rows)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), size
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark COPY-based CSV export")
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per path")
+    parser.add_argument("--modules", nargs="+", default=["materials", "fillers"])
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"COPY EXPORT BENCHMARK ({args.rows:,} rows, median of {args.runs})")
+    print("=" * 72)
+    print(f"{'module':<12}{'path':<16}{'seconds':>10}{'MB':>10}{'rows/s':>12}{'vs csv':>10}")
+    print("-" * 72)
+
+    for name in args.modules:
+        await copy_path(name, 1000)  # 预热连接池和缓存
+        baseline = None
+        for path_name, export in PATHS:
+            elapsed, size = await time_path(export, name, args.rows, args.runs)
+            baseline = baseline or elapsed
+            print(
+                f"{name:<12}{path_name:<16}{elapsed:>10.2f}{size / 1024 / 1024:>10.1f}"
+                f"{args.rows / elapsed:>12,.0f}{baseline / elapsed:>9.1f}x"
+            )
+
+    print("=" * 72)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Export Load Benchmark
+Compare how long it takes to load project exports into a typed DataFrame downstream:
+
+- csv: pandas.read_csv, then parse the "测试数据" (k=v; k=v) strings into columns and
+  convert dates / weights, which is what consumers of the CSV export have to do
+- parquet: pandas.read_parquet (typed columns, one column per test property)
+- arrow: pandas.read_feather (Arrow IPC file)
+
+Columnar files are timed twice: with pandas' default NumPy/object dtypes and with
+dtype_backend="pyarrow", which skips converting string columns to Python objects.
+
+Produce the files with benchmark_project_export.py first:
+
+    python scripts/benchmark_project_export.py --format csv --output /tmp/projects.csv
+    python scripts/benchmark_project_export.py --format parquet --output /tmp/projects.parquet
+    python scripts/benchmark_project_export.py --format arrow --output /tmp/projects.arrow
+    python scripts/benchmark_export_load.py --csv /tmp/projects.csv \\
+        --parquet /tmp/projects.parquet --arrow /tmp/projects.arrow
+"""
+
+import argparse
+import os
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+import pandas as pd
+
+
+def load_csv(path: str) -> pd.DataFrame:
+    """读取 CSV 并还原为与列式导出等价的类型化宽表"""
+    frame = pd.read_csv(path, encoding="utf-8-sig", low_memory=False)
+    frame["配方日期"] = pd.to_datetime(frame["配方日期"], errors="coerce")
+    frame["重量百分比(%)"] = pd.to_numeric(frame["重量百分比(%)"], errors="coerce")
+    frame["总重量百分比(%)"] = pd.to_numeric(frame["总重量百分比(%)"], errors="coerce")
+
+    # 测试数据只写在每个项目的第一行，需要拆成列再向下填充
+    pairs = frame["测试数据"].dropna().str.split("; ")
+    parsed: List[Dict[str, str]] = [
+        dict(item.split("=", 1) for item in items if "=" in item) for items in pairs
+    ]
+    tests = pd.DataFrame(parsed, index=pairs.index)
+    frame = frame.drop(columns=["测试数据"]).join(tests)
+    frame[tests.columns] = frame.groupby("项目ID")[list(tests.columns)].ffill()
+    return frame
+
+
+# (文件参数, 加载函数)
+LOADERS: Dict[str, Tuple[str, Callable[[str], pd.DataFrame]]] = {
+    "csv": ("csv", load_csv),
+    "parquet": ("parquet", pd.read_parquet),
+    "parquet/pa": ("parquet", lambda path: pd.read_parquet(path, dtype_backend="pyarrow")),
+    "arrow": ("arrow", pd.read_feather),
+    "arrow/pa": ("arrow", lambda path: pd.read_feather(path, dtype_backend="pyarrow")),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading export files into pandas")
+    parser.add_argument("--csv")
+    parser.add_argument("--parquet")
+    parser.add_argument("--arrow")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("EXPORT LOAD BENCHMARK")
+    print("=" * 72)
+    print(f"{'format':<12}{'size MB':>10}{'rows':>12}{'cols':>6}{'load s':>10}{'vs csv':>9}")
+
+    baseline = None
+    for name, (source, loader) in LOADERS.items():
+        path = getattr(args, source)
+        if not path:
+            continue
+        timings = []
+        frame = None
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            frame = loader(path)
+            timings.append(time.perf_counter() - start)
+        elapsed = statistics.median(timings)
+        if name == "csv":
+            baseline = elapsed
+        speedup = f"{baseline / elapsed:>8.1f}x" if baseline else f"{'-':>9}"
+        print(
+            f"{name:<12}{os.path.getsize(path) / 1024 / 1024:>10.1f}{len(frame):>12,}"
+            f"{len(frame.columns):>6}{elapsed:>10.2f}{speedup}"
+        )
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
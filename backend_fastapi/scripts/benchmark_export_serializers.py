@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Export Serializer Microbenchmark
+Compare per-row CPU cost of the project export serializers, without a database
+
+Legacy serializer (before column plans):
+    ORM objects -> dir()/getattr() test-result string -> sanitize every cell -> csv per batch
+Plan serializer (current export_service):
+    Core row tuples -> TestResultPlan.format -> build_project_rows -> pluggable writer
+
+    python scripts/benchmark_export_serializers.py --projects 5000 --runs 5
+"""
+
+import sys
+import os
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import csv
+import io
+import statistics
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Callable, List, Tuple
+
+# Set environment before importing app modules
+os.environ["ENVIRONMENT"] = "dev"
+
+from app.api.v1.modules.projects.model import (
+    ProjectModel,
+    ProjectTypeModel,
+    FormulaCompositionModel,
+    TestResultInkModel,
+)
+from app.api.v1.modules.materials.model import MaterialModel
+from app.api.v1.modules.fillers.model import FillerModel
+from app.api.v1.modules.projects.export_service import ProjectExportService
+from app.utils.export_helper import ExportHelper
+from app.utils.export_writers import get_export_writer
+
+COMPOSITIONS_PER_PROJECT = 3
+
+
+# ==================== 测试数据 ====================
+
+def build_orm_batch(count: int) -> Tuple[list, dict]:
+    """旧路径的输入：带关联对象的 ORM 实体和测试结果实体"""
+    project_type = ProjectTypeModel(TypeID=1, TypeName="Inkjet", TypeCode="INK")
+    material = MaterialModel(MaterialID=1, TradeName="Resin A")
+    filler = FillerModel(FillerID=1, TradeName="Silica B")
+    projects, results = [], {}
+    for i in range(count):
+        project = ProjectModel(
+            ProjectID=i,
+            ProjectName=f"Project {i}",
+            FormulaCode=f"AB-01012026-INK-{i:05d}",
+            FormulatorName="Ann Lee",
+            FormulationDate=date(2026, 1, 1),
+            SubstrateApplication="PET film",
+        )
+        project.project_type = project_type
+        project.compositions = [
+            FormulaCompositionModel(
+                MaterialID_FK=1 if k < 2 else None,
+                FillerID_FK=None if k < 2 else 1,
+                WeightPercentage=Decimal("33.3300"),
+                AdditionMethod="mix" if k == 1 else None,
+                material=material if k < 2 else None,
+                filler=None if k < 2 else filler,
+            )
+            for k in range(COMPOSITIONS_PER_PROJECT)
+        ]
+        projects.append(project)
+        if i % 2 == 0:
+            results[i] = TestResultInkModel(
+                ResultID=i, ProjectID_FK=i, Ink_Viscosity="12 cP",
+                Ink_SurfaceTension="32", TestDate=date(2026, 2, 1),
+            )
+    return projects, results
+
+
+def build_row_batch(count: int) -> Tuple[list, dict, dict]:
+    """新路径的输入：Core 查询返回的行元组"""
+    plan = ProjectExportService.TEST_RESULT_PLANS[0]
+    projects, compositions, results = [], {}, {}
+    for i in range(count):
+        projects.append(
+            (i, f"Project {i}", "Inkjet", f"AB-01012026-INK-{i:05d}", "Ann Lee", date(2026, 1, 1), "PET film")
+        )
+        compositions[i] = [
+            (i, 1 if k < 2 else None, Decimal("33.3300"), "mix" if k == 1 else None, None,
+             "Resin A" if k < 2 else None, None if k < 2 else "Silica B")
+            for k in range(COMPOSITIONS_PER_PROJECT)
+        ]
+        if i % 2 == 0:
+            values = {"Ink_Viscosity": "12 cP", "Ink_SurfaceTension": "32", "TestDate": date(2026, 2, 1)}
+            results[i] = (i, *[values.get(key) for key in plan.keys])
+    return projects, compositions, results
+
+
+# ==================== 旧序列化路径 ====================
+
+def legacy_test_result_str(test_result) -> str:
+    test_dict = {}
+    for key in dir(test_result):
+        if not key.startswith("_") and key not in ["ResultID", "ProjectID_FK", "metadata", "registry"]:
+            value = getattr(test_result, key, None)
+            if value and not callable(value):
+                test_dict[key] = value
+    return "; ".join(f"{k}={v}" for k, v in test_dict.items() if v)
+
+
+def legacy_serialize(projects: list, results: dict) -> bytes:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    for project in projects:
+        test_result_str = ""
+        if project.ProjectID in results:
+            test_result_str = legacy_test_result_str(results[project.ProjectID])
+        compositions = project.compositions or []
+        total_weight = sum(float(c.WeightPercentage) for c in compositions) if compositions else 0
+        for idx, comp in enumerate(compositions):
+            comp_name = comp.material.TradeName if comp.material else (comp.filler.TradeName if comp.filler else "")
+            row = [
+                project.ProjectID, project.ProjectName,
+                project.project_type.TypeName if project.project_type else "",
+                project.FormulaCode or "", project.FormulatorName or "",
+                str(project.FormulationDate) if project.FormulationDate else "",
+                project.SubstrateApplication or "", idx + 1,
+                "原料" if comp.MaterialID_FK else "填料", comp_name,
+                float(comp.WeightPercentage), comp.AdditionMethod or "", comp.Remarks or "",
+                f"{total_weight:.2f}" if idx == 0 else "", test_result_str if idx == 0 else "",
+            ]
+            writer.writerow([ExportHelper.sanitize_spreadsheet_value(v) for v in row])
+    return output.getvalue().encode("utf-8")
+
+
+# ==================== 列计划序列化路径 ====================
+
+def plan_serialize(projects: list, compositions: dict, results: dict, writer) -> bytes:
+    plan = ProjectExportService.TEST_RESULT_PLANS[0]
+    test_results = {pid: plan.format(row[1:]) for pid, row in results.items()}
+    rows = []
+    for project in projects:
+        rows.extend(
+            ProjectExportService.build_project_rows(
+                project, compositions.get(project[0], []), test_results.get(project[0], "")
+            )
+        )
+    return writer.write_rows(rows)
+
+
+def time_it(fn: Callable[[], bytes], runs: int) -> Tuple[float, bytes]:
+    timings: List[float] = []
+    data = fn()
+    for _ in range(runs):
+        start = time.perf_counter()
+        data = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark export row serializers")
+    parser.add_argument("--projects", type=int, default=5000, help="projects per batch")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    orm_projects, orm_results = build_orm_batch(args.projects)
+    row_projects, row_compositions, row_results = build_row_batch(args.projects)
+    rows = args.projects * COMPOSITIONS_PER_PROJECT
+
+    print("=" * 72)
+    print(f"EXPORT SERIALIZER MICROBENCHMARK ({args.projects:,} projects, {rows:,} rows)")
+    print("=" * 72)
+    legacy_s, legacy_data = time_it(lambda: legacy_serialize(orm_projects, orm_results), args.runs)
+    print(f"{'legacy csv':<16}{legacy_s * 1e6 / rows:>10.2f} us/row")
+    for export_format in ("csv", "txt"):
+        writer = get_export_writer(export_format)(ProjectExportService.HEADER_COLUMNS)
+        writer.begin()
+        plan_s, plan_data = time_it(
+            lambda: plan_serialize(row_projects, row_compositions, row_results, writer), args.runs
+        )
+        note = ""
+        if export_format == "csv":
+            note = "  (output identical)" if plan_data == legacy_data else "  (OUTPUT DIFFERS)"
+        print(
+            f"{'plan ' + export_format:<16}{plan_s * 1e6 / rows:>10.2f} us/row"
+            f"{legacy_s / plan_s:>8.1f}x{note}"
+        )
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
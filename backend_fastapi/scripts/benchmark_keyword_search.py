@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Keyword Search Benchmark
+Measure trigram-backed keyword search latency for projects, materials and fillers
+
+Run against a database seeded by generate_test_data.py / generate_materials_fillers.py
+after applying the Alembic migrations (pg_trgm + GIN indexes):
+
+    python scripts/benchmark_keyword_search.py --runs 20 --target-ms 50
+"""
+
+import sys
+import os
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+# Set environment before importing app modules
+os.environ["ENVIRONMENT"] = "dev"
+
+from sqlalchemy import text
+
+from app.core.database import async_engine, AsyncSessionLocal
+from app.api.v1.modules.projects.crud import ProjectCRUD
+from app.api.v1.modules.materials.crud import MaterialCRUD
+from app.api.v1.modules.fillers.crud import FillerCRUD
+
+
+# 每组: (名称, 关键词, 查询函数)
+CASES = [
+    ("projects/name-infix", "Perform", lambda db, kw: ProjectCRUD.get_list_paginated(db, 1, 20, keyword=kw)),
+    ("projects/name-ci", "perform", lambda db, kw: ProjectCRUD.get_list_paginated(db, 1, 20, keyword=kw)),
+    ("projects/formula-code", "INK-0", lambda db, kw: ProjectCRUD.get_list_paginated(db, 1, 20, keyword=kw)),
+    ("materials/trade-name", "acryl", lambda db, kw: MaterialCRUD.get_list_paginated(db, 1, 20, keyword=kw)),
+    ("materials/cas", "-58-", lambda db, kw: MaterialCRUD.get_list_paginated(db, 1, 20, keyword=kw)),
+    ("fillers/trade-name", "silica", lambda db, kw: FillerCRUD.get_list_paginated(db, 1, 20, keyword=kw)),
+]
+
+EXPLAIN_SQL = {
+    "tbl_ProjectInfo": 'SELECT 1 FROM "tbl_ProjectInfo" WHERE "ProjectName" ILIKE :p',
+    "tbl_RawMaterials": 'SELECT 1 FROM "tbl_RawMaterials" WHERE "TradeName" ILIKE :p',
+    "tbl_InorganicFillers": 'SELECT 1 FROM "tbl_InorganicFillers" WHERE "TradeName" ILIKE :p',
+}
+
+
+async def time_case(
+    query: Callable[..., Awaitable], keyword: str, runs: int
+) -> List[float]:
+    """执行一组查询并返回每次耗时（毫秒），首次执行作为预热不计入"""
+    timings = []
+    async with AsyncSessionLocal() as db:
+        await query(db, keyword)
+        for _ in range(runs):
+            start = time.perf_counter()
+            await query(db, keyword)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def show_plans():
+    """打印执行计划，确认命中 gin_trgm_ops 索引"""
+    print("\nQuery plans:")
+    async with async_engine.connect() as conn:
+        for table_name, sql in EXPLAIN_SQL.items():
+            result = await conn.execute(text(f"EXPLAIN {sql}"), {"p": "%perform%"})
+            plan = [row[0] for row in result]
+            uses_index = any("Bitmap Index Scan" in line or "Index Scan" in line for line in plan)
+            print(f"  {table_name}: {'index' if uses_index else 'SEQ SCAN'}")
+            for line in plan:
+                print(f"      {line}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark keyword search latency")
+    parser.add_argument("--runs", type=int, default=20, help="timed runs per case")
+    parser.add_argument("--target-ms", type=float, default=50.0, help="p95 latency target")
+    parser.add_argument("--plans", action="store_true", help="print EXPLAIN output")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("KEYWORD SEARCH BENCHMARK")
+    print("=" * 80)
+    print(f"{'case':<28}{'keyword':<12}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}  result")
+    print("-" * 80)
+
+    failed = 0
+    for name, keyword, query in CASES:
+        timings = sorted(await time_case(query, keyword, args.runs))
+        p50 = statistics.median(timings)
+        p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+        ok = p95 <= args.target_ms
+        failed += 0 if ok else 1
+        print(
+            f"{name:<28}{keyword:<12}{p50:>10.1f}{p95:>10.1f}{timings[-1]:>10.1f}  "
+            f"{'OK' if ok else 'SLOW'}"
+        )
+
+    if args.plans:
+        await show_plans()
+
+    print("=" * 80)
+    print(f"{len(CASES) - failed}/{len(CASES)} cases within {args.target_ms:.0f} ms (p95)")
+    await async_engine.dispose()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+List Read Path Benchmark
+Compare the ORM entity read path with the column-projection read path for list endpoints
+
+Legacy path (before projection):
+    select(Model).options(selectinload(relation)) -> per-row model_validate -> patch name in Python
+Projection path (current services):
+    select(explicit columns + joined name) -> TypeAdapter.validate_python(rows) for the whole page
+
+Both paths finish with JSON-mode serialization, as the controllers do.
+Run against a database seeded by generate_test_data.py / generate_materials_fillers.py:
+
+    python scripts/benchmark_list_read_path.py --page-sizes 100 250 500 1000 --runs 10
+"""
+
+import sys
+import os
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+# Set environment before importing app modules
+os.environ["ENVIRONMENT"] = "dev"
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.core.database import async_engine, AsyncSessionLocal
+from app.api.v1.modules.projects.model import ProjectModel
+from app.api.v1.modules.projects.schema import (
+    ProjectBasicResponse,
+    ProjectQueryParams,
+    PROJECT_LIST_ADAPTER,
+)
+from app.api.v1.modules.projects.service import ProjectService
+from app.api.v1.modules.materials.model import MaterialModel
+from app.api.v1.modules.materials.schema import (
+    MaterialResponse,
+    MaterialQueryParams,
+    MATERIAL_LIST_ADAPTER,
+)
+from app.api.v1.modules.materials.service import MaterialService
+from app.api.v1.modules.fillers.model import FillerModel
+from app.api.v1.modules.fillers.schema import (
+    FillerResponse,
+    FillerQueryParams,
+    FILLER_LIST_ADAPTER,
+)
+from app.api.v1.modules.fillers.service import FillerService
+
+
+# ==================== 旧读取路径（ORM实体 + 逐行转换） ====================
+
+async def legacy_projects(db, page_size: int) -> list:
+    stmt = (
+        select(ProjectModel)
+        .options(selectinload(ProjectModel.project_type))
+        .order_by(ProjectModel.ProjectID.desc())
+        .limit(page_size)
+    )
+    result = []
+    for project in (await db.execute(stmt)).scalars().all():
+        data = ProjectBasicResponse.model_validate(project)
+        if project.project_type:
+            data.TypeName = project.project_type.TypeName
+        result.append(data)
+    return [p.model_dump(mode="json") for p in result]
+
+
+async def legacy_materials(db, page_size: int) -> list:
+    stmt = (
+        select(MaterialModel)
+        .options(selectinload(MaterialModel.category))
+        .order_by(MaterialModel.MaterialID.desc())
+        .limit(page_size)
+    )
+    result = []
+    for material in (await db.execute(stmt)).scalars().all():
+        data = MaterialResponse.model_validate(material)
+        if material.category:
+            data.CategoryName = material.category.CategoryName
+        result.append(data)
+    return [m.model_dump(mode="json") for m in result]
+
+
+async def legacy_fillers(db, page_size: int) -> list:
+    stmt = (
+        select(FillerModel)
+        .options(selectinload(FillerModel.filler_type))
+        .order_by(FillerModel.FillerID.desc())
+        .limit(page_size)
+    )
+    result = []
+    for filler in (await db.execute(stmt)).scalars().all():
+        data = FillerResponse.model_validate(filler)
+        if filler.filler_type:
+            data.FillerTypeName = filler.filler_type.FillerTypeName
+        result.append(data)
+    return [f.model_dump(mode="json") for f in result]
+
+
+# ==================== 投影读取路径（当前服务实现） ====================
+
+async def projection_projects(db, page_size: int) -> list:
+    projects, _, _ = await ProjectService.get_project_list(
+        db, 1, page_size, ProjectQueryParams(), count_mode="cached"
+    )
+    return PROJECT_LIST_ADAPTER.dump_python(projects, mode="json")
+
+
+async def projection_materials(db, page_size: int) -> list:
+    materials, _ = await MaterialService.get_material_list(
+        db, 1, page_size, MaterialQueryParams(), count_mode="cached"
+    )
+    return MATERIAL_LIST_ADAPTER.dump_python(materials, mode="json")
+
+
+async def projection_fillers(db, page_size: int) -> list:
+    fillers, _ = await FillerService.get_filler_list(
+        db, 1, page_size, FillerQueryParams(), count_mode="cached"
+    )
+    return FILLER_LIST_ADAPTER.dump_python(fillers, mode="json")
+
+
+# 每组: (名称, 旧路径, 投影路径)
+CASES = [
+    ("projects", legacy_projects, projection_projects),
+    ("materials", legacy_materials, projection_materials),
+    ("fillers", legacy_fillers, projection_fillers),
+]
+
+
+async def time_path(
+    query: Callable[..., Awaitable[list]], page_size: int, runs: int
+) -> Tuple[float, int]:
+    """返回 (中位耗时毫秒, 返回行数)，首次执行作为预热不计入"""
+    timings: List[float] = []
+    async with AsyncSessionLocal() as db:
+        rows = len(await query(db, page_size))
+        for _ in range(runs):
+            db.expunge_all()
+            start = time.perf_counter()
+            await query(db, page_size)
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), rows
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark list read paths")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[100, 250, 500, 1000])
+    parser.add_argument("--runs", type=int, default=10, help="timed runs per case")
+    args = parser.parse_args()
+
+    print("=" * 88)
+    print("LIST READ PATH BENCHMARK (median per page)")
+    print("=" * 88)
+    print(
+        f"{'case':<12}{'page':>6}{'rows':>6}{'orm ms':>10}{'proj ms':>10}"
+        f"{'orm us/row':>13}{'proj us/row':>13}{'speedup':>10}"
+    )
+    print("-" * 88)
+
+    for name, legacy, projection in CASES:
+        for page_size in args.page_sizes:
+            legacy_ms, rows = await time_path(legacy, page_size, args.runs)
+            projection_ms, _ = await time_path(projection, page_size, args.runs)
+            if rows == 0:
+                print(f"{name:<12}{page_size:>6}{rows:>6}  (no data)")
+                continue
+            print(
+                f"{name:<12}{page_size:>6}{rows:>6}{legacy_ms:>10.2f}{projection_ms:>10.2f}"
+                f"{legacy_ms * 1000 / rows:>13.1f}{projection_ms * 1000 / rows:>13.1f}"
+                f"{legacy_ms / projection_ms:>9.1f}x"
+            )
+
+    print("=" * 88)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
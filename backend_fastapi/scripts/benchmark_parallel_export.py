@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Parallel Project Export Benchmark
+Compare the single-connection project export with the range-sharded parallel export
+(ProjectExportService.stream_export_parallel) at several shard counts:
+
+- serial: stream_export, one snapshot connection, batches fetched one after another
+- ordered N: N shards in shard worker processes sharing one snapshot, reassembled in order
+  (csv/txt only)
+- split N: N shards encoded as separate files inside a ZIP
+
+Ordered output is checked to be byte-identical to the serial export. "main CPU" is the CPU
+time spent in the benchmark process itself (event loop + reader threads); with the shards in
+worker processes it should stay a small fraction of the serial export's, so wall time scales
+with the cores and connections available rather than with one event loop. The shard worker
+processes are started and warmed up before timing. Run against a database seeded by
+generate_test_data.py, ideally from a separate host than the database server:
+
+    python scripts/benchmark_parallel_export.py --format csv --shards 2 4 8
+    python scripts/benchmark_parallel_export.py --format parquet --shards 4 --split
+"""
+
+import sys
+import os
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import asyncio
+import hashlib
+import resource
+import time
+from typing import AsyncIterator, Tuple
+
+# Set environment before importing app modules
+os.environ["ENVIRONMENT"] = "dev"
+
+from app.core.database import async_engine
+from app.api.v1.modules.projects.schema import ProjectQueryParams
+from app.api.v1.modules.projects.export_service import (
+    ProjectExportService,
+    shutdown_shard_executor,
+    warm_up_shard_executor,
+)
+from app.utils.export_writers import EXPORT_WRITERS, get_export_writer
+
+
+async def consume(chunks: AsyncIterator[bytes]) -> Tuple[float, float, int, str]:
+    """读完导出流，返回 (耗时秒, 本进程 CPU 秒, 字节数, sha256)"""
+    digest = hashlib.sha256()
+    size = 0
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    async for chunk in chunks:
+        digest.update(chunk)
+        size += len(chunk)
+    return time.perf_counter() - start, time.process_time() - cpu_start, size, digest.hexdigest()
+
+
+def report(mode: str, elapsed: float, cpu: float, size: int, baseline: float, note: str) -> None:
+    print(
+        f"{mode:<16}{elapsed:>10.1f}{cpu:>10.1f}{size / 1024 / 1024:>10.1f}"
+        f"{baseline / elapsed:>9.1f}x  {note}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel project export")
+    parser.add_argument("--format", default="csv", choices=sorted(EXPORT_WRITERS))
+    parser.add_argument("--shards", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--split", action="store_true", help="also time the multi-file ZIP output")
+    parser.add_argument("--formulator", default=None, help="optional formulator filter")
+    args = parser.parse_args()
+
+    writer_class = get_export_writer(args.format)
+    query_params = ProjectQueryParams(formulator=args.formulator)
+
+    print("=" * 82)
+    print(f"PARALLEL PROJECT EXPORT BENCHMARK (format={args.format}, {os.cpu_count()} CPUs)")
+    print("=" * 82)
+    print(f"{'mode':<16}{'seconds':>10}{'main CPU':>10}{'MB':>10}{'speedup':>10}  output")
+    print("-" * 82)
+
+    await warm_up_shard_executor()
+
+    baseline, cpu, size, digest = await consume(
+        ProjectExportService.stream_export(query_params, writer_class)
+    )
+    report("serial", baseline, cpu, size, baseline, "")
+
+    for shards in args.shards:
+        if writer_class.concatenable:
+            elapsed, cpu, size, shard_digest = await consume(
+                ProjectExportService.stream_export_parallel(query_params, writer_class, shards=shards)
+            )
+            same = "identical" if shard_digest == digest else "DIFFERENT"
+            report(f"ordered {shards}", elapsed, cpu, size, baseline, same)
+        if args.split or not writer_class.concatenable:
+            elapsed, cpu, size, _ = await consume(
+                ProjectExportService.stream_export_parallel(
+                    query_params, writer_class, shards=shards, split=True
+                )
+            )
+            report(f"split {shards}", elapsed, cpu, size, baseline, "zip")
+
+    print("-" * 82)
+    print(f"peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    print("=" * 82)
+    shutdown_shard_executor()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Project Export Benchmark
+Export the whole project catalogue through ProjectExportService and report throughput,
+per-batch latency (early vs late batches) and process memory
+
+Run against a database seeded by generate_test_data.py (990,000 projects):
+
+    python scripts/benchmark_project_export.py --format csv --output /dev/null
+    python scripts/benchmark_project_export.py --format parquet --output /tmp/projects.parquet
+    python scripts/benchmark_project_export.py --format xlsx --output /tmp/projects.xlsx
+    python scripts/benchmark_project_export.py --offset-depths 0 100000 500000 900000
+"""
+
+import sys
+import os
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import asyncio
+import resource
+import statistics
+import time
+from typing import List
+
+# Set environment before importing app modules
+os.environ["ENVIRONMENT"] = "dev"
+
+from sqlalchemy import select
+
+from app.core.database import async_engine
+from app.api.v1.modules.projects.model import ProjectModel
+from app.api.v1.modules.projects.schema import ProjectQueryParams
+from app.api.v1.modules.projects.export_service import ProjectExportService
+from app.utils.export_writers import EXPORT_WRITERS, get_export_writer
+
+
+def current_rss_mb() -> float:
+    """当前常驻内存（MB），非 Linux 平台退回峰值内存"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def counting_writer(writer_class):
+    """包装写入器，统计写出的行数（二进制格式无法按换行符计数）"""
+
+    class CountingWriter(writer_class):
+        rows = 0
+
+        def write_rows(self, rows):
+            rows = list(rows)
+            CountingWriter.rows += len(rows)
+            return super().write_rows(rows)
+
+    return CountingWriter
+
+
+async def run_export(export_format: str, output_path: str) -> None:
+    """完整导出一次，统计吞吐、每批耗时与内存"""
+    writer_class = counting_writer(get_export_writer(export_format))
+
+    batch_ms: List[float] = []
+    rss_samples: List[float] = []
+    size = 0
+    first_batch_ms = None
+
+    start = time.perf_counter()
+    last = start
+    chunk_index = 0
+    with open(output_path, "wb") as output:
+        async for chunk in ProjectExportService.stream_export(ProjectQueryParams(), writer_class):
+            now = time.perf_counter()
+            chunk_index += 1
+            # 第一块是文件头，之后每块对应一批项目（列式格式为一个行组）
+            if chunk_index > 1:
+                batch_ms.append((now - last) * 1000)
+                if first_batch_ms is None:
+                    first_batch_ms = (now - start) * 1000
+                rss_samples.append(current_rss_mb())
+            output.write(chunk)
+            size += len(chunk)
+            last = time.perf_counter()
+    elapsed = time.perf_counter() - start
+
+    rows = writer_class.rows
+    print(f"format            : {export_format}")
+    if writer_class.columnar:
+        # 列式格式按行组输出，每块对应 ROW_GROUP_SIZE 行
+        print(f"row groups        : {len(batch_ms):,} x {writer_class.ROW_GROUP_SIZE} rows")
+    else:
+        print(f"batches           : {len(batch_ms):,} x {ProjectExportService.BATCH_SIZE} projects")
+    print(f"rows written      : {rows:,}")
+    print(f"bytes written     : {size / 1024 / 1024:,.1f} MB")
+    print(f"elapsed           : {elapsed:,.1f} s")
+    print(f"throughput        : {rows / elapsed:,.0f} rows/s")
+    if batch_ms:
+        window = max(1, min(20, len(batch_ms) // 10))
+        print(f"first batch       : {first_batch_ms:,.1f} ms")
+        print(f"batch p50         : {statistics.median(batch_ms):,.1f} ms")
+        print(f"early batches p50 : {statistics.median(batch_ms[:window]):,.1f} ms (first {window})")
+        print(f"late batches p50  : {statistics.median(batch_ms[-window:]):,.1f} ms (last {window})")
+        print(
+            f"rss               : {rss_samples[0]:,.1f} MB after first batch, "
+            f"{max(rss_samples):,.1f} MB max, {rss_samples[-1]:,.1f} MB at end"
+        )
+
+
+async def compare_offset(depths: List[int], runs: int) -> None:
+    """对比 OFFSET 分页与键集分页在不同深度读取一批项目的耗时"""
+    batch = ProjectExportService.BATCH_SIZE
+    base = select(ProjectModel.ProjectID, ProjectModel.ProjectName, ProjectModel.FormulaCode)
+
+    print(f"\n{'depth':>10}{'offset ms':>12}{'keyset ms':>12}")
+    async with async_engine.connect() as conn:
+        for depth in depths:
+            boundary = (
+                await conn.execute(
+                    select(ProjectModel.ProjectID)
+                    .order_by(ProjectModel.ProjectID)
+                    .offset(max(depth - 1, 0))
+                    .limit(1)
+                )
+            ).scalar()
+            if boundary is None:
+                print(f"{depth:>10}  (beyond end of table)")
+                continue
+
+            offset_stmt = base.order_by(ProjectModel.ProjectID).offset(depth).limit(batch)
+            keyset_stmt = base.order_by(ProjectModel.ProjectID).limit(batch)
+            if depth:
+                keyset_stmt = keyset_stmt.where(ProjectModel.ProjectID > boundary)
+
+            timings = {"offset": [], "keyset": []}
+            for _ in range(runs):
+                for name, stmt in (("offset", offset_stmt), ("keyset", keyset_stmt)):
+                    start = time.perf_counter()
+                    (await conn.execute(stmt)).all()
+                    timings[name].append((time.perf_counter() - start) * 1000)
+            print(
+                f"{depth:>10}{statistics.median(timings['offset']):>12.1f}"
+                f"{statistics.median(timings['keyset']):>12.1f}"
+            )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark full project export")
+    parser.add_argument("--format", choices=list(EXPORT_WRITERS), default="csv")
+    parser.add_argument("--output", default=os.devnull, help="export destination")
+    parser.add_argument("--batch-size", type=int, default=ProjectExportService.BATCH_SIZE)
+    parser.add_argument(
+        "--offset-depths", type=int, nargs="*", default=None,
+        help="also compare OFFSET vs keyset batch latency at these depths",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per depth")
+    parser.add_argument("--skip-export", action="store_true")
+    args = parser.parse_args()
+
+    ProjectExportService.BATCH_SIZE = args.batch_size
+
+    print("=" * 72)
+    print("PROJECT EXPORT BENCHMARK")
+    print("=" * 72)
+    if not args.skip_export:
+        await run_export(args.format, args.output)
+    if args.offset_depths:
+        await compare_offset(args.offset_depths, args.runs)
+    print("=" * 72)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
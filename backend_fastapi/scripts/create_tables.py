@@ -35,6 +35,9 @@ DB_NAME = os.getenv("DB_DATABASE", "photopolymer_formulation_db")
 # 表定义
 TABLES = {}
 
+# 关键词搜索的 gin_trgm_ops 索引依赖 pg_trgm 扩展
+TABLES["ext_pg_trgm"] = "CREATE EXTENSION IF NOT EXISTS pg_trgm; "
+
 TABLES["tbl_Config_ProjectTypes"] = (
     'CREATE TABLE "tbl_Config_ProjectTypes" ('
     '  "TypeID" SERIAL PRIMARY KEY,'
@@ -77,6 +80,10 @@ TABLES["tbl_ProjectInfo"] = (
     '  FOREIGN KEY ("ProjectType_FK") REFERENCES "tbl_Config_ProjectTypes" ("TypeID") ON DELETE SET NULL'
     "); "
     'CREATE INDEX IF NOT EXISTS idx_project_type_fk ON "tbl_ProjectInfo"("ProjectType_FK"); '
+    'CREATE INDEX IF NOT EXISTS idx_project_formulation_date_id ON "tbl_ProjectInfo"("FormulationDate", "ProjectID"); '
+    'CREATE INDEX IF NOT EXISTS idx_project_name_id ON "tbl_ProjectInfo"("ProjectName", "ProjectID"); '
+    'CREATE INDEX IF NOT EXISTS idx_project_name_trgm ON "tbl_ProjectInfo" USING gin ("ProjectName" gin_trgm_ops); '
+    'CREATE INDEX IF NOT EXISTS idx_project_formula_code_trgm ON "tbl_ProjectInfo" USING gin ("FormulaCode" gin_trgm_ops); '
 )
 
 TABLES["tbl_RawMaterials"] = (
@@ -94,6 +101,8 @@ TABLES["tbl_RawMaterials"] = (
     '  FOREIGN KEY ("Category_FK") REFERENCES "tbl_Config_MaterialCategories" ("CategoryID") ON DELETE SET NULL'
     "); "
     'CREATE INDEX IF NOT EXISTS idx_material_category_fk ON "tbl_RawMaterials"("Category_FK"); '
+    'CREATE INDEX IF NOT EXISTS idx_material_tradename_trgm ON "tbl_RawMaterials" USING gin ("TradeName" gin_trgm_ops); '
+    'CREATE INDEX IF NOT EXISTS idx_material_cas_trgm ON "tbl_RawMaterials" USING gin ("CAS_Number" gin_trgm_ops); '
 )
 
 TABLES["tbl_InorganicFillers"] = (
@@ -111,6 +120,7 @@ TABLES["tbl_InorganicFillers"] = (
     '  FOREIGN KEY ("FillerType_FK") REFERENCES "tbl_Config_FillerTypes" ("FillerTypeID") ON DELETE SET NULL'
     "); "
     'CREATE INDEX IF NOT EXISTS idx_filler_type_fk ON "tbl_InorganicFillers"("FillerType_FK"); '
+    'CREATE INDEX IF NOT EXISTS idx_filler_tradename_trgm ON "tbl_InorganicFillers" USING gin ("TradeName" gin_trgm_ops); '
 )
 
 TABLES["tbl_FormulaComposition"] = (
@@ -141,12 +151,32 @@ TABLES["tbl_TestResults_Ink"] = (
     '  "Ink_SurfaceTension" VARCHAR(255),'
     '  "Ink_ColorValue" VARCHAR(255),'
     '  "Ink_RheologyNote" TEXT,'
+    '  "Ink_Viscosity_Value" DOUBLE PRECISION,'
+    '  "Ink_Viscosity_Unit" VARCHAR(20),'
+    '  "Ink_Viscosity_ParseStatus" VARCHAR(20),'
+    '  "Ink_Reactivity_Value" DOUBLE PRECISION,'
+    '  "Ink_Reactivity_Unit" VARCHAR(20),'
+    '  "Ink_Reactivity_ParseStatus" VARCHAR(20),'
+    '  "Ink_ParticleSize_Value" DOUBLE PRECISION,'
+    '  "Ink_ParticleSize_Unit" VARCHAR(20),'
+    '  "Ink_ParticleSize_ParseStatus" VARCHAR(20),'
+    '  "Ink_SurfaceTension_Value" DOUBLE PRECISION,'
+    '  "Ink_SurfaceTension_Unit" VARCHAR(20),'
+    '  "Ink_SurfaceTension_ParseStatus" VARCHAR(20),'
+    '  "Ink_ColorValue_Value" DOUBLE PRECISION,'
+    '  "Ink_ColorValue_Unit" VARCHAR(20),'
+    '  "Ink_ColorValue_ParseStatus" VARCHAR(20),'
     '  "TestDate" DATE,'
     '  "Notes" TEXT,'
     '  "ReservedField1" TEXT,'
     '  "ReservedField2" TEXT,'
     '  FOREIGN KEY ("ProjectID_FK") REFERENCES "tbl_ProjectInfo" ("ProjectID") ON DELETE CASCADE'
     "); "
+    'CREATE INDEX IF NOT EXISTS idx_ink_viscosity_value ON "tbl_TestResults_Ink"("Ink_Viscosity_Value", "ProjectID_FK") WHERE "Ink_Viscosity_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_ink_reactivity_value ON "tbl_TestResults_Ink"("Ink_Reactivity_Value", "ProjectID_FK") WHERE "Ink_Reactivity_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_ink_particlesize_value ON "tbl_TestResults_Ink"("Ink_ParticleSize_Value", "ProjectID_FK") WHERE "Ink_ParticleSize_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_ink_surfacetension_value ON "tbl_TestResults_Ink"("Ink_SurfaceTension_Value", "ProjectID_FK") WHERE "Ink_SurfaceTension_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_ink_colorvalue_value ON "tbl_TestResults_Ink"("Ink_ColorValue_Value", "ProjectID_FK") WHERE "Ink_ColorValue_Value" IS NOT NULL; '
 )
 
 TABLES["tbl_TestResults_Coating"] = (
@@ -158,12 +188,32 @@ TABLES["tbl_TestResults_Coating"] = (
     '  "Coating_SurfaceHardness" VARCHAR(255),'
     '  "Coating_ChemicalResistance" VARCHAR(255),'
     '  "Coating_CostEstimate" VARCHAR(255),'
+    '  "Coating_Adhesion_Value" DOUBLE PRECISION,'
+    '  "Coating_Adhesion_Unit" VARCHAR(20),'
+    '  "Coating_Adhesion_ParseStatus" VARCHAR(20),'
+    '  "Coating_Transparency_Value" DOUBLE PRECISION,'
+    '  "Coating_Transparency_Unit" VARCHAR(20),'
+    '  "Coating_Transparency_ParseStatus" VARCHAR(20),'
+    '  "Coating_SurfaceHardness_Value" DOUBLE PRECISION,'
+    '  "Coating_SurfaceHardness_Unit" VARCHAR(20),'
+    '  "Coating_SurfaceHardness_ParseStatus" VARCHAR(20),'
+    '  "Coating_ChemicalResistance_Value" DOUBLE PRECISION,'
+    '  "Coating_ChemicalResistance_Unit" VARCHAR(20),'
+    '  "Coating_ChemicalResistance_ParseStatus" VARCHAR(20),'
+    '  "Coating_CostEstimate_Value" DOUBLE PRECISION,'
+    '  "Coating_CostEstimate_Unit" VARCHAR(20),'
+    '  "Coating_CostEstimate_ParseStatus" VARCHAR(20),'
     '  "TestDate" DATE,'
     '  "Notes" TEXT,'
     '  "ReservedField1" TEXT,'
     '  "ReservedField2" TEXT,'
     '  FOREIGN KEY ("ProjectID_FK") REFERENCES "tbl_ProjectInfo" ("ProjectID") ON DELETE CASCADE'
     "); "
+    'CREATE INDEX IF NOT EXISTS idx_coating_adhesion_value ON "tbl_TestResults_Coating"("Coating_Adhesion_Value", "ProjectID_FK") WHERE "Coating_Adhesion_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_coating_transparency_value ON "tbl_TestResults_Coating"("Coating_Transparency_Value", "ProjectID_FK") WHERE "Coating_Transparency_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_coating_surfacehardness_value ON "tbl_TestResults_Coating"("Coating_SurfaceHardness_Value", "ProjectID_FK") WHERE "Coating_SurfaceHardness_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_coating_chemicalresistance_value ON "tbl_TestResults_Coating"("Coating_ChemicalResistance_Value", "ProjectID_FK") WHERE "Coating_ChemicalResistance_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_coating_costestimate_value ON "tbl_TestResults_Coating"("Coating_CostEstimate_Value", "ProjectID_FK") WHERE "Coating_CostEstimate_Value" IS NOT NULL; '
 )
 
 TABLES["tbl_TestResults_3DPrint"] = (
@@ -175,12 +225,32 @@ TABLES["tbl_TestResults_3DPrint"] = (
     '  "Print3D_FlexuralStrength" VARCHAR(255),'
     '  "Print3D_ShoreHardness" VARCHAR(255),'
     '  "Print3D_ImpactResistance" VARCHAR(255),'
+    '  "Print3D_Shrinkage_Value" DOUBLE PRECISION,'
+    '  "Print3D_Shrinkage_Unit" VARCHAR(20),'
+    '  "Print3D_Shrinkage_ParseStatus" VARCHAR(20),'
+    '  "Print3D_YoungsModulus_Value" DOUBLE PRECISION,'
+    '  "Print3D_YoungsModulus_Unit" VARCHAR(20),'
+    '  "Print3D_YoungsModulus_ParseStatus" VARCHAR(20),'
+    '  "Print3D_FlexuralStrength_Value" DOUBLE PRECISION,'
+    '  "Print3D_FlexuralStrength_Unit" VARCHAR(20),'
+    '  "Print3D_FlexuralStrength_ParseStatus" VARCHAR(20),'
+    '  "Print3D_ShoreHardness_Value" DOUBLE PRECISION,'
+    '  "Print3D_ShoreHardness_Unit" VARCHAR(20),'
+    '  "Print3D_ShoreHardness_ParseStatus" VARCHAR(20),'
+    '  "Print3D_ImpactResistance_Value" DOUBLE PRECISION,'
+    '  "Print3D_ImpactResistance_Unit" VARCHAR(20),'
+    '  "Print3D_ImpactResistance_ParseStatus" VARCHAR(20),'
     '  "TestDate" DATE,'
     '  "Notes" TEXT,'
     '  "ReservedField1" TEXT,'
     '  "ReservedField2" TEXT,'
     '  FOREIGN KEY ("ProjectID_FK") REFERENCES "tbl_ProjectInfo" ("ProjectID") ON DELETE CASCADE'
     "); "
+    'CREATE INDEX IF NOT EXISTS idx_print3d_shrinkage_value ON "tbl_TestResults_3DPrint"("Print3D_Shrinkage_Value", "ProjectID_FK") WHERE "Print3D_Shrinkage_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_print3d_youngsmodulus_value ON "tbl_TestResults_3DPrint"("Print3D_YoungsModulus_Value", "ProjectID_FK") WHERE "Print3D_YoungsModulus_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_print3d_flexuralstrength_value ON "tbl_TestResults_3DPrint"("Print3D_FlexuralStrength_Value", "ProjectID_FK") WHERE "Print3D_FlexuralStrength_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_print3d_shorehardness_value ON "tbl_TestResults_3DPrint"("Print3D_ShoreHardness_Value", "ProjectID_FK") WHERE "Print3D_ShoreHardness_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_print3d_impactresistance_value ON "tbl_TestResults_3DPrint"("Print3D_ImpactResistance_Value", "ProjectID_FK") WHERE "Print3D_ImpactResistance_Value" IS NOT NULL; '
 )
 
 TABLES["tbl_TestResults_Composite"] = (
@@ -192,12 +262,32 @@ TABLES["tbl_TestResults_Composite"] = (
     '  "Composite_ImpactResistance" VARCHAR(255),'
     '  "Composite_ConversionRate" VARCHAR(255),'
     '  "Composite_WaterAbsorption" VARCHAR(255),'
+    '  "Composite_FlexuralStrength_Value" DOUBLE PRECISION,'
+    '  "Composite_FlexuralStrength_Unit" VARCHAR(20),'
+    '  "Composite_FlexuralStrength_ParseStatus" VARCHAR(20),'
+    '  "Composite_YoungsModulus_Value" DOUBLE PRECISION,'
+    '  "Composite_YoungsModulus_Unit" VARCHAR(20),'
+    '  "Composite_YoungsModulus_ParseStatus" VARCHAR(20),'
+    '  "Composite_ImpactResistance_Value" DOUBLE PRECISION,'
+    '  "Composite_ImpactResistance_Unit" VARCHAR(20),'
+    '  "Composite_ImpactResistance_ParseStatus" VARCHAR(20),'
+    '  "Composite_ConversionRate_Value" DOUBLE PRECISION,'
+    '  "Composite_ConversionRate_Unit" VARCHAR(20),'
+    '  "Composite_ConversionRate_ParseStatus" VARCHAR(20),'
+    '  "Composite_WaterAbsorption_Value" DOUBLE PRECISION,'
+    '  "Composite_WaterAbsorption_Unit" VARCHAR(20),'
+    '  "Composite_WaterAbsorption_ParseStatus" VARCHAR(20),'
     '  "TestDate" DATE,'
     '  "Notes" TEXT,'
     '  "ReservedField1" TEXT,'
     '  "ReservedField2" TEXT,'
     '  FOREIGN KEY ("ProjectID_FK") REFERENCES "tbl_ProjectInfo" ("ProjectID") ON DELETE CASCADE'
     "); "
+    'CREATE INDEX IF NOT EXISTS idx_composite_flexuralstrength_value ON "tbl_TestResults_Composite"("Composite_FlexuralStrength_Value", "ProjectID_FK") WHERE "Composite_FlexuralStrength_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_composite_youngsmodulus_value ON "tbl_TestResults_Composite"("Composite_YoungsModulus_Value", "ProjectID_FK") WHERE "Composite_YoungsModulus_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_composite_impactresistance_value ON "tbl_TestResults_Composite"("Composite_ImpactResistance_Value", "ProjectID_FK") WHERE "Composite_ImpactResistance_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_composite_conversionrate_value ON "tbl_TestResults_Composite"("Composite_ConversionRate_Value", "ProjectID_FK") WHERE "Composite_ConversionRate_Value" IS NOT NULL; '
+    'CREATE INDEX IF NOT EXISTS idx_composite_waterabsorption_value ON "tbl_TestResults_Composite"("Composite_WaterAbsorption_Value", "ProjectID_FK") WHERE "Composite_WaterAbsorption_Value" IS NOT NULL; '
 )
 
 TABLES["fn_validate_project_type_for_test"] = (
@@ -292,6 +382,194 @@ TABLES["trg_ProjectInfo_ProjectType_Change"] = (
     'FOR EACH ROW EXECUTE FUNCTION "fn_validate_project_type_change"(); '
 )
 
+# 配方编码序号表：每个 (配方日期, 项目类型) 一行，创建项目时原子递增
+TABLES["tbl_FormulaCodeSequence"] = (
+    'CREATE TABLE "tbl_FormulaCodeSequence" ('
+    '  "FormulationDate" DATE NOT NULL,'
+    '  "ProjectType_FK" INTEGER NOT NULL,'
+    '  "LastValue" INTEGER NOT NULL DEFAULT 0,'
+    '  PRIMARY KEY ("FormulationDate", "ProjectType_FK"),'
+    '  FOREIGN KEY ("ProjectType_FK") REFERENCES "tbl_Config_ProjectTypes" ("TypeID") ON DELETE CASCADE'
+    ")"
+)
+
+# 项目汇总表：由下方触发器维护，供列表 has_compositions / has_test_results 筛选
+TABLES["tbl_ProjectSummary"] = (
+    'CREATE TABLE "tbl_ProjectSummary" ('
+    '  "ProjectID_FK" INTEGER PRIMARY KEY,'
+    '  "CompositionCount" INTEGER NOT NULL DEFAULT 0,'
+    '  "TotalWeightPercentage" DECIMAL(9,4) NOT NULL DEFAULT 0,'
+    '  "HasCompositions" BOOLEAN NOT NULL DEFAULT FALSE,'
+    '  "TestResultType" VARCHAR(10),'
+    '  "HasTestResults" BOOLEAN NOT NULL DEFAULT FALSE,'
+    '  "LastTestDate" DATE,'
+    '  "UpdatedAt" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,'
+    '  FOREIGN KEY ("ProjectID_FK") REFERENCES "tbl_ProjectInfo" ("ProjectID") ON DELETE CASCADE'
+    "); "
+    'CREATE INDEX IF NOT EXISTS idx_project_summary_has_compositions ON "tbl_ProjectSummary"("ProjectID_FK") WHERE "HasCompositions"; '
+    'CREATE INDEX IF NOT EXISTS idx_project_summary_has_test_results ON "tbl_ProjectSummary"("ProjectID_FK") WHERE "HasTestResults"; '
+)
+
+# 重新计算指定项目的汇总行（成分数量/重量合计、测试结果类型/最近测试日期）
+# 重算前按 ProjectID 顺序锁住父项目行（FOR NO KEY UPDATE，不与外键检查的 KEY SHARE 冲突），
+# 并发写同一项目的事务依次重算，后提交的一方不会用旧快照覆盖汇总行
+TABLES["fn_recompute_project_summary"] = (
+    'CREATE OR REPLACE FUNCTION "fn_recompute_project_summary"(p_ids INTEGER[]) '
+    "RETURNS VOID AS $$ "
+    "BEGIN "
+    "  IF p_ids IS NULL OR cardinality(p_ids) = 0 THEN RETURN; END IF; "
+    '  PERFORM 1 FROM "tbl_ProjectInfo" WHERE "ProjectID" = ANY(p_ids) '
+    '  ORDER BY "ProjectID" FOR NO KEY UPDATE; '
+    '  INSERT INTO "tbl_ProjectSummary" ('
+    '    "ProjectID_FK", "CompositionCount", "TotalWeightPercentage", "HasCompositions", '
+    '    "TestResultType", "HasTestResults", "LastTestDate", "UpdatedAt") '
+    '  SELECT p."ProjectID", COALESCE(c.cnt, 0), COALESCE(c.total, 0), COALESCE(c.cnt, 0) > 0, '
+    "         t.type_code, t.type_code IS NOT NULL, t.test_date, CURRENT_TIMESTAMP "
+    '  FROM "tbl_ProjectInfo" p '
+    "  LEFT JOIN ("
+    '    SELECT "ProjectID_FK", COUNT(*) AS cnt, SUM("WeightPercentage") AS total '
+    '    FROM "tbl_FormulaComposition" WHERE "ProjectID_FK" = ANY(p_ids) GROUP BY "ProjectID_FK"'
+    '  ) c ON c."ProjectID_FK" = p."ProjectID" '
+    "  LEFT JOIN LATERAL ("
+    "    SELECT r.type_code, r.test_date FROM ("
+    '      SELECT \'INK\' AS type_code, "TestDate" AS test_date FROM "tbl_TestResults_Ink" WHERE "ProjectID_FK" = p."ProjectID" '
+    '      UNION ALL SELECT \'COAT\', "TestDate" FROM "tbl_TestResults_Coating" WHERE "ProjectID_FK" = p."ProjectID" '
+    '      UNION ALL SELECT \'3DP\', "TestDate" FROM "tbl_TestResults_3DPrint" WHERE "ProjectID_FK" = p."ProjectID" '
+    '      UNION ALL SELECT \'COMP\', "TestDate" FROM "tbl_TestResults_Composite" WHERE "ProjectID_FK" = p."ProjectID"'
+    "    ) r ORDER BY r.test_date DESC NULLS LAST LIMIT 1"
+    "  ) t ON TRUE "
+    '  WHERE p."ProjectID" = ANY(p_ids) '
+    '  ON CONFLICT ("ProjectID_FK") DO UPDATE SET '
+    '    "CompositionCount" = EXCLUDED."CompositionCount", '
+    '    "TotalWeightPercentage" = EXCLUDED."TotalWeightPercentage", '
+    '    "HasCompositions" = EXCLUDED."HasCompositions", '
+    '    "TestResultType" = EXCLUDED."TestResultType", '
+    '    "HasTestResults" = EXCLUDED."HasTestResults", '
+    '    "LastTestDate" = EXCLUDED."LastTestDate", '
+    '    "UpdatedAt" = EXCLUDED."UpdatedAt"; '
+    "END; "
+    "$$ LANGUAGE plpgsql; "
+)
+
+# 语句级触发器函数：从转换表收集受影响的项目ID后统一重算
+# 事务内设置 app.defer_project_summary = on 时直接返回（批量导入暂停触发器，提交前统一重算一次）
+TABLES["fn_refresh_project_summary"] = (
+    'CREATE OR REPLACE FUNCTION "fn_refresh_project_summary"() '
+    "RETURNS TRIGGER AS $$ "
+    "DECLARE ids INTEGER[]; "
+    "BEGIN "
+    "  IF current_setting('app.defer_project_summary', true) = 'on' THEN RETURN NULL; END IF; "
+    "  IF TG_OP = 'INSERT' THEN "
+    '    SELECT array_agg(DISTINCT "ProjectID_FK") INTO ids FROM new_rows; '
+    "  ELSIF TG_OP = 'DELETE' THEN "
+    '    SELECT array_agg(DISTINCT "ProjectID_FK") INTO ids FROM old_rows; '
+    "  ELSE "
+    "    SELECT array_agg(DISTINCT id) INTO ids FROM ("
+    '      SELECT "ProjectID_FK" AS id FROM new_rows UNION SELECT "ProjectID_FK" FROM old_rows'
+    "    ) changed; "
+    "  END IF; "
+    '  PERFORM "fn_recompute_project_summary"(ids); '
+    "  RETURN NULL; "
+    "END; "
+    "$$ LANGUAGE plpgsql; "
+)
+
+# 新建项目时插入空汇总行（暂停时同上，由重算插入）
+TABLES["fn_init_project_summary"] = (
+    'CREATE OR REPLACE FUNCTION "fn_init_project_summary"() '
+    "RETURNS TRIGGER AS $$ "
+    "BEGIN "
+    "  IF current_setting('app.defer_project_summary', true) = 'on' THEN RETURN NULL; END IF; "
+    '  INSERT INTO "tbl_ProjectSummary" ("ProjectID_FK") '
+    '  SELECT "ProjectID" FROM new_rows '
+    '  ON CONFLICT ("ProjectID_FK") DO NOTHING; '
+    "  RETURN NULL; "
+    "END; "
+    "$$ LANGUAGE plpgsql; "
+)
+
+TABLES["trg_ProjectInfo_Summary_Init"] = (
+    'DROP TRIGGER IF EXISTS "trg_projectinfo_summary_init" ON "tbl_ProjectInfo"; '
+    'CREATE TRIGGER "trg_projectinfo_summary_init" AFTER INSERT ON "tbl_ProjectInfo" '
+    "REFERENCING NEW TABLE AS new_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_init_project_summary"(); '
+)
+
+TABLES["trg_FormulaComposition_Summary"] = (
+    'DROP TRIGGER IF EXISTS "trg_composition_summary_ins" ON "tbl_FormulaComposition"; '
+    'DROP TRIGGER IF EXISTS "trg_composition_summary_upd" ON "tbl_FormulaComposition"; '
+    'DROP TRIGGER IF EXISTS "trg_composition_summary_del" ON "tbl_FormulaComposition"; '
+    'CREATE TRIGGER "trg_composition_summary_ins" AFTER INSERT ON "tbl_FormulaComposition" '
+    "REFERENCING NEW TABLE AS new_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+    'CREATE TRIGGER "trg_composition_summary_upd" AFTER UPDATE ON "tbl_FormulaComposition" '
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+    'CREATE TRIGGER "trg_composition_summary_del" AFTER DELETE ON "tbl_FormulaComposition" '
+    "REFERENCING OLD TABLE AS old_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+)
+
+TABLES["trg_TestResults_Ink_Summary"] = (
+    'DROP TRIGGER IF EXISTS "trg_testresults_ink_summary_ins" ON "tbl_TestResults_Ink"; '
+    'DROP TRIGGER IF EXISTS "trg_testresults_ink_summary_upd" ON "tbl_TestResults_Ink"; '
+    'DROP TRIGGER IF EXISTS "trg_testresults_ink_summary_del" ON "tbl_TestResults_Ink"; '
+    'CREATE TRIGGER "trg_testresults_ink_summary_ins" AFTER INSERT ON "tbl_TestResults_Ink" '
+    "REFERENCING NEW TABLE AS new_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+    'CREATE TRIGGER "trg_testresults_ink_summary_upd" AFTER UPDATE ON "tbl_TestResults_Ink" '
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+    'CREATE TRIGGER "trg_testresults_ink_summary_del" AFTER DELETE ON "tbl_TestResults_Ink" '
+    "REFERENCING OLD TABLE AS old_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+)
+
+TABLES["trg_TestResults_Coating_Summary"] = (
+    'DROP TRIGGER IF EXISTS "trg_testresults_coating_summary_ins" ON "tbl_TestResults_Coating"; '
+    'DROP TRIGGER IF EXISTS "trg_testresults_coating_summary_upd" ON "tbl_TestResults_Coating"; '
+    'DROP TRIGGER IF EXISTS "trg_testresults_coating_summary_del" ON "tbl_TestResults_Coating"; '
+    'CREATE TRIGGER "trg_testresults_coating_summary_ins" AFTER INSERT ON "tbl_TestResults_Coating" '
+    "REFERENCING NEW TABLE AS new_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+    'CREATE TRIGGER "trg_testresults_coating_summary_upd" AFTER UPDATE ON "tbl_TestResults_Coating" '
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+    'CREATE TRIGGER "trg_testresults_coating_summary_del" AFTER DELETE ON "tbl_TestResults_Coating" '
+    "REFERENCING OLD TABLE AS old_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+)
+
+TABLES["trg_TestResults_3DPrint_Summary"] = (
+    'DROP TRIGGER IF EXISTS "trg_testresults_3dprint_summary_ins" ON "tbl_TestResults_3DPrint"; '
+    'DROP TRIGGER IF EXISTS "trg_testresults_3dprint_summary_upd" ON "tbl_TestResults_3DPrint"; '
+    'DROP TRIGGER IF EXISTS "trg_testresults_3dprint_summary_del" ON "tbl_TestResults_3DPrint"; '
+    'CREATE TRIGGER "trg_testresults_3dprint_summary_ins" AFTER INSERT ON "tbl_TestResults_3DPrint" '
+    "REFERENCING NEW TABLE AS new_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+    'CREATE TRIGGER "trg_testresults_3dprint_summary_upd" AFTER UPDATE ON "tbl_TestResults_3DPrint" '
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+    'CREATE TRIGGER "trg_testresults_3dprint_summary_del" AFTER DELETE ON "tbl_TestResults_3DPrint" '
+    "REFERENCING OLD TABLE AS old_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+)
+
+TABLES["trg_TestResults_Composite_Summary"] = (
+    'DROP TRIGGER IF EXISTS "trg_testresults_composite_summary_ins" ON "tbl_TestResults_Composite"; '
+    'DROP TRIGGER IF EXISTS "trg_testresults_composite_summary_upd" ON "tbl_TestResults_Composite"; '
+    'DROP TRIGGER IF EXISTS "trg_testresults_composite_summary_del" ON "tbl_TestResults_Composite"; '
+    'CREATE TRIGGER "trg_testresults_composite_summary_ins" AFTER INSERT ON "tbl_TestResults_Composite" '
+    "REFERENCING NEW TABLE AS new_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+    'CREATE TRIGGER "trg_testresults_composite_summary_upd" AFTER UPDATE ON "tbl_TestResults_Composite" '
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+    'CREATE TRIGGER "trg_testresults_composite_summary_del" AFTER DELETE ON "tbl_TestResults_Composite" '
+    "REFERENCING OLD TABLE AS old_rows "
+    'FOR EACH STATEMENT EXECUTE FUNCTION "fn_refresh_project_summary"(); '
+)
+
 TABLES["tbl_Users"] = (
     'CREATE TABLE "tbl_Users" ('
     '  "UserID" SERIAL PRIMARY KEY,'
@@ -310,6 +588,35 @@ TABLES["tbl_Users"] = (
     'CREATE INDEX IF NOT EXISTS idx_users_email ON "tbl_Users"("Email"); '
 )
 
+# 导出任务表：异步导出的进度与文件信息
+TABLES["tbl_ExportJobs"] = (
+    'CREATE TABLE "tbl_ExportJobs" ('
+    '  "JobID" SERIAL PRIMARY KEY,'
+    '  "Resource" VARCHAR(32) NOT NULL,'
+    '  "Format" VARCHAR(16) NOT NULL,'
+    '  "Compression" VARCHAR(16),'
+    '  "Filters" JSONB NOT NULL,'
+    '  "RequestKey" VARCHAR(64) NOT NULL,'
+    "  \"Status\" VARCHAR(16) NOT NULL DEFAULT 'pending',"
+    '  "TotalItems" INTEGER,'
+    '  "ProcessedItems" INTEGER NOT NULL DEFAULT 0,'
+    '  "RowsWritten" INTEGER NOT NULL DEFAULT 0,'
+    '  "BytesWritten" BIGINT NOT NULL DEFAULT 0,'
+    '  "FileName" VARCHAR(255),'
+    '  "FilePath" VARCHAR(512),'
+    '  "FileSize" BIGINT,'
+    '  "ErrorMessage" TEXT,'
+    '  "CreatedBy" INTEGER,'
+    '  "CreatedAt" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,'
+    '  "StartedAt" TIMESTAMP,'
+    '  "UpdatedAt" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,'
+    '  "FinishedAt" TIMESTAMP,'
+    '  "ExpiresAt" TIMESTAMP'
+    "); "
+    'CREATE INDEX IF NOT EXISTS idx_export_jobs_request_key ON "tbl_ExportJobs"("RequestKey", "CreatedAt"); '
+    'CREATE INDEX IF NOT EXISTS "ix_tbl_ExportJobs_Status" ON "tbl_ExportJobs"("Status"); '
+)
+
 TABLES["tbl_SystemInfo"] = (
     'CREATE TABLE "tbl_SystemInfo" ('
     '  "InfoID" SERIAL PRIMARY KEY,'
@@ -354,6 +661,7 @@ TABLES["tbl_UserRegistrationLogs"] = (
 
 # 表创建顺序
 TABLE_ORDER = [
+    "ext_pg_trgm",
     "tbl_Config_ProjectTypes",
     "tbl_Config_MaterialCategories",
     "tbl_Config_FillerTypes",
@@ -373,6 +681,18 @@ TABLE_ORDER = [
     "trg_TestResults_3DPrint_ProjectType",
     "trg_TestResults_Composite_ProjectType",
     "trg_ProjectInfo_ProjectType_Change",
+    "tbl_FormulaCodeSequence",
+    "tbl_ProjectSummary",
+    "fn_recompute_project_summary",
+    "fn_refresh_project_summary",
+    "fn_init_project_summary",
+    "trg_ProjectInfo_Summary_Init",
+    "trg_FormulaComposition_Summary",
+    "trg_TestResults_Ink_Summary",
+    "trg_TestResults_Coating_Summary",
+    "trg_TestResults_3DPrint_Summary",
+    "trg_TestResults_Composite_Summary",
+    "tbl_ExportJobs",
     "tbl_SystemInfo",
     "tbl_UserLoginLogs",
     "tbl_UserRegistrationLogs",
@@ -39,6 +39,7 @@ from app.api.v1.modules.projects.model import (
 )
 from app.api.v1.modules.materials.model import MaterialModel, MaterialCategoryModel
 from app.api.v1.modules.fillers.model import FillerModel, FillerTypeModel
+from app.utils.measurements import MEASUREMENT_FIELDS, shadow_values
 
 
 # ==================== Data Templates ====================
@@ -255,6 +256,10 @@ class BulkDataGenerator:
         if not data:
             return
         
+        # Test result tables: write the parsed numeric shadow columns as well
+        if table_name in MEASUREMENT_FIELDS:
+            data = [{**row, **shadow_values(row)} for row in data]
+        
         # Build column names and placeholders
         columns = list(data[0].keys())
         placeholders = ', '.join([f':{col}' for col in columns])
@@ -191,6 +191,81 @@ export function getFormulatorsApi() {
   })
 }
 
+/**
+ * 项目报告图表数据（各列表等长）
+ */
+export interface ProjectChartData {
+  project_id: number
+  project_type: string
+  radar: {
+    fields: string[]
+    names: string[]
+    units: string[]
+    min: number[]
+    max: number[]
+    measured: number[]
+    values: number[]
+    reference: number
+  }
+  compositions: {
+    names: string[]
+    kinds: ('material' | 'filler')[]
+    percentages: number[]
+    total: number
+  }
+}
+
+/**
+ * 获取项目报告图表数据（成分柱状图、测试结果雷达图，前端绘图）
+ */
+export function getProjectChartDataApi(projectId: number) {
+  return request<ProjectChartData>({
+    url: `/api/v1/projects/${projectId}/chart-data`,
+    method: 'get',
+  })
+}
+
+/**
+ * 测试指标统计值（数值均为标准单位）
+ */
+export interface PropertyStats {
+  count: number
+  mean: number | null
+  std: number | null
+  min: number | null
+  max: number | null
+  percentiles: Record<string, number>
+  histogram: number[]
+}
+
+/**
+ * 跨项目测试指标统计
+ */
+export interface ProjectAnalytics {
+  total: number
+  bins: number
+  percentiles: number[]
+  properties: {
+    field: string
+    label: string
+    unit: string
+    bin_edges: number[]
+    overall: PropertyStats
+    by_type: (PropertyStats & { project_type: string | null })[]
+  }[]
+}
+
+/**
+ * 获取跨项目测试指标统计（筛选参数与项目列表一致）
+ */
+export function getProjectAnalyticsApi(params?: Record<string, any>) {
+  return request<ProjectAnalytics>({
+    url: '/api/v1/projects/analytics',
+    method: 'get',
+    params,
+  })
+}
+
 /**
  * 导出项目图片报告
  */